@@ -0,0 +1,321 @@
+"""
+Move conversations that have gone quiet out of USA_Pawn_Conversations into
+gzip-compressed JSONL, partitioned by the month of their last activity.
+
+  <archive>/index.json
+  <archive>/<YYYY-MM>/part-<run>.jsonl.gz
+
+Each conversation is written as its own gzip member, so a part file is still
+ordinary gzip JSONL (zcat works) while index.json can point at the exact byte
+range of one conversation. /api/conversations/[id] uses that index and an S3
+ranged GET to answer for archived ids without reading whole parts.
+
+The archive lives in S3 (CONVERSATION_ARCHIVE_BUCKET, keys under
+CONVERSATION_ARCHIVE_PREFIX) so the deployed app can read it. Archived rows
+are then not deleted from the hot table directly: they get expires_at = now
+and DynamoDB's TTL sweep (configured by create_tables.py) removes them without
+consuming write capacity. The stamp is conditional on updated_at, so a
+conversation that picked up a new message after the scan stays live.
+--delete removes rows immediately instead.
+
+Without a bucket, --output writes a local copy only and hot rows are left in
+place: nothing the app serves may depend on files it cannot reach.
+"""
+import argparse
+import gzip
+import io
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError, PartialCredentialsError
+
+from dynamodb_client import DEFAULT_REGION, describe_backend, get_client
+from export_tables import SegmentResult, scan_page
+from snapshot_format import PROJECT_ROOT, encode_row
+
+
+CONVERSATIONS_TABLE = "USA_Pawn_Conversations"
+ARCHIVE_ROOT = PROJECT_ROOT / "backend" / "data" / "archive" / "conversations"
+DEFAULT_ARCHIVE_PREFIX = "conversations/"
+INDEX_NAME = "index.json"
+INDEX_VERSION = 1
+TTL_ATTRIBUTE = "expires_at"
+DEFAULT_AGE_DAYS = 90
+DEFAULT_SEGMENTS = 4
+DEFAULT_MAX_WORKERS = 8
+
+serializer = TypeSerializer()
+deserializer = TypeDeserializer()
+
+
+def activity_time(row: dict[str, Any]) -> str:
+    return str(row.get("updated_at") or row.get("ended_at") or row.get("started_at") or "")
+
+
+def month_of(row: dict[str, Any]) -> str:
+    return activity_time(row)[:7] or "unknown"
+
+
+def scan_segment(client, cutoff: str, segment: int, total_segments: int) -> list[dict[str, Any]]:
+    params: dict[str, Any] = {
+        "TableName": CONVERSATIONS_TABLE,
+        "Segment": segment,
+        "TotalSegments": total_segments,
+        # Rows written before updated_at was stamped fall back to started_at.
+        "FilterExpression": "attribute_not_exists(#ttl) AND (#updated < :cutoff OR (attribute_not_exists(#updated) AND #started < :cutoff))",
+        "ExpressionAttributeNames": {"#ttl": TTL_ATTRIBUTE, "#updated": "updated_at", "#started": "started_at"},
+        "ExpressionAttributeValues": {":cutoff": {"S": cutoff}},
+    }
+    result = SegmentResult(table_name=CONVERSATIONS_TABLE, segment=segment, path=Path())
+    rows: list[dict[str, Any]] = []
+    while True:
+        response = scan_page(client, params, result)
+        rows.extend({key: deserializer.deserialize(value) for key, value in item.items()} for item in response.get("Items", []))
+        if not response.get("LastEvaluatedKey"):
+            return rows
+        params["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def find_stale(client, cutoff: str, segments: int) -> list[dict[str, Any]]:
+    with ThreadPoolExecutor(max_workers=segments) as pool:
+        parts = pool.map(lambda segment: scan_segment(client, cutoff, segment, segments), range(segments))
+        return [row for part in parts for row in part if row.get("conversation_id")]
+
+
+# Storage.
+
+
+class LocalArchive:
+    """A directory on this machine. The deployed app cannot read it, so rows archived here stay live."""
+
+    shared = False
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def describe(self) -> str:
+        return f"{self.root}/"
+
+    def get(self, key: str) -> bytes | None:
+        path = self.root / key
+        return path.read_bytes() if path.exists() else None
+
+    def put(self, key: str, data: bytes, content_type: str) -> None:
+        path = self.root / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with tmp_path.open("wb") as handle:
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        tmp_path.replace(path)
+
+
+class S3Archive:
+    """Bucket the web app reads through frontend/src/lib/conversation-archive.ts."""
+
+    shared = True
+
+    def __init__(self, bucket: str, prefix: str):
+        import boto3
+
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = boto3.client("s3", region_name=os.getenv("AWS_REGION", DEFAULT_REGION))
+
+    def describe(self) -> str:
+        return f"s3://{self.bucket}/{self.prefix}"
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=self.prefix + key)["Body"].read()
+        except ClientError as error:
+            if error.response.get("Error", {}).get("Code", "") in ("NoSuchKey", "404"):
+                return None
+            raise
+
+    def put(self, key: str, data: bytes, content_type: str) -> None:
+        self.client.put_object(Bucket=self.bucket, Key=self.prefix + key, Body=data, ContentType=content_type)
+
+
+# Index.
+
+
+def read_index(store) -> dict[str, Any]:
+    data = store.get(INDEX_NAME)
+    if data is None:
+        return {"version": INDEX_VERSION, "updated_at": None, "count": 0, "conversations": {}}
+    index = json.loads(data.decode("utf-8"))
+    if index.get("version") != INDEX_VERSION:
+        raise ValueError(f"{store.describe()}{INDEX_NAME} has unsupported version {index.get('version')}")
+    return index
+
+
+def write_index(store, index: dict[str, Any]) -> None:
+    index["updated_at"] = datetime.now(timezone.utc).isoformat()
+    index["count"] = len(index["conversations"])
+    # Written after the parts it points into, so readers never see an entry without its bytes.
+    store.put(INDEX_NAME, json.dumps(index, separators=(",", ":")).encode("utf-8"), "application/json")
+
+
+# Parts.
+
+
+def write_month(store, month: str, run_id: str, rows: list[dict[str, Any]]) -> dict[str, list[Any]]:
+    """Write one part for the month; returns index entries [file, offset, length, updated_at] by id."""
+    relative = f"{month}/part-{run_id}.jsonl.gz"
+    entries: dict[str, list[Any]] = {}
+    buffer = io.BytesIO()
+    for row in sorted(rows, key=activity_time):
+        member = gzip.compress((encode_row(row) + "\n").encode("utf-8"), compresslevel=6, mtime=0)
+        entries[str(row["conversation_id"])] = [relative, buffer.tell(), len(member), activity_time(row)]
+        buffer.write(member)
+    store.put(relative, buffer.getvalue(), "application/gzip")
+    return entries
+
+
+def archive_rows(store, rows: list[dict[str, Any]], index: dict[str, Any]) -> tuple[int, dict[str, int]]:
+    # A conversation archived by an earlier run that crashed before stamping the hot row is
+    # already stored at the same updated_at; only the stamp is still missing.
+    known = index["conversations"]
+    pending = [row for row in rows if known.get(str(row["conversation_id"]), [None] * 4)[3] != activity_time(row)]
+
+    months: dict[str, list[dict[str, Any]]] = {}
+    for row in pending:
+        months.setdefault(month_of(row), []).append(row)
+
+    run_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    for month, month_rows in sorted(months.items()):
+        known.update(write_month(store, month, run_id, month_rows))
+    write_index(store, index)
+    return len(rows) - len(pending), {month: len(month_rows) for month, month_rows in sorted(months.items())}
+
+
+# Hot table.
+
+
+def retire_row(client, row: dict[str, Any], expires_at: int, delete: bool) -> bool:
+    key = {"conversation_id": serializer.serialize(row["conversation_id"])}
+    if row.get("updated_at"):
+        condition = "#updated = :updated"
+        values = {":updated": serializer.serialize(row["updated_at"])}
+    else:
+        condition = "attribute_not_exists(#updated)"
+        values = {}
+
+    try:
+        if delete:
+            client.delete_item(
+                TableName=CONVERSATIONS_TABLE,
+                Key=key,
+                ConditionExpression=condition,
+                ExpressionAttributeNames={"#updated": "updated_at"},
+                **({"ExpressionAttributeValues": values} if values else {}),
+            )
+        else:
+            client.update_item(
+                TableName=CONVERSATIONS_TABLE,
+                Key=key,
+                UpdateExpression="SET #ttl = :expires",
+                ConditionExpression=condition,
+                ExpressionAttributeNames={"#updated": "updated_at", "#ttl": TTL_ATTRIBUTE},
+                ExpressionAttributeValues={**values, ":expires": {"N": str(expires_at)}},
+            )
+    except ClientError as error:
+        if error.response.get("Error", {}).get("Code", "") == "ConditionalCheckFailedException":
+            return False
+        raise
+    return True
+
+
+def retire_rows(client, rows: list[dict[str, Any]], delete: bool, max_workers: int) -> int:
+    expires_at = int(time.time())
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        return sum(pool.map(lambda row: retire_row(client, row, expires_at, delete), rows))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Archive quiet conversations to gzip JSONL partitioned by month")
+    parser.add_argument(
+        "--older-than-days",
+        type=int,
+        default=int(os.getenv("CONVERSATION_ARCHIVE_DAYS", str(DEFAULT_AGE_DAYS))),
+        help="Archive conversations with no activity for this many days",
+    )
+    parser.add_argument(
+        "--bucket",
+        default=os.getenv("CONVERSATION_ARCHIVE_BUCKET"),
+        help="S3 bucket the web app reads the archive from (default CONVERSATION_ARCHIVE_BUCKET)",
+    )
+    parser.add_argument(
+        "--prefix",
+        default=os.getenv("CONVERSATION_ARCHIVE_PREFIX", DEFAULT_ARCHIVE_PREFIX),
+        help="Key prefix inside the bucket",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=ARCHIVE_ROOT,
+        help="Local archive directory when no bucket is set; hot rows are then left in place",
+    )
+    parser.add_argument("--segments", type=int, default=DEFAULT_SEGMENTS, help="Parallel scan segments")
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS, help="Concurrent hot-table updates")
+    parser.add_argument("--delete", action="store_true", help="Delete archived rows now instead of leaving them to TTL")
+    args = parser.parse_args()
+
+    if args.older_than_days < 1:
+        parser.error("--older-than-days must be at least 1")
+    if args.delete and not args.bucket:
+        parser.error("--delete needs --bucket: the app can only serve archived conversations from S3")
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=args.older_than_days)).isoformat()
+    dry_run = os.getenv("DYNAMODB_DRY_RUN", "false").lower() == "true"
+
+    try:
+        client = get_client()
+        store = S3Archive(args.bucket, args.prefix) if args.bucket else LocalArchive(args.output)
+        print(f"Scanning {describe_backend()} for conversations idle since {cutoff}")
+        rows = find_stale(client, cutoff, max(1, args.segments))
+        if dry_run:
+            months: dict[str, int] = {}
+            for row in rows:
+                months[month_of(row)] = months.get(month_of(row), 0) + 1
+            print(f"Dry-run mode enabled. Would archive {len(rows)} conversations to {store.describe()}")
+            for month, count in sorted(months.items()):
+                print(f"  {month}: {count}")
+            return 0
+        if not rows:
+            print("Nothing to archive.")
+            return 0
+
+        index = read_index(store)
+        already, months = archive_rows(store, rows, index)
+        # Only retire hot rows once the copy is somewhere /api/conversations/[id] can read it.
+        retired = retire_rows(client, rows, args.delete, args.workers) if store.shared else 0
+    except (NoCredentialsError, PartialCredentialsError):
+        print("AWS credentials unavailable. Nothing archived.")
+        return 1
+    except (ClientError, BotoCoreError, ValueError) as error:
+        print(f"Archive failed: {error}")
+        return 1
+
+    for month, count in months.items():
+        print(f"  {month}: {count} conversations")
+    if already:
+        print(f"  {already} conversations were already archived by an earlier run")
+    if store.shared:
+        action = "Deleted" if args.delete else "Marked for TTL expiry"
+        print(f"{action}: {retired} of {len(rows)} rows; {len(rows) - retired} changed since the scan and stay live")
+    else:
+        print("Local archive only: hot rows left in place. Set CONVERSATION_ARCHIVE_BUCKET to retire them.")
+    print(f"Index: {store.describe()}{INDEX_NAME} ({index['count']} conversations)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
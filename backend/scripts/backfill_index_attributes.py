@@ -0,0 +1,236 @@
+"""
+Backfill the attributes the app's GSIs are keyed on, for rows written before
+the writers stamped them.
+
+  conversations  updated_bucket (YYYY-MM-DD of updated_at), the partition key of
+                 updated_bucket-updated_at-index; the app derives it from each
+                 row's own updated_at on write (frontend/src/lib/dynamodb.ts)
+  staff_log      staff_key (normalized, lowercased staff_name), the partition key
+                 of staff_key-timestamp-index, so name lookups ignore case
+  appointments   type = "appointment" and appointment_time (else scheduled_time,
+                 else preferred_time) on leads that carry an appointment, the
+                 keys of the sparse type-appointment_time-index
+
+Rows are scanned in parallel segments with a projection of just the attributes
+a backfill reads. Only rows whose derived values differ from the stored ones
+are written, with an UpdateItem SET conditioned on the source attributes seen
+in the scan, so a row the app rewrote meanwhile is left for the next run.
+
+Usage:
+  python backfill_index_attributes.py                      # every backfill
+  python backfill_index_attributes.py --only conversations --only staff_log
+  python backfill_index_attributes.py --only appointments
+  DYNAMODB_DRY_RUN=true python backfill_index_attributes.py
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError, PartialCredentialsError
+
+from bulk_writer import MAX_RETRIES, THROTTLE_ERROR_CODES, backoff_delay
+from dynamodb_client import describe_backend, get_client
+from export_tables import SegmentResult, scan_page
+from staff_directory import staff_key
+
+
+DEFAULT_SEGMENTS = 4
+DEFAULT_MAX_WORKERS = 8
+
+deserializer = TypeDeserializer()
+serializer = TypeSerializer()
+
+
+@dataclass
+class Backfill:
+    name: str
+    table_name: str
+    key_name: str
+    # Attributes derive() reads; the write is conditioned on them being unchanged.
+    sources: tuple[str, ...]
+    # Attributes derive() may set; projected so unchanged values are not rewritten.
+    targets: tuple[str, ...]
+    derive: Callable[[dict[str, Any]], dict[str, Any]]
+
+
+@dataclass
+class BackfillStats:
+    scanned: int = 0
+    updates: list[tuple[dict[str, Any], dict[str, Any]]] = field(default_factory=list)
+    written: int = 0
+    conflicts: list[str] = field(default_factory=list)
+    retries: int = 0
+    seconds: float = 0.0
+
+
+def conversation_bucket(row: dict[str, Any]) -> dict[str, Any]:
+    updated_at = row.get("updated_at")
+    if not isinstance(updated_at, str) or not updated_at:
+        return {}
+    # Same slice as conversationUpdatedBucket() in frontend/src/lib/dynamodb.ts.
+    return {"updated_bucket": updated_at[:10]}
+
+
+def staff_log_key(row: dict[str, Any]) -> dict[str, Any]:
+    name = row.get("staff_name")
+    return {"staff_key": staff_key(name)} if isinstance(name, str) and name.strip() else {}
+
+
+def lead_appointment(row: dict[str, Any]) -> dict[str, Any]:
+    # Same rule as withIndexAttributes() in frontend/src/lib/dynamodb.ts.
+    appointment_time = next(
+        (row[name] for name in ("appointment_time", "scheduled_time", "preferred_time") if isinstance(row.get(name), str) and row[name]),
+        None,
+    )
+    is_appointment = row.get("type") == "appointment" or (row.get("type") is None and bool(row.get("appointment_id") or appointment_time))
+    if not is_appointment or not appointment_time:
+        return {}
+    return {"type": "appointment", "appointment_time": appointment_time}
+
+
+BACKFILLS = [
+    Backfill("conversations", "USA_Pawn_Conversations", "conversation_id", ("updated_at",), ("updated_bucket",), conversation_bucket),
+    Backfill("staff_log", "USA_Pawn_Staff_Log", "log_id", ("staff_name",), ("staff_key",), staff_log_key),
+    Backfill(
+        "appointments",
+        "USA_Pawn_Leads",
+        "lead_id",
+        ("type", "appointment_id", "appointment_time", "scheduled_time", "preferred_time"),
+        (),
+        lead_appointment,
+    ),
+]
+
+
+def scan_segment(client, backfill: Backfill, segment: int, total_segments: int) -> list[dict[str, Any]]:
+    attributes = list(dict.fromkeys((backfill.key_name, *backfill.sources, *backfill.targets)))
+    names = {f"#a{position}": name for position, name in enumerate(attributes)}
+    params: dict[str, Any] = {
+        "TableName": backfill.table_name,
+        "Segment": segment,
+        "TotalSegments": total_segments,
+        "ProjectionExpression": ", ".join(names),
+        "ExpressionAttributeNames": names,
+    }
+    result = SegmentResult(table_name=backfill.table_name, segment=segment, path=Path())
+    rows: list[dict[str, Any]] = []
+    while True:
+        response = scan_page(client, params, result)
+        rows.extend({key: deserializer.deserialize(value) for key, value in item.items()} for item in response.get("Items", []))
+        if not response.get("LastEvaluatedKey"):
+            return rows
+        params["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def plan_backfill(client, backfill: Backfill, segments: int) -> BackfillStats:
+    stats = BackfillStats()
+    with ThreadPoolExecutor(max_workers=segments) as pool:
+        parts = pool.map(lambda segment: scan_segment(client, backfill, segment, segments), range(segments))
+        for row in (row for part in parts for row in part):
+            stats.scanned += 1
+            changes = {name: value for name, value in backfill.derive(row).items() if row.get(name) != value}
+            if changes:
+                stats.updates.append((row, changes))
+    return stats
+
+
+def update_row(client, backfill: Backfill, row: dict[str, Any], changes: dict[str, Any], stats: BackfillStats) -> None:
+    names: dict[str, str] = {}
+    values: dict[str, Any] = {}
+    clauses = []
+    for position, (name, value) in enumerate(changes.items()):
+        names[f"#t{position}"] = name
+        values[f":t{position}"] = serializer.serialize(value)
+        clauses.append(f"#t{position} = :t{position}")
+
+    conditions = ["attribute_exists(#k)"]
+    names["#k"] = backfill.key_name
+    for position, name in enumerate(backfill.sources):
+        names[f"#s{position}"] = name
+        if name in row:
+            values[f":s{position}"] = serializer.serialize(row[name])
+            conditions.append(f"#s{position} = :s{position}")
+        else:
+            conditions.append(f"attribute_not_exists(#s{position})")
+
+    params: dict[str, Any] = {
+        "TableName": backfill.table_name,
+        "Key": {backfill.key_name: serializer.serialize(row[backfill.key_name])},
+        "UpdateExpression": "SET " + ", ".join(clauses),
+        "ConditionExpression": " AND ".join(conditions),
+        "ExpressionAttributeNames": names,
+        "ExpressionAttributeValues": values,
+    }
+
+    attempt = 0
+    while True:
+        try:
+            client.update_item(**params)
+            stats.written += 1
+            return
+        except ClientError as error:
+            code = error.response.get("Error", {}).get("Code", "")
+            if code == "ConditionalCheckFailedException":
+                stats.conflicts.append(str(row[backfill.key_name]))
+                return
+            if code not in THROTTLE_ERROR_CODES or attempt >= MAX_RETRIES:
+                raise
+        attempt += 1
+        stats.retries += 1
+        time.sleep(backoff_delay(attempt))
+
+
+def apply_backfill(client, backfill: Backfill, stats: BackfillStats, max_workers: int) -> None:
+    started = time.perf_counter()
+    if stats.updates:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(stats.updates)))) as pool:
+            list(pool.map(lambda update: update_row(client, backfill, *update, stats), stats.updates))
+    stats.seconds = time.perf_counter() - started
+
+
+def print_stats(backfill: Backfill, stats: BackfillStats, dry_run: bool) -> None:
+    line = f"{backfill.name} ({backfill.table_name}): {stats.scanned} rows, {len(stats.updates)} to update"
+    if not dry_run:
+        line += f", {stats.written} written in {stats.seconds:.2f}s, retries: {stats.retries}"
+    if stats.conflicts:
+        line += f", skipped (changed since the scan): {', '.join(stats.conflicts)}"
+    print(line)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Backfill GSI key attributes on rows written before the app stamped them")
+    parser.add_argument("--only", action="append", choices=[backfill.name for backfill in BACKFILLS], help="Run just this backfill (repeatable)")
+    parser.add_argument("--segments", type=int, default=DEFAULT_SEGMENTS, help="Parallel scan segments")
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS, help="Concurrent item updates")
+    args = parser.parse_args()
+
+    dry_run = os.getenv("DYNAMODB_DRY_RUN", "false").lower() == "true"
+    selected = [backfill for backfill in BACKFILLS if not args.only or backfill.name in args.only]
+
+    try:
+        client = get_client()
+        print(f"Backfilling index attributes on {describe_backend()}")
+        if dry_run:
+            print("Dry-run mode enabled. Nothing will be written.")
+        for backfill in selected:
+            stats = plan_backfill(client, backfill, max(1, args.segments))
+            if not dry_run:
+                apply_backfill(client, backfill, stats, args.workers)
+            print_stats(backfill, stats, dry_run)
+    except (NoCredentialsError, PartialCredentialsError):
+        print("AWS credentials unavailable. Nothing backfilled.")
+        return 1
+    except (ClientError, BotoCoreError) as error:
+        print(f"DynamoDB error: {error}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,171 @@
+"""
+Benchmark scrape_website's single-pass PageExtractor against the original
+BeautifulSoup extraction (full tree, then separate walks for text, iframes,
+anchors and images).
+
+Runs over saved HTML fixtures, e.g. pages captured with
+`python scrape_website.py --save-html ../data/html_fixtures`. When the fixture
+directory has no .html files it generates deterministic catalog and gallery
+pages instead. Checks both extractors agree on every page and reports time
+and peak Python memory for each.
+
+Usage:
+  python benchmark_html_extraction.py
+  python benchmark_html_extraction.py --fixtures ../data/html_fixtures --repeats 10
+  python benchmark_html_extraction.py --catalog-items 5000 --gallery-images 2000 --write-fixtures /tmp/pages
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+from bs4 import BeautifulSoup
+
+from scrape_website import DATA_DIR, PHONE_PATTERN, extract_page, is_youtube_link
+
+
+FIXTURES_DIR = DATA_DIR / "html_fixtures"
+WORDS = [
+    "gold", "chain", "14k", "ring", "diamond", "guitar", "fender", "drill", "dewalt", "pistol", "console",
+    "laptop", "vintage", "watch", "rolex", "sterling", "bracelet", "amp", "pawn", "loan", "deal", "mint",
+]
+
+
+def legacy_extract(html: str) -> dict:
+    """Reference copy of the extraction scrape() did before PageExtractor."""
+    soup = BeautifulSoup(html, "lxml")
+    links = []
+    for iframe in soup.find_all("iframe"):
+        src = iframe.get("src", "")
+        if is_youtube_link(src):
+            links.append(src)
+    for anchor in soup.find_all("a", href=True):
+        href = anchor["href"]
+        if is_youtube_link(href):
+            links.append(href)
+    text = soup.get_text(" ", strip=True)
+    return {
+        "text": text,
+        "youtube": sorted(set(links)),
+        "images": [image.get("src") for image in soup.find_all("img") if image.get("src")],
+        "phones": list(dict.fromkeys(PHONE_PATTERN.findall(text))),
+    }
+
+
+def sentence(rng: random.Random, low: int, high: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(low, high)))
+
+
+def page_shell(title: str, body: str) -> str:
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<style>.card {{ display: grid; }} .price::before {{ content: "$"; }}</style>
+<script>window.__STATE__ = {{"items": [1, 2, 3], "phone": "000-000-0000"}};</script>
+</head><body>
+<nav><a href="/">Home</a> <a href="/products">Products</a> <a href="/gallery">Gallery</a></nav>
+{body}
+<footer><!-- contact --><p>Call us: <a href="tel:+19047445611">(904) 744-5611</a></p>
+<p>6132 Merrill Rd &amp; Ste 1, Jacksonville&nbsp;FL</p>
+<iframe src="https://www.youtube.com/embed/store-tour"></iframe>
+<template><p>hidden template text</p></template></footer>
+</body></html>"""
+
+
+def catalog_page(items: int, seed: int) -> str:
+    rng = random.Random(f"catalog:{seed}")
+    cards = []
+    for index in range(items):
+        cards.append(
+            f'<div class="card"><img src="/images/item-{index}.jpg" alt="{sentence(rng, 1, 3)}">'
+            f"<h3>{sentence(rng, 2, 4).title()}</h3><p>{sentence(rng, 8, 30)}</p>"
+            f'<span class="price">{rng.randint(20, 5000)}.00</span> <b>{rng.choice(["New", "Used", "Mint"])}</b>'
+            f'<a href="/products/{index}">Details</a></div>'
+        )
+        if index % 250 == 0:
+            cards.append(f'<a href="https://youtu.be/catalog-{index}">Video</a>')
+    return page_shell("Products", "<main>" + "\n".join(cards) + "</main>")
+
+
+def gallery_page(images: int, seed: int) -> str:
+    rng = random.Random(f"gallery:{seed}")
+    figures = [
+        f'<figure><img src="https://cdn.example.com/gallery/{index}.webp" loading="lazy">'
+        f"<figcaption>{sentence(rng, 1, 5)}</figcaption></figure>"
+        for index in range(images)
+    ]
+    # Some gallery entries lack a src; neither extractor should report them.
+    figures.extend('<img data-src="/lazy.jpg">' for _ in range(images // 50))
+    return page_shell("Gallery", "<section>" + "".join(figures) + "</section>")
+
+
+def load_fixtures(directory: Path, catalog_items: int, gallery_images: int, seed: int) -> dict[str, str]:
+    fixtures = {path.name: path.read_text(encoding="utf-8") for path in sorted(directory.glob("*.html"))} if directory.is_dir() else {}
+    if fixtures:
+        return fixtures
+    return {
+        "catalog.html (generated)": catalog_page(catalog_items, seed),
+        "gallery.html (generated)": gallery_page(gallery_images, seed),
+    }
+
+
+def measure(extract: Callable[[str], dict], html: str, repeats: int) -> tuple[dict, float, int]:
+    """Result, best wall time of `repeats` runs, and peak traced memory of one run."""
+    best = float("inf")
+    result: dict = {}
+    for _ in range(max(1, repeats)):
+        started = time.perf_counter()
+        result = extract(html)
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    extract(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, best, peak
+
+
+def agrees(expected: dict, actual: dict) -> bool:
+    # PageExtractor also reports tel: link numbers, after the ones found in the text.
+    phones = actual["phones"][: len(expected["phones"])]
+    return all(expected[key] == actual[key] for key in ("text", "youtube", "images")) and phones == expected["phones"]
+
+
+def run_benchmark(name: str, html: str, repeats: int) -> bool:
+    expected, legacy_seconds, legacy_peak = measure(legacy_extract, html, repeats)
+    actual, single_seconds, single_peak = measure(extract_page, html, repeats)
+    ok = agrees(expected, actual)
+    speedup = legacy_seconds / single_seconds if single_seconds > 0 else float("inf")
+    print(
+        f"{name:<28} {len(html) / 1024:>8.0f} KB | legacy {legacy_seconds * 1000:8.1f} ms {legacy_peak / 2**20:7.1f} MiB | "
+        f"single-pass {single_seconds * 1000:8.1f} ms {single_peak / 2**20:7.1f} MiB | "
+        f"speedup {speedup:4.1f}x | {'match' if ok else 'MISMATCH'}"
+    )
+    return ok
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark single-pass HTML extraction against the BeautifulSoup path")
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES_DIR, help="Directory of saved .html pages")
+    parser.add_argument("--catalog-items", type=int, default=2000, help="Product cards on the generated catalog page")
+    parser.add_argument("--gallery-images", type=int, default=1000, help="Images on the generated gallery page")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for generated pages")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per extractor; the best is reported")
+    parser.add_argument("--write-fixtures", type=Path, default=None, help="Save the pages used to this directory")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures, args.catalog_items, args.gallery_images, args.seed)
+    if args.write_fixtures:
+        args.write_fixtures.mkdir(parents=True, exist_ok=True)
+        for name, html in fixtures.items():
+            (args.write_fixtures / name.split(" ")[0]).write_text(html, encoding="utf-8")
+
+    ok = all([run_benchmark(name, html, args.repeats) for name, html in fixtures.items()])
+    print("Parity: OK" if ok else "Parity: MISMATCH")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,346 @@
+import argparse
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError, PartialCredentialsError
+
+from bulk_writer import MAX_RETRIES, THROTTLE_ERROR_CODES, backoff_delay
+from dynamodb_client import describe_backend, get_client
+
+
+# frontend/src/lib/dashboard-metrics.ts builds the same document on the Vercel cron;
+# keep the column rules and aggregates below in step with it.
+CONFIG_TABLE = "USA_Pawn_Store_Config"
+METRICS_CONFIG_KEY = "dashboard_metrics"
+METRICS_VERSION = 1
+MAX_DOCUMENT_BYTES = 350_000
+DEFAULT_DAYS = 30
+DEFAULT_SEGMENTS = 4
+
+LEADS_TABLE = "USA_Pawn_Leads"
+APPRAISALS_TABLE = "USA_Pawn_Appraisals"
+CONVERSATIONS_TABLE = "USA_Pawn_Conversations"
+
+# Only these attributes are read; message bodies and photos never leave DynamoDB.
+LEAD_ATTRIBUTES = [
+    "lead_id", "status", "source", "source_channel", "contact_method", "type",
+    "customer_name", "phone", "customer_phone", "estimated_value", "created_at", "timestamp",
+]
+APPRAISAL_ATTRIBUTES = ["appraisal_id", "item_category", "estimated_value", "timestamp", "created_at"]
+CONVERSATION_ATTRIBUTES = ["conversation_id", "channel", "source", "customer_key", "phone", "message_count", "started_at"]
+
+DAY_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}")
+NUMBER_CLEANUP = re.compile(r"[^\d.-]")
+
+deserializer = TypeDeserializer()
+
+
+def scan_segment(client, table_name: str, attributes: list[str], segment: int, total_segments: int) -> list[dict[str, Any]]:
+    names = {f"#a{index}": name for index, name in enumerate(attributes)}
+    params: dict[str, Any] = {
+        "TableName": table_name,
+        "Segment": segment,
+        "TotalSegments": total_segments,
+        "ProjectionExpression": ", ".join(names),
+        "ExpressionAttributeNames": names,
+    }
+    rows: list[dict[str, Any]] = []
+    attempt = 0
+    while True:
+        try:
+            response = client.scan(**params)
+        except ClientError as error:
+            code = error.response.get("Error", {}).get("Code", "")
+            if code not in THROTTLE_ERROR_CODES or attempt >= MAX_RETRIES:
+                raise
+            attempt += 1
+            time.sleep(backoff_delay(attempt))
+            continue
+
+        attempt = 0
+        rows.extend({key: deserializer.deserialize(value) for key, value in item.items()} for item in response.get("Items", []))
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return rows
+        params["ExclusiveStartKey"] = last_key
+
+
+def scan_table(client, table_name: str, attributes: list[str], segments: int) -> list[dict[str, Any]]:
+    with ThreadPoolExecutor(max_workers=segments) as pool:
+        parts = pool.map(lambda segment: scan_segment(client, table_name, attributes, segment, segments), range(segments))
+        return [row for part in parts for row in part]
+
+
+# Column builders. Each table becomes a dict of equal-length NumPy arrays.
+
+
+def text_column(rows: list[dict[str, Any]], *names: str, default: str = "", lower: bool = True) -> np.ndarray:
+    values = []
+    for row in rows:
+        value = next((row[name] for name in names if row.get(name) not in (None, "")), default)
+        text = str(value).strip()
+        values.append(text.lower() if lower else text)
+    return np.array(values, dtype=str) if values else np.array([], dtype="<U1")
+
+
+def number_column(rows: list[dict[str, Any]], name: str) -> np.ndarray:
+    # Mirrors parseEstimatedValue in the leads route: strip currency text, anything unparseable is 0.
+    values = np.zeros(len(rows), dtype=np.float64)
+    for index, row in enumerate(rows):
+        value = row.get(name)
+        if value is None or isinstance(value, bool):
+            continue
+        try:
+            values[index] = float(value) if not isinstance(value, str) else float(NUMBER_CLEANUP.sub("", value) or 0)
+        except ValueError:
+            continue
+    return values
+
+
+def day_column(rows: list[dict[str, Any]], *names: str) -> np.ndarray:
+    # Same prefix test the dashboard uses (created_at.startsWith(today)), so offsets are kept as written.
+    days = []
+    for row in rows:
+        value = next((str(row[name]) for name in names if row.get(name)), "")
+        days.append(value[:10] if DAY_PATTERN.match(value) else "NaT")
+    return np.array(days, dtype="datetime64[D]")
+
+
+def lead_columns(rows: list[dict[str, Any]]) -> dict[str, np.ndarray]:
+    source = text_column(rows, "source", "source_channel", default="web")
+    method = text_column(rows, "contact_method")
+    method = np.where(method == "", np.vectorize(derive_method, otypes=[str])(source) if len(source) else method, method)
+    name = text_column(rows, "customer_name")
+    phone = text_column(rows, "phone", "customer_phone", lower=False)
+    return {
+        "status": text_column(rows, "status", default="new"),
+        "source": source,
+        "contact_method": method,
+        "type": text_column(rows, "type", default="unknown"),
+        "customer": np.char.add(np.char.add(name, "|"), phone) if len(rows) else name,
+        "estimated_value": number_column(rows, "estimated_value"),
+        "created": text_column(rows, "created_at", "timestamp", lower=False),
+        "day": day_column(rows, "created_at", "timestamp"),
+    }
+
+
+def appraisal_columns(rows: list[dict[str, Any]]) -> dict[str, np.ndarray]:
+    return {
+        "category": text_column(rows, "item_category", default="unknown"),
+        "estimated_value": number_column(rows, "estimated_value"),
+        "day": day_column(rows, "timestamp", "created_at"),
+    }
+
+
+def conversation_columns(rows: list[dict[str, Any]]) -> dict[str, np.ndarray]:
+    source = text_column(rows, "source", default="web")
+    messages = number_column(rows, "message_count")
+    return {
+        "channel": text_column(rows, "channel", "source", default="web"),
+        "source": source,
+        "customer": text_column(rows, "customer_key", "phone", "conversation_id", lower=False),
+        # The API shows a placeholder message for conversations with none recorded.
+        "messages": np.maximum(messages, 1),
+        "day": day_column(rows, "started_at"),
+    }
+
+
+def derive_method(source: str) -> str:
+    if "sms" in source or "mms" in source or "text" in source:
+        return "sms"
+    if "voice" in source or "phone" in source or "call" in source:
+        return "phone"
+    if "chat" in source:
+        return "chat"
+    return "web"
+
+
+# Aggregations.
+
+
+def counts_by(column: np.ndarray, weights: np.ndarray | None = None) -> dict[str, Any]:
+    if not len(column):
+        return {}
+    labels, codes = np.unique(column, return_inverse=True)
+    totals = np.bincount(codes, weights=weights, minlength=len(labels))
+    order = np.argsort(-totals, kind="stable")
+    return {str(labels[index]): round_number(totals[index]) for index in order}
+
+
+def daily(days: np.ndarray, start: np.datetime64, window: int, weights: np.ndarray | None = None) -> list[Any]:
+    offsets = (days - start).astype("timedelta64[D]").astype(np.int64)
+    mask = ~np.isnat(days) & (offsets >= 0) & (offsets < window)
+    totals = np.bincount(offsets[mask], weights=None if weights is None else weights[mask], minlength=window)
+    return [round_number(value) for value in totals]
+
+
+def round_number(value: Any) -> int | float:
+    number = float(value)
+    return int(number) if number.is_integer() else round(number, 2)
+
+
+def unique_customers_daily(columns: dict[str, np.ndarray], start: np.datetime64, window: int) -> tuple[list[int], list[Any]]:
+    """Distinct customers per day and their revenue, counting each customer's earliest lead of the day once."""
+    offsets = (columns["day"] - start).astype("timedelta64[D]").astype(np.int64)
+    mask = ~np.isnat(columns["day"]) & (offsets >= 0) & (offsets < window)
+    if not mask.any():
+        return [0] * window, [0] * window
+
+    _, customer_codes = np.unique(columns["customer"][mask], return_inverse=True)
+    group = offsets[mask] * (customer_codes.max() + 1) + customer_codes
+    order = np.lexsort((columns["created"][mask], group))
+    _, first = np.unique(group[order], return_index=True)
+    picked = order[first]
+
+    customers = np.bincount(offsets[mask][picked], minlength=window)
+    revenue = np.bincount(offsets[mask][picked], weights=columns["estimated_value"][mask][picked], minlength=window)
+    return [int(value) for value in customers], [round_number(value) for value in revenue]
+
+
+def build_metrics(
+    leads: dict[str, np.ndarray],
+    appraisals: dict[str, np.ndarray],
+    conversations: dict[str, np.ndarray],
+    anchor: datetime,
+    window: int,
+) -> dict[str, Any]:
+    end = np.datetime64(anchor.date(), "D")
+    start = end - np.timedelta64(window - 1, "D")
+    dates = [str(start + np.timedelta64(offset, "D")) for offset in range(window)]
+    unique_daily, revenue_daily = unique_customers_daily(leads, start, window)
+    appraisal_total = float(appraisals["estimated_value"].sum())
+    appraisal_values = counts_by(appraisals["category"], appraisals["estimated_value"])
+
+    return {
+        "version": METRICS_VERSION,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "dates": dates,
+        "leads": {
+            "total": int(len(leads["status"])),
+            "by_status": counts_by(leads["status"]),
+            "by_source": counts_by(leads["source"]),
+            "by_contact_method": counts_by(leads["contact_method"]),
+            "by_type": counts_by(leads["type"]),
+            "daily": {
+                "count": daily(leads["day"], start, window),
+                "unique_customers": unique_daily,
+                "revenue": revenue_daily,
+            },
+            "today": {"date": dates[-1], "unique_customers": unique_daily[-1], "revenue": revenue_daily[-1]},
+        },
+        "appraisals": {
+            "total": int(len(appraisals["category"])),
+            "total_value": round_number(appraisal_total),
+            "average_value": round_number(appraisal_total / len(appraisals["category"])) if len(appraisals["category"]) else 0,
+            "by_category": {
+                category: {"count": count, "value": appraisal_values.get(category, 0)}
+                for category, count in counts_by(appraisals["category"]).items()
+            },
+            "daily": {
+                "count": daily(appraisals["day"], start, window),
+                "value": daily(appraisals["day"], start, window, appraisals["estimated_value"]),
+            },
+        },
+        "conversations": {
+            "total": int(len(conversations["channel"])),
+            "messages": round_number(conversations["messages"].sum()),
+            "unique_customers": int(len(np.unique(conversations["customer"]))),
+            "by_channel": counts_by(conversations["channel"]),
+            "by_source": counts_by(conversations["source"]),
+            "daily": {
+                "count": daily(conversations["day"], start, window),
+                "messages": daily(conversations["day"], start, window, conversations["messages"]),
+            },
+        },
+    }
+
+
+def save_snapshot(path: Path, tables: dict[str, dict[str, np.ndarray]]) -> None:
+    arrays = {f"{table}.{name}": column for table, columns in tables.items() for name, column in columns.items()}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(path, **arrays)
+
+
+def write_metrics(client, metrics: dict[str, Any]) -> int:
+    value = json.dumps(metrics, separators=(",", ":"))
+    size = len(value.encode("utf-8"))
+    if size > MAX_DOCUMENT_BYTES:
+        raise ValueError(f"Metrics document is {size} bytes (limit {MAX_DOCUMENT_BYTES}); lower --days")
+    client.put_item(
+        TableName=CONFIG_TABLE,
+        Item={
+            "config_key": {"S": METRICS_CONFIG_KEY},
+            "value": {"S": value},
+            "updated_at": {"S": metrics["generated_at"]},
+        },
+    )
+    return size
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Precompute dashboard metrics into Store_Config")
+    parser.add_argument("--days", type=int, default=DEFAULT_DAYS, help="Days of daily series to keep")
+    parser.add_argument("--segments", type=int, default=DEFAULT_SEGMENTS, help="Parallel scan segments per table")
+    parser.add_argument("--anchor", default=None, help="Last day (YYYY-MM-DD) of the daily series; defaults to today (UTC)")
+    parser.add_argument("--snapshot", type=Path, default=None, help="Also save the columnar snapshot as a .npz file")
+    parser.add_argument("--print", dest="print_only", action="store_true", help="Print the document instead of writing it")
+    args = parser.parse_args()
+
+    anchor = datetime.fromisoformat(args.anchor).replace(tzinfo=timezone.utc) if args.anchor else datetime.now(timezone.utc)
+    dry_run = args.print_only or os.getenv("DYNAMODB_DRY_RUN", "false").lower() == "true"
+
+    try:
+        client = get_client()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            lead_rows, appraisal_rows, conversation_rows = pool.map(
+                lambda job: scan_table(client, job[0], job[1], max(1, args.segments)),
+                [(LEADS_TABLE, LEAD_ATTRIBUTES), (APPRAISALS_TABLE, APPRAISAL_ATTRIBUTES), (CONVERSATIONS_TABLE, CONVERSATION_ATTRIBUTES)],
+            )
+        scanned = time.perf_counter() - started
+
+        tables = {
+            "leads": lead_columns(lead_rows),
+            "appraisals": appraisal_columns(appraisal_rows),
+            "conversations": conversation_columns(conversation_rows),
+        }
+        del lead_rows, appraisal_rows, conversation_rows
+        metrics = build_metrics(tables["leads"], tables["appraisals"], tables["conversations"], anchor, max(1, args.days))
+        aggregated = time.perf_counter() - started - scanned
+
+        if args.snapshot:
+            save_snapshot(args.snapshot, tables)
+            print(f"Columnar snapshot: {args.snapshot}")
+
+        if dry_run:
+            print(json.dumps(metrics, indent=2))
+            return 0
+
+        size = write_metrics(client, metrics)
+    except (NoCredentialsError, PartialCredentialsError):
+        print("AWS credentials unavailable. Nothing built.")
+        return 1
+    except (ClientError, BotoCoreError, ValueError) as error:
+        print(f"Dashboard metrics failed: {error}")
+        return 1
+
+    print(f"Source: {describe_backend()}")
+    print(
+        f"Rows: {metrics['leads']['total']} leads, {metrics['appraisals']['total']} appraisals, "
+        f"{metrics['conversations']['total']} conversations"
+    )
+    print(f"Scan: {scanned:.2f}s, aggregate: {aggregated:.3f}s")
+    print(f"Wrote {CONFIG_TABLE}/{METRICS_CONFIG_KEY} ({size / 1024:.1f} KiB)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
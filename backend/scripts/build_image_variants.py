@@ -0,0 +1,179 @@
+import argparse
+import base64
+import hashlib
+import io
+import json
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from PIL import Image, features
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+PUBLIC_DIR = PROJECT_ROOT / "frontend" / "public"
+VARIANTS_DIR = PUBLIC_DIR / "variants"
+MANIFEST_JSON = VARIANTS_DIR / "manifest.json"
+MANIFEST_VERSION = 1
+
+SOURCE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".webp"}
+DEFAULT_WIDTHS = [320, 640, 960, 1280, 1920]
+WEBP_QUALITY = 80
+AVIF_QUALITY = 55
+PLACEHOLDER_WIDTH = 16
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def variant_slug(relative_path: str) -> str:
+    stem = str(Path(relative_path).with_suffix(""))
+    return re.sub(r"[^a-zA-Z0-9]+", "-", stem).strip("-").lower()
+
+
+def find_source_images(public_dir: Path = PUBLIC_DIR) -> list[Path]:
+    return sorted(
+        path
+        for path in public_dir.rglob("*")
+        if path.is_file() and path.suffix.lower() in SOURCE_EXTENSIONS and VARIANTS_DIR not in path.parents
+    )
+
+
+def available_formats() -> list[str]:
+    formats = ["webp"]
+    if features.check("avif"):
+        formats.append("avif")
+    return formats
+
+
+def blur_placeholder(image: Image.Image) -> str:
+    height = max(1, round(image.height * PLACEHOLDER_WIDTH / image.width))
+    tiny = image.resize((PLACEHOLDER_WIDTH, height), Image.Resampling.BILINEAR)
+    buffer = io.BytesIO()
+    tiny.save(buffer, format="WEBP", quality=40)
+    return "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def build_variants(source: str, relative_path: str, source_hash: str, widths: list[int], formats: list[str]) -> dict:
+    slug = variant_slug(relative_path)
+    output_dir = VARIANTS_DIR / slug
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    with Image.open(source) as opened:
+        image = opened.convert("RGBA") if opened.mode in ("P", "LA", "RGBA") else opened.convert("RGB")
+
+    targets = sorted({width for width in widths if width < image.width} | {image.width})
+    variants = []
+    for width in targets:
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.Resampling.LANCZOS)
+        for image_format in formats:
+            name = f"{width}.{image_format}"
+            quality = AVIF_QUALITY if image_format == "avif" else WEBP_QUALITY
+            resized.save(output_dir / name, format=image_format.upper(), quality=quality)
+            variants.append(
+                {
+                    "src": f"/variants/{slug}/{name}",
+                    "format": image_format,
+                    "width": width,
+                    "height": height,
+                    "bytes": (output_dir / name).stat().st_size,
+                }
+            )
+
+    return {
+        "source": f"/{relative_path}",
+        "source_hash": source_hash,
+        "width": image.width,
+        "height": image.height,
+        "placeholder": blur_placeholder(image),
+        "variants": variants,
+    }
+
+
+def load_manifest() -> dict:
+    if not MANIFEST_JSON.exists():
+        return {}
+    try:
+        payload = json.loads(MANIFEST_JSON.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return payload.get("images", {}) if payload.get("version") == MANIFEST_VERSION else {}
+
+
+def is_current(entry: dict | None, source_hash: str, widths: list[int], formats: list[str]) -> bool:
+    if not entry or entry.get("source_hash") != source_hash:
+        return False
+    if {variant["format"] for variant in entry.get("variants", [])} != set(formats):
+        return False
+    expected_widths = {width for width in widths if width < entry.get("width", 0)} | {entry.get("width")}
+    if {variant["width"] for variant in entry.get("variants", [])} != expected_widths:
+        return False
+    return all((PUBLIC_DIR / variant["src"].lstrip("/")).exists() for variant in entry["variants"])
+
+
+def build_all(widths: list[int], max_workers: int | None = None, force: bool = False) -> None:
+    started = time.perf_counter()
+    VARIANTS_DIR.mkdir(parents=True, exist_ok=True)
+    previous = {} if force else load_manifest()
+    formats = available_formats()
+    if "avif" not in formats:
+        print("AVIF encoder unavailable in this Pillow build. Generating WebP only.")
+
+    images: dict[str, dict] = {}
+    pending = []
+    for path in find_source_images():
+        relative_path = path.relative_to(PUBLIC_DIR).as_posix()
+        source_hash = file_sha256(path)
+        entry = previous.get(relative_path)
+        if is_current(entry, source_hash, widths, formats):
+            images[relative_path] = entry
+        else:
+            pending.append((str(path), relative_path, source_hash))
+
+    print(f"Source images: {len(images) + len(pending)} (unchanged: {len(images)}, to build: {len(pending)})")
+
+    failed = 0
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(build_variants, source, relative_path, source_hash, widths, formats): relative_path
+            for source, relative_path, source_hash in pending
+        }
+        for future in as_completed(futures):
+            relative_path = futures[future]
+            try:
+                images[relative_path] = future.result()
+                print(f"Built: {relative_path}")
+            except (OSError, ValueError) as error:
+                failed += 1
+                print(f"Failed: {relative_path}: {error}")
+
+    payload = {"version": MANIFEST_VERSION, "widths": widths, "formats": formats, "images": dict(sorted(images.items()))}
+    MANIFEST_JSON.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+    source_bytes = sum((PUBLIC_DIR / path).stat().st_size for path in images)
+    smallest_bytes = sum(min(variant["bytes"] for variant in entry["variants"]) for entry in images.values() if entry["variants"])
+    print(f"Built: {len(pending) - failed}, Failed: {failed}, Elapsed: {time.perf_counter() - started:.2f}s")
+    print(f"Source bytes: {source_bytes}, smallest-variant bytes: {smallest_bytes}")
+    print(f"Manifest: {MANIFEST_JSON}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate responsive WebP/AVIF variants for frontend/public images")
+    parser.add_argument("--widths", default=",".join(str(width) for width in DEFAULT_WIDTHS), help="Comma-separated target widths")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (defaults to CPU count)")
+    parser.add_argument("--force", action="store_true", help="Rebuild every image even if its source hash is unchanged")
+    args = parser.parse_args()
+
+    widths = sorted({int(width) for width in args.widths.split(",") if width.strip()})
+    build_all(widths, max_workers=args.workers, force=args.force)
+
+
+if __name__ == "__main__":
+    main()
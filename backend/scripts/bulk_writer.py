@@ -0,0 +1,102 @@
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+from botocore.exceptions import ClientError
+
+
+BATCH_SIZE = 25
+MAX_RETRIES = 8
+BASE_BACKOFF_SECONDS = 0.05
+MAX_BACKOFF_SECONDS = 5.0
+DEFAULT_MAX_WORKERS = 3
+THROTTLE_ERROR_CODES = {
+    "ProvisionedThroughputExceededException",
+    "ThrottlingException",
+    "RequestLimitExceeded",
+}
+
+
+@dataclass
+class WriteStats:
+    table_name: str
+    items: int = 0
+    batches: int = 0
+    retries: int = 0
+    seconds: float = 0.0
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items / self.seconds if self.seconds > 0 else 0.0
+
+
+def chunked(items: Iterable[dict], size: int = BATCH_SIZE) -> Iterator[list[dict]]:
+    chunk: list[dict] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def backoff_delay(attempt: int) -> float:
+    # Full jitter: spread retries from parallel writers across the whole window.
+    cap = min(MAX_BACKOFF_SECONDS, BASE_BACKOFF_SECONDS * (2**attempt))
+    return random.uniform(0, cap)
+
+
+def write_batch(client, table_name: str, chunk: list[dict], stats: WriteStats) -> None:
+    request_items = {table_name: [{"PutRequest": {"Item": item}} for item in chunk]}
+    attempt = 0
+
+    while request_items:
+        try:
+            response = client.batch_write_item(RequestItems=request_items)
+            request_items = response.get("UnprocessedItems") or {}
+        except ClientError as error:
+            code = error.response.get("Error", {}).get("Code", "")
+            if code not in THROTTLE_ERROR_CODES:
+                raise
+
+        if not request_items:
+            return
+
+        attempt += 1
+        if attempt > MAX_RETRIES:
+            pending = len(request_items.get(table_name, []))
+            raise RuntimeError(f"{table_name}: {pending} items still unprocessed after {MAX_RETRIES} retries")
+
+        stats.retries += 1
+        time.sleep(backoff_delay(attempt))
+
+
+def write_table(client, table_name: str, items: Iterable[dict]) -> WriteStats:
+    stats = WriteStats(table_name=table_name)
+    started = time.perf_counter()
+
+    for chunk in chunked(items):
+        write_batch(client, table_name, chunk, stats)
+        stats.items += len(chunk)
+        stats.batches += 1
+
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def write_tables(client, tables: dict[str, Iterable[dict]], max_workers: int = DEFAULT_MAX_WORKERS) -> list[WriteStats]:
+    workers = max(1, min(max_workers, len(tables)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(write_table, client, name, items) for name, items in tables.items()]
+        return [future.result() for future in futures]
+
+
+def print_write_stats(results: list[WriteStats]) -> None:
+    for stats in results:
+        print(
+            f"{stats.table_name}: {stats.items} items in {stats.batches} batches, "
+            f"{stats.seconds:.2f}s ({stats.items_per_second:.1f} items/sec), retries: {stats.retries}"
+        )
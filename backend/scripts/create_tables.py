@@ -1,21 +1,62 @@
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
-import boto3
-from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError, PartialCredentialsError
+from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError, PartialCredentialsError, WaiterError
+
+from dynamodb_client import get_client
 
 
 TABLES: list[dict[str, Any]] = [
     {
         "TableName": "USA_Pawn_Leads",
         "KeySchema": [{"AttributeName": "lead_id", "KeyType": "HASH"}],
-        "AttributeDefinitions": [{"AttributeName": "lead_id", "AttributeType": "S"}],
+        "AttributeDefinitions": [
+            {"AttributeName": "lead_id", "AttributeType": "S"},
+            {"AttributeName": "status", "AttributeType": "S"},
+            {"AttributeName": "created_at", "AttributeType": "S"},
+            {"AttributeName": "type", "AttributeType": "S"},
+            {"AttributeName": "appointment_time", "AttributeType": "S"},
+        ],
+        "GlobalSecondaryIndexes": [
+            {
+                "IndexName": "status-created_at-index",
+                "KeySchema": [
+                    {"AttributeName": "status", "KeyType": "HASH"},
+                    {"AttributeName": "created_at", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            },
+            {
+                "IndexName": "type-appointment_time-index",
+                "KeySchema": [
+                    {"AttributeName": "type", "KeyType": "HASH"},
+                    {"AttributeName": "appointment_time", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            },
+        ],
         "BillingMode": "PAY_PER_REQUEST",
     },
     {
         "TableName": "USA_Pawn_Inventory",
         "KeySchema": [{"AttributeName": "item_id", "KeyType": "HASH"}],
-        "AttributeDefinitions": [{"AttributeName": "item_id", "AttributeType": "S"}],
+        "AttributeDefinitions": [
+            {"AttributeName": "item_id", "AttributeType": "S"},
+            {"AttributeName": "category", "AttributeType": "S"},
+            {"AttributeName": "date_added", "AttributeType": "S"},
+        ],
+        "GlobalSecondaryIndexes": [
+            {
+                "IndexName": "category-date_added-index",
+                "KeySchema": [
+                    {"AttributeName": "category", "KeyType": "HASH"},
+                    {"AttributeName": "date_added", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            },
+        ],
         "BillingMode": "PAY_PER_REQUEST",
     },
     {
@@ -25,6 +66,19 @@ TABLES: list[dict[str, Any]] = [
         ],
         "AttributeDefinitions": [
             {"AttributeName": "log_id", "AttributeType": "S"},
+            {"AttributeName": "staff_key", "AttributeType": "S"},
+            {"AttributeName": "timestamp", "AttributeType": "S"},
+        ],
+        "GlobalSecondaryIndexes": [
+            {
+                # staff_key is the normalized, lowercased staff_name, so lookups ignore case and spacing.
+                "IndexName": "staff_key-timestamp-index",
+                "KeySchema": [
+                    {"AttributeName": "staff_key", "KeyType": "HASH"},
+                    {"AttributeName": "timestamp", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            },
         ],
         "BillingMode": "PAY_PER_REQUEST",
     },
@@ -37,7 +91,21 @@ TABLES: list[dict[str, Any]] = [
     {
         "TableName": "USA_Pawn_Conversations",
         "KeySchema": [{"AttributeName": "conversation_id", "KeyType": "HASH"}],
-        "AttributeDefinitions": [{"AttributeName": "conversation_id", "AttributeType": "S"}],
+        "AttributeDefinitions": [
+            {"AttributeName": "conversation_id", "AttributeType": "S"},
+            {"AttributeName": "updated_bucket", "AttributeType": "S"},
+            {"AttributeName": "updated_at", "AttributeType": "S"},
+        ],
+        "GlobalSecondaryIndexes": [
+            {
+                "IndexName": "updated_bucket-updated_at-index",
+                "KeySchema": [
+                    {"AttributeName": "updated_bucket", "KeyType": "HASH"},
+                    {"AttributeName": "updated_at", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            },
+        ],
         "BillingMode": "PAY_PER_REQUEST",
     },
     {
@@ -46,53 +114,141 @@ TABLES: list[dict[str, Any]] = [
         "AttributeDefinitions": [{"AttributeName": "config_key", "AttributeType": "S"}],
         "BillingMode": "PAY_PER_REQUEST",
     },
+    {
+        "TableName": "USA_Pawn_Staff",
+        "KeySchema": [{"AttributeName": "staff_key", "KeyType": "HASH"}],
+        "AttributeDefinitions": [
+            {"AttributeName": "staff_key", "AttributeType": "S"},
+            {"AttributeName": "pin_hash", "AttributeType": "S"},
+        ],
+        "GlobalSecondaryIndexes": [
+            {
+                "IndexName": "pin_hash-index",
+                "KeySchema": [{"AttributeName": "pin_hash", "KeyType": "HASH"}],
+                "Projection": {"ProjectionType": "INCLUDE", "NonKeyAttributes": ["name", "role"]},
+            },
+        ],
+        "BillingMode": "PAY_PER_REQUEST",
+    },
+    {
+        "TableName": "USA_Pawn_Staff_Hours",
+        "KeySchema": [{"AttributeName": "period", "KeyType": "HASH"}],
+        "AttributeDefinitions": [{"AttributeName": "period", "AttributeType": "S"}],
+        "BillingMode": "PAY_PER_REQUEST",
+    },
 ]
 
+# TTL attribute per table (epoch seconds). archive_conversations.py stamps it on rows it has archived.
+TIME_TO_LIVE = {"USA_Pawn_Conversations": "expires_at"}
+
+INDEX_POLL_SECONDS = 10
+INDEX_TIMEOUT_SECONDS = 30 * 60
+
 
 def print_dry_run() -> None:
     print("AWS credentials unavailable or dry-run requested. Table definitions:")
     for table in TABLES:
         print(f"- {table['TableName']}")
+        for index in table.get("GlobalSecondaryIndexes", []):
+            print(f"    index: {index['IndexName']}")
+        if table["TableName"] in TIME_TO_LIVE:
+            print(f"    ttl: {TIME_TO_LIVE[table['TableName']]}")
 
 
-def table_exists(client, table_name: str) -> bool:
+def describe_table(client, table_name: str) -> dict[str, Any] | None:
     try:
-        client.describe_table(TableName=table_name)
-        return True
+        return client.describe_table(TableName=table_name)["Table"]
     except ClientError as error:
         code = error.response.get("Error", {}).get("Code", "")
-        return code != "ResourceNotFoundException"
+        if code == "ResourceNotFoundException":
+            return None
+        raise
+
+
+def missing_indexes(table: dict[str, Any], description: dict[str, Any]) -> list[dict[str, Any]]:
+    existing = {index["IndexName"] for index in description.get("GlobalSecondaryIndexes", [])}
+    return [index for index in table.get("GlobalSecondaryIndexes", []) if index["IndexName"] not in existing]
+
+
+def index_attribute_definitions(table: dict[str, Any], index: dict[str, Any]) -> list[dict[str, str]]:
+    key_names = {key["AttributeName"] for key in index["KeySchema"]}
+    return [definition for definition in table["AttributeDefinitions"] if definition["AttributeName"] in key_names]
+
+
+def wait_for_index(client, table_name: str, index_name: str) -> None:
+    deadline = time.monotonic() + INDEX_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        description = describe_table(client, table_name) or {}
+        statuses = {index["IndexName"]: index.get("IndexStatus") for index in description.get("GlobalSecondaryIndexes", [])}
+        if statuses.get(index_name) == "ACTIVE":
+            return
+        time.sleep(INDEX_POLL_SECONDS)
+    raise TimeoutError(f"Index {index_name} on {table_name} did not become ACTIVE")
+
+
+def ensure_table(client, table: dict[str, Any]) -> tuple[str, int]:
+    name = table["TableName"]
+    description = describe_table(client, name)
+
+    if description is None:
+        client.create_table(**table)
+        print(f"Creating table: {name}")
+        client.get_waiter("table_exists").wait(TableName=name)
+        print(f"Table active: {name}")
+        return "created", 0
+
+    pending = missing_indexes(table, description)
+    if not pending:
+        print(f"Skipping existing table: {name}")
+        return "skipped", 0
+
+    # DynamoDB accepts one new GSI per UpdateTable call, so backfill them in turn.
+    for index in pending:
+        client.update_table(
+            TableName=name,
+            AttributeDefinitions=index_attribute_definitions(table, index),
+            GlobalSecondaryIndexUpdates=[{"Create": index}],
+        )
+        print(f"Adding index {index['IndexName']} to {name}")
+        wait_for_index(client, name, index["IndexName"])
+        print(f"Index active: {index['IndexName']}")
+    return "updated", len(pending)
+
+
+def ensure_time_to_live(client, table_name: str, attribute: str) -> bool:
+    description = client.describe_time_to_live(TableName=table_name).get("TimeToLiveDescription", {})
+    if description.get("TimeToLiveStatus") in ("ENABLED", "ENABLING") and description.get("AttributeName") == attribute:
+        return False
+    client.update_time_to_live(TableName=table_name, TimeToLiveSpecification={"Enabled": True, "AttributeName": attribute})
+    print(f"Enabled TTL on {table_name}.{attribute}")
+    return True
 
 
 def create_tables() -> None:
     dry_run = os.getenv("DYNAMODB_DRY_RUN", "false").lower() == "true"
-    region = os.getenv("AWS_REGION", "us-east-1")
 
     if dry_run:
         print_dry_run()
         return
 
     try:
-        dynamodb = boto3.client("dynamodb", region_name=region)
-        created = 0
-        skipped = 0
+        dynamodb = get_client()
 
-        for table in TABLES:
-            name = table["TableName"]
-            if table_exists(dynamodb, name):
-                print(f"Skipping existing table: {name}")
-                skipped += 1
-                continue
+        with ThreadPoolExecutor(max_workers=len(TABLES)) as pool:
+            outcomes = list(pool.map(lambda table: ensure_table(dynamodb, table), TABLES))
 
-            dynamodb.create_table(**table)
-            print(f"Creating table: {name}")
-            created += 1
+        for table_name, attribute in TIME_TO_LIVE.items():
+            ensure_time_to_live(dynamodb, table_name, attribute)
 
-        print(f"Done. Created: {created}, Skipped: {skipped}")
+        states = [state for state, _ in outcomes]
+        print(
+            f"Done. Created: {states.count('created')}, "
+            f"Indexes added: {sum(added for _, added in outcomes)}, Skipped: {states.count('skipped')}"
+        )
 
     except (NoCredentialsError, PartialCredentialsError):
         print_dry_run()
-    except (ClientError, BotoCoreError) as error:
+    except (ClientError, BotoCoreError, WaiterError, TimeoutError) as error:
         print(f"DynamoDB error: {error}")
         print_dry_run()
 
@@ -0,0 +1,65 @@
+"""
+Single place the scripts get a DynamoDB client from.
+
+  DYNAMODB_BACKEND=aws       boto3 client (default)
+  DYNAMODB_BACKEND=memory    in-process MemoryDynamoDB, no AWS calls at all
+  DYNAMODB_ENDPOINT_URL      point boto3 at DynamoDB Local / LocalStack
+  DYNAMODB_MEMORY_PATH       JSON file the memory backend loads on start and saves on exit
+  AWS_REGION                 region for boto3 (default us-east-1)
+"""
+
+import atexit
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+
+DEFAULT_REGION = "us-east-1"
+
+_memory_client = None
+_memory_lock = threading.Lock()
+
+
+def backend_name() -> str:
+    return os.getenv("DYNAMODB_BACKEND", "aws").strip().lower()
+
+
+def describe_backend() -> str:
+    if backend_name() == "memory":
+        path = os.getenv("DYNAMODB_MEMORY_PATH")
+        return f"memory ({path})" if path else "memory"
+    endpoint = os.getenv("DYNAMODB_ENDPOINT_URL") or os.getenv("AWS_ENDPOINT_URL_DYNAMODB")
+    return f"aws ({endpoint})" if endpoint else f"aws ({os.getenv('AWS_REGION', DEFAULT_REGION)})"
+
+
+def get_memory_client():
+    """Shared in-process backend; every caller in the process sees the same tables."""
+    global _memory_client
+    with _memory_lock:
+        if _memory_client is None:
+            from memory_dynamodb import MemoryDynamoDB
+
+            path = os.getenv("DYNAMODB_MEMORY_PATH")
+            _memory_client = MemoryDynamoDB(Path(path) if path else None)
+            if path:
+                atexit.register(_memory_client.save)
+        return _memory_client
+
+
+def get_client(region: str | None = None, **kwargs: Any):
+    if backend_name() == "memory":
+        return get_memory_client()
+
+    import boto3
+
+    options: dict[str, Any] = {"region_name": region or os.getenv("AWS_REGION", DEFAULT_REGION)}
+    endpoint = os.getenv("DYNAMODB_ENDPOINT_URL")
+    if endpoint:
+        options["endpoint_url"] = endpoint
+        # DynamoDB Local accepts any credentials but boto3 still requires some.
+        if not os.getenv("AWS_ACCESS_KEY_ID") and not os.getenv("AWS_PROFILE"):
+            options["aws_access_key_id"] = "local"
+            options["aws_secret_access_key"] = "local"
+    options.update(kwargs)
+    return boto3.client("dynamodb", **options)
@@ -0,0 +1,191 @@
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError, PartialCredentialsError
+
+from bulk_writer import MAX_RETRIES, THROTTLE_ERROR_CODES, backoff_delay
+from create_tables import TABLES
+from dynamodb_client import describe_backend, get_client
+from snapshot_format import FORMATS, SNAPSHOT_ROOT, new_manifest, open_writer, part_path, table_definition, time_to_live_attribute, write_manifest
+
+
+DEFAULT_SEGMENTS = 8
+DEFAULT_PAGE_SIZE = 1000
+DEFAULT_MAX_WORKERS = 16
+
+
+@dataclass
+class SegmentResult:
+    table_name: str
+    segment: int
+    path: Path
+    rows: int = 0
+    pages: int = 0
+    capacity_units: float = 0.0
+    retries: int = 0
+    seconds: float = 0.0
+
+
+def scan_page(client, params: dict[str, Any], result: SegmentResult) -> dict[str, Any]:
+    attempt = 0
+    while True:
+        try:
+            return client.scan(**params)
+        except ClientError as error:
+            code = error.response.get("Error", {}).get("Code", "")
+            if code not in THROTTLE_ERROR_CODES or attempt >= MAX_RETRIES:
+                raise
+        attempt += 1
+        result.retries += 1
+        time.sleep(backoff_delay(attempt))
+
+
+def export_segment(
+    client,
+    table_name: str,
+    key_names: list[str],
+    segment: int,
+    total_segments: int,
+    directory: Path,
+    fmt: str,
+    page_size: int,
+) -> SegmentResult:
+    result = SegmentResult(table_name=table_name, segment=segment, path=part_path(directory, table_name, segment, fmt))
+    started = time.perf_counter()
+    params: dict[str, Any] = {
+        "TableName": table_name,
+        "Segment": segment,
+        "TotalSegments": total_segments,
+        "Limit": page_size,
+        "ReturnConsumedCapacity": "TOTAL",
+    }
+
+    # Each segment streams into its own part file, one page at a time.
+    writer = open_writer(fmt, result.path, key_names)
+    try:
+        while True:
+            response = scan_page(client, params, result)
+            # Attribute values are written as scanned, so the snapshot keeps every DynamoDB type.
+            rows = response.get("Items", [])
+            writer.write(rows)
+            result.rows += len(rows)
+            result.pages += 1
+            result.capacity_units += (response.get("ConsumedCapacity") or {}).get("CapacityUnits", 0.0)
+
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                break
+            params["ExclusiveStartKey"] = last_key
+    finally:
+        writer.close()
+
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def export_tables(
+    client,
+    table_names: list[str],
+    directory: Path,
+    fmt: str = "jsonl",
+    segments: int = DEFAULT_SEGMENTS,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> dict[str, Any]:
+    manifest = new_manifest(fmt, segments, describe_backend())
+    key_names: dict[str, list[str]] = {}
+    for name in table_names:
+        description = client.describe_table(TableName=name)["Table"]
+        key_names[name] = [key["AttributeName"] for key in description["KeySchema"]]
+        ttl = client.describe_time_to_live(TableName=name).get("TimeToLiveDescription", {})
+        manifest["tables"][name] = {"definition": table_definition(description), "time_to_live": time_to_live_attribute(ttl)}
+
+    started = time.perf_counter()
+    tasks = [(name, segment) for name in table_names for segment in range(segments)]
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tasks)))) as pool:
+        futures = [
+            pool.submit(export_segment, client, name, key_names[name], segment, segments, directory, fmt, page_size)
+            for name, segment in tasks
+        ]
+        results = [future.result() for future in futures]
+
+    for name in table_names:
+        parts = [result for result in results if result.table_name == name]
+        manifest["tables"][name].update(
+            {
+                "rows": sum(part.rows for part in parts),
+                "capacity_units": round(sum(part.capacity_units for part in parts), 2),
+                "retries": sum(part.retries for part in parts),
+                "seconds": round(max(part.seconds for part in parts), 3),
+                "parts": [
+                    {
+                        "file": str(part.path.relative_to(directory)),
+                        "segment": part.segment,
+                        "rows": part.rows,
+                        "bytes": part.path.stat().st_size,
+                    }
+                    for part in parts
+                ],
+            }
+        )
+    manifest["seconds"] = round(time.perf_counter() - started, 3)
+    write_manifest(directory, manifest)
+    return manifest
+
+
+def print_export_stats(manifest: dict[str, Any]) -> None:
+    for name, table in manifest["tables"].items():
+        size = sum(part["bytes"] for part in table["parts"]) / 1024
+        rate = table["rows"] / table["seconds"] if table["seconds"] > 0 else 0.0
+        print(
+            f"{name}: {table['rows']} rows in {len(table['parts'])} parts, {size:.1f} KiB, "
+            f"{table['seconds']:.2f}s ({rate:.1f} rows/sec), capacity: {table['capacity_units']}, retries: {table['retries']}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Export USA Pawn DynamoDB tables to a snapshot directory")
+    parser.add_argument("--tables", default=",".join(table["TableName"] for table in TABLES), help="Comma-separated tables to export")
+    parser.add_argument("--output", type=Path, default=None, help="Snapshot directory (default backend/data/snapshots/<timestamp>)")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="jsonl", help="Part file format")
+    parser.add_argument("--segments", type=int, default=DEFAULT_SEGMENTS, help="Parallel scan segments per table")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("EXPORT_MAX_WORKERS", str(DEFAULT_MAX_WORKERS))), help="Concurrent segment scans")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE, help="Items per scan page")
+    args = parser.parse_args()
+
+    tables = [name.strip() for name in args.tables.split(",") if name.strip()]
+    directory = args.output or SNAPSHOT_ROOT / datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+    if os.getenv("DYNAMODB_DRY_RUN", "false").lower() == "true":
+        print("Dry-run mode enabled. No scans performed.")
+        print(f"Would export {', '.join(tables)} as {args.format} ({args.segments} segments each) to {directory}")
+        return 0
+
+    if (directory / "manifest.json").exists():
+        parser.error(f"{directory} already holds a snapshot")
+
+    try:
+        client = get_client()
+        print(f"Exporting from {describe_backend()} to {directory}")
+        manifest = export_tables(client, tables, directory, args.format, args.segments, args.workers, args.page_size)
+    except (NoCredentialsError, PartialCredentialsError):
+        print("AWS credentials unavailable. Nothing exported.")
+        return 1
+    except (ClientError, BotoCoreError, RuntimeError) as error:
+        print(f"Export failed: {error}")
+        return 1
+
+    print("Export complete.")
+    print_export_stats(manifest)
+    print(f"Total: {sum(table['rows'] for table in manifest['tables'].values())} rows in {manifest['seconds']:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
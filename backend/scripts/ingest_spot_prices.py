@@ -0,0 +1,245 @@
+"""
+Poll metal spot prices and publish them to USA_Pawn_Store_Config.
+
+Writes one item, config_key = "spot_prices":
+
+  value    latest quote, the payload /api/gold-price returns
+           {"gold", "silver", "platinum", "timestamp", "source"} in USD/oz
+  history  rolling window as parallel arrays
+           {"t": [epoch seconds...], "gold": [...], "silver": [...], "platinum": [...]}
+
+The web app reads that item with a single GetItem (frontend/src/lib/spot-prices.ts)
+instead of calling metals-api from each server instance.
+
+Quotes come from metals-api and METALS_API_KEY is required. The local
+random-walk provider has to be asked for by name, and its quotes are published
+with source "local" so readers never mistake them for a live feed.
+
+Usage:
+  python ingest_spot_prices.py --once                 # one poll, e.g. from cron
+  python ingest_spot_prices.py --interval 900         # keep polling
+  python ingest_spot_prices.py --provider local       # offline random-walk quotes
+  python ingest_spot_prices.py --reprice              # also revalue metal inventory after each quote
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+import requests
+from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError, PartialCredentialsError
+
+from dynamodb_client import describe_backend, get_client
+
+
+CONFIG_TABLE = "USA_Pawn_Store_Config"
+SPOT_PRICES_KEY = "spot_prices"
+METALS = ("gold", "silver", "platinum")
+METALS_API_URL = "https://metals-api.com/api/latest"
+METALS_API_SYMBOLS = {"gold": "XAU", "silver": "XAG", "platinum": "XPT"}
+TROY_OUNCE_GRAMS = 31.1034768
+# Same numbers /api/gold-price falls back to when nothing has been published yet.
+BASELINE_PRICES = {"gold": 2050.0, "silver": 24.5, "platinum": 950.0}
+# Quote sources that reflect the market; anything else (the local random walk) is demo data.
+LIVE_SOURCES = ("metals-api",)
+DEFAULT_INTERVAL_SECONDS = 15 * 60
+DEFAULT_HISTORY_HOURS = 7 * 24
+REQUEST_TIMEOUT_SECONDS = 7
+
+
+def normalize_rate_to_ounce(rate: float) -> float:
+    # metals-api quotes either metal per USD, USD per gram or USD per ounce depending on plan.
+    if not rate or rate <= 0:
+        return 0.0
+    if rate < 1:
+        return 1 / rate
+    if rate < 100:
+        return rate * TROY_OUNCE_GRAMS
+    return rate
+
+
+class MetalsApiProvider:
+    name = "metals-api"
+
+    def __init__(self, api_key: str):
+        self.api_key = api_key
+        self.session = requests.Session()
+
+    def quote(self) -> dict[str, float]:
+        response = self.session.get(
+            METALS_API_URL,
+            params={"access_key": self.api_key, "base": "USD", "symbols": ",".join(METALS_API_SYMBOLS.values())},
+            timeout=REQUEST_TIMEOUT_SECONDS,
+        )
+        response.raise_for_status()
+        payload = response.json()
+        if not payload.get("success") or not payload.get("rates"):
+            raise ValueError(f"Unexpected metals API payload: {str(payload)[:200]}")
+
+        prices = {metal: normalize_rate_to_ounce(float(payload["rates"].get(symbol) or 0)) for metal, symbol in METALS_API_SYMBOLS.items()}
+        if not all(prices.values()):
+            raise ValueError(f"Metals API omitted a rate: {payload['rates']}")
+        return prices
+
+
+class LocalProvider:
+    """Random walk around the last published (or baseline) prices, for offline and demo runs."""
+
+    name = "local"
+
+    def __init__(self, start: dict[str, float] | None = None, seed: int | None = None, volatility: float = 0.002):
+        self.prices = dict(start or BASELINE_PRICES)
+        self.rng = random.Random(seed)
+        self.volatility = volatility
+
+    def quote(self) -> dict[str, float]:
+        self.prices = {metal: price * (1 + self.rng.gauss(0, self.volatility)) for metal, price in self.prices.items()}
+        return dict(self.prices)
+
+
+def is_live(quote: dict[str, Any] | None) -> bool:
+    return bool(quote) and quote.get("source") in LIVE_SOURCES
+
+
+def read_published(client) -> dict[str, Any] | None:
+    item = client.get_item(TableName=CONFIG_TABLE, Key={"config_key": {"S": SPOT_PRICES_KEY}}).get("Item")
+    if not item:
+        return None
+    return {
+        "value": json.loads(item.get("value", {}).get("S") or "{}"),
+        "history": json.loads(item.get("history", {}).get("S") or "{}"),
+        "updated_at": item.get("updated_at", {}).get("S"),
+    }
+
+
+def append_history(history: dict[str, list], epoch: int, prices: dict[str, float], window_seconds: int) -> dict[str, list]:
+    times = list(history.get("t", []))
+    columns = {metal: list(history.get(metal, [])) for metal in METALS}
+    if any(len(values) != len(times) for values in columns.values()):
+        # Columns out of step (hand edit or older format): start a fresh window.
+        times, columns = [], {metal: [] for metal in METALS}
+
+    times.append(epoch)
+    for metal in METALS:
+        columns[metal].append(round(prices[metal], 2))
+
+    cutoff = epoch - window_seconds
+    start = next((index for index, value in enumerate(times) if value >= cutoff), len(times))
+    return {"t": times[start:], **{metal: values[start:] for metal, values in columns.items()}}
+
+
+def publish(client, prices: dict[str, float], source: str, published: dict[str, Any] | None, window_seconds: int) -> dict[str, Any]:
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    latest = {**{metal: round(prices[metal], 2) for metal in METALS}, "timestamp": now.isoformat(), "source": source}
+    history = append_history((published or {}).get("history", {}), int(now.timestamp()), prices, window_seconds)
+
+    params: dict[str, Any] = {
+        "TableName": CONFIG_TABLE,
+        "Item": {
+            "config_key": {"S": SPOT_PRICES_KEY},
+            "value": {"S": json.dumps(latest, separators=(",", ":"))},
+            "history": {"S": json.dumps(history, separators=(",", ":"))},
+            "updated_at": {"S": now.isoformat()},
+        },
+    }
+    # Two pollers racing would drop each other's history points; the loser just retries next tick.
+    if published and published.get("updated_at"):
+        params["ConditionExpression"] = "updated_at = :previous"
+        params["ExpressionAttributeValues"] = {":previous": {"S": published["updated_at"]}}
+    else:
+        params["ConditionExpression"] = "attribute_not_exists(config_key)"
+    client.put_item(**params)
+    return {"value": latest, "history": history, "updated_at": now.isoformat()}
+
+
+def reprice_after_publish(client, latest: dict[str, Any]) -> None:
+    # Imported on demand: reprice_inventory reads published quotes through this module.
+    from reprice_inventory import DEFAULT_MAX_WORKERS, DEFAULT_SEGMENTS, reprice
+
+    reprice(client, latest, DEFAULT_SEGMENTS, DEFAULT_MAX_WORKERS)
+
+
+def poll_once(client, provider, window_seconds: int, dry_run: bool, reprice: bool = False) -> bool:
+    published = read_published(client)
+    try:
+        prices = provider.quote()
+    except (requests.RequestException, ValueError) as error:
+        print(f"[{provider.name}] quote failed, keeping the last published prices: {error}")
+        return False
+
+    summary = ", ".join(f"{metal} {prices[metal]:.2f}" for metal in METALS)
+    if dry_run:
+        print(f"[{provider.name}] would publish {summary}")
+        return True
+
+    try:
+        result = publish(client, prices, provider.name, published, window_seconds)
+    except ClientError as error:
+        if error.response.get("Error", {}).get("Code", "") != "ConditionalCheckFailedException":
+            raise
+        print(f"[{provider.name}] another writer updated {SPOT_PRICES_KEY} first; skipping this tick")
+        return False
+    print(f"[{provider.name}] published {summary} ({len(result['history']['t'])} history points)")
+    if reprice and is_live(result["value"]):
+        reprice_after_publish(client, result["value"])
+    elif reprice:
+        print(f"[{provider.name}] not a live quote; inventory valuations left unchanged")
+    return True
+
+
+def make_provider(name: str, client, seed: int | None):
+    if name == "metals-api":
+        api_key = os.getenv("METALS_API_KEY")
+        if not api_key:
+            raise SystemExit("METALS_API_KEY is not set; use --provider local for offline runs")
+        return MetalsApiProvider(api_key)
+
+    # Continue the walk from whatever is published so the offline feed has no jumps.
+    published = read_published(client)
+    start = {metal: float(published["value"][metal]) for metal in METALS} if published and published["value"] else None
+    return LocalProvider(start=start, seed=seed)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Publish metal spot prices to USA_Pawn_Store_Config")
+    parser.add_argument(
+        "--provider",
+        choices=["metals-api", "local"],
+        default="metals-api",
+        help="Quote source (default metals-api, which needs METALS_API_KEY; local is a demo random walk)",
+    )
+    parser.add_argument("--interval", type=int, default=int(os.getenv("SPOT_PRICE_INTERVAL_SECONDS", str(DEFAULT_INTERVAL_SECONDS))), help="Seconds between polls")
+    parser.add_argument("--history-hours", type=int, default=DEFAULT_HISTORY_HOURS, help="Rolling history window")
+    parser.add_argument("--once", action="store_true", help="Poll once and exit (for cron)")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for the local provider")
+    parser.add_argument("--reprice", action="store_true", help="Run reprice_inventory.py after each published quote")
+    args = parser.parse_args()
+
+    dry_run = os.getenv("DYNAMODB_DRY_RUN", "false").lower() == "true"
+    window_seconds = max(1, args.history_hours) * 3600
+
+    try:
+        client = get_client()
+        provider = make_provider(args.provider, client, args.seed)
+        print(f"Publishing {args.provider} quotes to {describe_backend()} every {args.interval}s")
+        while True:
+            ok = poll_once(client, provider, window_seconds, dry_run, args.reprice)
+            if args.once:
+                return 0 if ok else 1
+            time.sleep(max(1, args.interval))
+    except KeyboardInterrupt:
+        return 0
+    except (NoCredentialsError, PartialCredentialsError):
+        print("AWS credentials unavailable. Nothing published.")
+        return 1
+    except (ClientError, BotoCoreError) as error:
+        print(f"DynamoDB error: {error}")
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,802 @@
+"""
+In-process stand-in for the low-level boto3 DynamoDB client.
+
+Covers the calls the scripts make: create/describe/update/delete/list tables,
+get/put/update/delete item, batch write/get, scan (with segments) and query
+(tables and GSIs), including condition, filter, key-condition, projection and
+update expressions. Items are kept in wire format ({"S": ...}) so callers see
+exactly what boto3 would return. Errors are raised as botocore ClientError
+with the real error codes.
+
+Optionally persisted to a JSON file so multi-step offline workflows (create
+tables, seed, backfill, benchmark) can run as separate processes.
+"""
+
+import json
+import re
+import threading
+import zlib
+from bisect import bisect_right
+from decimal import Decimal
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from botocore.exceptions import ClientError
+
+
+Item = dict[str, dict[str, Any]]
+
+TOKEN_PATTERN = re.compile(
+    r"\s*(?:(?P<name>#[A-Za-z0-9_]+)|(?P<value>:[A-Za-z0-9_]+)|(?P<number>\d+)"
+    r"|(?P<ident>[A-Za-z_][A-Za-z0-9_\-]*)|(?P<op><>|<=|>=|[=<>(),.\[\]+\-]))"
+)
+KEYWORDS = {"AND", "OR", "NOT", "BETWEEN", "IN", "SET", "REMOVE", "ADD", "DELETE"}
+
+
+def client_error(code: str, message: str, operation: str) -> ClientError:
+    return ClientError({"Error": {"Code": code, "Message": message}}, operation)
+
+
+def plain(value: dict[str, Any] | None) -> Any:
+    """Comparable Python form of a wire-format attribute value."""
+    if value is None:
+        return None
+    kind, raw = next(iter(value.items()))
+    if kind == "N":
+        return Decimal(raw)
+    if kind == "NS":
+        return frozenset(Decimal(entry) for entry in raw)
+    if kind in ("SS", "BS"):
+        return frozenset(raw)
+    if kind == "L":
+        return tuple(plain(entry) for entry in raw)
+    if kind == "M":
+        return {key: plain(entry) for key, entry in raw.items()}
+    if kind == "NULL":
+        return None
+    return raw
+
+
+def clone(value: Any) -> Any:
+    """Deep copy of a wire-format value, so callers never share state with the store."""
+    if isinstance(value, dict):
+        return {key: clone(entry) for key, entry in value.items()}
+    if isinstance(value, list):
+        return [clone(entry) for entry in value]
+    return value
+
+
+def format_number(number: Decimal) -> str:
+    text = format(number.normalize(), "f")
+    return text if text not in ("-0",) else "0"
+
+
+def sort_key(value: dict[str, Any] | None) -> Any:
+    converted = plain(value)
+    return (0, converted) if isinstance(converted, Decimal) else (1, str(converted))
+
+
+class Tokens:
+    def __init__(self, expression: str, operation: str):
+        self.operation = operation
+        self.items: list[tuple[str, str]] = []
+        position = 0
+        expression = expression.strip()
+        while position < len(expression):
+            match = TOKEN_PATTERN.match(expression, position)
+            if not match or match.end() == position:
+                raise client_error("ValidationException", f"Invalid expression near: {expression[position:]}", operation)
+            kind = match.lastgroup or ""
+            text = match.group(kind)
+            if kind == "ident" and text.upper() in KEYWORDS:
+                kind, text = "keyword", text.upper()
+            self.items.append((kind, text))
+            position = match.end()
+            while position < len(expression) and expression[position].isspace():
+                position += 1
+        self.index = 0
+
+    def peek(self, offset: int = 0) -> tuple[str, str]:
+        position = self.index + offset
+        return self.items[position] if position < len(self.items) else ("end", "")
+
+    def take(self) -> tuple[str, str]:
+        token = self.peek()
+        self.index += 1
+        return token
+
+    def accept(self, text: str) -> bool:
+        if self.peek()[1] == text:
+            self.index += 1
+            return True
+        return False
+
+    def expect(self, text: str) -> None:
+        if not self.accept(text):
+            raise client_error("ValidationException", f"Expected '{text}' but found '{self.peek()[1]}'", self.operation)
+
+    def done(self) -> bool:
+        return self.index >= len(self.items)
+
+
+class ExpressionContext:
+    def __init__(self, params: dict[str, Any], operation: str):
+        self.names: dict[str, str] = params.get("ExpressionAttributeNames") or {}
+        self.values: dict[str, dict[str, Any]] = params.get("ExpressionAttributeValues") or {}
+        self.operation = operation
+
+    def name(self, token: tuple[str, str]) -> str:
+        kind, text = token
+        if kind == "name":
+            if text not in self.names:
+                raise client_error("ValidationException", f"Undefined attribute name {text}", self.operation)
+            return self.names[text]
+        if kind == "ident":
+            return text
+        raise client_error("ValidationException", f"Expected attribute name, found '{text}'", self.operation)
+
+    def value(self, text: str) -> dict[str, Any]:
+        if text not in self.values:
+            raise client_error("ValidationException", f"Undefined attribute value {text}", self.operation)
+        return self.values[text]
+
+    def path(self, tokens: Tokens) -> list[str | int]:
+        segments: list[str | int] = [self.name(tokens.take())]
+        while True:
+            if tokens.accept("."):
+                segments.append(self.name(tokens.take()))
+            elif tokens.accept("["):
+                kind, text = tokens.take()
+                if kind != "number":
+                    raise client_error("ValidationException", "List index must be a number", self.operation)
+                segments.append(int(text))
+                tokens.expect("]")
+            else:
+                return segments
+
+
+def resolve(item: Item, path: list[str | int]) -> dict[str, Any] | None:
+    current: Any = {"M": item}
+    for segment in path:
+        if isinstance(segment, int):
+            entries = current.get("L") if isinstance(current, dict) else None
+            if entries is None or segment >= len(entries):
+                return None
+            current = entries[segment]
+        else:
+            members = current.get("M") if isinstance(current, dict) else None
+            if members is None or segment not in members:
+                return None
+            current = members[segment]
+    return current
+
+
+def assign(item: Item, path: list[str | int], value: dict[str, Any] | None) -> None:
+    container: Any = item
+    for segment in path[:-1]:
+        node = container[segment] if isinstance(segment, int) else container.get(segment)
+        if node is None:
+            raise client_error("ValidationException", "The document path provided in the update expression is invalid", "UpdateItem")
+        container = node.get("L") if "L" in node else node.get("M")
+    last = path[-1]
+    if value is None:
+        if isinstance(last, int):
+            if last < len(container):
+                container.pop(last)
+        else:
+            container.pop(last, None)
+    elif isinstance(last, int):
+        if last < len(container):
+            container[last] = value
+        else:
+            container.append(value)
+    else:
+        container[last] = value
+
+
+def compile_condition(expression: str, context: ExpressionContext) -> Callable[[Item], bool]:
+    tokens = Tokens(expression, context.operation)
+
+    def operand() -> Callable[[Item], Any]:
+        kind, text = tokens.peek()
+        if kind == "value":
+            tokens.take()
+            attribute = context.value(text)
+            return lambda item: attribute
+        if kind == "ident" and text == "size" and tokens.peek(1)[1] == "(":
+            tokens.take()
+            tokens.expect("(")
+            path = context.path(tokens)
+            tokens.expect(")")
+
+            def size(item: Item) -> Any:
+                found = resolve(item, path)
+                if found is None:
+                    return None
+                raw = next(iter(found.values()))
+                return {"N": str(len(raw))}
+
+            return size
+        path = context.path(tokens)
+        return lambda item: resolve(item, path)
+
+    def compare(left: Any, operator: str, right: Any) -> bool:
+        if operator == "=":
+            return left is not None and right is not None and plain(left) == plain(right)
+        if operator == "<>":
+            return plain(left) != plain(right) or left is None or right is None
+        if left is None or right is None or next(iter(left)) != next(iter(right)):
+            return False
+        a, b = plain(left), plain(right)
+        return {"<": a < b, "<=": a <= b, ">": a > b, ">=": a >= b}[operator]
+
+    def function(name: str) -> Callable[[Item], bool]:
+        tokens.expect("(")
+        if name in ("attribute_exists", "attribute_not_exists"):
+            path = context.path(tokens)
+            tokens.expect(")")
+            exists = name == "attribute_exists"
+            return lambda item: (resolve(item, path) is not None) == exists
+        if name == "attribute_type":
+            path = context.path(tokens)
+            tokens.expect(",")
+            expected = operand()
+            tokens.expect(")")
+            return lambda item: (found := resolve(item, path)) is not None and next(iter(found)) == plain(expected(item))
+        if name in ("begins_with", "contains"):
+            target = operand()
+            tokens.expect(",")
+            needle = operand()
+            tokens.expect(")")
+
+            def check(item: Item) -> bool:
+                haystack, wanted = target(item), needle(item)
+                if haystack is None or wanted is None:
+                    return False
+                if name == "begins_with":
+                    return isinstance(plain(haystack), str) and str(plain(haystack)).startswith(str(plain(wanted)))
+                kind, raw = next(iter(haystack.items()))
+                if kind == "S":
+                    return str(plain(wanted)) in raw
+                if kind == "L":
+                    return any(plain(entry) == plain(wanted) for entry in raw)
+                if kind in ("SS", "NS", "BS"):
+                    return plain(wanted) in plain(haystack)
+                return False
+
+            return check
+        raise client_error("ValidationException", f"Unsupported function {name}", context.operation)
+
+    def primary() -> Callable[[Item], bool]:
+        if tokens.accept("("):
+            inner = disjunction()
+            tokens.expect(")")
+            return inner
+        kind, text = tokens.peek()
+        if kind == "ident" and tokens.peek(1)[1] == "(" and text != "size":
+            tokens.take()
+            return function(text)
+        left = operand()
+        kind, text = tokens.peek()
+        if text == "BETWEEN":
+            tokens.take()
+            low = operand()
+            tokens.expect("AND")
+            high = operand()
+            return lambda item: compare(left(item), ">=", low(item)) and compare(left(item), "<=", high(item))
+        if text == "IN":
+            tokens.take()
+            tokens.expect("(")
+            options = [operand()]
+            while tokens.accept(","):
+                options.append(operand())
+            tokens.expect(")")
+            return lambda item: any(compare(left(item), "=", option(item)) for option in options)
+        if text in ("=", "<>", "<", "<=", ">", ">="):
+            tokens.take()
+            right = operand()
+            return lambda item: compare(left(item), text, right(item))
+        raise client_error("ValidationException", f"Invalid condition near '{text}'", context.operation)
+
+    def negation() -> Callable[[Item], bool]:
+        if tokens.accept("NOT"):
+            inner = negation()
+            return lambda item: not inner(item)
+        return primary()
+
+    def conjunction() -> Callable[[Item], bool]:
+        parts = [negation()]
+        while tokens.accept("AND"):
+            parts.append(negation())
+        return parts[0] if len(parts) == 1 else (lambda item: all(part(item) for part in parts))
+
+    def disjunction() -> Callable[[Item], bool]:
+        parts = [conjunction()]
+        while tokens.accept("OR"):
+            parts.append(conjunction())
+        return parts[0] if len(parts) == 1 else (lambda item: any(part(item) for part in parts))
+
+    predicate = disjunction()
+    if not tokens.done():
+        raise client_error("ValidationException", f"Unexpected token '{tokens.peek()[1]}'", context.operation)
+    return predicate
+
+
+def apply_update(item: Item, expression: str, context: ExpressionContext) -> set[str]:
+    """Apply an UpdateExpression in place; returns the top-level attributes touched."""
+    tokens = Tokens(expression, context.operation)
+    original = clone(item)
+    actions: list[tuple[str, list[str | int], Any]] = []
+
+    def set_operand() -> dict[str, Any] | None:
+        kind, text = tokens.peek()
+        if kind == "value":
+            tokens.take()
+            return context.value(text)
+        if kind == "ident" and tokens.peek(1)[1] == "(":
+            tokens.take()
+            tokens.expect("(")
+            if text == "if_not_exists":
+                path = context.path(tokens)
+                tokens.expect(",")
+                fallback = set_operand()
+                tokens.expect(")")
+                existing = resolve(original, path)
+                return existing if existing is not None else fallback
+            if text == "list_append":
+                first = set_operand()
+                tokens.expect(",")
+                second = set_operand()
+                tokens.expect(")")
+                return {"L": list((first or {}).get("L", [])) + list((second or {}).get("L", []))}
+            raise client_error("ValidationException", f"Unsupported function {text}", context.operation)
+        return resolve(original, context.path(tokens))
+
+    def set_value() -> dict[str, Any] | None:
+        left = set_operand()
+        if tokens.peek()[1] in ("+", "-"):
+            operator = tokens.take()[1]
+            right = set_operand()
+            if left is None or right is None or "N" not in left or "N" not in right:
+                raise client_error("ValidationException", "An operand in the update expression has an incorrect data type", context.operation)
+            a, b = Decimal(left["N"]), Decimal(right["N"])
+            return {"N": format_number(a + b if operator == "+" else a - b)}
+        return left
+
+    clause = ""
+    while not tokens.done():
+        kind, text = tokens.peek()
+        if kind == "keyword" and text in ("SET", "REMOVE", "ADD", "DELETE"):
+            clause = tokens.take()[1]
+        elif clause and tokens.accept(","):
+            pass
+        elif not clause:
+            raise client_error("ValidationException", f"Invalid UpdateExpression near '{text}'", context.operation)
+
+        path = context.path(tokens)
+        if clause == "SET":
+            tokens.expect("=")
+            actions.append(("SET", path, set_value()))
+        elif clause == "REMOVE":
+            actions.append(("REMOVE", path, None))
+        else:
+            kind, text = tokens.take()
+            actions.append((clause, path, context.value(text)))
+
+    touched: set[str] = set()
+    for action, path, value in actions:
+        touched.add(str(path[0]))
+        if action == "SET":
+            assign(item, path, value)
+        elif action == "REMOVE":
+            assign(item, path, None)
+        else:
+            current = resolve(item, path)
+            kind = next(iter(value))
+            if action == "ADD" and kind == "N":
+                base = Decimal(current["N"]) if current else Decimal(0)
+                assign(item, path, {"N": format_number(base + Decimal(value["N"]))})
+            elif kind in ("SS", "NS", "BS"):
+                members = list(current[kind]) if current else []
+                if action == "ADD":
+                    members.extend(entry for entry in value[kind] if entry not in members)
+                else:
+                    members = [entry for entry in members if entry not in value[kind]]
+                assign(item, path, {kind: members} if members else None)
+            else:
+                raise client_error("ValidationException", f"{action} requires a number or set value", context.operation)
+    return touched
+
+
+def projection(expression: str | None, context: ExpressionContext) -> list[str] | None:
+    """Top-level attributes named by a ProjectionExpression (nested paths keep the whole attribute)."""
+    if not expression:
+        return None
+    tokens = Tokens(expression, context.operation)
+    names: list[str] = []
+    while not tokens.done():
+        names.append(str(context.path(tokens)[0]))
+        tokens.accept(",")
+    return names
+
+
+def project(item: Item, names: list[str] | None) -> Item:
+    if names is None:
+        return clone(item)
+    return {name: clone(item[name]) for name in names if name in item}
+
+
+class MemoryTable:
+    def __init__(self, definition: dict[str, Any]):
+        self.definition = clone(definition)
+        self.key_schema = definition["KeySchema"]
+        self.items: dict[tuple, Item] = {}
+        # Storage keys in sorted order, rebuilt lazily after the key set changes; scans walk this.
+        self._order: list[tuple] | None = None
+        self.ttl: dict[str, Any] = {"TimeToLiveStatus": "DISABLED"}
+        self.primary_names = [name for name in self.key_names() if name]
+
+    def key_names(self, index_name: str | None = None) -> tuple[str, str | None]:
+        schema = self.key_schema
+        if index_name:
+            index = self.index(index_name)
+            schema = index["KeySchema"]
+        hash_key = next(key["AttributeName"] for key in schema if key["KeyType"] == "HASH")
+        range_key = next((key["AttributeName"] for key in schema if key["KeyType"] == "RANGE"), None)
+        return hash_key, range_key
+
+    def index(self, index_name: str) -> dict[str, Any]:
+        for group in ("GlobalSecondaryIndexes", "LocalSecondaryIndexes"):
+            for index in self.definition.get(group, []):
+                if index["IndexName"] == index_name:
+                    return index
+        raise client_error("ValidationException", f"The table does not have the specified index: {index_name}", "Query")
+
+    def storage_key(self, key: Item, operation: str) -> tuple:
+        if len(key) != len(self.primary_names) or any(name not in key for name in self.primary_names):
+            raise client_error("ValidationException", "The provided key element does not match the schema", operation)
+        parts = []
+        for name in self.primary_names:
+            kind, raw = next(iter(key[name].items()))
+            parts.append((kind, format_number(Decimal(raw)) if kind == "N" else raw))
+        return tuple(parts)
+
+    def store(self, storage_key: tuple, item: Item) -> None:
+        if storage_key not in self.items:
+            self._order = None
+        self.items[storage_key] = item
+
+    def remove(self, storage_key: tuple) -> None:
+        if self.items.pop(storage_key, None) is not None:
+            self._order = None
+
+    def scan_order(self) -> list[tuple]:
+        if self._order is None:
+            self._order = sorted(self.items)
+        return self._order
+
+    def primary_key(self, item: Item, operation: str = "PutItem") -> Item:
+        if any(name not in item for name in self.primary_names):
+            raise client_error("ValidationException", "One of the required keys was not given a value", operation)
+        return {name: item[name] for name in self.primary_names}
+
+    def describe(self) -> dict[str, Any]:
+        description = clone(self.definition)
+        description["TableStatus"] = "ACTIVE"
+        description["ItemCount"] = len(self.items)
+        for index in description.get("GlobalSecondaryIndexes", []):
+            index["IndexStatus"] = "ACTIVE"
+        return description
+
+
+class MemoryPaginator:
+    def __init__(self, client: "MemoryDynamoDB", operation: str):
+        self.client = client
+        self.operation = operation
+
+    def paginate(self, **params: Any) -> Iterator[dict[str, Any]]:
+        params = dict(params)
+        config = params.pop("PaginationConfig", {}) or {}
+        if config.get("PageSize"):
+            params["Limit"] = config["PageSize"]
+        method = getattr(self.client, self.operation)
+        while True:
+            page = method(**params)
+            yield page
+            if not page.get("LastEvaluatedKey"):
+                return
+            params["ExclusiveStartKey"] = page["LastEvaluatedKey"]
+
+
+class MemoryWaiter:
+    def __init__(self, client: "MemoryDynamoDB", exists: bool):
+        self.client = client
+        self.exists = exists
+
+    def wait(self, TableName: str, **_: Any) -> None:
+        present = TableName in self.client.tables
+        if present != self.exists:
+            raise client_error("ResourceNotFoundException", f"Waiter gave up on {TableName}", "DescribeTable")
+
+
+class MemoryDynamoDB:
+    def __init__(self, path: Path | None = None):
+        self.path = path
+        self.tables: dict[str, MemoryTable] = {}
+        self._lock = threading.RLock()
+        self.changed = False
+        if path and path.exists():
+            self.load(path)
+
+    # Persistence
+
+    def load(self, path: Path) -> None:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        with self._lock:
+            self.tables = {}
+            for name, stored in payload.get("tables", {}).items():
+                table = MemoryTable(stored["definition"])
+                table.ttl = stored.get("ttl", table.ttl)
+                for item in stored["items"]:
+                    table.store(table.storage_key(table.primary_key(item), "Load"), item)
+                self.tables[name] = table
+
+    def save(self, path: Path | None = None) -> None:
+        target = path or self.path
+        if not target:
+            return
+        if path is None and not self.changed:
+            return
+        with self._lock:
+            payload = {
+                "tables": {
+                    name: {"definition": table.definition, "ttl": table.ttl, "items": list(table.items.values())}
+                    for name, table in self.tables.items()
+                }
+            }
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_suffix(target.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+        tmp_path.replace(target)
+
+    # Table management
+
+    def _table(self, name: str, operation: str) -> MemoryTable:
+        table = self.tables.get(name)
+        if table is None:
+            raise client_error("ResourceNotFoundException", f"Requested resource not found: Table: {name} not found", operation)
+        return table
+
+    def create_table(self, **params: Any) -> dict[str, Any]:
+        with self._lock:
+            name = params["TableName"]
+            if name in self.tables:
+                raise client_error("ResourceInUseException", f"Table already exists: {name}", "CreateTable")
+            self.tables[name] = MemoryTable(params)
+            self.changed = True
+            return {"TableDescription": self.tables[name].describe()}
+
+    def describe_table(self, TableName: str) -> dict[str, Any]:
+        with self._lock:
+            return {"Table": self._table(TableName, "DescribeTable").describe()}
+
+    def list_tables(self, **_: Any) -> dict[str, Any]:
+        with self._lock:
+            return {"TableNames": sorted(self.tables)}
+
+    def delete_table(self, TableName: str) -> dict[str, Any]:
+        with self._lock:
+            table = self._table(TableName, "DeleteTable")
+            del self.tables[TableName]
+            self.changed = True
+            return {"TableDescription": table.describe()}
+
+    def update_table(self, TableName: str, **params: Any) -> dict[str, Any]:
+        with self._lock:
+            table = self._table(TableName, "UpdateTable")
+            definitions = {entry["AttributeName"]: entry for entry in table.definition.get("AttributeDefinitions", [])}
+            for entry in params.get("AttributeDefinitions", []):
+                definitions[entry["AttributeName"]] = entry
+            table.definition["AttributeDefinitions"] = list(definitions.values())
+            self.changed = True
+            for update in params.get("GlobalSecondaryIndexUpdates", []):
+                if "Create" in update:
+                    table.definition.setdefault("GlobalSecondaryIndexes", []).append(update["Create"])
+                elif "Delete" in update:
+                    doomed = update["Delete"]["IndexName"]
+                    table.definition["GlobalSecondaryIndexes"] = [
+                        index for index in table.definition.get("GlobalSecondaryIndexes", []) if index["IndexName"] != doomed
+                    ]
+            return {"TableDescription": table.describe()}
+
+    def update_time_to_live(self, TableName: str, TimeToLiveSpecification: dict[str, Any]) -> dict[str, Any]:
+        with self._lock:
+            table = self._table(TableName, "UpdateTimeToLive")
+            enabled = TimeToLiveSpecification.get("Enabled", False)
+            table.ttl = {"TimeToLiveStatus": "ENABLED" if enabled else "DISABLED"}
+            self.changed = True
+            if enabled:
+                table.ttl["AttributeName"] = TimeToLiveSpecification["AttributeName"]
+            return {"TimeToLiveSpecification": TimeToLiveSpecification}
+
+    def describe_time_to_live(self, TableName: str) -> dict[str, Any]:
+        with self._lock:
+            return {"TimeToLiveDescription": dict(self._table(TableName, "DescribeTimeToLive").ttl)}
+
+    def get_waiter(self, name: str) -> MemoryWaiter:
+        return MemoryWaiter(self, exists=name == "table_exists")
+
+    def get_paginator(self, operation: str) -> MemoryPaginator:
+        return MemoryPaginator(self, operation)
+
+    # Item operations
+
+    def _check_condition(self, params: dict[str, Any], existing: Item | None, operation: str) -> None:
+        expression = params.get("ConditionExpression")
+        if not expression:
+            return
+        context = ExpressionContext(params, operation)
+        if not compile_condition(expression, context)(existing or {}):
+            raise client_error("ConditionalCheckFailedException", "The conditional request failed", operation)
+
+    def get_item(self, TableName: str, Key: Item, **params: Any) -> dict[str, Any]:
+        with self._lock:
+            table = self._table(TableName, "GetItem")
+            item = table.items.get(table.storage_key(Key, "GetItem"))
+            if item is None:
+                return {}
+            return {"Item": project(item, projection(params.get("ProjectionExpression"), ExpressionContext(params, "GetItem")))}
+
+    def put_item(self, TableName: str, Item: Item, **params: Any) -> dict[str, Any]:
+        with self._lock:
+            table = self._table(TableName, "PutItem")
+            storage_key = table.storage_key(table.primary_key(Item), "PutItem")
+            existing = table.items.get(storage_key)
+            self._check_condition(params, existing, "PutItem")
+            table.store(storage_key, clone(Item))
+            self.changed = True
+            if params.get("ReturnValues") == "ALL_OLD" and existing:
+                return {"Attributes": existing}
+            return {}
+
+    def delete_item(self, TableName: str, Key: Item, **params: Any) -> dict[str, Any]:
+        with self._lock:
+            table = self._table(TableName, "DeleteItem")
+            storage_key = table.storage_key(Key, "DeleteItem")
+            existing = table.items.get(storage_key)
+            self._check_condition(params, existing, "DeleteItem")
+            table.remove(storage_key)
+            self.changed = True
+            if params.get("ReturnValues") == "ALL_OLD" and existing:
+                return {"Attributes": existing}
+            return {}
+
+    def update_item(self, TableName: str, Key: Item, **params: Any) -> dict[str, Any]:
+        with self._lock:
+            table = self._table(TableName, "UpdateItem")
+            storage_key = table.storage_key(Key, "UpdateItem")
+            existing = table.items.get(storage_key)
+            self._check_condition(params, existing, "UpdateItem")
+
+            updated = clone(existing) if existing else clone(Key)
+            touched: set[str] = set()
+            if params.get("UpdateExpression"):
+                touched = apply_update(updated, params["UpdateExpression"], ExpressionContext(params, "UpdateItem"))
+            if any(name in touched for name in Key):
+                raise client_error("ValidationException", "Cannot update attribute that is part of the key", "UpdateItem")
+            table.store(storage_key, updated)
+            self.changed = True
+
+            return_values = params.get("ReturnValues", "NONE")
+            if return_values == "ALL_NEW":
+                return {"Attributes": clone(updated)}
+            if return_values == "ALL_OLD":
+                return {"Attributes": existing} if existing else {}
+            if return_values in ("UPDATED_NEW", "UPDATED_OLD"):
+                source = updated if return_values == "UPDATED_NEW" else (existing or {})
+                return {"Attributes": {name: clone(source[name]) for name in touched if name in source}}
+            return {}
+
+    def batch_write_item(self, RequestItems: dict[str, list[dict[str, Any]]], **_: Any) -> dict[str, Any]:
+        with self._lock:
+            for table_name, requests in RequestItems.items():
+                if len(requests) > 25:
+                    raise client_error("ValidationException", "Too many items requested for the BatchWriteItem call", "BatchWriteItem")
+                for request in requests:
+                    if "PutRequest" in request:
+                        self.put_item(table_name, request["PutRequest"]["Item"])
+                    elif "DeleteRequest" in request:
+                        self.delete_item(table_name, request["DeleteRequest"]["Key"])
+            return {"UnprocessedItems": {}}
+
+    def batch_get_item(self, RequestItems: dict[str, dict[str, Any]], **_: Any) -> dict[str, Any]:
+        with self._lock:
+            responses: dict[str, list[Item]] = {}
+            for table_name, request in RequestItems.items():
+                found = responses.setdefault(table_name, [])
+                for key in request["Keys"]:
+                    result = self.get_item(table_name, key, **{k: v for k, v in request.items() if k != "Keys"})
+                    if "Item" in result:
+                        found.append(result["Item"])
+            return {"Responses": responses, "UnprocessedKeys": {}}
+
+    # Reads
+
+    def _page(self, table: MemoryTable, candidates: list[Item], params: dict[str, Any], operation: str) -> dict[str, Any]:
+        context = ExpressionContext(params, operation)
+        start = params.get("ExclusiveStartKey")
+        if start:
+            start_key = table.primary_key(start, operation)
+            for position, item in enumerate(candidates):
+                if all(item[name] == value for name, value in start_key.items()):
+                    candidates = candidates[position + 1:]
+                    break
+
+        limit = params.get("Limit")
+        evaluated = candidates[:limit] if limit else candidates
+        predicate = compile_condition(params["FilterExpression"], context) if params.get("FilterExpression") else None
+        matched = [item for item in evaluated if predicate is None or predicate(item)]
+
+        result: dict[str, Any] = {"Count": len(matched), "ScannedCount": len(evaluated)}
+        if params.get("Select") != "COUNT":
+            names = projection(params.get("ProjectionExpression"), context)
+            result["Items"] = [project(item, names) for item in matched]
+        if limit and len(candidates) > limit:
+            last = evaluated[-1]
+            key = table.primary_key(last)
+            if params.get("IndexName"):
+                for name in table.key_names(params["IndexName"]):
+                    if name:
+                        key[name] = last[name]
+            result["LastEvaluatedKey"] = key
+        return result
+
+    def _index_items(self, table: MemoryTable, index_name: str | None) -> list[Item]:
+        if not index_name:
+            return list(table.items.values())
+        hash_key, range_key = table.key_names(index_name)
+        return [item for item in table.items.values() if hash_key in item and (not range_key or range_key in item)]
+
+    def scan(self, TableName: str, **params: Any) -> dict[str, Any]:
+        with self._lock:
+            table = self._table(TableName, "Scan")
+            index_name = params.get("IndexName")
+            hash_key, range_key = table.key_names(index_name) if index_name else (None, None)
+            total_segments = params.get("TotalSegments")
+            segment = params.get("Segment", 0)
+
+            # Like DynamoDB, resume at the first key after the start key, even if that row was deleted since.
+            order = table.scan_order()
+            position = 0
+            start = params.get("ExclusiveStartKey")
+            if start:
+                position = bisect_right(order, table.storage_key(table.primary_key(start, "Scan"), "Scan"))
+
+            limit = params.get("Limit")
+            candidates: list[Item] = []
+            for storage_key in islice(order, position, None):
+                item = table.items[storage_key]
+                if total_segments and zlib.crc32(repr(storage_key).encode("utf-8")) % total_segments != segment:
+                    continue
+                if index_name and (hash_key not in item or (range_key and range_key not in item)):
+                    continue
+                candidates.append(item)
+                if limit and len(candidates) > limit:
+                    break
+            return self._page(table, candidates, {key: value for key, value in params.items() if key != "ExclusiveStartKey"}, "Scan")
+
+    def query(self, TableName: str, **params: Any) -> dict[str, Any]:
+        with self._lock:
+            table = self._table(TableName, "Query")
+            index_name = params.get("IndexName")
+            _, range_key = table.key_names(index_name)
+            context = ExpressionContext(params, "Query")
+            if not params.get("KeyConditionExpression"):
+                raise client_error("ValidationException", "KeyConditionExpression is required", "Query")
+            key_condition = compile_condition(params["KeyConditionExpression"], context)
+
+            candidates = [item for item in self._index_items(table, index_name) if key_condition(item)]
+            if range_key:
+                candidates.sort(key=lambda item: sort_key(item.get(range_key)), reverse=params.get("ScanIndexForward") is False)
+            return self._page(table, candidates, params, "Query")
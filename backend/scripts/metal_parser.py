@@ -0,0 +1,177 @@
+"""
+Python port of frontend/src/lib/metalParser.ts: metal type, purity and weight
+from a free-text item description.
+
+The rules, tables and their lookup order match the TypeScript exactly, so a
+stored parse agrees with what the Price Lookup tool shows for the same text.
+Bump PARSER_VERSION (and METAL_PARSER_VERSION in metalParser.ts) whenever the
+rules change; reprice_inventory.py re-parses every item whose stored
+metal_specs carry an older version.
+"""
+
+import re
+from typing import Any
+
+
+PARSER_VERSION = 1
+METAL_TYPES = ("gold", "silver", "platinum")
+GRAMS_PER_OUNCE = 31.1034768
+GRAMS_PER_PENNYWEIGHT = 1.55517384
+
+# Same defaults as calculateValuation's storeMargins.
+DEFAULT_MARGINS = {
+    "payout_low": 0.70,
+    "payout_high": 0.80,
+    "pawn_loan": 0.30,
+    "retail_estimate": 1.20,
+}
+
+
+def purity(karat: int | None, decimal: float, label: str) -> dict[str, Any]:
+    return {"karat": karat, "decimal": decimal, "label": label}
+
+
+# Ordered the way JavaScript enumerates the object literals in metalParser.ts:
+# integer-like keys first in ascending order, then the rest in source order.
+# The first substring hit wins, so the order decides e.g. "14k 750" -> 18K.
+GOLD_PURITY = {
+    "417": purity(10, 0.417, "10K (.417)"),
+    "585": purity(14, 0.585, "14K (.585)"),
+    "750": purity(18, 0.750, "18K (.750)"),
+    "916": purity(22, 0.916, "22K (.916)"),
+    "999": purity(24, 0.999, "24K (.999)"),
+    "24k": purity(24, 0.999, "24K"),
+    "24kt": purity(24, 0.999, "24K"),
+    "24 karat": purity(24, 0.999, "24K"),
+    "22k": purity(22, 0.916, "22K"),
+    "22kt": purity(22, 0.916, "22K"),
+    "22 karat": purity(22, 0.916, "22K"),
+    "18k": purity(18, 0.750, "18K"),
+    "18kt": purity(18, 0.750, "18K"),
+    "18 karat": purity(18, 0.750, "18K"),
+    "14k": purity(14, 0.585, "14K"),
+    "14kt": purity(14, 0.585, "14K"),
+    "14 karat": purity(14, 0.585, "14K"),
+    "10k": purity(10, 0.417, "10K"),
+    "10kt": purity(10, 0.417, "10K"),
+    "10 karat": purity(10, 0.417, "10K"),
+}
+
+SILVER_PURITY = {
+    "800": purity(None, 0.800, "Silver (.800)"),
+    "900": purity(None, 0.900, "Coin Silver (.900)"),
+    "925": purity(None, 0.925, "Sterling (.925)"),
+    "999": purity(None, 0.999, "Fine Silver (.999)"),
+    "sterling": purity(None, 0.925, "Sterling Silver"),
+    "coin": purity(None, 0.900, "Coin Silver (.900)"),
+}
+
+PLATINUM_PURITY = {
+    "850": purity(None, 0.850, "Platinum (.850)"),
+    "900": purity(None, 0.900, "Platinum (.900)"),
+    "950": purity(None, 0.950, "Platinum (.950)"),
+    "999": purity(None, 0.999, "Platinum (.999)"),
+}
+
+PURITY_TABLES = {"gold": GOLD_PURITY, "silver": SILVER_PURITY, "platinum": PLATINUM_PURITY}
+
+DEFAULT_PURITY = {
+    "gold": purity(14, 0.585, "14K (assumed)"),
+    "silver": purity(None, 0.925, "Sterling (assumed)"),
+    "platinum": purity(None, 0.950, "Platinum .950 (assumed)"),
+}
+UNKNOWN_PURITY = purity(None, 0.0, "Unknown")
+
+METAL_KEYWORDS = {
+    "gold": ["gold", "yellow gold", "white gold", "rose gold", "pink gold", "green gold"],
+    "silver": ["silver", "sterling", "argent"],
+    "platinum": ["platinum", "plat", "pt"],
+}
+
+# re.ASCII keeps \d and \b to what they mean in JavaScript.
+GRAM_PATTERNS = [
+    re.compile(r"(\d+\.?\d*)\s*(?:grams?|gr|g)\b", re.ASCII),
+    re.compile(r"(\d+\.?\d*)\s*grams?\b", re.ASCII),
+]
+DWT_PATTERNS = [
+    re.compile(r"(\d+\.?\d*)\s*(?:pennyweight|dwt|pw)\b", re.ASCII),
+    re.compile(r"(\d+\.?\d*)\s*dwt\b", re.ASCII),
+]
+KARAT_PATTERNS = [
+    re.compile(r"\b\d+k\b", re.ASCII),
+    re.compile(r"\b\d+kt\b", re.ASCII),
+    re.compile(r"\b\d+\s*karat\b", re.ASCII),
+]
+SILVER_STAMP_PATTERNS = [re.compile(r"\bsterling\b", re.ASCII), re.compile(r"\b925\b", re.ASCII)]
+PLATINUM_STAMP_PATTERNS = [re.compile(r"\bplatinum\b", re.ASCII), re.compile(r"\bpt950\b", re.ASCII)]
+
+
+def first_weight(text: str, patterns: list[re.Pattern]) -> float | None:
+    for pattern in patterns:
+        match = pattern.search(text)
+        if match:
+            value = float(match.group(1))
+            if 0 < value < 10000:
+                return value
+    return None
+
+
+def parse_weight(description: str) -> tuple[float | None, float | None]:
+    """(grams, pennyweight); a pennyweight figure wins over grams, as in parseWeight."""
+    normalized = description.lower().replace(",", "")
+    grams = first_weight(normalized, GRAM_PATTERNS)
+    pennyweight = first_weight(normalized, DWT_PATTERNS)
+    if pennyweight is not None:
+        grams = pennyweight * GRAMS_PER_PENNYWEIGHT
+    return grams, pennyweight
+
+
+def detect_metal_type(description: str) -> tuple[str, str]:
+    normalized = description.lower()
+
+    for metal, keywords in METAL_KEYWORDS.items():
+        if any(keyword in normalized for keyword in keywords):
+            return metal, "high"
+
+    if any(pattern.search(normalized) for pattern in KARAT_PATTERNS):
+        return "gold", "medium"
+    if any(pattern.search(normalized) for pattern in SILVER_STAMP_PATTERNS):
+        return "silver", "medium"
+    if any(pattern.search(normalized) for pattern in PLATINUM_STAMP_PATTERNS):
+        return "platinum", "high"
+    return "unknown", "low"
+
+
+def detect_purity(description: str, metal_type: str) -> tuple[dict[str, Any], list[str]]:
+    table = PURITY_TABLES.get(metal_type)
+    if table is None:
+        return UNKNOWN_PURITY, []
+
+    normalized = description.lower()
+    for keyword, standard in table.items():
+        if keyword in normalized:
+            return standard, [keyword]
+    return DEFAULT_PURITY[metal_type], ["default-assumed"]
+
+
+def parse_metal_description(description: str) -> dict[str, Any]:
+    """Same result as parseMetalDescription, with snake_case keys."""
+    normalized = description.strip()
+    metal_type, confidence = detect_metal_type(normalized)
+    grams, pennyweight = parse_weight(normalized)
+    standard, detected_keywords = detect_purity(normalized, metal_type)
+
+    if grams is None and pennyweight is None:
+        confidence = "low"
+    elif grams is not None and detected_keywords:
+        confidence = "high"
+
+    return {
+        "metal_type": metal_type,
+        "purity": standard,
+        "weight_grams": grams,
+        "weight_pennyweight": pennyweight,
+        "confidence": confidence,
+        "original_description": normalized,
+        "detected_keywords": detected_keywords,
+    }
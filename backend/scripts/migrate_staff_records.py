@@ -0,0 +1,130 @@
+import argparse
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError, PartialCredentialsError, WaiterError
+
+from create_tables import TABLES, ensure_table
+from dynamodb_client import describe_backend, get_client
+from staff_directory import STAFF_TABLE, pin_hash, staff_item, staff_key
+
+
+CONFIG_TABLE = "USA_Pawn_Store_Config"
+STAFF_RECORDS_KEY = "staff_records"
+# 10,000-entry PIN list written by old seed runs; nothing reads it.
+DEAD_CONFIG_KEYS = ["staff_pins"]
+
+
+def read_blob(client) -> list[dict[str, Any]] | None:
+    item = client.get_item(TableName=CONFIG_TABLE, Key={"config_key": {"S": STAFF_RECORDS_KEY}}).get("Item")
+    if not item:
+        return None
+    parsed = json.loads(item.get("value", {}).get("S") or "{}")
+    staff = parsed.get("staff") or parsed.get("staff_records") or []
+    return [entry for entry in staff if isinstance(entry, dict)]
+
+
+def insert_member(client, member: dict[str, Any]) -> str:
+    item = staff_item(member)
+    try:
+        client.put_item(
+            TableName=STAFF_TABLE,
+            Item=item,
+            ConditionExpression="attribute_not_exists(staff_key)",
+        )
+    except ClientError as error:
+        if error.response.get("Error", {}).get("Code", "") != "ConditionalCheckFailedException":
+            raise
+        existing = client.get_item(TableName=STAFF_TABLE, Key={"staff_key": item["staff_key"]}).get("Item") or {}
+        # Same PIN: an earlier run already moved this entry. A different PIN is a conflict.
+        return "present" if existing.get("pin_hash", {}).get("S") == pin_hash(member["pin"]) else "exists"
+    return "inserted"
+
+
+def migrate(client, staff: list[dict[str, Any]], max_workers: int) -> dict[str, list[str]]:
+    outcome: dict[str, list[str]] = {"inserted": [], "present": [], "exists": [], "invalid": [], "duplicate": []}
+    unique: dict[str, dict[str, Any]] = {}
+    for member in staff:
+        name = str(member.get("name") or member.get("staff_name") or "").strip()
+        pin = str(member.get("pin") or "").strip()
+        if not name or not pin:
+            outcome["invalid"].append(name or "<unnamed>")
+            continue
+        if staff_key(name) in unique:
+            # The old clock-in check matched the first entry with this name.
+            outcome["duplicate"].append(name)
+            continue
+        unique[staff_key(name)] = {**member, "name": name, "pin": pin}
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        results = pool.map(lambda member: (member["name"], insert_member(client, member)), unique.values())
+        for name, result in results:
+            outcome[result].append(name)
+    return outcome
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Move the staff_records config blob into the USA_Pawn_Staff table")
+    parser.add_argument("--keep-blob", action="store_true", help="Leave the staff_records config item in place")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent inserts")
+    args = parser.parse_args()
+
+    dry_run = os.getenv("DYNAMODB_DRY_RUN", "false").lower() == "true"
+
+    try:
+        client = get_client()
+        staff = read_blob(client)
+        print(f"Source: {describe_backend()}")
+        if staff is None:
+            print(f"No {STAFF_RECORDS_KEY} item found; nothing to migrate.")
+        else:
+            print(f"{STAFF_RECORDS_KEY}: {len(staff)} entries")
+
+        if dry_run:
+            print("Dry-run mode enabled. No writes performed.")
+            for member in staff or []:
+                print(f"  would insert {staff_key(member.get('name') or member.get('staff_name') or '')!r}")
+            print(f"Would delete: {', '.join(DEAD_CONFIG_KEYS)}")
+            if staff is not None and not args.keep_blob:
+                print(f"Would delete {STAFF_RECORDS_KEY} if every entry migrates without a conflict")
+            return 0
+
+        ensure_table(client, next(table for table in TABLES if table["TableName"] == STAFF_TABLE))
+        outcome = migrate(client, staff or [], args.workers)
+
+        for key in DEAD_CONFIG_KEYS:
+            client.delete_item(TableName=CONFIG_TABLE, Key={"config_key": {"S": key}})
+            print(f"Deleted config item: {key}")
+        # Only retire the blob once every entry is in the table with the PIN it had there;
+        # anything skipped would otherwise exist nowhere but this run's output.
+        conflicts = outcome["exists"] or outcome["duplicate"] or outcome["invalid"]
+        if staff is not None and not args.keep_blob and not conflicts:
+            client.delete_item(TableName=CONFIG_TABLE, Key={"config_key": {"S": STAFF_RECORDS_KEY}})
+            print(f"Deleted config item: {STAFF_RECORDS_KEY}")
+    except (NoCredentialsError, PartialCredentialsError):
+        print("AWS credentials unavailable. Nothing migrated.")
+        return 1
+    except (ClientError, BotoCoreError, WaiterError, TimeoutError, ValueError) as error:
+        print(f"Staff migration failed: {error}")
+        return 1
+
+    print(
+        f"Inserted: {len(outcome['inserted'])}, already migrated: {len(outcome['present'])}, "
+        f"conflicts: {len(outcome['exists']) + len(outcome['duplicate']) + len(outcome['invalid'])}"
+    )
+    if outcome["exists"]:
+        print(f"  existing rows with a different PIN (not overwritten): {', '.join(outcome['exists'])}")
+    if outcome["duplicate"]:
+        print(f"  repeated names (only the first entry was inserted): {', '.join(outcome['duplicate'])}")
+    if outcome["invalid"]:
+        print(f"  entries without a name or PIN: {', '.join(outcome['invalid'])}")
+    if conflicts and staff is not None:
+        print(f"Kept {STAFF_RECORDS_KEY}: resolve the entries above in {STAFF_TABLE} or the blob, then rerun.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
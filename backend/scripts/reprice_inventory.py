@@ -0,0 +1,340 @@
+"""
+Reprice gold, silver and platinum inventory against the published spot prices.
+
+Each item's description is parsed once (metal_parser.py, the port of
+frontend/src/lib/metalParser.ts) and the result is stored on the item:
+
+  metal_specs  {metal_type, purity, purity_label, karat, weight_grams,
+                weight_pennyweight, confidence, parser_version, description_hash}
+  valuation    {melt_value, payout_low, payout_high, pawn_loan, retail_estimate,
+                metal_type, spot_price, spot_timestamp, priced_at}
+
+A description is parsed again only when its hash or PARSER_VERSION no longer
+matches metal_specs. Valuations for every priced item are then recomputed in
+one NumPy pass and only the rows whose figures moved by at least a cent are
+written back, so the inventory views read stored numbers instead of parsing
+on each request. Writes are conditional on the description seen in the scan;
+an item edited meanwhile is left for the next run.
+
+frontend/src/lib/inventory-valuation.ts computes the same attributes: the
+inventory API stamps them when a description is created or edited, and the
+Vercel cron (/api/cron/spot-prices) runs this pass after every live quote.
+
+Usage:
+  python reprice_inventory.py              # reprice against the published quote
+  python reprice_inventory.py --reparse    # also re-parse every description
+  python reprice_inventory.py --allow-local  # accept a quote from the local demo provider
+  python ingest_spot_prices.py --reprice   # reprice after every published quote
+"""
+
+import argparse
+import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError, PartialCredentialsError
+
+from bulk_writer import MAX_RETRIES, THROTTLE_ERROR_CODES, backoff_delay
+from dynamodb_client import describe_backend, get_client
+from export_tables import SegmentResult, scan_page
+from ingest_spot_prices import is_live, read_published
+from metal_parser import DEFAULT_MARGINS, GRAMS_PER_OUNCE, METAL_TYPES, PARSER_VERSION, parse_metal_description
+
+
+INVENTORY_TABLE = "USA_Pawn_Inventory"
+DEFAULT_SEGMENTS = 4
+DEFAULT_MAX_WORKERS = 8
+# Column order of the valuation matrix; the offers are fractions of melt value.
+VALUATION_FIELDS = ("melt_value", "payout_low", "payout_high", "pawn_loan", "retail_estimate")
+
+serializer = TypeSerializer()
+deserializer = TypeDeserializer()
+
+
+@dataclass
+class RepricePlan:
+    scanned: int = 0
+    parsed: int = 0
+    priced: int = 0
+    # item_id -> (description seen in the scan, SET values, REMOVE names)
+    updates: dict[str, tuple[str | None, dict[str, Any], list[str]]] = field(default_factory=dict)
+    revalued: int = 0
+    cleared: int = 0
+
+
+@dataclass
+class RepriceStats:
+    written: int = 0
+    conflicts: list[str] = field(default_factory=list)
+    retries: int = 0
+    seconds: float = 0.0
+
+
+def description_hash(description: str) -> str:
+    return hashlib.sha256(description.encode("utf-8")).hexdigest()[:16]
+
+
+def stored_specs(description: str) -> dict[str, Any]:
+    parsed = parse_metal_description(description)
+    return {
+        "metal_type": parsed["metal_type"],
+        "purity": parsed["purity"]["decimal"],
+        "purity_label": parsed["purity"]["label"],
+        "karat": parsed["purity"]["karat"],
+        "weight_grams": parsed["weight_grams"],
+        "weight_pennyweight": parsed["weight_pennyweight"],
+        "confidence": parsed["confidence"],
+        "parser_version": PARSER_VERSION,
+        "description_hash": description_hash(description),
+    }
+
+
+def scan_segment(client, segment: int, total_segments: int) -> list[dict[str, Any]]:
+    params: dict[str, Any] = {
+        "TableName": INVENTORY_TABLE,
+        "Segment": segment,
+        "TotalSegments": total_segments,
+        "ProjectionExpression": "#id, #description, #specs, #valuation",
+        "ExpressionAttributeNames": {
+            "#id": "item_id",
+            "#description": "description",
+            "#specs": "metal_specs",
+            "#valuation": "valuation",
+        },
+    }
+    result = SegmentResult(table_name=INVENTORY_TABLE, segment=segment, path=Path())
+    rows: list[dict[str, Any]] = []
+    while True:
+        response = scan_page(client, params, result)
+        rows.extend({key: deserializer.deserialize(value) for key, value in item.items()} for item in response.get("Items", []))
+        if not response.get("LastEvaluatedKey"):
+            return rows
+        params["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def scan_inventory(client, segments: int) -> list[dict[str, Any]]:
+    with ThreadPoolExecutor(max_workers=segments) as pool:
+        parts = pool.map(lambda segment: scan_segment(client, segment, segments), range(segments))
+        return [row for part in parts for row in part if row.get("item_id")]
+
+
+def round_cents(values: np.ndarray) -> np.ndarray:
+    # Math.round(x * 100) / 100 rounds halves up; np.round would round them to even.
+    return np.floor(values * 100 + 0.5) / 100
+
+
+def compute_valuations(
+    weights: np.ndarray,
+    purities: np.ndarray,
+    metal_index: np.ndarray,
+    spot: dict[str, float],
+    margins: dict[str, float] = DEFAULT_MARGINS,
+) -> np.ndarray:
+    """(n, len(VALUATION_FIELDS)) matrix of rounded dollar figures, as calculateValuation computes them."""
+    prices = np.array([float(spot[metal]) for metal in METAL_TYPES])
+    melt = weights * purities / GRAMS_PER_OUNCE * prices[metal_index]
+    factors = np.array([1.0] + [margins[name] for name in VALUATION_FIELDS[1:]])
+    return round_cents(melt[:, None] * factors[None, :])
+
+
+def stored_valuations(rows: list[dict[str, Any]]) -> np.ndarray:
+    values = np.full((len(rows), len(VALUATION_FIELDS)), np.nan)
+    for position, row in enumerate(rows):
+        valuation = row.get("valuation") or {}
+        for column, name in enumerate(VALUATION_FIELDS):
+            if valuation.get(name) is not None:
+                values[position, column] = float(valuation[name])
+    return values
+
+
+def plan_reprice(rows: list[dict[str, Any]], quote: dict[str, Any], reparse: bool = False) -> RepricePlan:
+    plan = RepricePlan(scanned=len(rows))
+    priced_rows: list[dict[str, Any]] = []
+    weights: list[float] = []
+    purities: list[float] = []
+    metal_index: list[int] = []
+
+    for row in rows:
+        description = row.get("description")
+        specs = row.get("metal_specs") or {}
+        if (
+            reparse
+            or specs.get("parser_version") != PARSER_VERSION
+            or specs.get("description_hash") != description_hash(description or "")
+        ):
+            parsed = stored_specs(description or "")
+            plan.parsed += 1
+            if not specs or to_attribute(parsed) != serializer.serialize(specs):
+                plan.updates[row["item_id"]] = (description, {"metal_specs": parsed}, [])
+            specs = parsed
+
+        weight = specs.get("weight_grams")
+        if specs.get("metal_type") in METAL_TYPES and weight is not None and float(weight) > 0:
+            priced_rows.append(row)
+            weights.append(float(weight))
+            purities.append(float(specs["purity"]))
+            metal_index.append(METAL_TYPES.index(specs["metal_type"]))
+        elif row.get("valuation") is not None:
+            # The description no longer yields a metal weight, so the old figures are wrong.
+            plan.updates.setdefault(row["item_id"], (description, {}, []))[2].append("valuation")
+            plan.cleared += 1
+
+    plan.priced = len(priced_rows)
+    if not priced_rows:
+        return plan
+
+    values = compute_valuations(np.array(weights), np.array(purities), np.array(metal_index), quote)
+    # Compare in whole cents so float noise in stored numbers never counts as a change.
+    current = np.rint(values * 100)
+    previous = np.rint(stored_valuations(priced_rows) * 100)
+    changed = np.flatnonzero(np.any(current != previous, axis=1))
+
+    priced_at = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+    for position in changed:
+        row = priced_rows[position]
+        metal = METAL_TYPES[metal_index[position]]
+        valuation = {name: float(values[position, column]) for column, name in enumerate(VALUATION_FIELDS)}
+        valuation.update(
+            metal_type=metal,
+            spot_price=round(float(quote[metal]), 2),
+            spot_timestamp=quote.get("timestamp"),
+            priced_at=priced_at,
+        )
+        plan.updates.setdefault(row["item_id"], (row.get("description"), {}, []))[1]["valuation"] = valuation
+    plan.revalued = len(changed)
+    return plan
+
+
+def to_attribute(value: Any) -> dict[str, Any]:
+    # TypeSerializer rejects floats; round-trip through str keeps the figures exact.
+    if isinstance(value, float):
+        return {"N": str(Decimal(str(value)))}
+    if isinstance(value, dict):
+        return {"M": {key: to_attribute(item) for key, item in value.items()}}
+    return serializer.serialize(value)
+
+
+def update_item(client, item_id: str, description: str | None, sets: dict[str, Any], removes: list[str], stats: RepriceStats) -> None:
+    names = {"#description": "description"}
+    values: dict[str, Any] = {}
+    clauses = []
+    for position, (name, value) in enumerate(sets.items()):
+        names[f"#s{position}"] = name
+        values[f":s{position}"] = to_attribute(value)
+        clauses.append(f"#s{position} = :s{position}")
+    expression = f"SET {', '.join(clauses)}" if clauses else ""
+    if removes:
+        for position, name in enumerate(removes):
+            names[f"#r{position}"] = name
+        expression += f" REMOVE {', '.join(f'#r{position}' for position in range(len(removes)))}"
+
+    params: dict[str, Any] = {
+        "TableName": INVENTORY_TABLE,
+        "Key": {"item_id": {"S": item_id}},
+        "UpdateExpression": expression.strip(),
+        "ExpressionAttributeNames": names,
+    }
+    # Only stamp figures derived from the description that was actually parsed.
+    if description is None:
+        params["ConditionExpression"] = "attribute_exists(item_id) AND attribute_not_exists(#description)"
+    else:
+        params["ConditionExpression"] = "#description = :description"
+        values[":description"] = {"S": description}
+    if values:
+        params["ExpressionAttributeValues"] = values
+
+    attempt = 0
+    while True:
+        try:
+            client.update_item(**params)
+            stats.written += 1
+            return
+        except ClientError as error:
+            code = error.response.get("Error", {}).get("Code", "")
+            if code == "ConditionalCheckFailedException":
+                stats.conflicts.append(item_id)
+                return
+            if code not in THROTTLE_ERROR_CODES or attempt >= MAX_RETRIES:
+                raise
+        attempt += 1
+        stats.retries += 1
+        time.sleep(backoff_delay(attempt))
+
+
+def apply_plan(client, plan: RepricePlan, max_workers: int) -> RepriceStats:
+    stats = RepriceStats()
+    started = time.perf_counter()
+    updates = list(plan.updates.items())
+    if updates:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(updates)))) as pool:
+            list(pool.map(lambda update: update_item(client, update[0], *update[1], stats), updates))
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def print_plan(plan: RepricePlan) -> None:
+    print(
+        f"{INVENTORY_TABLE}: {plan.scanned} items, {plan.parsed} descriptions parsed, "
+        f"{plan.priced} priced, {plan.revalued} valuations changed, {plan.cleared} cleared "
+        f"-> {len(plan.updates)} writes"
+    )
+
+
+def print_stats(plan: RepricePlan, stats: RepriceStats) -> None:
+    line = f"{INVENTORY_TABLE}: {stats.written} of {len(plan.updates)} writes in {stats.seconds:.2f}s, retries: {stats.retries}"
+    if stats.conflicts:
+        line += f", skipped (edited since the scan): {', '.join(stats.conflicts)}"
+    print(line)
+
+
+def reprice(client, quote: dict[str, Any], segments: int, max_workers: int, reparse: bool = False, dry_run: bool = False) -> RepricePlan:
+    plan = plan_reprice(scan_inventory(client, max(1, segments)), quote, reparse)
+    print_plan(plan)
+    if not dry_run:
+        print_stats(plan, apply_plan(client, plan, max_workers))
+    return plan
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Recompute stored metal valuations for inventory from the published spot prices")
+    parser.add_argument("--reparse", action="store_true", help="Parse every description again, not only new or edited ones")
+    parser.add_argument("--segments", type=int, default=DEFAULT_SEGMENTS, help="Parallel scan segments")
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS, help="Concurrent item updates")
+    parser.add_argument("--allow-local", action="store_true", help="Reprice against a quote from the local demo provider")
+    args = parser.parse_args()
+
+    dry_run = os.getenv("DYNAMODB_DRY_RUN", "false").lower() == "true"
+
+    try:
+        client = get_client()
+        published = read_published(client)
+        if not published or not published["value"]:
+            print("No spot prices published yet; run ingest_spot_prices.py first.")
+            return 1
+        quote = published["value"]
+        if not is_live(quote) and not args.allow_local:
+            print(f"The published quote came from {quote.get('source', 'an unknown source')!r}, not a live feed; pass --allow-local to use it anyway.")
+            return 1
+        print(f"Repricing {describe_backend()} at " + ", ".join(f"{metal} {float(quote[metal]):.2f}" for metal in METAL_TYPES))
+        if dry_run:
+            print("Dry-run mode enabled. Nothing will be written.")
+        reprice(client, quote, args.segments, args.workers, args.reparse, dry_run)
+    except (NoCredentialsError, PartialCredentialsError):
+        print("AWS credentials unavailable. Nothing repriced.")
+        return 1
+    except (ClientError, BotoCoreError) as error:
+        print(f"DynamoDB error: {error}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
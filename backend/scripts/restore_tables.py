@@ -0,0 +1,202 @@
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from boto3.dynamodb.types import TypeSerializer
+from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError, PartialCredentialsError, WaiterError
+
+from bulk_writer import WriteStats, chunked, print_write_stats, write_batch
+from create_tables import TABLES, TIME_TO_LIVE, ensure_table, ensure_time_to_live
+from dynamodb_client import describe_backend, get_client
+from snapshot_format import iter_part_rows, part_paths, read_manifest
+
+
+PROGRESS_NAME = "restore-progress.json"
+DEFAULT_MAX_WORKERS = 16
+CHECKPOINT_ROWS = 1000
+
+serializer = TypeSerializer()
+
+
+class RestoreProgress:
+    """Rows written per part file, checkpointed so an interrupted restore can pick up where it stopped."""
+
+    def __init__(self, path: Path, snapshot_id: str, restart: bool = False):
+        self.path = path
+        self.snapshot_id = snapshot_id
+        self.lock = threading.Lock()
+        self.parts: dict[str, dict[str, Any]] = {}
+
+        if path.exists() and not restart:
+            stored = json.loads(path.read_text(encoding="utf-8"))
+            if stored.get("snapshot") != snapshot_id:
+                raise ValueError(f"{path} belongs to a different snapshot; pass --restart to discard it")
+            self.parts = stored.get("parts", {})
+
+    def rows_done(self, part: str) -> int:
+        with self.lock:
+            return self.parts.get(part, {}).get("rows", 0)
+
+    def is_done(self, part: str) -> bool:
+        with self.lock:
+            return self.parts.get(part, {}).get("done", False)
+
+    def record(self, part: str, rows: int, done: bool = False) -> None:
+        with self.lock:
+            self.parts[part] = {"rows": rows, "done": done}
+            payload = {"snapshot": self.snapshot_id, "parts": self.parts}
+            tmp_path = self.path.with_suffix(".json.tmp")
+            tmp_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+            tmp_path.replace(self.path)
+
+
+def restore_definition(recorded: dict[str, Any], maintained: dict[str, Any] | None) -> dict[str, Any]:
+    """The table as the snapshot recorded it (billing and throughput included), plus GSIs create_tables.py has added since."""
+    definition = dict(recorded)
+    known = {index["IndexName"] for index in recorded.get("GlobalSecondaryIndexes", [])}
+    added = [dict(index) for index in (maintained or {}).get("GlobalSecondaryIndexes", []) if index["IndexName"] not in known]
+    if not added:
+        return definition
+
+    if definition.get("BillingMode") == "PROVISIONED":
+        for index in added:
+            index["ProvisionedThroughput"] = definition["ProvisionedThroughput"]
+    definition["GlobalSecondaryIndexes"] = [*recorded.get("GlobalSecondaryIndexes", []), *added]
+    attributes = {entry["AttributeName"]: entry for entry in recorded["AttributeDefinitions"]}
+    for entry in maintained["AttributeDefinitions"]:
+        attributes.setdefault(entry["AttributeName"], entry)
+    key_names = {key["AttributeName"] for index in [definition, *definition["GlobalSecondaryIndexes"]] for key in index["KeySchema"]}
+    definition["AttributeDefinitions"] = [entry for name, entry in attributes.items() if name in key_names]
+    return definition
+
+
+def restore_part(client, table_name: str, path: Path, part: str, progress: RestoreProgress, typed: bool = True) -> WriteStats:
+    stats = WriteStats(table_name=table_name)
+    started = time.perf_counter()
+    skip = progress.rows_done(part)
+    written = skip
+
+    for rows in iter_part_rows(path, batch_size=CHECKPOINT_ROWS, typed=typed):
+        if skip >= len(rows):
+            skip -= len(rows)
+            continue
+        rows, skip = rows[skip:], 0
+
+        # Typed rows are already attribute values; version 1 rows are plain and go through the serializer.
+        items = iter(rows) if typed else ({key: serializer.serialize(value) for key, value in row.items()} for row in rows)
+        for chunk in chunked(items):
+            write_batch(client, table_name, chunk, stats)
+            stats.items += len(chunk)
+            stats.batches += 1
+        written += len(rows)
+        progress.record(part, written)
+
+    progress.record(part, written, done=True)
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def restore_tables(
+    client,
+    directory: Path,
+    manifest: dict[str, Any],
+    table_names: list[str],
+    progress: RestoreProgress,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> list[WriteStats]:
+    maintained = {table["TableName"]: table for table in TABLES}
+    with ThreadPoolExecutor(max_workers=max(1, len(table_names))) as pool:
+        list(
+            pool.map(
+                lambda name: ensure_table(client, restore_definition(manifest["tables"][name]["definition"], maintained.get(name))),
+                table_names,
+            )
+        )
+    for name in table_names:
+        table = manifest["tables"][name]
+        # Version 1 manifests did not record TTL; use what create_tables.py configures.
+        attribute = table["time_to_live"] if "time_to_live" in table else TIME_TO_LIVE.get(name)
+        if attribute:
+            ensure_time_to_live(client, name, attribute)
+    typed = manifest["version"] >= 2
+
+    tasks = []
+    for name in table_names:
+        for path in part_paths(directory, name):
+            part = str(path.relative_to(directory))
+            if progress.is_done(part):
+                print(f"Skipping restored part: {part}")
+                continue
+            tasks.append((name, path, part))
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tasks) or 1))) as pool:
+        futures = [pool.submit(restore_part, client, name, path, part, progress, typed) for name, path, part in tasks]
+        part_stats = [future.result() for future in futures]
+
+    results = []
+    for name in table_names:
+        stats = WriteStats(table_name=name)
+        for part in part_stats:
+            if part.table_name == name:
+                stats.items += part.items
+                stats.batches += part.batches
+                stats.retries += part.retries
+                stats.seconds = max(stats.seconds, part.seconds)
+        results.append(stats)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Restore USA Pawn DynamoDB tables from an export_tables.py snapshot")
+    parser.add_argument("snapshot", type=Path, help="Snapshot directory containing manifest.json")
+    parser.add_argument("--tables", default=None, help="Comma-separated tables to restore (default: all in the snapshot)")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("SEED_MAX_WORKERS", str(DEFAULT_MAX_WORKERS))), help="Concurrent part writers")
+    parser.add_argument("--progress", type=Path, default=None, help=f"Progress file (default <snapshot>/{PROGRESS_NAME})")
+    parser.add_argument("--restart", action="store_true", help="Ignore existing progress and write every part again")
+    args = parser.parse_args()
+
+    manifest = read_manifest(args.snapshot)
+    tables = [name.strip() for name in args.tables.split(",") if name.strip()] if args.tables else list(manifest["tables"])
+    unknown = [name for name in tables if name not in manifest["tables"]]
+    if unknown:
+        parser.error(f"Tables not in snapshot: {', '.join(unknown)}")
+
+    if os.getenv("DYNAMODB_DRY_RUN", "false").lower() == "true":
+        print("Dry-run mode enabled. No writes performed.")
+        for name in tables:
+            print(f"{name}: {manifest['tables'][name]['rows']} rows in {len(part_paths(args.snapshot, name))} parts")
+        return 0
+
+    progress = RestoreProgress(args.progress or args.snapshot / PROGRESS_NAME, manifest["created_at"], restart=args.restart)
+
+    try:
+        client = get_client()
+        print(f"Restoring {args.snapshot} into {describe_backend()}")
+        results = restore_tables(client, args.snapshot, manifest, tables, progress, args.workers)
+    except (NoCredentialsError, PartialCredentialsError):
+        print("AWS credentials unavailable. Nothing restored.")
+        return 1
+    except (ClientError, BotoCoreError, WaiterError, RuntimeError, TimeoutError) as error:
+        print(f"Restore interrupted: {error}")
+        print("Re-run the same command to resume from the progress file.")
+        return 1
+
+    print("Restore complete.")
+    print_write_stats(results)
+    mismatched = []
+    for name in tables:
+        restored = sum(entry["rows"] for part, entry in progress.parts.items() if part.startswith(f"{name}/"))
+        if restored != manifest["tables"][name]["rows"]:
+            mismatched.append(f"{name}: {restored} restored, {manifest['tables'][name]['rows']} in manifest")
+    for line in mismatched:
+        print(f"Row count mismatch - {line}")
+    return 1 if mismatched else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
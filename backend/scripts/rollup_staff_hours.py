@@ -0,0 +1,367 @@
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+import numpy as np
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError, PartialCredentialsError
+
+from build_dashboard_metrics import scan_table
+from bulk_writer import MAX_RETRIES, THROTTLE_ERROR_CODES, backoff_delay
+from dynamodb_client import describe_backend, get_client
+from staff_directory import STAFF_TABLE, staff_key
+
+
+STAFF_LOG_TABLE = "USA_Pawn_Staff_Log"
+STAFF_LOG_INDEX = "staff_key-timestamp-index"
+HOURS_TABLE = "USA_Pawn_Staff_Hours"
+STATE_PERIOD = "state"
+LOG_ATTRIBUTES = ["log_id", "staff_name", "event_type", "timestamp"]
+# Re-read a little before the watermark so entries written with a slightly older timestamp are not missed.
+# The state item remembers the log ids inside that window, and day rollups remember which clock-outs they
+# include, so re-reading is harmless.
+WATERMARK_OVERLAP = timedelta(minutes=15)
+DEFAULT_SEGMENTS = 4
+BATCH_GET_SIZE = 100
+
+serializer = TypeSerializer()
+deserializer = TypeDeserializer()
+
+
+def to_item(record: dict[str, Any]) -> dict[str, Any]:
+    return {key: serializer.serialize(value) for key, value in record.items() if value is not None}
+
+
+def from_item(item: dict[str, Any]) -> dict[str, Any]:
+    return {key: deserializer.deserialize(value) for key, value in item.items()}
+
+
+def parse_time(value: str) -> float:
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def week_start(day: str) -> str:
+    parsed = date.fromisoformat(day)
+    return (parsed - timedelta(days=parsed.weekday())).isoformat()
+
+
+# Reading.
+
+
+def load_state(client) -> dict[str, Any] | None:
+    item = client.get_item(TableName=HOURS_TABLE, Key={"period": {"S": STATE_PERIOD}}).get("Item")
+    return from_item(item) if item else None
+
+
+def roster_names(client) -> set[str]:
+    names: set[str] = set()
+    params: dict[str, Any] = {"TableName": STAFF_TABLE, "ProjectionExpression": "#name", "ExpressionAttributeNames": {"#name": "name"}}
+    while True:
+        try:
+            response = client.scan(**params)
+        except ClientError as error:
+            if error.response.get("Error", {}).get("Code", "") == "ResourceNotFoundException":
+                return names
+            raise
+        names.update(item["name"]["S"] for item in response.get("Items", []) if "name" in item)
+        if not response.get("LastEvaluatedKey"):
+            return names
+        params["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def query_staff_since(client, staff_name: str, since: str) -> list[dict[str, Any]]:
+    params: dict[str, Any] = {
+        "TableName": STAFF_LOG_TABLE,
+        "IndexName": STAFF_LOG_INDEX,
+        "KeyConditionExpression": "#key = :key AND #ts > :since",
+        "ExpressionAttributeNames": {"#key": "staff_key", "#name": "staff_name", "#ts": "timestamp", "#id": "log_id", "#type": "event_type"},
+        "ExpressionAttributeValues": {":key": {"S": staff_key(staff_name)}, ":since": {"S": since}},
+        "ProjectionExpression": "#id, #name, #type, #ts",
+    }
+    rows: list[dict[str, Any]] = []
+    attempt = 0
+    while True:
+        try:
+            response = client.query(**params)
+        except ClientError as error:
+            code = error.response.get("Error", {}).get("Code", "")
+            if code not in THROTTLE_ERROR_CODES or attempt >= MAX_RETRIES:
+                raise
+            attempt += 1
+            time.sleep(backoff_delay(attempt))
+            continue
+        rows.extend(from_item(item) for item in response.get("Items", []))
+        if not response.get("LastEvaluatedKey"):
+            return rows
+        params["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def read_new_entries(client, names: set[str], since: str, workers: int) -> list[dict[str, Any]]:
+    # Spellings of one name share a staff_key, so query each key once.
+    names = set({staff_key(name): name for name in names}.values())
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(names) or 1))) as pool:
+        return [row for rows in pool.map(lambda name: query_staff_since(client, name, since), sorted(names)) for row in rows]
+
+
+def batch_get(client, periods: list[str]) -> dict[str, dict[str, Any]]:
+    found: dict[str, dict[str, Any]] = {}
+    for start in range(0, len(periods), BATCH_GET_SIZE):
+        request = {HOURS_TABLE: {"Keys": [{"period": {"S": period}} for period in periods[start:start + BATCH_GET_SIZE]]}}
+        attempt = 0
+        while request:
+            response = client.batch_get_item(RequestItems=request)
+            for item in response.get("Responses", {}).get(HOURS_TABLE, []):
+                record = from_item(item)
+                found[record["period"]] = record
+            request = response.get("UnprocessedKeys") or {}
+            if request:
+                attempt += 1
+                time.sleep(backoff_delay(attempt))
+    return found
+
+
+# Pairing.
+
+
+def pair_punches(rows: list[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Pair clock-ins with clock-outs the way pairShiftData does in the staff-log route:
+    per staff member in time order, an "out" closes the shift only when the entry right
+    before it is an "in"; a repeated "in" replaces the open one.
+    """
+    if not rows:
+        return {"shifts": [], "orphans": [], "open": {}}
+
+    keys = np.array([staff_key(row["staff_name"]) for row in rows])
+    times = np.array([parse_time(str(row["timestamp"])) for row in rows], dtype=np.float64)
+    is_in = np.array([row.get("event_type") in ("in", "clock_in") for row in rows], dtype=bool)
+
+    _, staff_codes = np.unique(keys, return_inverse=True)
+    order = np.lexsort((times, staff_codes))
+    staff_sorted = staff_codes[order]
+    in_sorted = is_in[order]
+
+    same_staff = staff_sorted[1:] == staff_sorted[:-1]
+    paired = same_staff & in_sorted[:-1] & ~in_sorted[1:]
+    out_positions = np.nonzero(paired)[0] + 1
+    in_positions = out_positions - 1
+
+    durations = np.maximum(0, np.rint(times[order][out_positions] - times[order][in_positions])).astype(np.int64)
+    closes = np.concatenate(([False], paired))
+    orphan_positions = np.nonzero(~in_sorted & ~closes)[0]
+    last_for_staff = np.concatenate((staff_sorted[1:] != staff_sorted[:-1], [True]))
+    open_positions = np.nonzero(last_for_staff & in_sorted)[0]
+
+    shifts = [
+        {
+            "key": keys[order[start]],
+            "name": rows[order[start]]["staff_name"],
+            "day": str(rows[order[start]]["timestamp"])[:10],
+            "out_id": rows[order[end]]["log_id"],
+            "seconds": int(seconds),
+        }
+        for start, end, seconds in zip(in_positions, out_positions, durations)
+    ]
+    orphans = [
+        {"key": keys[order[position]], "day": str(rows[order[position]]["timestamp"])[:10], "out_id": rows[order[position]]["log_id"]}
+        for position in orphan_positions
+    ]
+    open_shifts = {
+        keys[order[position]]: {key: rows[order[position]][key] for key in LOG_ATTRIBUTES} for position in open_positions
+    }
+    return {"shifts": shifts, "orphans": orphans, "open": open_shifts}
+
+
+# Rollups.
+
+
+def empty_day(day: str) -> dict[str, Any]:
+    return {"period": f"day:{day}", "period_type": "day", "start": day, "staff": {}, "shift_ids": [], "orphan_ids": []}
+
+
+def apply_shifts(days: dict[str, dict[str, Any]], paired: dict[str, Any]) -> set[str]:
+    """Fold paired shifts into day rollups; returns the days that changed."""
+    changed: set[str] = set()
+    seen = {day: set(record["shift_ids"]) | set(record["orphan_ids"]) for day, record in days.items()}
+
+    for shift in paired["shifts"]:
+        record = days.setdefault(shift["day"], empty_day(shift["day"]))
+        ids = seen.setdefault(shift["day"], set())
+        if shift["out_id"] in ids:
+            continue
+        ids.add(shift["out_id"])
+        staff = record["staff"].setdefault(shift["key"], {"name": shift["name"], "seconds": 0, "shifts": 0})
+        staff["name"] = shift["name"]
+        staff["seconds"] = int(staff["seconds"]) + shift["seconds"]
+        staff["shifts"] = int(staff["shifts"]) + 1
+        record["shift_ids"].append(shift["out_id"])
+        changed.add(shift["day"])
+
+    for orphan in paired["orphans"]:
+        record = days.setdefault(orphan["day"], empty_day(orphan["day"]))
+        ids = seen.setdefault(orphan["day"], set())
+        if orphan["out_id"] in ids:
+            continue
+        ids.add(orphan["out_id"])
+        record["orphan_ids"].append(orphan["out_id"])
+        changed.add(orphan["day"])
+
+    for day in changed:
+        record = days[day]
+        record["total_seconds"] = sum(int(staff["seconds"]) for staff in record["staff"].values())
+        record["shift_count"] = len(record["shift_ids"])
+        record["orphan_clock_outs"] = len(record["orphan_ids"])
+    return changed
+
+
+def build_week(start: str, days: dict[str, dict[str, Any]]) -> dict[str, Any]:
+    dates = [(date.fromisoformat(start) + timedelta(days=offset)).isoformat() for offset in range(7)]
+    present = [days[day] for day in dates if day in days]
+    keys = sorted({key for record in present for key in record["staff"]})
+
+    # One row per staff member, one column per weekday.
+    seconds = np.zeros((len(keys), 7), dtype=np.int64)
+    shifts = np.zeros((len(keys), 7), dtype=np.int64)
+    names = {}
+    for column, day in enumerate(dates):
+        for row, key in enumerate(keys):
+            staff = days.get(day, {}).get("staff", {}).get(key)
+            if staff:
+                seconds[row, column] = int(staff["seconds"])
+                shifts[row, column] = int(staff["shifts"])
+                names[key] = staff["name"]
+
+    return {
+        "period": f"week:{start}",
+        "period_type": "week",
+        "start": start,
+        "days": dates,
+        "staff": {
+            key: {
+                "name": names[key],
+                "seconds": int(seconds[row].sum()),
+                "shifts": int(shifts[row].sum()),
+                "days_worked": int(np.count_nonzero(seconds[row])),
+                "daily_seconds": [int(value) for value in seconds[row]],
+            }
+            for row, key in enumerate(keys)
+        },
+        "total_seconds": int(seconds.sum()),
+        "shift_count": int(shifts.sum()),
+        "orphan_clock_outs": sum(int(record.get("orphan_clock_outs", 0)) for record in present),
+    }
+
+
+def put_records(client, records: list[dict[str, Any]], workers: int) -> None:
+    updated_at = datetime.now(timezone.utc).isoformat()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        list(pool.map(lambda record: client.put_item(TableName=HOURS_TABLE, Item=to_item({**record, "updated_at": updated_at})), records))
+
+
+def run_rollup(client, full: bool = False, segments: int = DEFAULT_SEGMENTS, workers: int = 8, dry_run: bool = False) -> dict[str, Any]:
+    state = None if full else load_state(client)
+    started = time.perf_counter()
+
+    if state is None:
+        rows = scan_table(client, STAFF_LOG_TABLE, LOG_ATTRIBUTES, segments)
+        mode = "full"
+    else:
+        since = (datetime.fromisoformat(state["watermark"]) - WATERMARK_OVERLAP).isoformat()
+        names = set(state.get("known_staff", [])) | roster_names(client)
+        rows = read_new_entries(client, names, since, workers)
+        mode = f"incremental since {since}"
+
+    # Shifts still open at the last run are replayed so they can close against new clock-outs;
+    # entries the last run already handled inside the overlap window are dropped.
+    carried = list((state or {}).get("open_shifts", {}).values())
+    seen_ids = set((state or {}).get("recent_ids", [])) | {row["log_id"] for row in carried}
+    entries = list(carried)
+    for row in rows:
+        if row.get("log_id") in seen_ids or not row.get("timestamp") or not row.get("staff_name"):
+            continue
+        seen_ids.add(row["log_id"])
+        entries.append(row)
+
+    paired = pair_punches(entries)
+    touched_days = sorted({shift["day"] for shift in paired["shifts"]} | {orphan["day"] for orphan in paired["orphans"]})
+    existing = {} if full else batch_get(client, [f"day:{day}" for day in touched_days])
+    days = {record["start"]: record for record in existing.values()}
+    changed = apply_shifts(days, paired)
+
+    weeks = sorted({week_start(day) for day in changed})
+    week_days = dict(days)
+    missing = [f"day:{day}" for start in weeks for day in build_week(start, {})["days"] if day not in week_days]
+    if missing and not full:
+        week_days.update({record["start"]: record for record in batch_get(client, missing).values()})
+    week_records = [build_week(start, week_days) for start in weeks]
+
+    watermark = max((str(row["timestamp"]) for row in entries), default=(state or {}).get("watermark"))
+    overlap_start = parse_time(watermark) - WATERMARK_OVERLAP.total_seconds() if watermark else 0.0
+    new_state = {
+        "period": STATE_PERIOD,
+        "period_type": "state",
+        "watermark": watermark or datetime.now(timezone.utc).isoformat(),
+        "open_shifts": paired["open"],
+        "recent_ids": sorted(
+            str(row["log_id"]) for row in carried + rows if row.get("timestamp") and parse_time(str(row["timestamp"])) > overlap_start
+        ),
+        "known_staff": sorted(set((state or {}).get("known_staff", [])) | {str(row["staff_name"]) for row in entries}),
+    }
+
+    summary = {
+        "mode": mode,
+        "entries": len(rows),
+        "shifts": len(paired["shifts"]),
+        "orphans": len(paired["orphans"]),
+        "open": len(paired["open"]),
+        "days": len(changed),
+        "weeks": len(week_records),
+        "seconds": 0.0,
+    }
+    if not dry_run:
+        # Days first, state last: a crash before the state write only means the next run re-reads
+        # entries the day rollups already include, which apply_shifts skips.
+        put_records(client, [days[day] for day in sorted(changed)], workers)
+        put_records(client, week_records, workers)
+        put_records(client, [new_state], 1)
+    summary["seconds"] = time.perf_counter() - started
+    return summary
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Roll staff-log punches up into daily and weekly hours")
+    parser.add_argument("--full", action="store_true", help="Ignore the watermark and rebuild from the whole staff log")
+    parser.add_argument("--segments", type=int, default=DEFAULT_SEGMENTS, help="Parallel scan segments for --full")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent queries and writes")
+    args = parser.parse_args()
+
+    dry_run = os.getenv("DYNAMODB_DRY_RUN", "false").lower() == "true"
+
+    try:
+        client = get_client()
+        summary = run_rollup(client, full=args.full, segments=max(1, args.segments), workers=args.workers, dry_run=dry_run)
+    except (NoCredentialsError, PartialCredentialsError):
+        print("AWS credentials unavailable. Nothing rolled up.")
+        return 1
+    except (ClientError, BotoCoreError) as error:
+        print(f"Staff hours rollup failed: {error}")
+        return 1
+
+    print(f"Source: {describe_backend()} ({summary['mode']})")
+    print(
+        f"Entries read: {summary['entries']}, shifts: {summary['shifts']}, unmatched clock-outs: {summary['orphans']}, "
+        f"open shifts: {summary['open']}"
+    )
+    verb = "Would write" if dry_run else "Wrote"
+    print(f"{verb} {summary['days']} day and {summary['weeks']} week rollups in {summary['seconds']:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
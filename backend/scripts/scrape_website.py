@@ -1,12 +1,21 @@
+import argparse
 import base64
+import hashlib
 import json
+import mimetypes
 import re
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
+from datetime import datetime, timezone
 from pathlib import Path
 from urllib.parse import urljoin, urlparse
 
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree
+from requests.adapters import HTTPAdapter
 
 
 BASE_URL = "https://usapawnfl.com"
@@ -26,6 +35,19 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 DATA_DIR = PROJECT_ROOT / "backend" / "data"
 IMAGES_DIR = PROJECT_ROOT / "frontend" / "public" / "images"
 OUTPUT_JSON = DATA_DIR / "scraped_data.json"
+MANIFEST_JSON = DATA_DIR / "fetch_manifest.json"
+MANIFEST_VERSION = 1
+IMAGE_INDEX_JSON = DATA_DIR / "image_manifest.json"
+IMAGE_CHUNK_SIZE = 64 * 1024
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".avif", ".svg"}
+
+PHONE_PATTERN = re.compile(r"(\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})")
+DEFAULT_PHONE = "(904) 744-5611"
+# BeautifulSoup's get_text() leaves these out, and so does PageExtractor.
+SKIPPED_TEXT_TAGS = {"script", "style", "template"}
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_PER_HOST_RATE = 4.0
 
 DEFAULT_CATEGORIES = [
     "Jewelry",
@@ -48,38 +70,274 @@ class FetchResult:
     ok: bool
     html: str = ""
     status_code: int = 0
+    unchanged: bool = False
+
+
+class FetchManifest:
+    def __init__(self, path: Path = MANIFEST_JSON, load: bool = True):
+        self.path = path
+        self.entries: dict[str, dict] = {}
+        if load and path.exists():
+            try:
+                payload = json.loads(path.read_text(encoding="utf-8"))
+                if payload.get("version") == MANIFEST_VERSION:
+                    self.entries = payload.get("entries", {})
+            except (OSError, json.JSONDecodeError):
+                self.entries = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.not_modified = 0
+        self.unchanged = 0
+        self.parses_skipped = 0
+        self.bytes_saved = 0
+
+    def entry(self, url: str) -> dict:
+        with self._lock:
+            return dict(self.entries.get(url, {}))
+
+    def conditional_headers(self, url: str, require: str | None = None) -> dict[str, str]:
+        entry = self.entry(url)
+        if require and require not in entry:
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def count_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def mark_not_modified(self, url: str) -> dict:
+        with self._lock:
+            entry = self.entries.get(url, {})
+            self.not_modified += 1
+            self.bytes_saved += int(entry.get("size", 0))
+            return dict(entry)
+
+    def record(self, url: str, response: requests.Response, digest: str, size: int) -> bool:
+        with self._lock:
+            previous = self.entries.get(url, {})
+            unchanged = previous.get("sha256") == digest
+            entry = {key: value for key, value in previous.items() if unchanged and key == "extraction"}
+            entry.update(
+                {
+                    "etag": response.headers.get("ETag", ""),
+                    "last_modified": response.headers.get("Last-Modified", ""),
+                    "sha256": digest,
+                    "size": size,
+                    "status_code": response.status_code,
+                    "fetched_at": datetime.now(timezone.utc).isoformat(),
+                }
+            )
+            self.entries[url] = entry
+            if unchanged:
+                self.unchanged += 1
+            return unchanged
+
+    def cached_extraction(self, url: str) -> dict | None:
+        with self._lock:
+            extraction = self.entries.get(url, {}).get("extraction")
+            if extraction is not None:
+                self.parses_skipped += 1
+            return extraction
+
+    def store_extraction(self, url: str, extraction: dict) -> None:
+        with self._lock:
+            if url in self.entries:
+                self.entries[url]["extraction"] = extraction
+
+    def save(self) -> None:
+        with self._lock:
+            payload = {"version": MANIFEST_VERSION, "entries": self.entries}
+        temp_path = self.path.with_suffix(".json.tmp")
+        temp_path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+        temp_path.replace(self.path)
+
+    def summary(self) -> str:
+        return (
+            f"{self.requests} requests, {self.not_modified} not modified, {self.unchanged} unchanged, "
+            f"{self.parses_skipped} parses skipped, {self.bytes_saved} bytes saved"
+        )
 
 
-def fetch_page(url: str, timeout: int = 15) -> FetchResult:
+@dataclass
+class StoredImage:
+    name: str
+    digest: str
+    size: int
+
+
+class ImageStore:
+    def __init__(self, root: Path = IMAGES_DIR, index_path: Path = IMAGE_INDEX_JSON):
+        self.root = root
+        self.index_path = index_path
+        self.sources: dict[str, str] = {}
+        if index_path.exists():
+            try:
+                payload = json.loads(index_path.read_text(encoding="utf-8"))
+                if payload.get("version") == MANIFEST_VERSION:
+                    self.sources = payload.get("sources", {})
+            except (OSError, json.JSONDecodeError):
+                self.sources = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, url: str) -> str | None:
+        with self._lock:
+            name = self.sources.get(url)
+        return name if name and (self.root / name).exists() else None
+
+    def extension_for(self, url: str, content_type: str) -> str:
+        suffix = Path(urlparse(url).path).suffix.lower()
+        if suffix in IMAGE_EXTENSIONS:
+            return suffix
+        guessed = mimetypes.guess_extension(content_type.split(";")[0].strip()) if content_type else None
+        return guessed if guessed in IMAGE_EXTENSIONS else ".jpg"
+
+    def put_stream(self, url: str, response: requests.Response) -> StoredImage | None:
+        digest = hashlib.sha256()
+        size = 0
+        with tempfile.NamedTemporaryFile(dir=self.root, prefix=".incoming-", delete=False) as handle:
+            temp_path = Path(handle.name)
+            try:
+                for chunk in response.iter_content(chunk_size=IMAGE_CHUNK_SIZE):
+                    if chunk:
+                        digest.update(chunk)
+                        handle.write(chunk)
+                        size += len(chunk)
+            except BaseException:
+                # A dropped connection mid-download must not leave a partial .incoming-* file behind.
+                handle.close()
+                temp_path.unlink(missing_ok=True)
+                raise
+
+        if size == 0:
+            temp_path.unlink(missing_ok=True)
+            return None
+
+        hex_digest = digest.hexdigest()
+        name = f"{hex_digest}{self.extension_for(url, response.headers.get('Content-Type', ''))}"
+        destination = self.root / name
+        if destination.exists():
+            temp_path.unlink(missing_ok=True)
+        else:
+            temp_path.replace(destination)
+
+        with self._lock:
+            self.sources[url] = name
+        return StoredImage(name=name, digest=hex_digest, size=size)
+
+    def save(self) -> None:
+        with self._lock:
+            payload = {"version": MANIFEST_VERSION, "sources": dict(sorted(self.sources.items()))}
+        temp_path = self.index_path.with_suffix(".json.tmp")
+        temp_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        temp_path.replace(self.index_path)
+
+
+class HostRateLimiter:
+    def __init__(self, requests_per_second: float):
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot: dict[str, float] = {}
+
+    def wait(self, url: str) -> None:
+        if not self.interval:
+            return
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class FetchEngine:
+    def __init__(
+        self,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        per_host_rate: float = DEFAULT_PER_HOST_RATE,
+        manifest: FetchManifest | None = None,
+    ):
+        self.concurrency = max(1, concurrency)
+        self.manifest = manifest
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.concurrency, pool_maxsize=self.concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.limiter = HostRateLimiter(per_host_rate)
+        self.pool = ThreadPoolExecutor(max_workers=self.concurrency)
+
+    def get(self, url: str, timeout: int = 15, **kwargs) -> requests.Response:
+        self.limiter.wait(url)
+        return self.session.get(url, timeout=timeout, **kwargs)
+
+    def submit(self, fn, *args) -> Future:
+        return self.pool.submit(fn, *args)
+
+    def close(self) -> None:
+        self.pool.shutdown(wait=True)
+        self.session.close()
+
+    def __enter__(self) -> "FetchEngine":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def fetch_page(url: str, timeout: int = 15, engine: FetchEngine | None = None) -> FetchResult:
+    manifest = engine.manifest if engine else None
+    # Only revalidate pages whose extraction we can reuse on a 304.
+    headers = manifest.conditional_headers(url, require="extraction") if manifest else {}
     try:
-        response = requests.get(url, timeout=timeout)
-        return FetchResult(url=url, ok=response.ok, html=response.text if response.ok else "", status_code=response.status_code)
+        response = engine.get(url, timeout=timeout, headers=headers) if engine else requests.get(url, timeout=timeout)
+        if manifest is None:
+            return FetchResult(url=url, ok=response.ok, html=response.text if response.ok else "", status_code=response.status_code)
+
+        manifest.count_request()
+        if response.status_code == 304:
+            entry = manifest.mark_not_modified(url)
+            return FetchResult(url=url, ok=True, status_code=int(entry.get("status_code", 200)), unchanged=True)
+
+        result = FetchResult(url=url, ok=response.ok, html=response.text if response.ok else "", status_code=response.status_code)
+        if response.ok:
+            content = response.content
+            result.unchanged = manifest.record(url, response, hashlib.sha256(content).hexdigest(), len(content))
+        return result
     except requests.RequestException:
         return FetchResult(url=url, ok=False, html="", status_code=0)
 
 
-def sanitize_filename(url_or_path: str) -> str:
-    parsed = urlparse(url_or_path)
-    name = Path(parsed.path).name if parsed.path else ""
-    if not name:
-        name = re.sub(r"[^a-zA-Z0-9]+", "-", url_or_path).strip("-") + ".jpg"
-    return name
-
-
-def download_image(image_url: str) -> str:
+def download_image(image_url: str, store: ImageStore, engine: FetchEngine | None = None) -> str:
     absolute_url = urljoin(BASE_URL, image_url)
-    filename = sanitize_filename(absolute_url)
-    destination = IMAGES_DIR / filename
+    stored_name = store.lookup(absolute_url)
+    manifest = engine.manifest if engine else None
 
-    if destination.exists():
-        return filename
+    if stored_name and manifest is None:
+        return stored_name
+
+    headers = manifest.conditional_headers(absolute_url) if manifest and stored_name else {}
+    getter = engine.get if engine else requests.get
 
     try:
-        response = requests.get(absolute_url, timeout=15)
-        if response.ok and response.content:
-            destination.write_bytes(response.content)
-            return filename
-    except requests.RequestException:
+        with getter(absolute_url, timeout=15, headers=headers, stream=True) as response:
+            if manifest:
+                manifest.count_request()
+            if response.status_code == 304 and manifest and stored_name:
+                manifest.mark_not_modified(absolute_url)
+                return stored_name
+            if response.ok:
+                stored = store.put_stream(absolute_url, response)
+                if stored is None:
+                    return ""
+                if manifest:
+                    manifest.record(absolute_url, response, stored.digest, stored.size)
+                return stored.name
+    except (requests.RequestException, OSError):
         pass
 
     return ""
@@ -122,60 +380,169 @@ def create_placeholder_images() -> dict:
     }
 
 
-def extract_phone(text: str) -> str:
-    match = re.search(r"(\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})", text)
-    return match.group(1) if match else "(904) 744-5611"
-
-
-def extract_youtube_links(soup: BeautifulSoup) -> list[str]:
-    links = []
-    for iframe in soup.find_all("iframe"):
-        src = iframe.get("src", "")
-        if "youtube.com" in src or "youtu.be" in src:
-            links.append(src)
-    for anchor in soup.find_all("a", href=True):
-        href = anchor["href"]
-        if "youtube.com" in href or "youtu.be" in href:
-            links.append(href)
-    return sorted(set(links))
-
-
-def scrape() -> dict:
+def is_youtube_link(url: str) -> bool:
+    return "youtube.com" in url or "youtu.be" in url
+
+
+class PageExtractor:
+    """
+    lxml parser target that collects a page's text, image sources, YouTube links
+    and phone numbers from the parse events in one pass, without building a
+    document tree. Text matches BeautifulSoup's get_text(" ", strip=True).
+    """
+
+    def __init__(self):
+        self.strings: list[str] = []
+        self.pending: list[str] = []
+        self.skip_depth = 0
+        self.images: list[str] = []
+        self.youtube: set[str] = set()
+        self.tel_links: list[str] = []
+
+    def flush(self) -> None:
+        # Adjacent data events form one string; any tag or comment ends it.
+        if self.pending:
+            text = "".join(self.pending).strip()
+            if text:
+                self.strings.append(text)
+            self.pending = []
+
+    def start(self, tag: str, attrib) -> None:
+        self.flush()
+        if tag in SKIPPED_TEXT_TAGS:
+            self.skip_depth += 1
+        elif tag == "img":
+            src = attrib.get("src")
+            if src:
+                self.images.append(src)
+        elif tag == "iframe":
+            src = attrib.get("src", "")
+            if is_youtube_link(src):
+                self.youtube.add(src)
+        elif tag == "a":
+            href = attrib.get("href")
+            if href is None:
+                return
+            if is_youtube_link(href):
+                self.youtube.add(href)
+            elif href.lower().startswith("tel:"):
+                self.tel_links.append(href[4:].strip())
+
+    def end(self, tag: str) -> None:
+        self.flush()
+        if tag in SKIPPED_TEXT_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+
+    def data(self, data: str) -> None:
+        if not self.skip_depth:
+            self.pending.append(data)
+
+    def comment(self, text: str) -> None:
+        self.flush()
+
+    def close(self) -> dict:
+        self.flush()
+        text = " ".join(self.strings)
+        phones = PHONE_PATTERN.findall(text) + [number for number in self.tel_links if number]
+        return {
+            "text": text,
+            "youtube": sorted(self.youtube),
+            "images": self.images,
+            "phones": list(dict.fromkeys(phones)),
+        }
+
+
+def extract_page(html: str) -> dict:
+    if not html.strip():
+        return {"text": "", "youtube": [], "images": [], "phones": []}
+    parser = etree.HTMLParser(target=PageExtractor())
+    parser.feed(html)
+    return parser.close()
+
+
+def page_phones(extraction: dict) -> list[str]:
+    # Extractions cached by older runs predate the phones list.
+    if "phones" in extraction:
+        return extraction["phones"]
+    return PHONE_PATTERN.findall(extraction["text"])
+
+
+def scrape(
+    concurrency: int = DEFAULT_CONCURRENCY,
+    per_host_rate: float = DEFAULT_PER_HOST_RATE,
+    timings: dict[str, float] | None = None,
+    manifest: FetchManifest | None = None,
+    save_html: Path | None = None,
+) -> dict:
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     IMAGES_DIR.mkdir(parents=True, exist_ok=True)
+    timings = timings if timings is not None else {}
+    manifest = manifest if manifest is not None else FetchManifest()
+    store = ImageStore()
+    started = time.perf_counter()
 
     pages = {}
     reachable = False
-    combined_text = []
+    phones: dict[str, list[str]] = {}
     youtube_links = []
     downloaded_images = []
 
-    for path in PAGE_CANDIDATES:
-        full_url = urljoin(BASE_URL, path)
-        result = fetch_page(full_url)
-        pages[path] = {"url": full_url, "status_code": result.status_code, "ok": result.ok}
+    with FetchEngine(concurrency=concurrency, per_host_rate=per_host_rate, manifest=manifest) as engine:
+        page_futures = {
+            engine.submit(fetch_page, urljoin(BASE_URL, path), 15, engine): path for path in PAGE_CANDIDATES
+        }
+        image_futures: list[Future] = []
+        queued_images: set[str] = set()
+
+        # Parse pages as they land and queue their images right away, so image
+        # downloads overlap with the remaining page fetches.
+        for future in as_completed(page_futures):
+            path = page_futures[future]
+            result = future.result()
+            pages[path] = {"url": result.url, "status_code": result.status_code, "ok": result.ok}
+
+            if not result.ok:
+                continue
 
-        if not result.ok:
-            continue
+            reachable = True
+            if save_html is not None and result.html:
+                save_html.mkdir(parents=True, exist_ok=True)
+                (save_html / f"{path.strip('/') or 'index'}.html").write_text(result.html, encoding="utf-8")
 
-        reachable = True
-        soup = BeautifulSoup(result.html, "lxml")
-        combined_text.append(soup.get_text(" ", strip=True))
-        youtube_links.extend(extract_youtube_links(soup))
+            extraction = manifest.cached_extraction(result.url) if result.unchanged else None
+            if extraction is None:
+                extraction = extract_page(result.html)
+                manifest.store_extraction(result.url, extraction)
 
-        for image in soup.find_all("img"):
-            src = image.get("src")
-            if not src:
-                continue
-            downloaded = download_image(src)
+            phones[path] = page_phones(extraction)
+            youtube_links.extend(extraction["youtube"])
+
+            for src in extraction["images"]:
+                absolute_url = urljoin(BASE_URL, src)
+                if absolute_url in queued_images:
+                    continue
+                queued_images.add(absolute_url)
+                image_futures.append(engine.submit(download_image, src, store, engine))
+
+        timings["pages"] = time.perf_counter() - started
+        images_started = time.perf_counter()
+
+        for future in image_futures:
+            downloaded = future.result()
             if downloaded:
                 downloaded_images.append(downloaded)
 
-    full_text = " ".join(combined_text)
-    phone = extract_phone(full_text)
+        timings["images"] = time.perf_counter() - images_started
+
+    pages = {path: pages[path] for path in PAGE_CANDIDATES}
+    placeholders_started = time.perf_counter()
+
+    # First number found, taking pages in PAGE_CANDIDATES order.
+    phone = next((number for path in PAGE_CANDIDATES for number in phones.get(path, [])), DEFAULT_PHONE)
 
     placeholders = create_placeholder_images()
     youtube_links = sorted(set(youtube_links))
+    timings["placeholders"] = time.perf_counter() - placeholders_started
 
     inventory = [
         {
@@ -283,17 +650,44 @@ def scrape() -> dict:
         "categories": DEFAULT_CATEGORIES,
     }
 
+    write_started = time.perf_counter()
     OUTPUT_JSON.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    manifest.save()
+    store.save()
+    timings["write"] = time.perf_counter() - write_started
+    timings["total"] = time.perf_counter() - started
     return data
 
 
 def main() -> None:
-    data = scrape()
+    parser = argparse.ArgumentParser(description="Scrape usapawnfl.com into scraped_data.json")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Max concurrent requests")
+    parser.add_argument(
+        "--per-host-rate",
+        type=float,
+        default=DEFAULT_PER_HOST_RATE,
+        help="Max requests per second to a single host (0 disables the limit)",
+    )
+    parser.add_argument("--full", action="store_true", help="Ignore the fetch manifest and re-download everything")
+    parser.add_argument("--save-html", type=Path, default=None, help="Also write each fetched page here (fixtures for benchmark_html_extraction.py)")
+    args = parser.parse_args()
+
+    timings: dict[str, float] = {}
+    manifest = FetchManifest(load=not args.full)
+    data = scrape(
+        concurrency=args.concurrency,
+        per_host_rate=args.per_host_rate,
+        timings=timings,
+        manifest=manifest,
+        save_html=args.save_html,
+    )
     print(f"Scrape status: {data['scrape_status']}")
     print(f"Pages checked: {len(data['pages_checked'])}")
     print(f"Inventory categories: {len(data['inventory'])}")
     print(f"Images directory: {IMAGES_DIR}")
     print(f"Output JSON: {OUTPUT_JSON}")
+    print(f"Fetch manifest: {manifest.summary()}")
+    print("Phase timings: " + ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in timings.items()))
 
 
 if __name__ == "__main__":
@@ -1,17 +1,28 @@
+import argparse
 import hashlib
 import json
 import os
-import uuid
+import re
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
-import boto3
 from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError, PartialCredentialsError
 
+from bulk_writer import DEFAULT_MAX_WORKERS, print_write_stats, write_tables
+from dynamodb_client import describe_backend, get_client
+from seed_diff import SeedSpec, apply_diff, plan_diff, print_apply_stats, print_diff
+from synthetic_data import SCALE_GENERATORS, scale_tables
+
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 SCRAPED_DATA_PATH = PROJECT_ROOT / "backend" / "data" / "scraped_data.json"
 
+SEED_SPECS = [
+    SeedSpec("USA_Pawn_Inventory", "item_id", preserved=("date_added",)),
+    SeedSpec("USA_Pawn_Store_Config", "config_key", volatile=("updated_at",)),
+    SeedSpec("USA_Pawn_Leads", "lead_id", volatile=("updated_at",), preserved=("created_at", "timestamp")),
+]
+
 
 def iso_now() -> str:
     return datetime.now(timezone.utc).isoformat()
@@ -28,10 +39,19 @@ def load_scraped_data() -> dict:
     return json.loads(SCRAPED_DATA_PATH.read_text(encoding="utf-8"))
 
 
+def inventory_item_id(category: str, seen: dict[str, int]) -> str:
+    # Keyed by category and its position among rows of that category, so a reseed
+    # addresses the same items even when their descriptions or prices change.
+    slug = re.sub(r"[^a-z0-9]+", "-", category.lower()).strip("-") or "item"
+    seen[slug] = seen.get(slug, 0) + 1
+    return f"seed-inv-{slug}" if seen[slug] == 1 else f"seed-inv-{slug}-{seen[slug]}"
+
+
 def build_inventory_items(data: dict) -> list[dict]:
     items = []
+    seen: dict[str, int] = {}
     for row in data.get("inventory", []):
-        item_id = str(uuid.uuid4())
+        item_id = inventory_item_id(row.get("category", "Unknown"), seen)
         brand = ", ".join(row.get("brands", [])) if isinstance(row.get("brands"), list) else ""
         items.append(
             {
@@ -51,7 +71,6 @@ def build_inventory_items(data: dict) -> list[dict]:
 def build_config_items(data: dict) -> list[dict]:
     token_secret = os.getenv("DAILY_QR_TOKEN_SECRET", "vault-dev-secret")
     daily_token = generate_daily_qr_token(token_secret)
-    staff_pins = [f"{n:04d}" for n in range(10000)]
 
     return [
         {
@@ -69,11 +88,6 @@ def build_config_items(data: dict) -> list[dict]:
             "value": {"S": json.dumps(data.get("specials", []))},
             "updated_at": {"S": iso_now()},
         },
-        {
-            "config_key": {"S": "staff_pins"},
-            "value": {"S": json.dumps(staff_pins)},
-            "updated_at": {"S": iso_now()},
-        },
         {
             "config_key": {"S": "daily_qr_tokens"},
             "value": {"S": json.dumps({"today": daily_token})},
@@ -198,51 +212,98 @@ def build_seed_lead_items() -> list[dict]:
     return items
 
 
-def seed() -> None:
+def seed(verbose: bool = False, overwrite_edited: bool = False) -> None:
     data = load_scraped_data()
-    inventory_items = build_inventory_items(data)
-    config_items = build_config_items(data)
-    lead_items = build_seed_lead_items()
+    tables = {
+        "USA_Pawn_Inventory": build_inventory_items(data),
+        "USA_Pawn_Store_Config": build_config_items(data),
+        "USA_Pawn_Leads": build_seed_lead_items(),
+    }
 
-    region = os.getenv("AWS_REGION", "us-east-1")
     dry_run = os.getenv("DYNAMODB_DRY_RUN", "false").lower() == "true"
-
-    if dry_run:
-        print("Dry-run mode enabled. No writes performed.")
-        print(f"Inventory items prepared: {len(inventory_items)}")
-        print(f"Config items prepared: {len(config_items)}")
-        print(f"Lead items prepared: {len(lead_items)}")
-        return
+    max_workers = int(os.getenv("SEED_MAX_WORKERS", str(DEFAULT_MAX_WORKERS)))
 
     try:
-        dynamodb = boto3.client("dynamodb", region_name=region)
-
-        for item in inventory_items:
-            dynamodb.put_item(TableName="USA_Pawn_Inventory", Item=item)
+        dynamodb = get_client()
+        # Reads only: compare against what is stored and write just the difference.
+        diffs = [plan_diff(dynamodb, spec, tables[spec.table_name], overwrite_edited) for spec in SEED_SPECS]
 
-        for item in config_items:
-            dynamodb.put_item(TableName="USA_Pawn_Store_Config", Item=item)
+        if dry_run:
+            print(f"Dry-run mode enabled. No writes performed. Diff against {describe_backend()}:")
+            print_diff(diffs, verbose=True)
+            print(f"Writes needed: {sum(diff.writes for diff in diffs)}")
+            return
 
-        for item in lead_items:
-            dynamodb.put_item(TableName="USA_Pawn_Leads", Item=item)
+        print_diff(diffs, verbose=verbose)
+        for diff in diffs:
+            apply_diff(dynamodb, diff, max_workers)
 
         print("Seed complete.")
-        print(f"Inserted inventory items: {len(inventory_items)}")
-        print(f"Inserted config items: {len(config_items)}")
-        print(f"Inserted lead items: {len(lead_items)}")
+        print_apply_stats(diffs)
 
     except (NoCredentialsError, PartialCredentialsError):
         print("AWS credentials unavailable. Running dry-run summary.")
-        print(f"Inventory items prepared: {len(inventory_items)}")
-        print(f"Config items prepared: {len(config_items)}")
-        print(f"Lead items prepared: {len(lead_items)}")
+        for table_name, items in tables.items():
+            print(f"{table_name}: {len(items)} items prepared")
     except (ClientError, BotoCoreError) as error:
-        print(f"DynamoDB write error: {error}")
+        print(f"DynamoDB error: {error}")
         print("Dry-run summary:")
-        print(f"Inventory items prepared: {len(inventory_items)}")
-        print(f"Config items prepared: {len(config_items)}")
-        print(f"Lead items prepared: {len(lead_items)}")
+        for table_name, items in tables.items():
+            print(f"{table_name}: {len(items)} items prepared")
+
+
+def seed_scale(count: int, seed_value: int, anchor: datetime | None = None, tables: list[str] | None = None) -> None:
+    dry_run = os.getenv("DYNAMODB_DRY_RUN", "false").lower() == "true"
+    max_workers = int(os.getenv("SEED_MAX_WORKERS", str(len(SCALE_GENERATORS))))
+    streams = scale_tables(count, seed_value, anchor=anchor, tables=tables)
+
+    if dry_run:
+        print("Dry-run mode enabled. No writes performed.")
+        for table_name, items in streams.items():
+            sample = next(items, None)
+            print(f"{table_name}: {count} items planned (seed {seed_value})")
+            if sample is not None:
+                print(f"  sample: {json.dumps(sample)[:300]}")
+        return
+
+    try:
+        dynamodb = get_client()
+        # Generators are consumed batch by batch, so memory stays flat at any scale.
+        results = write_tables(dynamodb, streams, max_workers=max_workers)
+        print("Scale seed complete.")
+        print_write_stats(results)
+    except (NoCredentialsError, PartialCredentialsError):
+        print("AWS credentials unavailable. Nothing written.")
+    except (ClientError, BotoCoreError) as error:
+        print(f"DynamoDB write error: {error}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed USA Pawn DynamoDB tables")
+    parser.add_argument("--scale", type=int, default=0, help="Generate N synthetic rows per table instead of the scraped seed")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for --scale data")
+    parser.add_argument("--anchor", default=None, help="Anchor date (YYYY-MM-DD) for generated timestamps; defaults to today (UTC)")
+    parser.add_argument(
+        "--tables",
+        default=",".join(SCALE_GENERATORS),
+        help="Comma-separated tables to generate in --scale mode",
+    )
+    parser.add_argument("--verbose", action="store_true", help="List every new and changed seed row")
+    parser.add_argument("--overwrite-edited", action="store_true", help="Also reset seed rows that were edited outside the seeder")
+    args = parser.parse_args()
+
+    if args.scale <= 0:
+        seed(verbose=args.verbose, overwrite_edited=args.overwrite_edited)
+        return
+
+    tables = [name.strip() for name in args.tables.split(",") if name.strip()]
+    unknown = [name for name in tables if name not in SCALE_GENERATORS]
+    if unknown:
+        parser.error(f"Unknown tables for --scale: {', '.join(unknown)}")
+
+    anchor = datetime.fromisoformat(args.anchor).replace(tzinfo=timezone.utc) if args.anchor else None
+    seed_scale(args.scale, args.seed, anchor=anchor, tables=tables)
 
 
 if __name__ == "__main__":
-    seed()
+    main()
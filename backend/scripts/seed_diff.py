@@ -0,0 +1,194 @@
+import hashlib
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from botocore.exceptions import ClientError
+
+from bulk_writer import MAX_RETRIES, THROTTLE_ERROR_CODES, backoff_delay
+
+
+BATCH_GET_SIZE = 100
+HASH_ATTRIBUTE = "content_hash"
+
+
+@dataclass
+class SeedSpec:
+    table_name: str
+    key_name: str
+    # Stamped on every build, so they never count as a change; preserved attributes are excluded too.
+    volatile: tuple[str, ...] = ()
+    # Only written when the stored row lacks them (e.g. the original date_added).
+    preserved: tuple[str, ...] = ()
+
+    def seeded_names(self, item: dict) -> list[str]:
+        """Attributes of a built item the diff compares; anything else on a stored row belongs to someone else."""
+        ignored = set(self.volatile) | set(self.preserved) | {HASH_ATTRIBUTE, self.key_name}
+        return sorted(name for name in item if name not in ignored)
+
+
+@dataclass
+class SeedDiff:
+    spec: SeedSpec
+    new: list[dict] = field(default_factory=list)
+    changed: list[tuple[dict, dict]] = field(default_factory=list)
+    unchanged: int = 0
+    edited: list[str] = field(default_factory=list)
+    written: int = 0
+    conflicts: list[str] = field(default_factory=list)
+    retries: int = 0
+    seconds: float = 0.0
+
+    @property
+    def writes(self) -> int:
+        return len(self.new) + len(self.changed)
+
+
+def content_hash(item: dict, names: list[str]) -> str:
+    # Derived attributes other jobs add (searchable_tokens, metal_specs, ...) are outside `names`.
+    stable = {name: item[name] for name in names if name in item}
+    return hashlib.sha256(json.dumps(stable, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()[:32]
+
+
+def fetch_current(client, spec: SeedSpec, keys: list[str]) -> dict[str, dict]:
+    current: dict[str, dict] = {}
+    for start in range(0, len(keys), BATCH_GET_SIZE):
+        request = {
+            spec.table_name: {
+                "Keys": [{spec.key_name: {"S": key}} for key in keys[start:start + BATCH_GET_SIZE]],
+            }
+        }
+        attempt = 0
+        while request:
+            response = client.batch_get_item(RequestItems=request)
+            for item in response.get("Responses", {}).get(spec.table_name, []):
+                current[item[spec.key_name]["S"]] = item
+            request = response.get("UnprocessedKeys") or {}
+            if request:
+                attempt += 1
+                time.sleep(backoff_delay(attempt))
+    return current
+
+
+def plan_diff(client, spec: SeedSpec, items: list[dict], overwrite_edited: bool = False) -> SeedDiff:
+    diff = SeedDiff(spec=spec)
+    hashed = [{**item, HASH_ATTRIBUTE: {"S": content_hash(item, spec.seeded_names(item))}} for item in items]
+
+    current = fetch_current(client, spec, [item[spec.key_name]["S"] for item in hashed])
+    for item in hashed:
+        key = item[spec.key_name]["S"]
+        stored = current.get(key)
+        if stored is None:
+            diff.new.append(item)
+            continue
+
+        names = spec.seeded_names(item)
+        stored_hash = content_hash(stored, names)
+        if stored_hash == item[HASH_ATTRIBUTE]["S"]:
+            diff.unchanged += 1
+        elif HASH_ATTRIBUTE not in stored or stored[HASH_ATTRIBUTE].get("S") == stored_hash or overwrite_edited:
+            # A row without a hash was written by the seeder before hashes existed, so it is still the seeder's.
+            diff.changed.append((item, stored))
+        else:
+            # The stored row no longer matches what the seeder last wrote: someone edited it in the app.
+            diff.edited.append(key)
+    return diff
+
+
+def write_params(diff: SeedDiff, item: dict, stored: dict | None) -> tuple[str, dict]:
+    """(operation, params) for one write: a conditional put for new rows, an UpdateItem for changed ones."""
+    spec = diff.spec
+    if stored is None:
+        return "put_item", {
+            "TableName": spec.table_name,
+            "Item": item,
+            "ConditionExpression": "attribute_not_exists(#k)",
+            "ExpressionAttributeNames": {"#k": spec.key_name},
+        }
+
+    # SET only what the seeder owns, so attributes added by other jobs survive the rewrite.
+    names = {"#k": spec.key_name, "#h": HASH_ATTRIBUTE}
+    values: dict = {}
+    clauses = []
+    for position, name in enumerate(sorted(set(item) - {spec.key_name})):
+        names[f"#a{position}"] = name
+        values[f":a{position}"] = item[name]
+        if name in spec.preserved:
+            clauses.append(f"#a{position} = if_not_exists(#a{position}, :a{position})")
+        else:
+            clauses.append(f"#a{position} = :a{position}")
+
+    if HASH_ATTRIBUTE in stored:
+        # Only replace the version that was diffed; anything edited since is left alone.
+        condition = "#h = :previous"
+        values[":previous"] = stored[HASH_ATTRIBUTE]
+    else:
+        condition = "attribute_exists(#k) AND attribute_not_exists(#h)"
+    return "update_item", {
+        "TableName": spec.table_name,
+        "Key": {spec.key_name: item[spec.key_name]},
+        "UpdateExpression": "SET " + ", ".join(clauses),
+        "ConditionExpression": condition,
+        "ExpressionAttributeNames": names,
+        "ExpressionAttributeValues": values,
+    }
+
+
+def conditional_write(client, diff: SeedDiff, item: dict, stored: dict | None) -> None:
+    key = item[diff.spec.key_name]["S"]
+    operation, params = write_params(diff, item, stored)
+
+    attempt = 0
+    while True:
+        try:
+            getattr(client, operation)(**params)
+            diff.written += 1
+            return
+        except ClientError as error:
+            code = error.response.get("Error", {}).get("Code", "")
+            if code == "ConditionalCheckFailedException":
+                diff.conflicts.append(key)
+                return
+            if code not in THROTTLE_ERROR_CODES or attempt >= MAX_RETRIES:
+                raise
+        attempt += 1
+        diff.retries += 1
+        time.sleep(backoff_delay(attempt))
+
+
+def apply_diff(client, diff: SeedDiff, max_workers: int) -> SeedDiff:
+    started = time.perf_counter()
+    writes = [(item, None) for item in diff.new] + diff.changed
+    if writes:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(writes)))) as pool:
+            list(pool.map(lambda write: conditional_write(client, diff, *write), writes))
+    diff.seconds = time.perf_counter() - started
+    return diff
+
+
+def changed_attributes(item: dict, stored: dict, spec: SeedSpec) -> list[str]:
+    return [name for name in spec.seeded_names(item) if item.get(name) != stored.get(name)]
+
+
+def print_diff(diffs: list[SeedDiff], verbose: bool = False) -> None:
+    for diff in diffs:
+        print(
+            f"{diff.spec.table_name}: {len(diff.new)} new, {len(diff.changed)} changed, "
+            f"{diff.unchanged} unchanged -> {diff.writes} writes"
+        )
+        if diff.edited:
+            print(f"  left alone (edited outside the seeder): {', '.join(diff.edited)}")
+        if verbose:
+            for item in diff.new:
+                print(f"  + {item[diff.spec.key_name]['S']}")
+            for item, stored in diff.changed:
+                print(f"  ~ {item[diff.spec.key_name]['S']}: {', '.join(changed_attributes(item, stored, diff.spec))}")
+
+
+def print_apply_stats(diffs: list[SeedDiff]) -> None:
+    for diff in diffs:
+        line = f"{diff.spec.table_name}: {diff.written} of {diff.writes} writes in {diff.seconds:.2f}s, retries: {diff.retries}"
+        if diff.conflicts:
+            line += f", skipped (changed since diff): {', '.join(diff.conflicts)}"
+        print(line)
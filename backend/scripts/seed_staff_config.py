@@ -1,31 +1,29 @@
-import boto3
-import json
-from datetime import datetime
+from botocore.exceptions import ClientError
 
-dynamodb = boto3.client('dynamodb', region_name='us-east-1')
+from dynamodb_client import get_client
+from staff_directory import STAFF_TABLE, staff_item
+
+dynamodb = get_client()
 
 # Simple staff records for demo
-staff_config = {
-    'config_key': 'staff_records',
-    'value': json.dumps({
-        'staff': [
-            {'name': 'Demo Staff', 'pin': '1234'},
-            {'name': 'John Doe', 'pin': '1234'},
-            {'name': 'Jane Smith', 'pin': '1234'},
-        ]
-    }),
-    'updated_at': datetime.utcnow().isoformat() + 'Z'
-}
+demo_staff = [
+    {'name': 'Demo Staff', 'pin': '1234'},
+    {'name': 'John Doe', 'pin': '1234'},
+    {'name': 'Jane Smith', 'pin': '1234'},
+]
 
-try:
-    dynamodb.put_item(
-        TableName='USA_Pawn_Store_Config',
-        Item={
-            'config_key': {'S': staff_config['config_key']},
-            'value': {'S': staff_config['value']},
-            'updated_at': {'S': staff_config['updated_at']}
-        }
-    )
-    print(f"✅ Created staff_records config")
-except Exception as e:
-    print(f"❌ Error: {e}")
+for member in demo_staff:
+    try:
+        dynamodb.put_item(
+            TableName=STAFF_TABLE,
+            Item=staff_item(member),
+            ConditionExpression='attribute_not_exists(staff_key)',
+        )
+        print(f"✅ Added {member['name']} to {STAFF_TABLE}")
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+            print(f"↩️  {member['name']} already exists")
+        else:
+            print(f"❌ Error: {e}")
+    except Exception as e:
+        print(f"❌ Error: {e}")
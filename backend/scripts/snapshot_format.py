@@ -0,0 +1,251 @@
+"""
+On-disk layout shared by export_tables.py and restore_tables.py.
+
+  <snapshot>/manifest.json
+  <snapshot>/<TableName>/part-00000.jsonl.gz   (or .parquet)
+
+One part file per scan segment. Rows are DynamoDB-typed JSON, the low-level
+client's attribute values as scanned ({"S": ...}, {"N": "1.50"}, {"SS": [...]},
+{"M": {...}}), with binary values base64-encoded. Restoring writes them back
+unchanged, so number precision, set types and binary attributes round-trip
+exactly. Version 1 snapshots held the TypeDeserializer view as plain JSON and
+are still readable.
+
+Parquet parts keep the key attributes as string columns next to an "item"
+column holding the same typed JSON, since the tables are schemaless beyond
+their keys. Parquet needs pyarrow.
+
+The manifest records each table's CreateTable parameters (billing mode and
+provisioned throughput included) and its TTL attribute.
+"""
+
+import base64
+import gzip
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Iterator
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SNAPSHOT_ROOT = PROJECT_ROOT / "backend" / "data" / "snapshots"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 2
+# Version 1 rows are plain JSON (sets as lists, numbers through float); restore_tables.py still reads them.
+READABLE_MANIFEST_VERSIONS = (1, 2)
+FORMATS = {"jsonl": ".jsonl.gz", "parquet": ".parquet"}
+
+
+def json_default(value: Any) -> Any:
+    # Plain-JSON view for readers that want ordinary objects (the conversation archive).
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    if isinstance(value, (bytes, bytearray)):
+        return base64.b64encode(bytes(value)).decode("ascii")
+    if hasattr(value, "value") and isinstance(value.value, (bytes, bytearray)):
+        # boto3.dynamodb.types.Binary
+        return base64.b64encode(bytes(value.value)).decode("ascii")
+    raise TypeError(f"Cannot encode {type(value).__name__} in a snapshot row")
+
+
+def encode_row(item: dict[str, Any]) -> str:
+    return json.dumps(item, default=json_default, ensure_ascii=False, separators=(",", ":"))
+
+
+def decode_row(line: str) -> dict[str, Any]:
+    return json.loads(line, parse_float=Decimal)
+
+
+def to_json_attribute(value: dict[str, Any]) -> dict[str, Any]:
+    (kind, data), = value.items()
+    if kind == "B":
+        return {"B": base64.b64encode(bytes(data)).decode("ascii")}
+    if kind == "BS":
+        return {"BS": [base64.b64encode(bytes(entry)).decode("ascii") for entry in data]}
+    if kind == "M":
+        return {"M": {name: to_json_attribute(entry) for name, entry in data.items()}}
+    if kind == "L":
+        return {"L": [to_json_attribute(entry) for entry in data]}
+    return value
+
+
+def from_json_attribute(value: dict[str, Any]) -> dict[str, Any]:
+    (kind, data), = value.items()
+    if kind == "B":
+        return {"B": base64.b64decode(data)}
+    if kind == "BS":
+        return {"BS": [base64.b64decode(entry) for entry in data]}
+    if kind == "M":
+        return {"M": {name: from_json_attribute(entry) for name, entry in data.items()}}
+    if kind == "L":
+        return {"L": [from_json_attribute(entry) for entry in data]}
+    return value
+
+
+def encode_typed_row(item: dict[str, Any]) -> str:
+    """One scanned item (low-level attribute values) as a typed JSON line."""
+    return json.dumps({name: to_json_attribute(value) for name, value in item.items()}, ensure_ascii=False, separators=(",", ":"))
+
+
+def decode_typed_row(line: str) -> dict[str, Any]:
+    return {name: from_json_attribute(value) for name, value in json.loads(line).items()}
+
+
+def key_string(value: dict[str, Any] | None) -> str:
+    """A key attribute's scalar as text, for the Parquet key columns."""
+    if not value:
+        return ""
+    encoded = to_json_attribute(value)
+    return str(next(iter(encoded.values())))
+
+
+def part_path(directory: Path, table_name: str, segment: int, fmt: str) -> Path:
+    return directory / table_name / f"part-{segment:05d}{FORMATS[fmt]}"
+
+
+def part_paths(directory: Path, table_name: str) -> list[Path]:
+    table_dir = directory / table_name
+    if not table_dir.is_dir():
+        return []
+    return sorted(path for path in table_dir.iterdir() if path.name.startswith("part-") and path.name.endswith(tuple(FORMATS.values())))
+
+
+class JsonlWriter:
+    def __init__(self, path: Path, key_names: list[str]):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.handle = gzip.open(path, "wt", encoding="utf-8", compresslevel=6)
+
+    def write(self, rows: list[dict[str, Any]]) -> None:
+        self.handle.writelines(encode_typed_row(row) + "\n" for row in rows)
+
+    def close(self) -> None:
+        self.handle.close()
+
+
+class ParquetWriter:
+    def __init__(self, path: Path, key_names: list[str]):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as error:
+            raise RuntimeError("Parquet snapshots need pyarrow (pip install pyarrow)") from error
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.pa = pa
+        self.key_names = key_names
+        self.schema = pa.schema([(name, pa.string()) for name in key_names] + [("item", pa.string())])
+        self.writer = pq.ParquetWriter(str(path), self.schema, compression="zstd")
+
+    def write(self, rows: list[dict[str, Any]]) -> None:
+        if not rows:
+            return
+        columns = {name: [key_string(row.get(name)) for row in rows] for name in self.key_names}
+        columns["item"] = [encode_typed_row(row) for row in rows]
+        self.writer.write_table(self.pa.table(columns, schema=self.schema))
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+def open_writer(fmt: str, path: Path, key_names: list[str]) -> JsonlWriter | ParquetWriter:
+    return ParquetWriter(path, key_names) if fmt == "parquet" else JsonlWriter(path, key_names)
+
+
+def iter_part_rows(path: Path, batch_size: int = 1000, typed: bool = True) -> Iterator[list[dict[str, Any]]]:
+    """Stream a part file back as batches of rows: attribute values, or plain values for version 1 parts."""
+    decode = decode_typed_row if typed else decode_row
+    if path.name.endswith(FORMATS["parquet"]):
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(str(path))
+        for batch in parquet.iter_batches(batch_size=batch_size, columns=["item"]):
+            yield [decode(value) for value in batch.column(0).to_pylist()]
+        return
+
+    with gzip.open(path, "rt", encoding="utf-8") as handle:
+        batch: list[dict[str, Any]] = []
+        for line in handle:
+            if line.strip():
+                batch.append(decode(line))
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def billing_mode(description: dict[str, Any]) -> str:
+    mode = description.get("BillingModeSummary", {}).get("BillingMode") or description.get("BillingMode")
+    if mode:
+        return mode
+    # DescribeTable leaves out BillingModeSummary for tables that have only ever been provisioned.
+    return "PROVISIONED" if description.get("ProvisionedThroughput", {}).get("ReadCapacityUnits") else "PAY_PER_REQUEST"
+
+
+def provisioned_throughput(description: dict[str, Any]) -> dict[str, int]:
+    throughput = description.get("ProvisionedThroughput", {})
+    return {"ReadCapacityUnits": throughput["ReadCapacityUnits"], "WriteCapacityUnits": throughput["WriteCapacityUnits"]}
+
+
+def table_definition(description: dict[str, Any]) -> dict[str, Any]:
+    """Turn a DescribeTable response into CreateTable parameters."""
+    mode = billing_mode(description)
+    definition: dict[str, Any] = {
+        "TableName": description["TableName"],
+        "KeySchema": description["KeySchema"],
+        "AttributeDefinitions": description["AttributeDefinitions"],
+        "BillingMode": mode,
+    }
+    if mode == "PROVISIONED":
+        definition["ProvisionedThroughput"] = provisioned_throughput(description)
+
+    indexes = []
+    for index in description.get("GlobalSecondaryIndexes", []):
+        created = {"IndexName": index["IndexName"], "KeySchema": index["KeySchema"], "Projection": index["Projection"]}
+        if mode == "PROVISIONED":
+            created["ProvisionedThroughput"] = provisioned_throughput(index) if index.get("ProvisionedThroughput") else definition["ProvisionedThroughput"]
+        indexes.append(created)
+    if indexes:
+        definition["GlobalSecondaryIndexes"] = indexes
+    return definition
+
+
+def time_to_live_attribute(description: dict[str, Any]) -> str | None:
+    """The TTL attribute from a DescribeTimeToLive response, or None when TTL is off."""
+    if description.get("TimeToLiveStatus") in ("ENABLED", "ENABLING"):
+        return description.get("AttributeName")
+    return None
+
+
+def new_manifest(fmt: str, segments: int, source: str) -> dict[str, Any]:
+    return {
+        "version": MANIFEST_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "format": fmt,
+        "segments": segments,
+        "source": source,
+        "tables": {},
+    }
+
+
+def write_manifest(directory: Path, manifest: dict[str, Any]) -> Path:
+    path = directory / MANIFEST_NAME
+    tmp_path = path.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    tmp_path.replace(path)
+    return path
+
+
+def read_manifest(directory: Path) -> dict[str, Any]:
+    path = directory / MANIFEST_NAME
+    if not path.exists():
+        raise FileNotFoundError(f"Missing snapshot manifest: {path}")
+    manifest = json.loads(path.read_text(encoding="utf-8"))
+    if manifest.get("version") not in READABLE_MANIFEST_VERSIONS:
+        raise ValueError(f"Unsupported snapshot manifest version: {manifest.get('version')}")
+    return manifest
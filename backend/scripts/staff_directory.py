@@ -0,0 +1,49 @@
+"""
+USA_Pawn_Staff rows and the salted PIN hash they are looked up by.
+
+One row per staff member, keyed by the lowercased name (names are matched
+case-insensitively everywhere else). PINs are never stored: pin_hash is
+HMAC-SHA256 of the PIN keyed by STAFF_PIN_SALT, and the pin_hash-index GSI
+turns a PIN check into a single Query. frontend/src/lib/staff-directory.ts
+computes the same hash, so both sides must see the same STAFF_PIN_SALT.
+"""
+
+import hashlib
+import hmac
+import os
+from datetime import datetime, timezone
+from typing import Any
+
+
+STAFF_TABLE = "USA_Pawn_Staff"
+PIN_INDEX = "pin_hash-index"
+DEFAULT_PIN_SALT = "vault-dev-secret"
+PROFILE_FIELDS = ("phone", "email", "hired_date")
+
+
+def pin_salt() -> str:
+    return os.getenv("STAFF_PIN_SALT") or os.getenv("DAILY_QR_TOKEN_SECRET") or DEFAULT_PIN_SALT
+
+
+def pin_hash(pin: str) -> str:
+    return hmac.new(pin_salt().encode("utf-8"), str(pin).strip().encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def staff_key(name: str) -> str:
+    return " ".join(str(name).split()).lower()
+
+
+def staff_item(member: dict[str, Any]) -> dict[str, Any]:
+    """Low-level item for a staff record shaped like the old staff_records entries ({name, pin, role, ...})."""
+    name = " ".join(str(member["name"]).split())
+    item: dict[str, Any] = {
+        "staff_key": {"S": staff_key(name)},
+        "name": {"S": name},
+        "pin_hash": {"S": pin_hash(member["pin"])},
+        "role": {"S": str(member.get("role") or "Staff")},
+        "updated_at": {"S": datetime.now(timezone.utc).isoformat()},
+    }
+    for field in PROFILE_FIELDS:
+        if member.get(field):
+            item[field] = {"S": str(member[field])}
+    return item
@@ -0,0 +1,280 @@
+import math
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Callable, Iterator
+
+from boto3.dynamodb.types import TypeSerializer
+
+from staff_directory import staff_key
+
+
+# (category, weight, brands, nouns, price range)
+INVENTORY_PROFILES = [
+    ("jewelry", 34, ["Unbranded", "Kay", "Zales", "Pandora", "Tiffany & Co."],
+     ["14k gold chain", "10k gold cuban link", "sterling silver necklace", "diamond engagement ring",
+      "gold tennis bracelet", "white gold band", "pearl pendant"], (40, 4500)),
+    ("watches", 6, ["Rolex", "Omega", "Seiko", "Citizen", "Invicta", "Apple"],
+     ["automatic watch", "chronograph watch", "dive watch", "smartwatch"], (60, 12000)),
+    ("electronics", 20, ["Apple", "Samsung", "Sony", "Microsoft", "Nintendo", "Bose", "Dell"],
+     ["iPhone", "Galaxy phone", "laptop", "tablet", "game console", "wireless headphones", "4K TV", "camera"],
+     (30, 1600)),
+    ("tools", 12, ["DeWalt", "Milwaukee", "Makita", "Ryobi", "Stihl", "Craftsman"],
+     ["cordless drill", "impact driver", "circular saw", "chainsaw", "mechanic tool set", "pressure washer"],
+     (25, 700)),
+    ("firearms", 9, ["Glock", "Smith & Wesson", "Ruger", "Taurus", "Sig Sauer", "Remington"],
+     ["9mm pistol", ".38 revolver", "12 gauge shotgun", ".22 rifle", "compact handgun"], (150, 1400)),
+    ("musical", 8, ["Fender", "Gibson", "Yamaha", "Ibanez", "Roland", "Marshall"],
+     ["electric guitar", "acoustic guitar", "bass guitar", "digital piano", "guitar amplifier", "drum kit"],
+     (60, 2200)),
+    ("sporting", 6, ["Callaway", "TaylorMade", "Trek", "Bowflex", "Wilson"],
+     ["golf club set", "mountain bike", "adjustable dumbbells", "compound bow"], (30, 900)),
+    ("collectibles", 5, ["Funko", "Topps", "Hot Wheels", "Lionel", "Pokemon"],
+     ["trading card lot", "coin collection", "model train set", "vinyl figure", "sports memorabilia"], (10, 800)),
+]
+CONDITIONS = [("excellent", 20), ("good", 45), ("fair", 25), ("poor", 10)]
+INVENTORY_STATUSES = [("available", 78), ("sold", 16), ("pending", 4), ("returned", 2)]
+DESCRIPTION_EXTRAS = ["with original box", "minor scratches", "like-new", "includes charger", "recently serviced",
+                      "vintage", "barely used", "with case", "tested and working", ""]
+
+LEAD_CHANNELS = [("web", 35, "web"), ("sms", 25, "sms"), ("voice", 25, "phone"), ("chat", 15, "chat")]
+LEAD_TYPES = [("appraisal", 45), ("purchase_offer", 30), ("appointment", 25)]
+LEAD_STATUSES = [("new", 35), ("contacted", 30), ("scheduled", 18), ("completed", 12), ("rejected", 5)]
+LEAD_PRIORITIES = [("normal", 75), ("high", 20), ("low", 5)]
+FIRST_NAMES = ["Marcus", "Ariana", "DeShawn", "Lena", "Terrell", "Maria", "James", "Keisha", "Carlos", "Tanya",
+               "Robert", "Jasmine", "Luis", "Brittany", "Andre", "Monique", "Kevin", "Destiny", "Jose", "Ashley"]
+LAST_NAMES = ["Taylor", "Daniels", "Harper", "Ortiz", "Johnson", "Williams", "Brown", "Garcia", "Davis", "Martinez",
+              "Wilson", "Anderson", "Thomas", "Jackson", "White", "Robinson", "Lewis", "Walker", "Young", "King"]
+
+METAL_TYPES = [("gold", 55), ("silver", 25), ("platinum", 5), (None, 15)]
+
+CONVERSATION_SOURCES = [("web_chat", "web", 45), ("sms", "sms", 25), ("voice", "voice", 20), ("appraise", "appraise", 10)]
+INTENTS = [
+    ("schedule_visit", "Appointment", "Can I schedule a visit to bring in my {noun}?"),
+    ("appraisal", "Appraisal", "What would my {noun} be worth?"),
+    ("inventory", "Inventory Inquiry", "Do you have any {noun} in stock?"),
+    ("hours", "Store Hours", "Are you open today?"),
+    ("support", "General Support", "I have a question about a {noun} I pawned."),
+]
+
+STAFF_NAMES = ["Alex Rivera", "Jordan Blake", "Sam Carter", "Taylor Brooks", "Morgan Lee", "Casey Nguyen"]
+STAFF_LOCATIONS = [("store_qr", 85), ("dashboard", 12), ("dashboard_force", 3)]
+
+SERIALIZER = TypeSerializer()
+
+
+def to_attribute_values(item: dict) -> dict:
+    return {key: SERIALIZER.serialize(value) for key, value in item.items() if value is not None}
+
+
+def pick(rng: random.Random, choices: list[tuple]) -> Any:
+    return rng.choices([choice[0] for choice in choices], weights=[choice[1] for choice in choices])[0]
+
+
+def deterministic_id(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def recent_time(rng: random.Random, anchor: datetime, mean_days: float, max_days: int = 730) -> datetime:
+    # Exponential recency: most rows are recent, with a long tail of history.
+    days = min(rng.expovariate(1 / mean_days), max_days)
+    return (anchor - timedelta(days=days)).replace(microsecond=0)
+
+
+def price_in(rng: random.Random, low: float, high: float) -> Decimal:
+    # Log-uniform so cheap items dominate but high-end pieces still appear.
+    value = low * (high / low) ** rng.random()
+    return Decimal(str(round(value, 2)))
+
+
+def phone_number(rng: random.Random) -> str:
+    return f"+1904{rng.randint(2000000, 9999999)}"
+
+
+def generate_inventory(count: int, seed: int, anchor: datetime) -> Iterator[dict]:
+    rng = random.Random(f"inventory:{seed}")
+    profiles = [(profile, profile[1]) for profile in INVENTORY_PROFILES]
+    for _ in range(count):
+        category, _, brands, nouns, (low, high) = pick(rng, profiles)
+        brand = rng.choice(brands)
+        noun = rng.choice(nouns)
+        condition = pick(rng, CONDITIONS)
+        extra = rng.choice(DESCRIPTION_EXTRAS)
+        created = recent_time(rng, anchor, mean_days=120).isoformat()
+        item_id = deterministic_id(rng)
+        yield {
+            "item_id": item_id,
+            "category": category,
+            "brand": brand,
+            "description": f"{brand} {noun} {extra}".strip(),
+            "tags": [category, noun.split()[-1].lower(), f"{condition}-condition"],
+            "price": price_in(rng, low, high),
+            "condition": condition,
+            "status": pick(rng, INVENTORY_STATUSES),
+            "images": [f"/inventory/{item_id}.webp"] if rng.random() < 0.7 else [],
+            "created_at": created,
+            "date_added": created,
+        }
+
+
+def generate_leads(count: int, seed: int, anchor: datetime) -> Iterator[dict]:
+    rng = random.Random(f"leads:{seed}")
+    channels = [(channel, weight) for channel, weight, _ in LEAD_CHANNELS]
+    contact_methods = {channel: method for channel, _, method in LEAD_CHANNELS}
+    nouns = [noun for profile in INVENTORY_PROFILES for noun in profile[3]]
+    for _ in range(count):
+        channel = pick(rng, channels)
+        lead_type = pick(rng, LEAD_TYPES)
+        status = pick(rng, LEAD_STATUSES)
+        created = recent_time(rng, anchor, mean_days=60).isoformat()
+        item = {
+            "lead_id": deterministic_id(rng),
+            "customer_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "phone": phone_number(rng),
+            "item_description": rng.choice(nouns),
+            "estimated_value": Decimal(rng.randint(20, 2500)),
+            "source": channel,
+            "source_channel": channel,
+            "contact_method": contact_methods[channel],
+            "type": lead_type,
+            "status": status,
+            "priority": pick(rng, LEAD_PRIORITIES),
+            "created_at": created,
+            "timestamp": created,
+            "updated_at": created,
+        }
+        if lead_type == "appointment":
+            offset_hours = rng.randint(-24 * 30, 24 * 14)
+            slot = (anchor + timedelta(hours=offset_hours)).replace(minute=rng.choice([0, 30]), second=0, microsecond=0)
+            item["appointment_id"] = deterministic_id(rng)
+            item["appointment_time"] = slot.isoformat()
+            item["preferred_time"] = item["appointment_time"]
+            item["scheduled_time"] = item["appointment_time"]
+        yield item
+
+
+def generate_appraisals(count: int, seed: int, anchor: datetime) -> Iterator[dict]:
+    rng = random.Random(f"appraisals:{seed}")
+    profiles = [(profile, profile[1]) for profile in INVENTORY_PROFILES]
+    for _ in range(count):
+        category, _, brands, nouns, (low, high) = pick(rng, profiles)
+        metal_type = pick(rng, METAL_TYPES) if category in ("jewelry", "watches") else None
+        value = price_in(rng, low, high)
+        appraisal_id = deterministic_id(rng)
+        photo_count = rng.randint(1, 4)
+        yield {
+            "appraisal_id": appraisal_id,
+            "item_category": category,
+            "metal_type": metal_type,
+            "estimated_value": value,
+            "value_range": f"${int(value * Decimal('0.8'))} - ${int(value * Decimal('1.2'))}",
+            "timestamp": recent_time(rng, anchor, mean_days=45).isoformat(),
+            "description": f"{rng.choice(brands)} {rng.choice(nouns)}",
+            "photo_count": photo_count,
+            "photo_url": f"https://example.com/appraisals/{appraisal_id}/0.jpg",
+        }
+
+
+def generate_conversations(count: int, seed: int, anchor: datetime) -> Iterator[dict]:
+    rng = random.Random(f"conversations:{seed}")
+    sources = [((source, channel), weight) for source, channel, weight in CONVERSATION_SOURCES]
+    nouns = [noun for profile in INVENTORY_PROFILES for noun in profile[3]]
+    for _ in range(count):
+        source, channel = pick(rng, sources)
+        intent_key, intent_title, opener = rng.choice(INTENTS)
+        started = recent_time(rng, anchor, mean_days=30)
+        phone = phone_number(rng) if channel in ("sms", "voice") or rng.random() < 0.3 else None
+
+        messages = []
+        timestamp = started
+        for turn in range(rng.randint(2, 10)):
+            role = "user" if turn % 2 == 0 else "assistant"
+            content = opener.format(noun=rng.choice(nouns)) if turn == 0 else (
+                "Thanks, let me check on that for you." if role == "assistant" else "Sounds good."
+            )
+            messages.append({"role": role, "content": content, "timestamp": timestamp.isoformat()})
+            timestamp += timedelta(seconds=rng.randint(5, 240))
+
+        conversation_id = f"{source}_{deterministic_id(rng)}"
+        if phone:
+            customer_key = f"phone:{phone.lstrip('+')}"
+        else:
+            customer_key = f"session:{conversation_id.replace('_', '-')[:26]}"
+        ended = messages[-1]["timestamp"]
+        yield {
+            "conversation_id": conversation_id,
+            "channel": channel,
+            "source": source,
+            "phone": phone,
+            "identity_tokens": [customer_key],
+            "customer_key": customer_key,
+            "case_key": f"{customer_key}:{intent_key.replace('_', '-')}",
+            "intent_key": intent_key,
+            "intent_title": intent_title,
+            "messages": messages,
+            "message_count": len(messages),
+            "started_at": started.isoformat(),
+            "ended_at": ended,
+            "updated_at": ended,
+            "updated_bucket": ended[:10],
+        }
+
+
+def generate_staff_log(count: int, seed: int, anchor: datetime) -> Iterator[dict]:
+    # Clock in/out pairs walking back from the anchor, one shift per staff member per day.
+    # The roster grows with the row count so large runs cover about a year, not decades.
+    rng = random.Random(f"staff_log:{seed}")
+    roster = list(STAFF_NAMES)
+    roster_size = max(len(roster), math.ceil(count / (365 * 2 * 0.8)))
+    extra_names = (f"{first} {last}" for last in LAST_NAMES for first in FIRST_NAMES)
+    while len(roster) < roster_size:
+        roster.append(next(extra_names, f"Staff {len(roster) + 1}"))
+
+    emitted = 0
+    day = 0
+    while emitted < count:
+        shift_date = (anchor - timedelta(days=day)).replace(hour=0, minute=0, second=0, microsecond=0)
+        for staff_name in roster:
+            if rng.random() < 0.2:
+                continue
+            clock_in = shift_date + timedelta(hours=8 + rng.randint(0, 3), minutes=rng.randint(0, 59))
+            duration = rng.randint(4 * 3600, 10 * 3600)
+            location = pick(rng, STAFF_LOCATIONS)
+            flags = ["admin_override"] if location == "dashboard_force" else []
+            for event_type, timestamp, shift_duration in (
+                ("in", clock_in, None),
+                ("out", clock_in + timedelta(seconds=duration), duration),
+            ):
+                if emitted >= count:
+                    return
+                yield {
+                    "log_id": deterministic_id(rng),
+                    "staff_name": staff_name,
+                    "staff_key": staff_key(staff_name),
+                    "event_type": event_type,
+                    "timestamp": timestamp.isoformat(),
+                    "shift_duration": shift_duration,
+                    "compliance_flags": flags,
+                    "location": location,
+                }
+                emitted += 1
+        day += 1
+
+
+SCALE_GENERATORS: dict[str, Callable[[int, int, datetime], Iterator[dict]]] = {
+    "USA_Pawn_Inventory": generate_inventory,
+    "USA_Pawn_Leads": generate_leads,
+    "USA_Pawn_Appraisals": generate_appraisals,
+    "USA_Pawn_Conversations": generate_conversations,
+    "USA_Pawn_Staff_Log": generate_staff_log,
+}
+
+
+def scale_tables(count: int, seed: int, anchor: datetime | None = None, tables: list[str] | None = None) -> dict[str, Iterator[dict]]:
+    anchor = anchor or datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    selected = tables or list(SCALE_GENERATORS)
+    return {
+        name: (to_attribute_values(item) for item in SCALE_GENERATORS[name](count, seed, anchor))
+        for name in selected
+    }
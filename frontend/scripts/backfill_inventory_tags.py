@@ -7,214 +7,227 @@ Usage:
   python scripts/backfill_inventory_tags.py --dry-run
   python scripts/backfill_inventory_tags.py --only-missing
   python scripts/backfill_inventory_tags.py --base-url http://localhost:3000 --limit 100
+  python scripts/backfill_inventory_tags.py --page-size 500
+  python scripts/backfill_inventory_tags.py --workers 8 --batch-size 50
+  python scripts/backfill_inventory_tags.py --resume
+
+Inventory is read page by page through the /api/inventory cursor, so memory
+stays flat regardless of catalog size. Tag changes are sent as bulk PATCH
+requests from a small worker pool; failed items are reported at the end.
+A local SQLite journal records each item's input hash and rule-set version, so
+reruns skip unchanged items and --resume continues from the first page that was
+not fully written, retrying any items that failed there or later.
 """
 
 from __future__ import annotations
 
 import argparse
-import json
-import re
 import sys
-from typing import Any, Dict, List
-from urllib import error, parse, request
-
-STOP_WORDS = {
-    "the",
-    "and",
-    "for",
-    "with",
-    "this",
-    "that",
-    "item",
-    "any",
-    "have",
-    "show",
-    "looking",
-    "look",
-    "please",
-    "sale",
-    "sell",
-    "new",
-    "used",
-}
-
-SYNONYMS = {
-    "gun": "firearms",
-    "guns": "firearms",
-    "firearm": "firearms",
-    "pistol": "handgun",
-    "revolver": "handgun",
-    "rifle": "long-gun",
-    "shotgun": "long-gun",
-    "jewelery": "jewelry",
-    "jewellery": "jewelry",
-    "necklaces": "necklace",
-    "chains": "chain",
-    "rings": "ring",
-    "sterling": "silver",
-    "goldtone": "gold-tone",
-}
-
-
-def _api_json(method: str, url: str, payload: Dict[str, Any] | None = None) -> Dict[str, Any]:
-    data = None
-    headers = {"Content-Type": "application/json"}
-    if payload is not None:
-        data = json.dumps(payload).encode("utf-8")
-
-    req = request.Request(url=url, data=data, method=method, headers=headers)
-    try:
-        with request.urlopen(req, timeout=30) as response:
-            body = response.read().decode("utf-8")
-            return json.loads(body) if body else {}
-    except error.HTTPError as exc:
-        detail = exc.read().decode("utf-8")
-        raise RuntimeError(f"{method} {url} failed: {exc.code} {detail}") from exc
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Set, Tuple
+from urllib import parse
 
+from backfill_journal import DEFAULT_JOURNAL_PATH, BackfillJournal, input_hash
+from inventory_api import ApiError, InventoryApi
+from tag_engine import DEFAULT_ENGINE
 
-def _sanitize(text: str) -> str:
-    return re.sub(r"\s+", " ", re.sub(r"[^a-z0-9\s-]", " ", text.lower())).strip()
 
+def infer_tags(item: Dict[str, Any]) -> List[str]:
+    return DEFAULT_ENGINE.infer(item)
 
-def _canonical(tag: str) -> str | None:
-    cleaned = _sanitize(tag)
-    if not cleaned or len(cleaned) < 2 or len(cleaned) > 30:
-        return None
-    if cleaned in STOP_WORDS:
-        return None
-    return SYNONYMS.get(cleaned, cleaned)
 
+def iter_inventory_pages(
+    api: InventoryApi, page_size: int, cursor: str = ""
+) -> Iterator[Tuple[List[Dict[str, Any]], str]]:
+    """Yield (items, next_cursor) for each page, starting at ``cursor``."""
+    while True:
+        query = parse.urlencode({"limit": str(page_size), "cursor": cursor})
+        response = api.request_json("GET", f"/api/inventory?{query}")
+        items = response.get("items") if isinstance(response, dict) else None
+        if not isinstance(items, list):
+            raise RuntimeError("Inventory API returned unexpected payload.")
 
-def infer_tags(item: Dict[str, Any]) -> List[str]:
-    category = str(item.get("category") or "").strip().lower()
-    brand = str(item.get("brand") or "").strip().lower()
-    description = str(item.get("description") or "")
-    condition = str(item.get("condition") or "").strip().lower()
-    existing = item.get("tags") if isinstance(item.get("tags"), list) else []
-
-    candidates: List[str] = []
-
-    if category:
-        candidates.append(category)
-
-    if brand and brand not in {"unknown", "unbranded", "none", "n/a"}:
-        candidates.append(brand)
-
-    if condition:
-        if condition == "excellent":
-            candidates.append("excellent-condition")
-        elif condition == "good":
-            candidates.append("good-condition")
-        elif condition == "fair":
-            candidates.append("fair-condition")
-        elif condition == "poor":
-            candidates.append("poor-condition")
-
-    text_blob = f"{category} {brand} {description}".lower()
-
-    pattern_tags = [
-        (r"\b(gold|10k|14k|18k|24k|karat)\b", "gold"),
-        (r"\b(silver|sterling)\b", "silver"),
-        (r"\b(platinum)\b", "platinum"),
-        (r"\b(necklace|chain|pendant)\b", "necklace"),
-        (r"\b(ring|band)\b", "ring"),
-        (r"\b(bracelet)\b", "bracelet"),
-        (r"\b(watch|chronograph)\b", "watch"),
-        (r"\b(vintage|retro|classic)\b", "vintage"),
-        (r"\b(cordless|wireless)\b", "wireless"),
-        (r"\b(acoustic)\b", "acoustic"),
-        (r"\b(electric)\b", "electric"),
-        (r"\b(glock|taurus|ruger|colt|9mm|pistol|handgun|firearm)\b", "handgun"),
-        (r"\b(rifle|shotgun)\b", "long-gun"),
-        (r"\b(phone|iphone|android|laptop|tablet|camera|console)\b", "electronics"),
-        (r"\b(drill|saw|tool|wrench)\b", "tools"),
-        (r"\b(guitar|piano|drum|amplifier|amp)\b", "musical"),
-    ]
-
-    for pattern, tag in pattern_tags:
-        if re.search(pattern, text_blob):
-            candidates.append(tag)
-
-    candidates.extend([str(t) for t in existing])
-
-    deduped: List[str] = []
-    for candidate in candidates:
-        canonical = _canonical(candidate)
-        if not canonical:
-            continue
-        if canonical not in deduped:
-            deduped.append(canonical)
-        if len(deduped) >= 12:
-            break
-
-    return deduped
+        cursor = str(response.get("next_cursor") or "")
+        yield items, cursor
+
+        if not cursor:
+            return
+
+
+def patch_batch(api: InventoryApi, batch: List[Dict[str, Any]]) -> List[Tuple[str, str | None]]:
+    """Send one bulk PATCH and return (item_id, error) for every update in the batch."""
+    try:
+        response = api.request_json("PATCH", "/api/inventory", {"updates": batch})
+    except ApiError as exc:
+        return [(str(update["item_id"]), str(exc)) for update in batch]
+
+    results = response.get("results") if isinstance(response, dict) else None
+    if not isinstance(results, list):
+        return [(str(update["item_id"]), "unexpected bulk response") for update in batch]
+    return [(str(result.get("item_id")), None if result.get("ok") else str(result.get("error"))) for result in results]
 
 
 def main() -> int:
     parser = argparse.ArgumentParser(description="Backfill inventory tags via /api/inventory")
     parser.add_argument("--base-url", default="http://localhost:3000", help="Base URL for frontend app")
-    parser.add_argument("--limit", type=int, default=200, help="Max inventory items to scan")
+    parser.add_argument("--limit", type=int, default=0, help="Max inventory items to scan (0 = whole catalog)")
+    parser.add_argument("--page-size", type=int, default=200, help="Items fetched per inventory page")
+    parser.add_argument("--batch-size", type=int, default=25, help="Tag updates sent per bulk PATCH")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent bulk PATCH requests")
     parser.add_argument("--dry-run", action="store_true", help="Preview changes without writing")
     parser.add_argument("--only-missing", action="store_true", help="Only update items with no existing tags")
+    parser.add_argument("--journal", type=Path, default=DEFAULT_JOURNAL_PATH, help="SQLite journal path")
+    parser.add_argument("--resume", action="store_true", help="Continue from the last checkpointed page")
+    parser.add_argument("--full", action="store_true", help="Re-evaluate items even if the journal says unchanged")
     args = parser.parse_args()
 
-    query = parse.urlencode({"limit": str(max(1, args.limit))})
-    inventory_url = f"{args.base_url.rstrip('/')}/api/inventory?{query}"
+    api = InventoryApi(args.base_url)
+    journal = BackfillJournal(args.journal)
+    rules_version = DEFAULT_ENGINE.rules_version
+    page_size = max(1, min(args.page_size, 1000))
+    batch_size = max(1, min(args.batch_size, 100))
+    workers = max(1, args.workers)
+    start_cursor = journal.resume_cursor() if args.resume else ""
+    if start_cursor:
+        print("Resuming from last checkpoint")
+    elif not args.dry_run:
+        # A fresh run starts over, so a checkpoint from an earlier run must not outlive it.
+        journal.clear_checkpoint()
+
+    scanned = 0
+    updated = 0
+    skipped = 0
+    unchanged = 0
+    failures: List[Tuple[str, str]] = []
+    batch: List[Dict[str, Any]] = []
+    pending: Dict[str, Tuple[str, List[str]]] = {}
+    in_flight: Set[Future] = set()
+    started = time.perf_counter()
+
+    def collect(done: Set[Future]) -> None:
+        nonlocal updated
+        for future in done:
+            for item_id, failure in future.result():
+                item_hash, tags = pending.pop(item_id, ("", []))
+                if failure:
+                    failures.append((item_id, failure))
+                    print(f"  update failed: {item_id}: {failure}")
+                else:
+                    updated += 1
+                    if item_hash:
+                        journal.record(item_id, item_hash, rules_version, tags)
+
+    def submit(pool: ThreadPoolExecutor) -> None:
+        nonlocal batch
+        if not batch:
+            return
+        in_flight.add(pool.submit(patch_batch, api, batch))
+        batch = []
+        # Bound the queue so pages are not read faster than they can be written.
+        if len(in_flight) >= workers * 2:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            in_flight.difference_update(done)
+            collect(done)
+
+    def drain(pool: ThreadPoolExecutor) -> None:
+        submit(pool)
+        collect(wait(in_flight).done)
+        in_flight.clear()
 
     try:
-        response = _api_json("GET", inventory_url)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pages = iter_inventory_pages(api, page_size, start_cursor)
+            for page_number, (items, next_cursor) in enumerate(pages, start=1):
+                page_scanned = 0
+                for item in items:
+                    if args.limit and scanned >= args.limit:
+                        break
+                    scanned += 1
+                    page_scanned += 1
+
+                    if not isinstance(item, dict):
+                        skipped += 1
+                        continue
+
+                    item_id = str(item.get("item_id") or "")
+                    if not item_id:
+                        skipped += 1
+                        continue
+
+                    existing_tags = [str(t) for t in item.get("tags", [])] if isinstance(item.get("tags"), list) else []
+                    if args.only_missing and existing_tags:
+                        skipped += 1
+                        continue
+
+                    current_hash = input_hash(item, existing_tags)
+                    if not args.full and journal.is_current(item_id, current_hash, rules_version):
+                        unchanged += 1
+                        continue
+
+                    new_tags = infer_tags(item)
+                    if new_tags == existing_tags or not new_tags:
+                        skipped += 1
+                        if not args.dry_run:
+                            journal.record(item_id, current_hash, rules_version, existing_tags)
+                        continue
+
+                    print(f"\n{item_id}")
+                    print(f"  old: {existing_tags}")
+                    print(f"  new: {new_tags}")
+
+                    if args.dry_run:
+                        updated += 1
+                        continue
+
+                    # Journal the post-update inputs so the next run sees this item as current.
+                    pending[item_id] = (input_hash(item, new_tags), new_tags)
+                    batch.append({"item_id": item_id, "tags": new_tags})
+                    if len(batch) >= batch_size:
+                        submit(pool)
+
+                page_complete = page_scanned == len(items)
+                if not args.dry_run:
+                    # Checkpoint only once every write from a fully scanned page has landed. After the
+                    # first failed write the checkpoint stays put, so --resume comes back to retry it.
+                    drain(pool)
+                    if page_complete and not failures:
+                        journal.checkpoint(next_cursor)
+
+                elapsed = time.perf_counter() - started
+                rate = scanned / elapsed if elapsed > 0 else 0.0
+                print(
+                    f"[page {page_number}] scanned: {scanned} | updated: {updated} | "
+                    f"unchanged: {unchanged} | {rate:.1f} items/sec"
+                )
+
+                if args.limit and scanned >= args.limit:
+                    break
+            else:
+                if not args.dry_run and not failures:
+                    journal.clear_checkpoint()
+
+            drain(pool)
     except Exception as exc:
-        print(f"Failed to load inventory: {exc}")
-        return 1
-
-    items = response.get("items") if isinstance(response, dict) else None
-    if not isinstance(items, list):
-        print("Inventory API returned unexpected payload.")
+        print(f"Backfill stopped: {exc}")
+        print("Rerun with --resume to continue from the last checkpoint.")
         return 1
-
-    print(f"Loaded {len(items)} inventory items")
-
-    updated = 0
-    skipped = 0
-
-    for item in items:
-        if not isinstance(item, dict):
-            skipped += 1
-            continue
-
-        item_id = str(item.get("item_id") or "")
-        if not item_id:
-            skipped += 1
-            continue
-
-        existing_tags = [str(t) for t in item.get("tags", [])] if isinstance(item.get("tags"), list) else []
-        if args.only_missing and existing_tags:
-            skipped += 1
-            continue
-
-        new_tags = infer_tags(item)
-        if new_tags == existing_tags or not new_tags:
-            skipped += 1
-            continue
-
-        print(f"\n{item_id}")
-        print(f"  old: {existing_tags}")
-        print(f"  new: {new_tags}")
-
-        if args.dry_run:
-            updated += 1
-            continue
-
-        patch_url = f"{args.base_url.rstrip('/')}/api/inventory"
-        payload = {"item_id": item_id, "tags": new_tags}
-        try:
-            _api_json("PATCH", patch_url, payload)
-            updated += 1
-        except Exception as exc:
-            print(f"  update failed: {exc}")
+    finally:
+        api.close()
+        journal.close()
 
     mode = "DRY RUN" if args.dry_run else "APPLY"
-    print(f"\n[{mode}] Updated: {updated} | Skipped: {skipped}")
+    elapsed = time.perf_counter() - started
+    print(
+        f"\n[{mode}] Scanned: {scanned} | Updated: {updated} | Unchanged: {unchanged} | "
+        f"Failed: {len(failures)} | Skipped: {skipped} | {elapsed:.1f}s"
+    )
+    for item_id, failure in failures:
+        print(f"  failed: {item_id}: {failure}")
+    if failures:
+        print("Rerun with --resume to retry the failed items.")
+        return 1
     return 0
 
 
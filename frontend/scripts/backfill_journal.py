@@ -0,0 +1,84 @@
+"""
+Local SQLite journal that lets inventory backfills skip unchanged items and
+resume after an interruption.
+
+Each processed item is recorded with a hash of the fields that feed tag
+inference plus the rule-set version that produced its tags. The checkpoint is
+the cursor after the last page whose writes, and every earlier page's, all
+succeeded, so ``--resume`` picks up at the first page with a failed item and
+the journal skips the items that did land.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+DEFAULT_JOURNAL_PATH = Path(__file__).resolve().with_name(".backfill_journal.sqlite")
+INPUT_FIELDS = ("category", "brand", "description", "condition")
+
+
+def input_hash(item: Dict[str, Any], tags: List[str]) -> str:
+    payload = {field: str(item.get(field) or "") for field in INPUT_FIELDS}
+    payload["tags"] = [str(tag) for tag in tags]
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class BackfillJournal:
+    def __init__(self, path: Path = DEFAULT_JOURNAL_PATH, job: str = "inventory_tags"):
+        self.job = job
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS items (
+                job TEXT NOT NULL,
+                item_id TEXT NOT NULL,
+                input_hash TEXT NOT NULL,
+                rules_version TEXT NOT NULL,
+                tags TEXT NOT NULL,
+                recorded_at TEXT NOT NULL,
+                PRIMARY KEY (job, item_id)
+            )
+            """
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS checkpoints (job TEXT PRIMARY KEY, cursor TEXT NOT NULL, updated_at TEXT NOT NULL)"
+        )
+        self.conn.commit()
+
+    def is_current(self, item_id: str, item_hash: str, rules_version: str) -> bool:
+        row = self.conn.execute(
+            "SELECT input_hash, rules_version FROM items WHERE job = ? AND item_id = ?",
+            (self.job, item_id),
+        ).fetchone()
+        return row is not None and row[0] == item_hash and row[1] == rules_version
+
+    def record(self, item_id: str, item_hash: str, rules_version: str, tags: List[str]) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO items (job, item_id, input_hash, rules_version, tags, recorded_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (self.job, item_id, item_hash, rules_version, json.dumps(tags), datetime.now(timezone.utc).isoformat()),
+        )
+
+    def checkpoint(self, cursor: str) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO checkpoints (job, cursor, updated_at) VALUES (?, ?, ?)",
+            (self.job, cursor, datetime.now(timezone.utc).isoformat()),
+        )
+        self.conn.commit()
+
+    def resume_cursor(self) -> str:
+        row = self.conn.execute("SELECT cursor FROM checkpoints WHERE job = ?", (self.job,)).fetchone()
+        return row[0] if row else ""
+
+    def clear_checkpoint(self) -> None:
+        self.conn.execute("DELETE FROM checkpoints WHERE job = ?", (self.job,))
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.commit()
+        self.conn.close()
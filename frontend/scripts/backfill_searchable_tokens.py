@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Precompute searchable_tokens for every inventory item.
+
+Usage:
+  python scripts/backfill_searchable_tokens.py
+  python scripts/backfill_searchable_tokens.py --dry-run
+  python scripts/backfill_searchable_tokens.py --workers 16 --page-size 500
+  python scripts/backfill_searchable_tokens.py --full
+
+Tokens are built the way POST/PATCH /api/inventory build them
+(buildSearchableTokens in tag-governance.ts): category, brand, description and
+normalized tags, tokenized with stop words dropped, synonyms applied and
+duplicates removed. Each updated item is stamped with
+searchable_tokens_version; items already stamped with the current rules
+version are skipped without recomputing, unless --full is given.
+
+Updates are conditional on searchable_tokens being unchanged since the scan,
+so an item edited through the app mid-run keeps the app's tokens.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.exceptions import ClientError
+
+from tag_governance import RULES_VERSION, build_searchable_tokens
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend" / "scripts"))
+from dynamodb_client import describe_backend, get_client  # noqa: E402
+
+DEFAULT_TABLE = "USA_Pawn_Inventory"
+VERSION_ATTRIBUTE = "searchable_tokens_version"
+SCAN_ATTRIBUTES = ["item_id", "category", "brand", "description", "tags", "searchable_tokens", VERSION_ATTRIBUTE]
+MAX_RETRIES = 8
+THROTTLE_ERROR_CODES = {"ProvisionedThroughputExceededException", "ThrottlingException", "RequestLimitExceeded"}
+
+serializer = TypeSerializer()
+deserializer = TypeDeserializer()
+
+
+def iter_inventory_pages(client, table_name: str, page_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Yields pages of raw (attribute-value) items."""
+    names = {f"#a{index}": name for index, name in enumerate(SCAN_ATTRIBUTES)}
+    params: Dict[str, Any] = {
+        "TableName": table_name,
+        "Limit": page_size,
+        "ProjectionExpression": ", ".join(names),
+        "ExpressionAttributeNames": names,
+    }
+    while True:
+        response = client.scan(**params)
+        yield response.get("Items", [])
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return
+        params["ExclusiveStartKey"] = last_key
+
+
+def deserialize(raw: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: deserializer.deserialize(value) for key, value in raw.items()}
+
+
+def is_stale(item: Dict[str, Any]) -> bool:
+    return item.get(VERSION_ATTRIBUTE) != RULES_VERSION
+
+
+def write_tokens(client, table_name: str, raw: Dict[str, Any], tokens: List[str]) -> str:
+    """Update one item; returns "updated", "conflict" or an error message."""
+    params: Dict[str, Any] = {
+        "TableName": table_name,
+        "Key": {"item_id": raw["item_id"]},
+        "UpdateExpression": "SET #tokens = :tokens, #version = :version",
+        "ExpressionAttributeNames": {"#tokens": "searchable_tokens", "#version": VERSION_ATTRIBUTE},
+        "ExpressionAttributeValues": {":tokens": serializer.serialize(tokens), ":version": {"S": RULES_VERSION}},
+    }
+    if "searchable_tokens" in raw:
+        params["ConditionExpression"] = "#tokens = :previous"
+        params["ExpressionAttributeValues"][":previous"] = raw["searchable_tokens"]
+    else:
+        params["ConditionExpression"] = "attribute_exists(item_id) AND attribute_not_exists(#tokens)"
+
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            client.update_item(**params)
+            return "updated"
+        except ClientError as error:
+            code = error.response.get("Error", {}).get("Code", "")
+            if code == "ConditionalCheckFailedException":
+                return "conflict"
+            if code not in THROTTLE_ERROR_CODES or attempt == MAX_RETRIES:
+                return f"{code}: {error}"
+            time.sleep(random.uniform(0, min(5.0, 0.05 * (2**attempt))))
+    return "retries exhausted"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Precompute searchable_tokens on inventory items")
+    parser.add_argument("--table", default=DEFAULT_TABLE, help="Inventory table name")
+    parser.add_argument("--page-size", type=int, default=500, help="Items read per scan page")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent UpdateItem calls")
+    parser.add_argument("--dry-run", action="store_true", help="Report stale items without writing")
+    parser.add_argument("--full", action="store_true", help="Recompute every item regardless of its rules version")
+    args = parser.parse_args()
+
+    client = get_client()
+    print(f"Backend: {describe_backend()}")
+    print(f"Rules version: {RULES_VERSION}")
+
+    scanned = 0
+    current = 0
+    unchanged = 0
+    updated = 0
+    conflicts = 0
+    failed: List[Tuple[str, str]] = []
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        for page in iter_inventory_pages(client, args.table, args.page_size):
+            scanned += len(page)
+            pending = []
+            for raw in page:
+                item = deserialize(raw)
+                if not args.full and not is_stale(item):
+                    current += 1
+                    continue
+                tokens = build_searchable_tokens(item)
+                if tokens == item.get("searchable_tokens") and not is_stale(item):
+                    unchanged += 1
+                    continue
+                pending.append((raw, tokens))
+
+            if args.dry_run:
+                updated += len(pending)
+                continue
+
+            outcomes = pool.map(lambda entry: write_tokens(client, args.table, *entry), pending)
+            for (raw, _), outcome in zip(pending, outcomes):
+                if outcome == "updated":
+                    updated += 1
+                elif outcome == "conflict":
+                    conflicts += 1
+                else:
+                    failed.append((str(raw["item_id"].get("S")), outcome))
+
+            elapsed = time.perf_counter() - started
+            print(f"Scanned {scanned} items, updated {updated} ({scanned / elapsed:.0f} items/sec)")
+
+    verb = "Would update" if args.dry_run else "Updated"
+    print(
+        f"Done. Scanned: {scanned}, Current: {current}, Unchanged: {unchanged}, "
+        f"{verb}: {updated}, Conflicts: {conflicts}, Failed: {len(failed)}"
+    )
+    for item_id, error in failed[:20]:
+        print(f"  {item_id}: {error}")
+    print(f"Elapsed: {time.perf_counter() - started:.2f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
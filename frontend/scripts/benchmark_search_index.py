@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Benchmark the prebuilt inventory search index against the linear scan.
+
+Generates deterministic synthetic inventories, builds an index for each, runs
+a fixed query set through both the linear searchInventoryItems port and the
+index, checks that counts, fallback flags, display images and the full ranked
+order match, and reports per-query latency.
+
+With --write-fixtures DIR it also saves each inventory, its index and the
+query set, so scripts/search_index_parity.ts can run the same check against the
+TypeScript searchInventoryItems scan and the TypeScript index loader.
+
+Usage:
+  python scripts/benchmark_search_index.py
+  python scripts/benchmark_search_index.py --sizes 1000,10000,100000 --seed 7
+  python scripts/benchmark_search_index.py --sizes 1000,10000 --write-fixtures /tmp/search-fixtures
+  npx tsx scripts/search_index_parity.ts /tmp/search-fixtures
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from inventory_search import SearchIndex, SearchResult, build_index, search_items, write_index
+from tag_governance import build_searchable_tokens
+
+CATEGORIES = ["Jewelry", "Firearms", "Electronics", "Tools", "Musical Instruments", "Collectibles", "Sporting Goods", "Watches", ""]
+BRANDS = ["Rolex", "Glock", "Apple", "DeWalt", "Fender", "Funko", "Wilson", "Unknown", "", "Samsung", "Taurus", "Smith & Wesson"]
+WORDS = [
+    "gold", "14k", "sterling", "silver", "platinum", "chain", "pendant", "ring", "band", "bracelet", "watch",
+    "chronograph", "vintage", "retro", "cordless", "acoustic", "electric", "9mm", "pistol", "rifle", "shotgun",
+    "iphone", "laptop", "console", "drill", "saw", "wrench", "guitar", "amp", "amplifier", "with", "case",
+    "box", "mint", "scratches", "original", "charger", "gold-tone", "rings", "Necklaces", "tool-set",
+    "sawblade", "10K", "karat", "the", "and", "20\"", "(like-new)", "cuban", "link", "diamond", "0.5ct",
+]
+TAGS = ["gold", "firearms", "jewelry", "handgun", "long-gun", "excellent-condition", "ring", "chain", "watch", "tools"]
+
+QUERIES: List[Tuple[str, str]] = [
+    ("", ""),
+    ("jewelry", ""),
+    ("watch", ""),
+    ("firearms", ""),
+    ("guns", "glock"),
+    ("", "gold chain"),
+    ("jewelry", "gold chain"),
+    ("jewelry", "14k gold cuban link"),
+    ("", "pistol"),
+    ("firearms", "9mm pistol with case"),
+    ("electronics", "rolex watch"),
+    ("tools", "dewalt cordless drill"),
+    ("", "gold-tone"),
+    ("", "like-new"),
+    ("", "the"),
+    ("", "xyz nothing"),
+    ("", "ring!"),
+    ("", "20\""),
+    ("musical", "fender acoustic guitar"),
+    ("sporting", "wilson"),
+    ("!!!", "amp"),
+    ("", "smith & wesson"),
+    ("collectibles", "funko vintage box"),
+    ("jewelry", "diamond 0.5ct ring"),
+]
+
+
+def synthetic_inventory(size: int, seed: int) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    items = []
+    for index in range(size):
+        item: Dict[str, Any] = {
+            "item_id": f"bench-{index:06d}",
+            "category": rng.choice(CATEGORIES),
+            "brand": rng.choice(BRANDS),
+            "description": " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 14))),
+        }
+        if rng.random() < 0.5:
+            item["tags"] = rng.sample(TAGS, rng.randint(1, 4))
+        if rng.random() < 0.6:
+            item["searchable_tokens"] = build_searchable_tokens(item)
+        roll = rng.random()
+        if roll < 0.4:
+            item["image_url"] = f"/inventory/{index}.webp"
+        elif roll < 0.6:
+            item["images"] = [f"https://cdn.example.com/{index}.jpg"]
+        elif roll < 0.65:
+            item["image_url"] = ""
+        items.append(item)
+    return items
+
+
+def fingerprint(result: SearchResult) -> Tuple[Any, ...]:
+    return (
+        result.count,
+        result.used_keyword_fallback,
+        result.display_image,
+        [item["item_id"] for item in result.top_matches],
+    )
+
+
+def timed(fn, *args) -> Tuple[float, Any]:
+    started = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - started, result
+
+
+def write_fixture(directory: Path, size: int, items: List[Dict[str, Any]], payload: Dict[str, Any]) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / f"inventory-{size}.json").write_text(json.dumps(items, ensure_ascii=False), encoding="utf-8")
+    write_index(payload, directory / f"search-index-{size}.json")
+    (directory / "queries.json").write_text(json.dumps(QUERIES), encoding="utf-8")
+
+
+def run_benchmark(size: int, seed: int, fixtures: Optional[Path] = None) -> bool:
+    items = synthetic_inventory(size, seed)
+    build_seconds, payload = timed(build_index, items, "synthetic")
+    if fixtures:
+        write_fixture(fixtures, size, items, payload)
+    # Round-trip through JSON so the index under test is exactly what the file holds.
+    index = SearchIndex(json.loads(json.dumps(payload)))
+
+    linear_times: List[float] = []
+    index_times: List[float] = []
+    mismatches = 0
+    for category, keyword in QUERIES:
+        # Limit = size compares the complete ranking, not just the top five.
+        linear_seconds, expected = timed(search_items, items, category, keyword, size)
+        index_seconds, actual = timed(index.search, category, keyword, size)
+        linear_times.append(linear_seconds)
+        index_times.append(index_seconds)
+        if fingerprint(expected) != fingerprint(actual):
+            mismatches += 1
+            print(f"  mismatch: category={category!r} keyword={keyword!r}")
+
+    linear_ms = statistics.median(linear_times) * 1000
+    index_ms = statistics.median(index_times) * 1000
+    speedup = linear_ms / index_ms if index_ms > 0 else float("inf")
+    print(
+        f"{size:>7} items | build {build_seconds:6.2f}s | linear p50 {linear_ms:9.2f}ms | "
+        f"index p50 {index_ms:9.2f}ms | speedup {speedup:5.1f}x | mismatches {mismatches}"
+    )
+    return mismatches == 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the inventory search index against the linear scan")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated inventory sizes")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for synthetic inventories")
+    parser.add_argument("--write-fixtures", type=Path, default=None, help="Save inventories, indexes and queries for search_index_parity.ts")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    ok = all([run_benchmark(size, args.seed, args.write_fixtures) for size in sizes])
+    print("Parity: OK" if ok else "Parity: MISMATCH")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Benchmark the compiled tag engine against the original per-pattern regex tagger.
+
+Generates deterministic synthetic inventories, checks that both implementations
+produce identical tags for every item, and reports items/sec for each.
+
+Usage:
+  python scripts/benchmark_tag_engine.py
+  python scripts/benchmark_tag_engine.py --sizes 1000,10000,100000 --seed 7
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import sys
+import time
+from typing import Any, Dict, List
+
+from tag_engine import STOP_WORDS, SYNONYMS, TagEngine
+
+CATEGORIES = ["Jewelry", "Firearms", "Electronics", "Tools", "Musical Instruments", "Collectibles", "Sporting Goods"]
+BRANDS = ["Rolex", "Glock", "Apple", "DeWalt", "Fender", "Funko", "Wilson", "Unknown", "", "Samsung", "Taurus"]
+CONDITIONS = ["excellent", "good", "fair", "poor", "Used", ""]
+WORDS = [
+    "gold", "14k", "sterling", "silver", "platinum", "chain", "pendant", "ring", "band", "bracelet", "watch",
+    "chronograph", "vintage", "retro", "cordless", "acoustic", "electric", "9mm", "pistol", "rifle", "shotgun",
+    "iphone", "laptop", "console", "drill", "saw", "wrench", "guitar", "amp", "amplifier", "with", "case",
+    "box", "mint", "used", "new", "scratches", "original", "charger", "gold-tone", "rings", "Necklaces",
+    "tool-set", "sawblade", "10K", "karat", "the", "and",
+]
+EXISTING_TAGS = ["Gold", "guns", "jewellery", "sale", "x", "rings", "pre-owned", "a" * 40, "gift idea", "firearm"]
+
+
+def legacy_infer_tags(item: Dict[str, Any]) -> List[str]:
+    """Reference copy of the original backfill_inventory_tags.infer_tags."""
+
+    def _sanitize(text: str) -> str:
+        return re.sub(r"\s+", " ", re.sub(r"[^a-z0-9\s-]", " ", text.lower())).strip()
+
+    def _canonical(tag: str) -> str | None:
+        cleaned = _sanitize(tag)
+        if not cleaned or len(cleaned) < 2 or len(cleaned) > 30:
+            return None
+        if cleaned in STOP_WORDS:
+            return None
+        return SYNONYMS.get(cleaned, cleaned)
+
+    category = str(item.get("category") or "").strip().lower()
+    brand = str(item.get("brand") or "").strip().lower()
+    description = str(item.get("description") or "")
+    condition = str(item.get("condition") or "").strip().lower()
+    existing = item.get("tags") if isinstance(item.get("tags"), list) else []
+
+    candidates: List[str] = []
+
+    if category:
+        candidates.append(category)
+
+    if brand and brand not in {"unknown", "unbranded", "none", "n/a"}:
+        candidates.append(brand)
+
+    if condition:
+        if condition == "excellent":
+            candidates.append("excellent-condition")
+        elif condition == "good":
+            candidates.append("good-condition")
+        elif condition == "fair":
+            candidates.append("fair-condition")
+        elif condition == "poor":
+            candidates.append("poor-condition")
+
+    text_blob = f"{category} {brand} {description}".lower()
+
+    pattern_tags = [
+        (r"\b(gold|10k|14k|18k|24k|karat)\b", "gold"),
+        (r"\b(silver|sterling)\b", "silver"),
+        (r"\b(platinum)\b", "platinum"),
+        (r"\b(necklace|chain|pendant)\b", "necklace"),
+        (r"\b(ring|band)\b", "ring"),
+        (r"\b(bracelet)\b", "bracelet"),
+        (r"\b(watch|chronograph)\b", "watch"),
+        (r"\b(vintage|retro|classic)\b", "vintage"),
+        (r"\b(cordless|wireless)\b", "wireless"),
+        (r"\b(acoustic)\b", "acoustic"),
+        (r"\b(electric)\b", "electric"),
+        (r"\b(glock|taurus|ruger|colt|9mm|pistol|handgun|firearm)\b", "handgun"),
+        (r"\b(rifle|shotgun)\b", "long-gun"),
+        (r"\b(phone|iphone|android|laptop|tablet|camera|console)\b", "electronics"),
+        (r"\b(drill|saw|tool|wrench)\b", "tools"),
+        (r"\b(guitar|piano|drum|amplifier|amp)\b", "musical"),
+    ]
+
+    for pattern, tag in pattern_tags:
+        if re.search(pattern, text_blob):
+            candidates.append(tag)
+
+    candidates.extend([str(t) for t in existing])
+
+    deduped: List[str] = []
+    for candidate in candidates:
+        canonical = _canonical(candidate)
+        if not canonical:
+            continue
+        if canonical not in deduped:
+            deduped.append(canonical)
+        if len(deduped) >= 12:
+            break
+
+    return deduped
+
+
+def synthetic_inventory(size: int, seed: int) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    items = []
+    for index in range(size):
+        item: Dict[str, Any] = {
+            "item_id": f"bench-{index:06d}",
+            "category": rng.choice(CATEGORIES),
+            "brand": rng.choice(BRANDS),
+            "description": " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 14))),
+            "condition": rng.choice(CONDITIONS),
+        }
+        if rng.random() < 0.4:
+            item["tags"] = rng.sample(EXISTING_TAGS, rng.randint(1, 4))
+        items.append(item)
+    return items
+
+
+def run_benchmark(size: int, seed: int) -> bool:
+    items = synthetic_inventory(size, seed)
+
+    started = time.perf_counter()
+    expected = [legacy_infer_tags(item) for item in items]
+    legacy_seconds = time.perf_counter() - started
+
+    engine = TagEngine()
+    started = time.perf_counter()
+    actual = list(engine.infer_batch(items))
+    engine_seconds = time.perf_counter() - started
+
+    mismatches = sum(1 for left, right in zip(expected, actual) if left != right)
+    speedup = legacy_seconds / engine_seconds if engine_seconds > 0 else float("inf")
+    print(
+        f"{size:>7} items | legacy {legacy_seconds:7.3f}s ({size / legacy_seconds:>10.0f}/s) | "
+        f"engine {engine_seconds:7.3f}s ({size / engine_seconds:>10.0f}/s) | "
+        f"speedup {speedup:4.1f}x | mismatches {mismatches}"
+    )
+    return mismatches == 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark compiled tag inference against the legacy tagger")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated inventory sizes")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for synthetic inventories")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    ok = all([run_benchmark(size, args.seed) for size in sizes])
+    print("Parity: OK" if ok else "Parity: MISMATCH")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Build the prebuilt inventory search index used by /api/inventory/search.
+
+Scans the inventory table (or reads a JSON array export) and writes a versioned
+inverted index to frontend/data/inventory-search-index.json. The route serves
+queries from it when INVENTORY_SEARCH_INDEX points at the file; rebuild after
+inventory changes.
+
+Usage:
+  python scripts/build_search_index.py
+  python scripts/build_search_index.py --input inventory.json --output data/inventory-search-index.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+from inventory_search import DEFAULT_INDEX_PATH, build_index, write_index
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend" / "scripts"))
+from dynamodb_client import get_client  # noqa: E402
+
+DEFAULT_TABLE = "USA_Pawn_Inventory"
+
+
+def scan_table(table_name: str) -> Iterator[Dict[str, Any]]:
+    from boto3.dynamodb.types import TypeDeserializer
+
+    client = get_client()
+    deserializer = TypeDeserializer()
+    for page in client.get_paginator("scan").paginate(TableName=table_name):
+        for item in page.get("Items", []):
+            yield {key: deserializer.deserialize(value) for key, value in item.items()}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build the inventory search index")
+    parser.add_argument("--table", default=DEFAULT_TABLE, help="Inventory table to scan")
+    parser.add_argument("--input", type=Path, default=None, help="Read items from a JSON array instead of DynamoDB")
+    parser.add_argument("--output", type=Path, default=DEFAULT_INDEX_PATH, help="Index file to write")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.input:
+        items = json.loads(args.input.read_text(encoding="utf-8"))
+        source = str(args.input)
+    else:
+        items = scan_table(args.table)
+        source = args.table
+
+    payload = build_index(items, source=source)
+    size = write_index(payload, args.output)
+
+    print(f"Items: {payload['item_count']}")
+    print(f"Terms: {len(payload['postings'])}, categories: {len(payload['categories'])}")
+    print(f"Wrote {size / 1024:.1f} KiB to {args.output} in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,21 +1,26 @@
-import boto3
 import json
+import sys
+from pathlib import Path
 
-dynamodb = boto3.client('dynamodb', region_name='us-east-1')
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'backend' / 'scripts'))
+from dynamodb_client import get_client  # noqa: E402
+from staff_directory import STAFF_TABLE  # noqa: E402
 
-# Get the staff_records item
-result = dynamodb.get_item(
+dynamodb = get_client()
+
+# Staff live one per row in USA_Pawn_Staff (see backend/scripts/migrate_staff_records.py)
+result = dynamodb.scan(TableName=STAFF_TABLE, ProjectionExpression='staff_key, #n, #r', ExpressionAttributeNames={'#n': 'name', '#r': 'role'})
+
+if result.get('Items'):
+    print(f"✅ {result['Count']} staff records found:")
+    for item in result['Items']:
+        print(json.dumps(item, default=str))
+else:
+    print('❌ No staff records found')
+
+legacy = dynamodb.get_item(
     TableName='USA_Pawn_Store_Config',
     Key={'config_key': {'S': 'staff_records'}}
 )
-
-if 'Item' in result:
-    print('✅ Staff config found:')
-    item = result['Item']
-    print(json.dumps(item, indent=2, default=str))
-else:
-    print('❌ Staff config not found')
-    print('Available items:')
-    scan = dynamodb.scan(TableName='USA_Pawn_Store_Config', Limit=5)
-    for item in scan.get('Items', []):
-        print(f"  - {item.get('config_key', {}).get('S', 'unknown')}")
+if 'Item' in legacy:
+    print('⚠️  Legacy staff_records config item still present; run backend/scripts/migrate_staff_records.py')
@@ -0,0 +1,116 @@
+"""
+Keep-alive JSON client for the frontend inventory API.
+
+Each worker thread reuses its own persistent HTTP connection. Retryable
+responses (429/5xx) and dropped connections feed a shared adaptive backoff, so
+every worker slows down together when the server pushes back and speeds up
+again as requests succeed.
+"""
+
+from __future__ import annotations
+
+import http.client
+import json
+import random
+import threading
+import time
+from typing import Any, Dict, List
+from urllib import parse
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class ApiError(RuntimeError):
+    def __init__(self, message: str, status: int = 0):
+        super().__init__(message)
+        self.status = status
+
+
+class AdaptiveBackoff:
+    def __init__(self, base_seconds: float = 0.25, max_seconds: float = 30.0):
+        self.base_seconds = base_seconds
+        self.max_seconds = max_seconds
+        self.delay = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        delay = self.delay
+        if delay > 0:
+            time.sleep(random.uniform(delay / 2, delay))
+
+    def penalize(self, retry_after: float | None = None) -> None:
+        with self._lock:
+            self.delay = min(self.max_seconds, max(self.base_seconds, self.delay * 2, retry_after or 0.0))
+
+    def relax(self) -> None:
+        with self._lock:
+            self.delay = self.delay / 2 if self.delay > self.base_seconds / 4 else 0.0
+
+
+class InventoryApi:
+    def __init__(self, base_url: str, timeout: float = 30.0, max_retries: int = 5):
+        parsed = parse.urlsplit(base_url.rstrip("/"))
+        self.scheme = parsed.scheme or "http"
+        self.netloc = parsed.netloc
+        self.prefix = parsed.path
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = AdaptiveBackoff()
+        self._local = threading.local()
+        self._connections: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            factory = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            conn = factory(self.netloc, timeout=self.timeout)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _reset_connection(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def request_json(self, method: str, path: str, payload: Dict[str, Any] | None = None) -> Dict[str, Any]:
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+
+        for attempt in range(self.max_retries + 1):
+            self.backoff.wait()
+            try:
+                conn = self._connection()
+                conn.request(method, f"{self.prefix}{path}", body=body, headers=headers)
+                response = conn.getresponse()
+                raw = response.read().decode("utf-8")
+            except (http.client.HTTPException, OSError) as exc:
+                self._reset_connection()
+                if attempt == self.max_retries:
+                    raise ApiError(f"{method} {path} failed: {exc}") from exc
+                self.backoff.penalize()
+                continue
+
+            if response.status in RETRY_STATUSES:
+                if attempt == self.max_retries:
+                    raise ApiError(f"{method} {path} failed: {response.status} {raw}", response.status)
+                retry_after = response.getheader("Retry-After")
+                self.backoff.penalize(float(retry_after) if retry_after and retry_after.isdigit() else None)
+                continue
+
+            if response.status >= 400:
+                raise ApiError(f"{method} {path} failed: {response.status} {raw}", response.status)
+
+            self.backoff.relax()
+            return json.loads(raw) if raw else {}
+
+        raise ApiError(f"{method} {path} failed: retries exhausted")
+
+    def close(self) -> None:
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
@@ -0,0 +1,383 @@
+"""
+Inventory search: linear reference and prebuilt inverted index.
+
+``search_items`` is a line-for-line port of searchInventoryItems in
+src/lib/inventory-search.ts. ``SearchIndex`` answers the same queries from an
+index file written by ``build_index``: postings map every lowercase
+``[a-z0-9-]+`` run of an item's searchable text to item positions, so the
+substring tests the scorer runs can be narrowed to a candidate set first.
+Candidates are then filtered and ranked with the exact same code, which keeps
+results identical to the linear scan.
+
+Index file layout (version 1):
+  items       inventory records in table scan order
+  postings    {word: [item position, ...]} ascending
+  categories  {lowercase item category: [item position, ...]}
+  weights     scoring weights the index was built for
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import math
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Sequence
+
+from tag_governance import matches_category_candidates, resolve_category_candidates, tokenize_search_input
+
+INDEX_VERSION = 1
+DEFAULT_INDEX_PATH = Path(__file__).resolve().parents[1] / "data" / "inventory-search-index.json"
+
+# Mirrors SEARCH_WEIGHTS in src/lib/inventory-search.ts.
+SEARCH_WEIGHTS = {
+    "categoryExact": 4,
+    "categoryContains": 2,
+    "categoryCandidateExact": 2,
+    "categoryCandidateContains": 1,
+    "keywordText": 6,
+    "keywordDescription": 5,
+    "keywordBrand": 4,
+    "keywordTags": 4,
+    "keywordCategory": 2,
+    "tokenText": 1,
+    "tokenDescription": 1,
+    "tokenBrand": 1,
+    "tokenTags": 1,
+    "tokenSearchable": 1,
+    "image": 0.5,
+}
+
+WORD_RUN = re.compile(r"[a-z0-9-]+")
+
+
+def js_string(value: Any) -> str:
+    """String(value) as JavaScript would render a JSON-decoded value."""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, Decimal)) or (isinstance(value, float) and value.is_integer()):
+        return str(int(value)) if value == int(value) else str(value)
+    if isinstance(value, float):
+        return "NaN" if math.isnan(value) else repr(value)
+    if isinstance(value, list):
+        return ",".join("" if entry is None else js_string(entry) for entry in value)
+    if isinstance(value, dict):
+        return "[object Object]"
+    return str(value)
+
+
+def js_truthy(value: Any) -> bool:
+    if isinstance(value, (list, dict)):
+        return True
+    if isinstance(value, float) and math.isnan(value):
+        return False
+    return bool(value)
+
+
+@dataclass(frozen=True)
+class ItemBlob:
+    item_category: str
+    brand: str
+    description: str
+    tags: str
+    searchable_tokens: str
+    searchable_text: str
+
+
+@dataclass(frozen=True)
+class SearchQuery:
+    category: str
+    keyword: str
+    limit: int
+    keyword_tokens: List[str]
+    category_candidates: List[str]
+
+
+@dataclass
+class SearchResult:
+    query_category: str
+    query_keyword: str
+    count: int
+    top_matches: List[Dict[str, Any]]
+    display_image: str | None
+    used_keyword_fallback: bool
+
+
+def _field(item: Dict[str, Any], key: str) -> str:
+    value = item.get(key)
+    return "" if value is None else js_string(value).lower()
+
+
+def _joined(item: Dict[str, Any], key: str) -> str:
+    value = item.get(key)
+    return " ".join(js_string(entry).lower() for entry in value) if isinstance(value, list) else ""
+
+
+def item_blob(item: Dict[str, Any]) -> ItemBlob:
+    item_category = _field(item, "category")
+    brand = _field(item, "brand")
+    description = _field(item, "description")
+    tags = _joined(item, "tags")
+    searchable_tokens = _joined(item, "searchable_tokens")
+    return ItemBlob(
+        item_category,
+        brand,
+        description,
+        tags,
+        searchable_tokens,
+        f"{item_category} {brand} {description} {tags} {searchable_tokens}",
+    )
+
+
+def prepare_query(category: str, keyword: str, limit: int = 5) -> SearchQuery:
+    query_category = category.lower().strip()
+    query_keyword = keyword.lower().strip()
+    keyword_tokens = tokenize_search_input(query_keyword)
+    return SearchQuery(
+        query_category,
+        query_keyword,
+        max(1, limit),
+        keyword_tokens,
+        resolve_category_candidates(query_category, keyword_tokens),
+    )
+
+
+def _matches(blob: ItemBlob, query: SearchQuery, require_category_match: bool) -> bool:
+    text = blob.searchable_text
+    if not query.keyword:
+        keyword_match = True
+    elif query.keyword in text:
+        keyword_match = True
+    else:
+        token_hits = sum(1 for token in query.keyword_tokens if token in text)
+        if len(query.keyword_tokens) <= 1:
+            keyword_match = token_hits == 1
+        else:
+            keyword_match = token_hits / len(query.keyword_tokens) >= 0.6
+
+    if not keyword_match:
+        return False
+    if not require_category_match or not query.category:
+        return True
+    return matches_category_candidates(blob.item_category, query.category_candidates)
+
+
+def _score(item: Dict[str, Any], blob: ItemBlob, query: SearchQuery) -> float:
+    weights = SEARCH_WEIGHTS
+    images = item.get("images")
+    has_image = js_truthy(item.get("image_url")) or (isinstance(images, list) and len(images) > 0)
+    category = blob.item_category
+    score = 0.0
+
+    if query.category:
+        if category == query.category:
+            score += weights["categoryExact"]
+        elif query.category in category:
+            score += weights["categoryContains"]
+        elif any(category == candidate for candidate in query.category_candidates):
+            score += weights["categoryCandidateExact"]
+        elif any(candidate in category for candidate in query.category_candidates):
+            score += weights["categoryCandidateContains"]
+
+    if query.keyword:
+        keyword = query.keyword
+        if keyword in blob.searchable_text:
+            score += weights["keywordText"]
+        if keyword in blob.description:
+            score += weights["keywordDescription"]
+        if keyword in blob.brand:
+            score += weights["keywordBrand"]
+        if keyword in blob.tags:
+            score += weights["keywordTags"]
+        if keyword in category:
+            score += weights["keywordCategory"]
+
+        for token in query.keyword_tokens:
+            if token in blob.searchable_text:
+                score += weights["tokenText"]
+            if token in blob.description:
+                score += weights["tokenDescription"]
+            if token in blob.brand:
+                score += weights["tokenBrand"]
+            if token in blob.tags:
+                score += weights["tokenTags"]
+            if token in blob.searchable_tokens:
+                score += weights["tokenSearchable"]
+
+    if has_image:
+        score += weights["image"]
+    return score
+
+
+def _display_image(item: Dict[str, Any]) -> str | None:
+    image_url = item.get("image_url")
+    rendered = "" if image_url is None else js_string(image_url)
+    if rendered:
+        return rendered
+    images = item.get("images")
+    return js_string(images[0]) if isinstance(images, list) and images else None
+
+
+def rank_candidates(
+    items: Sequence[Dict[str, Any]], blobs: Sequence[ItemBlob], query: SearchQuery, candidates: Iterable[int]
+) -> SearchResult:
+    candidate_list = list(candidates)
+    strict = [index for index in candidate_list if _matches(blobs[index], query, True)]
+    fallback = [index for index in candidate_list if _matches(blobs[index], query, False)] if query.keyword else strict
+    used_fallback = not strict and bool(fallback) and bool(query.category)
+    filtered = fallback if used_fallback else strict
+
+    ranked = sorted(filtered, key=lambda index: -_score(items[index], blobs[index], query))
+    top_matches = [items[index] for index in ranked[: query.limit]]
+
+    return SearchResult(
+        query.category,
+        query.keyword,
+        len(filtered),
+        top_matches,
+        _display_image(top_matches[0]) if top_matches else None,
+        used_fallback,
+    )
+
+
+def search_items(items: Sequence[Dict[str, Any]], category: str, keyword: str, limit: int = 5) -> SearchResult:
+    """Linear scan, equivalent to searchInventoryItems."""
+    blobs = [item_blob(item) for item in items]
+    return rank_candidates(items, blobs, prepare_query(category, keyword, limit), range(len(items)))
+
+
+def _json_safe(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, dict):
+        return {key: _json_safe(entry) for key, entry in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [_json_safe(entry) for entry in value]
+    return value
+
+
+def build_index(items: Iterable[Dict[str, Any]], source: str = "") -> Dict[str, Any]:
+    records: List[Dict[str, Any]] = []
+    postings: Dict[str, List[int]] = {}
+    categories: Dict[str, List[int]] = {}
+
+    for position, item in enumerate(items):
+        record = _json_safe(item)
+        records.append(record)
+        blob = item_blob(record)
+        categories.setdefault(blob.item_category, []).append(position)
+        for word in set(WORD_RUN.findall(blob.searchable_text)):
+            postings.setdefault(word, []).append(position)
+
+    return {
+        "version": INDEX_VERSION,
+        "built_at": datetime.now(timezone.utc).isoformat(),
+        "source": source,
+        "weights": SEARCH_WEIGHTS,
+        "item_count": len(records),
+        "items": records,
+        "postings": dict(sorted(postings.items())),
+        "categories": categories,
+    }
+
+
+def write_index(payload: Dict[str, Any], path: Path = DEFAULT_INDEX_PATH) -> int:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    encoded = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(encoded)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return len(encoded)
+
+
+class SearchIndex:
+    def __init__(self, payload: Dict[str, Any]):
+        if payload.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported search index version: {payload.get('version')}")
+        if payload.get("weights") != SEARCH_WEIGHTS:
+            raise ValueError("Search index was built with different scoring weights")
+
+        self.items: List[Dict[str, Any]] = payload["items"]
+        self.blobs = [item_blob(item) for item in self.items]
+        self.categories: Dict[str, List[int]] = payload["categories"]
+        self.postings: Dict[str, List[int]] = payload["postings"]
+
+        # Vocabulary joined into one newline-separated string so substring
+        # lookups run as str.find over a single buffer.
+        self._words = list(self.postings)
+        self._offsets: List[int] = []
+        offset = 0
+        for word in self._words:
+            self._offsets.append(offset)
+            offset += len(word) + 1
+        self._vocabulary = "\n".join(self._words)
+        self._term_cache: Dict[str, List[int]] = {}
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_INDEX_PATH) -> "SearchIndex":
+        return cls(json.loads(path.read_text(encoding="utf-8")))
+
+    def term_postings(self, term: str) -> List[int]:
+        """Positions of items whose searchable text contains ``term``, a single [a-z0-9-] run."""
+        cached = self._term_cache.get(term)
+        if cached is not None:
+            return cached
+
+        matched: set[int] = set()
+        seen_words: set[int] = set()
+        start = self._vocabulary.find(term)
+        while start != -1:
+            word_index = bisect.bisect_right(self._offsets, start) - 1
+            if word_index not in seen_words:
+                seen_words.add(word_index)
+                matched.update(self.postings[self._words[word_index]])
+            start = self._vocabulary.find(term, start + 1)
+
+        result = sorted(matched)
+        self._term_cache[term] = result
+        return result
+
+    def candidates(self, query: SearchQuery) -> Iterable[int]:
+        if not query.keyword:
+            if not query.category:
+                return range(len(self.items))
+            positions: set[int] = set()
+            for category, members in self.categories.items():
+                if matches_category_candidates(category, query.category_candidates):
+                    positions.update(members)
+            return sorted(positions)
+
+        # Any keyword match needs either the whole keyword (every run of it
+        # inside some word) or at least one token to appear in the text.
+        runs = WORD_RUN.findall(query.keyword)
+        if not runs:
+            return range(len(self.items))
+
+        direct: set[int] | None = None
+        for run in sorted(set(runs), key=len, reverse=True):
+            members = self.term_postings(run)
+            direct = set(members) if direct is None else direct.intersection(members)
+            if not direct:
+                break
+
+        positions = set(direct or ())
+        for token in query.keyword_tokens:
+            positions.update(self.term_postings(token))
+        return sorted(positions)
+
+    def search(self, category: str, keyword: str, limit: int = 5) -> SearchResult:
+        query = prepare_query(category, keyword, limit)
+        return rank_candidates(self.items, self.blobs, query, self.candidates(query))
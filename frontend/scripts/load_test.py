@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Load-test the read-heavy API routes of a local Next.js server.
+
+Usage:
+  python scripts/load_test.py
+  python scripts/load_test.py --concurrency 32 --duration 60
+  python scripts/load_test.py --mix inventory=2,inventory_search=5,leads=1 --requests 5000
+  python scripts/load_test.py --compare scripts/load_results/baseline.json --tolerance 0.2
+
+Run it against a local stack only:
+  docker run -p 8000:8000 amazon/dynamodb-local
+  export AWS_ENDPOINT_URL_DYNAMODB=http://localhost:8000 AWS_ACCESS_KEY_ID=local AWS_SECRET_ACCESS_KEY=local
+  python backend/scripts/create_tables.py
+  python backend/scripts/seed_database.py --scale 100000
+  npm run build && npm run start   # same environment, from frontend/
+
+Each worker thread keeps one persistent connection and picks requests from the
+weighted mix. Requests are never retried, so errors show up in the results.
+Latency percentiles, throughput, error rate and status counts per scenario are
+written to a JSON file. --compare checks them against an earlier run and exits
+non-zero when p95 latency or error rate regresses beyond --tolerance.
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import math
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+from urllib import parse
+
+RESULTS_DIR = Path(__file__).resolve().parent / "load_results"
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1", "0.0.0.0"}
+
+SEARCH_TERMS = [
+    ("jewelry", "gold chain"),
+    ("jewelry", "14k"),
+    ("", "rolex watch"),
+    ("firearms", "9mm pistol"),
+    ("electronics", "iphone"),
+    ("tools", "dewalt cordless drill"),
+    ("musical", "acoustic guitar"),
+    ("", "diamond ring"),
+    ("collectibles", ""),
+    ("", "nothing matches this"),
+]
+LEAD_STATUSES = ["new", "contacted", "scheduled", "completed"]
+STAFF_NAMES = ["Alex Rivera", "Jordan Blake", "Sam Carter", "Taylor Brooks"]
+
+RequestSpec = Tuple[str, str, Dict[str, Any] | None]
+
+
+def inventory_request(rng: random.Random) -> RequestSpec:
+    category = rng.choice(["", "jewelry", "electronics", "tools"])
+    query = {"limit": "20", "sort": rng.choice(["newest", "price-low", "price-high"])}
+    if category:
+        query["category"] = category
+    return "GET", f"/api/inventory?{parse.urlencode(query)}", None
+
+
+def inventory_page_request(rng: random.Random) -> RequestSpec:
+    return "GET", "/api/inventory?limit=100&cursor=", None
+
+
+def inventory_search_request(rng: random.Random) -> RequestSpec:
+    category, keyword = rng.choice(SEARCH_TERMS)
+    return "POST", "/api/inventory/search", {"category": category, "keyword": keyword}
+
+
+def leads_request(rng: random.Random) -> RequestSpec:
+    return "GET", f"/api/leads?status={rng.choice(LEAD_STATUSES)}&limit=50", None
+
+
+def leads_all_request(rng: random.Random) -> RequestSpec:
+    return "GET", "/api/leads?limit=50", None
+
+
+def schedule_request(rng: random.Random) -> RequestSpec:
+    return "GET", "/api/schedule", None
+
+
+def staff_log_request(rng: random.Random) -> RequestSpec:
+    return "GET", f"/api/staff-log?{parse.urlencode({'staff_name': rng.choice(STAFF_NAMES)})}", None
+
+
+def conversations_request(rng: random.Random) -> RequestSpec:
+    return "GET", f"/api/conversations?days={rng.choice([1, 7, 30])}", None
+
+
+SCENARIOS: Dict[str, Callable[[random.Random], RequestSpec]] = {
+    "inventory": inventory_request,
+    "inventory_page": inventory_page_request,
+    "inventory_search": inventory_search_request,
+    "leads": leads_request,
+    "leads_all": leads_all_request,
+    "schedule": schedule_request,
+    "staff_log": staff_log_request,
+    "conversations": conversations_request,
+}
+DEFAULT_MIX = "inventory=3,inventory_page=1,inventory_search=4,leads=2,leads_all=1,schedule=1,staff_log=1,conversations=1"
+
+
+@dataclass
+class ScenarioStats:
+    latencies: List[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    errors: int = 0
+    bytes_received: int = 0
+
+
+def parse_mix(raw: str) -> Dict[str, float]:
+    mix: Dict[str, float] = {}
+    for part in raw.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario '{name}'. Choose from: {', '.join(SCENARIOS)}")
+        mix[name] = float(weight or 1)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("Request mix must contain at least one scenario with positive weight")
+    return mix
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(stats: ScenarioStats, elapsed: float) -> Dict[str, Any]:
+    latencies = sorted(stats.latencies)
+    count = len(latencies)
+    return {
+        "requests": count,
+        "errors": stats.errors,
+        "error_rate": stats.errors / count if count else 0.0,
+        "throughput_rps": count / elapsed if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "min": latencies[0] * 1000 if latencies else 0.0,
+            "mean": sum(latencies) / count * 1000 if count else 0.0,
+            "p50": percentile(latencies, 50) * 1000,
+            "p95": percentile(latencies, 95) * 1000,
+            "p99": percentile(latencies, 99) * 1000,
+            "max": latencies[-1] * 1000 if latencies else 0.0,
+        },
+        "statuses": {str(status): total for status, total in sorted(stats.statuses.items(), key=lambda kv: str(kv[0]))},
+        "bytes_received": stats.bytes_received,
+    }
+
+
+class LoadRunner:
+    def __init__(self, base_url: str, mix: Dict[str, float], timeout: float, seed: int):
+        parsed = parse.urlsplit(base_url.rstrip("/"))
+        self.scheme = parsed.scheme or "http"
+        self.netloc = parsed.netloc
+        self.prefix = parsed.path
+        self.timeout = timeout
+        self.names = list(mix)
+        self.weights = [mix[name] for name in self.names]
+        self.seed = seed
+        self.stats: Dict[str, ScenarioStats] = {name: ScenarioStats() for name in self.names}
+        self._lock = threading.Lock()
+        self._issued = 0
+
+    def _connect(self) -> http.client.HTTPConnection:
+        factory = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        return factory(self.netloc, timeout=self.timeout)
+
+    def _claim(self, max_requests: int, deadline: float) -> bool:
+        if time.perf_counter() >= deadline:
+            return False
+        with self._lock:
+            if max_requests and self._issued >= max_requests:
+                return False
+            self._issued += 1
+            return True
+
+    def _worker(self, worker_id: int, max_requests: int, deadline: float, record: bool) -> None:
+        rng = random.Random(self.seed * 1000 + worker_id)
+        local: Dict[str, ScenarioStats] = {name: ScenarioStats() for name in self.names}
+        conn = self._connect()
+
+        while self._claim(max_requests, deadline):
+            name = rng.choices(self.names, weights=self.weights)[0]
+            method, path, payload = SCENARIOS[name](rng)
+            body = json.dumps(payload).encode("utf-8") if payload is not None else None
+            headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+            stats = local[name]
+
+            started = time.perf_counter()
+            try:
+                conn.request(method, f"{self.prefix}{path}", body=body, headers=headers)
+                response = conn.getresponse()
+                raw = response.read()
+                elapsed = time.perf_counter() - started
+                stats.statuses[response.status] += 1
+                stats.bytes_received += len(raw)
+                if response.status >= 400:
+                    stats.errors += 1
+            except (http.client.HTTPException, OSError) as exc:
+                elapsed = time.perf_counter() - started
+                stats.statuses[type(exc).__name__] += 1
+                stats.errors += 1
+                conn.close()
+                conn = self._connect()
+            stats.latencies.append(elapsed)
+
+        conn.close()
+        if record:
+            with self._lock:
+                for name, stats in local.items():
+                    merged = self.stats[name]
+                    merged.latencies.extend(stats.latencies)
+                    merged.statuses.update(stats.statuses)
+                    merged.errors += stats.errors
+                    merged.bytes_received += stats.bytes_received
+
+    def run(self, concurrency: int, duration: float, max_requests: int, record: bool = True) -> float:
+        self._issued = 0
+        deadline = time.perf_counter() + duration if duration > 0 else math.inf
+        threads = [
+            threading.Thread(target=self._worker, args=(worker_id, max_requests, deadline, record), daemon=True)
+            for worker_id in range(concurrency)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - started
+
+
+def compare_runs(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    regressions: List[str] = []
+    print(f"\nComparison against baseline ({baseline.get('started_at', 'unknown')}):")
+    for name, result in current["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous or not previous.get("requests"):
+            print(f"  {name:<18} no baseline")
+            continue
+        old_p95 = previous["latency_ms"]["p95"]
+        new_p95 = result["latency_ms"]["p95"]
+        change = (new_p95 - old_p95) / old_p95 if old_p95 > 0 else 0.0
+        print(
+            f"  {name:<18} p95 {old_p95:8.1f}ms -> {new_p95:8.1f}ms ({change:+.0%}), "
+            f"errors {previous['error_rate']:.2%} -> {result['error_rate']:.2%}"
+        )
+        if change > tolerance:
+            regressions.append(f"{name}: p95 up {change:.0%}")
+        if result["error_rate"] > previous["error_rate"] + 0.01:
+            regressions.append(f"{name}: error rate {previous['error_rate']:.2%} -> {result['error_rate']:.2%}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load-test the read-heavy API routes")
+    parser.add_argument("--base-url", default="http://localhost:3000", help="Base URL of the local Next.js server")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent workers (one connection each)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run (0 = until --requests)")
+    parser.add_argument("--requests", type=int, default=0, help="Stop after this many requests (0 = no limit)")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Unrecorded warm-up seconds")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Weighted scenarios, e.g. inventory=3,leads=1")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for request selection")
+    parser.add_argument("--output", type=Path, default=None, help="Results JSON path (default: scripts/load_results/)")
+    parser.add_argument("--compare", type=Path, default=None, help="Baseline results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed p95 increase before flagging a regression")
+    parser.add_argument("--allow-remote", action="store_true", help="Permit a non-local --base-url")
+    args = parser.parse_args()
+
+    host = parse.urlsplit(args.base_url).hostname or ""
+    if host not in LOCAL_HOSTS and not args.allow_remote:
+        parser.error(f"Refusing to load-test non-local host '{host}'. Pass --allow-remote to override.")
+    if args.duration <= 0 and args.requests <= 0:
+        parser.error("Set --duration or --requests so the run terminates.")
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    runner = LoadRunner(args.base_url, mix, args.timeout, args.seed)
+    if args.warmup > 0:
+        print(f"Warming up for {args.warmup:.0f}s...")
+        runner.run(args.concurrency, args.warmup, 0, record=False)
+
+    print(f"Running {args.concurrency} workers against {args.base_url} ({', '.join(mix)})...")
+    started_at = datetime.now(timezone.utc)
+    elapsed = runner.run(args.concurrency, args.duration, args.requests)
+
+    scenarios = {name: summarize(stats, elapsed) for name, stats in runner.stats.items()}
+    total = ScenarioStats()
+    for stats in runner.stats.values():
+        total.latencies.extend(stats.latencies)
+        total.statuses.update(stats.statuses)
+        total.errors += stats.errors
+        total.bytes_received += stats.bytes_received
+
+    results = {
+        "started_at": started_at.isoformat(),
+        "base_url": args.base_url,
+        "concurrency": args.concurrency,
+        "duration_s": elapsed,
+        "mix": mix,
+        "seed": args.seed,
+        "overall": summarize(total, elapsed),
+        "scenarios": scenarios,
+    }
+
+    print(f"\n{'scenario':<18}{'reqs':>8}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>9}")
+    for name, result in [*scenarios.items(), ("overall", results["overall"])]:
+        latency = result["latency_ms"]
+        print(
+            f"{name:<18}{result['requests']:>8}{result['throughput_rps']:>9.1f}"
+            f"{latency['p50']:>10.1f}{latency['p95']:>10.1f}{latency['p99']:>10.1f}{result['error_rate']:>9.2%}"
+        )
+
+    output = args.output or RESULTS_DIR / f"run-{started_at.strftime('%Y%m%dT%H%M%SZ')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"\nResults: {output}")
+
+    if args.compare:
+        regressions = compare_runs(results, json.loads(args.compare.read_text(encoding="utf-8")), args.tolerance)
+        if regressions:
+            print("Regressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("No regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
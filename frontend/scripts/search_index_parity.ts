@@ -0,0 +1,101 @@
+/* ──────────────────────────────────────────────────────
+   Search index parity, TypeScript side
+
+   benchmark_search_index.py checks the Python index against the Python scan.
+   This runs the path the app actually serves: each saved index is loaded
+   through loadInventorySearchIndex (INVENTORY_SEARCH_INDEX) and queried with
+   searchInventoryIndex, and every query is compared with searchInventoryItems
+   scanning the same inventory. Counts, fallback flags, display images and
+   the full ranked order must match.
+
+   Usage:
+     python scripts/benchmark_search_index.py --sizes 1000,10000 --write-fixtures /tmp/search-fixtures
+     npx tsx scripts/search_index_parity.ts /tmp/search-fixtures
+   ────────────────────────────────────────────────────── */
+
+import { readdirSync, readFileSync } from "fs";
+import path from "path";
+import { searchInventoryItems, type InventorySearchResult } from "@/lib/inventory-search";
+import { loadInventorySearchIndex, searchInventoryIndex } from "@/lib/inventory-search-index";
+
+type Query = [category: string, keyword: string];
+
+function fingerprint(result: InventorySearchResult): string {
+  return JSON.stringify([
+    result.count,
+    result.usedKeywordFallback,
+    result.displayImage,
+    result.topMatches.map((item) => item.item_id),
+  ]);
+}
+
+function median(values: number[]): number {
+  const sorted = [...values].sort((a, b) => a - b);
+  const middle = sorted.length >> 1;
+  return sorted.length % 2 ? sorted[middle] : (sorted[middle - 1] + sorted[middle]) / 2;
+}
+
+function checkSize(directory: string, size: number, queries: Query[]): boolean {
+  const items = JSON.parse(readFileSync(path.join(directory, `inventory-${size}.json`), "utf-8")) as Array<
+    Record<string, unknown>
+  >;
+  process.env.INVENTORY_SEARCH_INDEX = path.join(directory, `search-index-${size}.json`);
+  const index = loadInventorySearchIndex();
+  if (!index) {
+    console.log(`${String(size).padStart(7)} items | index failed to load`);
+    return false;
+  }
+
+  const scanTimes: number[] = [];
+  const indexTimes: number[] = [];
+  let mismatches = 0;
+  for (const [category, keyword] of queries) {
+    // limit = size compares the complete ranking, not just the top five.
+    let started = performance.now();
+    const expected = searchInventoryItems(items, { category, keyword, limit: size });
+    scanTimes.push(performance.now() - started);
+
+    started = performance.now();
+    const actual = searchInventoryIndex(index, { category, keyword, limit: size });
+    indexTimes.push(performance.now() - started);
+
+    if (fingerprint(expected) !== fingerprint(actual)) {
+      mismatches++;
+      console.log(`  mismatch: category=${JSON.stringify(category)} keyword=${JSON.stringify(keyword)}`);
+    }
+  }
+
+  const scanMs = median(scanTimes);
+  const indexMs = median(indexTimes);
+  console.log(
+    `${String(size).padStart(7)} items | scan p50 ${scanMs.toFixed(2).padStart(9)}ms | ` +
+      `index p50 ${indexMs.toFixed(2).padStart(9)}ms | speedup ${(scanMs / indexMs).toFixed(1).padStart(5)}x | ` +
+      `mismatches ${mismatches}`
+  );
+  return mismatches === 0;
+}
+
+function main(): number {
+  const directory = path.resolve(process.argv[2] ?? "");
+  if (!process.argv[2]) {
+    console.error("Usage: tsx scripts/search_index_parity.ts <fixtures dir from benchmark_search_index.py --write-fixtures>");
+    return 2;
+  }
+
+  const queries = JSON.parse(readFileSync(path.join(directory, "queries.json"), "utf-8")) as Query[];
+  const sizes = readdirSync(directory)
+    .map((name) => /^inventory-(\d+)\.json$/.exec(name)?.[1])
+    .filter((size): size is string => Boolean(size))
+    .map(Number)
+    .sort((a, b) => a - b);
+  if (sizes.length === 0) {
+    console.error(`No inventory-<size>.json fixtures in ${directory}`);
+    return 2;
+  }
+
+  const ok = sizes.map((size) => checkSize(directory, size, queries)).every(Boolean);
+  console.log(ok ? "Parity: OK" : "Parity: MISMATCH");
+  return ok ? 0 : 1;
+}
+
+process.exitCode = main();
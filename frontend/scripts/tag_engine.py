@@ -0,0 +1,180 @@
+"""
+Compiled inventory tag inference shared by the backfill and batch jobs.
+
+All keyword rules are folded into a single word-boundary alternation, so each
+item's text is scanned once instead of once per rule. Output matches the
+original per-pattern ``re.search`` implementation exactly.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+STOP_WORDS = {
+    "the",
+    "and",
+    "for",
+    "with",
+    "this",
+    "that",
+    "item",
+    "any",
+    "have",
+    "show",
+    "looking",
+    "look",
+    "please",
+    "sale",
+    "sell",
+    "new",
+    "used",
+}
+
+SYNONYMS = {
+    "gun": "firearms",
+    "guns": "firearms",
+    "firearm": "firearms",
+    "pistol": "handgun",
+    "revolver": "handgun",
+    "rifle": "long-gun",
+    "shotgun": "long-gun",
+    "jewelery": "jewelry",
+    "jewellery": "jewelry",
+    "necklaces": "necklace",
+    "chains": "chain",
+    "rings": "ring",
+    "sterling": "silver",
+    "goldtone": "gold-tone",
+}
+
+# (keywords, tag) in emission order. Every keyword is a whole word.
+PATTERN_TAGS: List[Tuple[Tuple[str, ...], str]] = [
+    (("gold", "10k", "14k", "18k", "24k", "karat"), "gold"),
+    (("silver", "sterling"), "silver"),
+    (("platinum",), "platinum"),
+    (("necklace", "chain", "pendant"), "necklace"),
+    (("ring", "band"), "ring"),
+    (("bracelet",), "bracelet"),
+    (("watch", "chronograph"), "watch"),
+    (("vintage", "retro", "classic"), "vintage"),
+    (("cordless", "wireless"), "wireless"),
+    (("acoustic",), "acoustic"),
+    (("electric",), "electric"),
+    (("glock", "taurus", "ruger", "colt", "9mm", "pistol", "handgun", "firearm"), "handgun"),
+    (("rifle", "shotgun"), "long-gun"),
+    (("phone", "iphone", "android", "laptop", "tablet", "camera", "console"), "electronics"),
+    (("drill", "saw", "tool", "wrench"), "tools"),
+    (("guitar", "piano", "drum", "amplifier", "amp"), "musical"),
+]
+
+CONDITION_TAGS = {
+    "excellent": "excellent-condition",
+    "good": "good-condition",
+    "fair": "fair-condition",
+    "poor": "poor-condition",
+}
+
+IGNORED_BRANDS = {"unknown", "unbranded", "none", "n/a"}
+
+MAX_TAGS = 12
+
+_NON_TAG_CHARS = re.compile(r"[^a-z0-9\s-]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def sanitize(text: str) -> str:
+    return _WHITESPACE.sub(" ", _NON_TAG_CHARS.sub(" ", text.lower())).strip()
+
+
+class TagEngine:
+    def __init__(
+        self,
+        pattern_tags: Sequence[Tuple[Tuple[str, ...], str]] = PATTERN_TAGS,
+        stop_words: Iterable[str] = STOP_WORDS,
+        synonyms: Dict[str, str] | None = None,
+        max_tags: int = MAX_TAGS,
+    ):
+        self.stop_words = frozenset(stop_words)
+        self.synonyms = dict(SYNONYMS if synonyms is None else synonyms)
+        self.max_tags = max_tags
+        self.pattern_tags = [tag for _, tag in pattern_tags]
+
+        self._word_rule: Dict[str, int] = {}
+        for index, (words, _) in enumerate(pattern_tags):
+            for word in words:
+                self._word_rule.setdefault(word, index)
+
+        alternation = "|".join(re.escape(word) for word in sorted(self._word_rule, key=len, reverse=True))
+        self._matcher = re.compile(rf"\b(?:{alternation})\b")
+        self._canonical_cache: Dict[str, str | None] = {}
+        self.rules_version = self._fingerprint(pattern_tags)
+
+    def _fingerprint(self, pattern_tags: Sequence[Tuple[Tuple[str, ...], str]]) -> str:
+        rules = {
+            "patterns": [[list(words), tag] for words, tag in pattern_tags],
+            "stop_words": sorted(self.stop_words),
+            "synonyms": self.synonyms,
+            "conditions": CONDITION_TAGS,
+            "ignored_brands": sorted(IGNORED_BRANDS),
+            "max_tags": self.max_tags,
+        }
+        encoded = json.dumps(rules, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()[:12]
+
+    def canonical(self, tag: str) -> str | None:
+        try:
+            return self._canonical_cache[tag]
+        except KeyError:
+            pass
+
+        cleaned = sanitize(tag)
+        if not cleaned or len(cleaned) < 2 or len(cleaned) > 30 or cleaned in self.stop_words:
+            result = None
+        else:
+            result = self.synonyms.get(cleaned, cleaned)
+        self._canonical_cache[tag] = result
+        return result
+
+    def matched_rules(self, text: str) -> List[int]:
+        return sorted({self._word_rule[match.group(0)] for match in self._matcher.finditer(text)})
+
+    def infer(self, item: Dict[str, Any]) -> List[str]:
+        category = str(item.get("category") or "").strip().lower()
+        brand = str(item.get("brand") or "").strip().lower()
+        description = str(item.get("description") or "")
+        condition = str(item.get("condition") or "").strip().lower()
+        existing = item.get("tags") if isinstance(item.get("tags"), list) else []
+
+        candidates: List[str] = []
+        if category:
+            candidates.append(category)
+        if brand and brand not in IGNORED_BRANDS:
+            candidates.append(brand)
+        if condition in CONDITION_TAGS:
+            candidates.append(CONDITION_TAGS[condition])
+
+        text_blob = f"{category} {brand} {description}".lower()
+        candidates.extend(self.pattern_tags[index] for index in self.matched_rules(text_blob))
+        candidates.extend(str(tag) for tag in existing)
+
+        deduped: List[str] = []
+        for candidate in candidates:
+            canonical = self.canonical(candidate)
+            if not canonical:
+                continue
+            if canonical not in deduped:
+                deduped.append(canonical)
+            if len(deduped) >= self.max_tags:
+                break
+
+        return deduped
+
+    def infer_batch(self, items: Iterable[Dict[str, Any]]) -> Iterator[List[str]]:
+        for item in items:
+            yield self.infer(item)
+
+
+DEFAULT_ENGINE = TagEngine()
@@ -0,0 +1,185 @@
+"""
+Python port of src/lib/tag-governance.ts.
+
+Search-side tokenization, synonym and category-alias rules used by the search
+index builder and batch jobs. Keep in sync with the TypeScript module; the
+tables below are copied verbatim.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from typing import Any, Dict, Iterable, List
+
+STOP_WORDS = {
+    "the",
+    "and",
+    "for",
+    "with",
+    "this",
+    "that",
+    "item",
+    "any",
+    "have",
+    "show",
+    "looking",
+    "look",
+    "please",
+    "sale",
+    "sell",
+    "in",
+    "on",
+    "at",
+    "to",
+    "of",
+}
+
+TAG_SYNONYMS = {
+    "gun": "firearms",
+    "guns": "firearms",
+    "firearm": "firearms",
+    "handgun": "handgun",
+    "pistol": "handgun",
+    "revolver": "handgun",
+    "rifle": "long-gun",
+    "shotgun": "long-gun",
+    "necklace": "necklace",
+    "necklaces": "necklace",
+    "chain": "chain",
+    "chains": "chain",
+    "pendant": "pendant",
+    "ring": "ring",
+    "rings": "ring",
+    "bracelet": "bracelet",
+    "watch": "watch",
+    "jewelery": "jewelry",
+    "jewellery": "jewelry",
+    "goldtone": "gold-tone",
+    "gold-tone": "gold-tone",
+    "sterling": "silver",
+    "like-new": "excellent-condition",
+    "pristine": "excellent-condition",
+    "excellent": "excellent-condition",
+    "fair": "fair-condition",
+    "poor": "poor-condition",
+}
+
+CATEGORY_ALIASES: Dict[str, List[str]] = {
+    "jewelry": ["jewelry", "watch", "watches"],
+    "watch": ["watch", "watches", "jewelry"],
+    "watches": ["watch", "watches", "jewelry"],
+    "electronics": ["electronics", "electronic", "tech"],
+    "tools": ["tools", "tool"],
+    "firearms": ["firearms", "firearm", "guns", "gun"],
+    "musical": ["musical", "instrument", "instruments"],
+    "sporting": ["sporting", "sports"],
+    "collectibles": ["collectibles", "collectible"],
+}
+
+_NON_TAG_CHARS = re.compile(r"[^a-z0-9\s-]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def sanitize(text: str) -> str:
+    return _WHITESPACE.sub(" ", _NON_TAG_CHARS.sub(" ", text.lower())).strip()
+
+
+def canonicalize_tag(text: str) -> str | None:
+    cleaned = sanitize(text)
+    if not cleaned or len(cleaned) < 2 or len(cleaned) > 30:
+        return None
+    if cleaned in STOP_WORDS:
+        return None
+    return TAG_SYNONYMS.get(cleaned, cleaned)
+
+
+def normalize_tag_list(raw: Any, max_tags: int = 20) -> List[str]:
+    if isinstance(raw, list):
+        base = [str(entry) for entry in raw]
+    elif isinstance(raw, str):
+        base = [entry.strip() for entry in raw.split(",")]
+    else:
+        base = []
+
+    unique: List[str] = []
+    for candidate in base:
+        canonical = canonicalize_tag(candidate)
+        if not canonical:
+            continue
+        if canonical not in unique:
+            unique.append(canonical)
+        if len(unique) >= max_tags:
+            break
+    return unique
+
+
+def tokenize_search_input(text: str) -> List[str]:
+    return [
+        TAG_SYNONYMS.get(token, token)
+        for token in (token.strip() for token in sanitize(text).split(" "))
+        if len(token) > 1 and token not in STOP_WORDS
+    ]
+
+
+def build_searchable_tokens(item: Dict[str, Any]) -> List[str]:
+    materialized_tags = normalize_tag_list(item.get("tags") or [])
+    source_text = " ".join(
+        [str(item.get("category") or ""), str(item.get("brand") or ""), str(item.get("description") or ""), *materialized_tags]
+    )
+    return list(dict.fromkeys(tokenize_search_input(source_text)))[:80]
+
+
+def resolve_category_candidates(category: str, keyword_tokens: Iterable[str] = ()) -> List[str]:
+    normalized_category = sanitize(category)
+    candidates: Dict[str, None] = {}
+
+    if normalized_category:
+        candidates[normalized_category] = None
+        for alias in CATEGORY_ALIASES.get(normalized_category, []):
+            candidates[alias] = None
+
+    normalized_tokens = [token for token in (sanitize(token) for token in keyword_tokens) if token]
+    if "watch" in normalized_tokens or "watches" in normalized_tokens:
+        for alias in ("watch", "watches", "jewelry"):
+            candidates[alias] = None
+
+    return list(candidates)
+
+
+def matches_category_candidates(item_category: str, candidates: List[str]) -> bool:
+    if not candidates:
+        return True
+
+    normalized_item_category = sanitize(item_category)
+    if not normalized_item_category:
+        return False
+
+    for candidate in candidates:
+        normalized_candidate = sanitize(candidate)
+        if not normalized_candidate:
+            continue
+        if (
+            normalized_item_category == normalized_candidate
+            or normalized_candidate in normalized_item_category
+            or normalized_item_category in normalized_candidate
+        ):
+            return True
+    return False
+
+
+def _fingerprint() -> str:
+    rules = {
+        "stop_words": sorted(STOP_WORDS),
+        "synonyms": TAG_SYNONYMS,
+        "tag_length": [2, 30],
+        "max_tags": 20,
+        "max_tokens": 80,
+    }
+    encoded = json.dumps(rules, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:12]
+
+
+# Stamped on items whose searchable_tokens were computed with these rules.
+RULES_VERSION = _fingerprint()
@@ -5,6 +5,7 @@ import { TABLES, putItem, scanItems, deleteItem } from "@/lib/dynamodb";
 import { createUnifiedConversationRecord } from "@/lib/conversation-model";
 import { analyzeImage, analyzeImages } from "@/lib/openai";
 import { getAgentConfigBatch } from "@/lib/agent-config";
+import { getSpotPrices } from "@/lib/spot-prices";
 
 type AppraiseRequestBody = {
   photoUrl?: string;
@@ -78,18 +79,6 @@ function inferPurity(text: string): number {
   return 0.75;
 }
 
-async function fetchGoldPrices(baseUrl: string) {
-  try {
-    const response = await fetch(`${baseUrl}/api/gold-price`, { cache: "no-store" });
-    if (!response.ok) {
-      throw new Error("gold-price route unavailable");
-    }
-    return (await response.json()) as { gold: number; silver: number; platinum: number };
-  } catch {
-    return { gold: 2050, silver: 24.5, platinum: 950 };
-  }
-}
-
 export async function POST(req: NextRequest) {
   try {
     const body = (await req.json()) as AppraiseRequestBody;
@@ -188,7 +177,7 @@ Be specific and thorough. When uncertain, state your confidence level. Always co
     const conservatismFactor = conservatism === "conservative" ? 0.85 : conservatism === "generous" ? 1.15 : 1.0;
 
     if (jewelryLike) {
-      const metalPrices = await fetchGoldPrices(req.nextUrl.origin);
+      const metalPrices = await getSpotPrices();
       metalType = inferMetalType(category, analysisText);
       const purity = inferPurity(analysisText);
 
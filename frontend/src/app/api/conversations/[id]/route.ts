@@ -1,5 +1,6 @@
 import { NextRequest, NextResponse } from "next/server";
 import { TABLES, getItem } from "@/lib/dynamodb";
+import { getArchivedConversation } from "@/lib/conversation-archive";
 
 export async function GET(
   req: NextRequest,
@@ -12,7 +13,16 @@ export async function GET(
       conversation_id: id,
     });
 
-    if (!conversation) {
+    if (conversation) {
+      return NextResponse.json({
+        success: true,
+        conversation,
+      });
+    }
+
+    // Older conversations are moved to cold storage by archive_conversations.py.
+    const archived = await getArchivedConversation(id);
+    if (!archived) {
       return NextResponse.json(
         { success: false, error: "Conversation not found" },
         { status: 404 }
@@ -21,7 +31,8 @@ export async function GET(
 
     return NextResponse.json({
       success: true,
-      conversation,
+      archived: true,
+      conversation: archived,
     });
   } catch (error) {
     console.error("Failed to fetch conversation:", error);
@@ -1,11 +1,44 @@
 import { NextRequest, NextResponse } from "next/server";
-import { TABLES, scanItems, deleteItem, putItem } from "@/lib/dynamodb";
+import {
+  INDEXES,
+  TABLES,
+  conversationUpdatedBucket,
+  deleteItem,
+  isMissingIndexError,
+  putItem,
+  queryIndexItems,
+  scanItems,
+} from "@/lib/dynamodb";
 import {
   buildConversationGroups,
   createUnifiedConversationRecord,
   toUnifiedConversationRecord,
   type InteractionSource,
 } from "@/lib/conversation-model";
+import { isArchivedRow } from "@/lib/conversation-archive";
+
+async function queryRecentConversations(days: number): Promise<Array<Record<string, unknown>>> {
+  const buckets = Array.from({ length: days }, (_, offset) =>
+    conversationUpdatedBucket(new Date(Date.now() - offset * 24 * 60 * 60 * 1000).toISOString())
+  );
+
+  try {
+    const pages = await Promise.all(
+      buckets.map((bucket) =>
+        queryIndexItems<Record<string, unknown>>(TABLES.conversations, INDEXES.conversationsByUpdatedBucket, {
+          name: "updated_bucket",
+          value: bucket,
+        })
+      )
+    );
+    return pages.flat();
+  } catch (error) {
+    if (!isMissingIndexError(error)) {
+      throw error;
+    }
+    return scanItems<Record<string, unknown>>(TABLES.conversations);
+  }
+}
 
 export async function GET(req: NextRequest) {
   try {
@@ -13,11 +46,19 @@ export async function GET(req: NextRequest) {
     const caseWindowHoursRaw = Number(req.nextUrl.searchParams.get("case_window_hours") ?? "72");
     const caseWindowHours = Number.isFinite(caseWindowHoursRaw) ? caseWindowHoursRaw : 72;
 
+    const daysRaw = Number(req.nextUrl.searchParams.get("days") ?? "0");
+    const days = Number.isFinite(daysRaw) ? Math.min(Math.max(0, Math.floor(daysRaw)), 90) : 0;
+
     console.log('[API /conversations] Fetching conversations from DynamoDB...');
-    const rawConversations = await scanItems<Record<string, unknown>>(TABLES.conversations);
+    const rawConversations =
+      days > 0
+        ? await queryRecentConversations(days)
+        : await scanItems<Record<string, unknown>>(TABLES.conversations);
     console.log('[API /conversations] Raw scan returned:', rawConversations.length, 'items');
 
+    // Rows archive_conversations.py has already moved to cold storage linger until the TTL sweep.
     const normalized = rawConversations
+      .filter((entry) => !isArchivedRow(entry))
       .map((entry) => toUnifiedConversationRecord(entry))
       .filter((entry): entry is NonNullable<typeof entry> => Boolean(entry));
 
@@ -0,0 +1,22 @@
+import { NextRequest, NextResponse } from "next/server";
+import { refreshDashboardMetrics } from "@/lib/dashboard-metrics";
+
+// Scheduled by the "crons" entry in vercel.json; the same rebuild
+// backend/scripts/build_dashboard_metrics.py does from a shell.
+export const dynamic = "force-dynamic";
+
+export async function GET(req: NextRequest) {
+  // Vercel sends CRON_SECRET as a bearer token on scheduled invocations.
+  const secret = process.env.CRON_SECRET;
+  if (!secret || req.headers.get("authorization") !== `Bearer ${secret}`) {
+    return NextResponse.json({ error: "Unauthorized" }, { status: 401 });
+  }
+
+  try {
+    const { metrics, bytes } = await refreshDashboardMetrics();
+    return NextResponse.json({ generated_at: metrics.generated_at, bytes });
+  } catch (error) {
+    console.error("[Dashboard Metrics] Failed to rebuild metrics:", error);
+    return NextResponse.json({ error: "Failed to rebuild dashboard metrics" }, { status: 500 });
+  }
+}
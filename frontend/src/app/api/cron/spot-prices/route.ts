@@ -0,0 +1,42 @@
+import { NextRequest, NextResponse } from "next/server";
+import { repriceInventory, type RepriceResult } from "@/lib/inventory-valuation";
+import { fetchMetalsApiQuote, publishSpotPrices } from "@/lib/spot-prices";
+
+// Scheduled by the "crons" entry in vercel.json; the same publish and reprice
+// backend/scripts/ingest_spot_prices.py --once --reprice does from a shell cron.
+export const dynamic = "force-dynamic";
+
+export async function GET(req: NextRequest) {
+  // Vercel sends CRON_SECRET as a bearer token on scheduled invocations.
+  const secret = process.env.CRON_SECRET;
+  if (!secret || req.headers.get("authorization") !== `Bearer ${secret}`) {
+    return NextResponse.json({ error: "Unauthorized" }, { status: 401 });
+  }
+
+  const quote = await fetchMetalsApiQuote();
+  if (!quote) {
+    return NextResponse.json(
+      { error: "No quote from metals-api; the last published prices are kept" },
+      { status: 502 }
+    );
+  }
+
+  let published: boolean;
+  try {
+    // False when a concurrent publisher (e.g. the ingest script) won the race; its quote stands.
+    published = await publishSpotPrices(quote);
+  } catch (error) {
+    console.error("[Spot Prices] Failed to publish quote:", error);
+    return NextResponse.json({ error: "Failed to publish spot prices" }, { status: 500 });
+  }
+
+  // Reprice against the quote just fetched either way; it is live and at most seconds old.
+  let repriced: RepriceResult;
+  try {
+    repriced = await repriceInventory(quote);
+  } catch (error) {
+    console.error("[Spot Prices] Failed to reprice inventory:", error);
+    return NextResponse.json({ published, quote, error: "Failed to reprice inventory" }, { status: 500 });
+  }
+  return NextResponse.json({ published, quote, repriced });
+}
@@ -0,0 +1,38 @@
+import { NextResponse } from "next/server";
+import { METRICS_CONFIG_KEY } from "@/lib/dashboard-metrics";
+import { TABLES, getItem } from "@/lib/dynamodb";
+
+// Written by /api/cron/dashboard-metrics and backend/scripts/build_dashboard_metrics.py.
+
+type MetricsConfigItem = {
+  config_key: string;
+  value?: string;
+  updated_at?: string;
+};
+
+export async function GET() {
+  try {
+    const item = await getItem<MetricsConfigItem>(TABLES.storeConfig, {
+      config_key: METRICS_CONFIG_KEY,
+    });
+
+    if (!item?.value) {
+      return NextResponse.json(
+        { success: false, error: "Dashboard metrics have not been built yet" },
+        { status: 404 }
+      );
+    }
+
+    return NextResponse.json({
+      success: true,
+      updated_at: item.updated_at,
+      metrics: JSON.parse(item.value),
+    });
+  } catch (error) {
+    console.error("Failed to fetch dashboard metrics:", error);
+    return NextResponse.json(
+      { success: false, error: "Failed to fetch dashboard metrics" },
+      { status: 500 }
+    );
+  }
+}
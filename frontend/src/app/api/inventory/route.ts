@@ -1,6 +1,9 @@
 import { randomUUID } from 'crypto';
 import { NextRequest, NextResponse } from 'next/server';
 import * as dynamodbLib from '@/lib/dynamodb';
+import { valuationFields } from '@/lib/inventory-valuation';
+import type { StoredMetalSpecs, StoredValuation } from '@/lib/metalParser';
+import { getSpotPrices } from '@/lib/spot-prices';
 import { buildSearchableTokens, matchesCategoryCandidates, normalizeTagList, resolveCategoryCandidates, tokenizeSearchInput } from '@/lib/tag-governance';
 
 type InventoryStatus = 'available' | 'sold' | 'pending' | 'returned';
@@ -17,13 +20,19 @@ type InventoryItem = {
   status: InventoryStatus;
   images?: string[];
   metadata?: Record<string, unknown>;
+  // Stamped here when the description is set; repriced by /api/cron/spot-prices and reprice_inventory.py.
+  metal_specs?: StoredMetalSpecs;
+  valuation?: StoredValuation;
   created_at: string;
+  date_added?: string;
   updated_at?: string;
   sold_date?: string;
   [key: string]: unknown;
 };
 
 const INVENTORY_TABLE = 'USA_Pawn_Inventory';
+const MAX_BULK_UPDATES = 100;
+const BULK_UPDATE_CONCURRENCY = 10;
 const DEFAULT_CATEGORIES = [
   'jewelry',
   'electronics',
@@ -56,9 +65,16 @@ async function putInventory(item: InventoryItem): Promise<void> {
   }
 }
 
-async function updateInventory(itemId: string, updates: Partial<InventoryItem>): Promise<InventoryItem> {
+async function getInventoryItem(itemId: string): Promise<InventoryItem | null> {
+  if (typeof dynamodb.getItem === 'function') {
+    return ((await dynamodb.getItem(INVENTORY_TABLE, { item_id: itemId })) as InventoryItem | null) ?? null;
+  }
   const items = await scanInventory();
-  const target = items.find((item) => item.item_id === itemId);
+  return items.find((item) => item.item_id === itemId) ?? null;
+}
+
+async function updateInventory(itemId: string, updates: Partial<InventoryItem>): Promise<InventoryItem> {
+  const target = await getInventoryItem(itemId);
   if (!target) {
     throw new Error('Item not found');
   }
@@ -82,8 +98,18 @@ async function updateInventory(itemId: string, updates: Partial<InventoryItem>):
     updates.tags = mergedPreview.tags;
   }
 
+  // A new description invalidates the parsed metal specs and the figures priced from them.
+  let remove: string[] = [];
+  if (updates.description != null && updates.description !== target.description) {
+    const fields = valuationFields(updates.description, await getSpotPrices());
+    Object.assign(updates, fields.set);
+    Object.assign(mergedPreview, fields.set);
+    remove = fields.remove;
+    for (const name of remove) delete mergedPreview[name];
+  }
+
   if (typeof dynamodb.updateItem === 'function') {
-    const updated = (await dynamodb.updateItem(INVENTORY_TABLE, { item_id: itemId }, updates)) as InventoryItem | null;
+    const updated = (await dynamodb.updateItem(INVENTORY_TABLE, { item_id: itemId }, updates, remove)) as InventoryItem | null;
     return updated ?? mergedPreview;
   }
 
@@ -92,6 +118,21 @@ async function updateInventory(itemId: string, updates: Partial<InventoryItem>):
   return merged;
 }
 
+// Normalize items to ensure all fields have valid defaults
+function normalizeInventoryItem(item: InventoryItem): InventoryItem {
+  return {
+    ...item,
+    images: Array.isArray(item.images) ? item.images : [],
+    tags: Array.isArray(item.tags) ? item.tags.map(String) : [],
+    searchable_tokens: Array.isArray(item.searchable_tokens) ? item.searchable_tokens.map(String) : [],
+    price: typeof item.price === 'number' ? item.price : 0,
+    brand: item.brand || 'Unknown',
+    description: item.description || 'No description',
+    condition: item.condition || 'Used',
+    status: (item.status || 'available') as InventoryStatus,
+  };
+}
+
 export async function GET(request: NextRequest) {
   try {
     const params = request.nextUrl.searchParams;
@@ -99,6 +140,7 @@ export async function GET(request: NextRequest) {
     const keyword = params.get('keyword')?.toLowerCase() ?? null;
     const status = params.get('status')?.toLowerCase() ?? null;
     const condition = params.get('condition')?.toLowerCase() ?? null;
+    const metal = params.get('metal')?.toLowerCase() ?? null;
     const minPriceParam = params.get('min_price');
     const maxPriceParam = params.get('max_price');
     const sort = params.get('sort')?.toLowerCase() ?? 'newest';
@@ -110,20 +152,27 @@ export async function GET(request: NextRequest) {
     const hasMinPrice = minPrice != null && Number.isFinite(minPrice) && minPrice >= 0;
     const hasMaxPrice = maxPrice != null && Number.isFinite(maxPrice) && maxPrice >= 0;
 
-    let items = await scanInventory();
-    
-    // Normalize items to ensure all fields have valid defaults
-    items = items.map(item => ({
-      ...item,
-      images: Array.isArray(item.images) ? item.images : [],
-      tags: Array.isArray(item.tags) ? item.tags.map(String) : [],
-      searchable_tokens: Array.isArray(item.searchable_tokens) ? item.searchable_tokens.map(String) : [],
-      price: typeof item.price === 'number' ? item.price : 0,
-      brand: item.brand || 'Unknown',
-      description: item.description || 'No description',
-      condition: item.condition || 'Used',
-      status: (item.status || 'available') as InventoryStatus,
-    }));
+    // Cursor mode pages through the raw table with LastEvaluatedKey so bulk
+    // consumers can walk catalogs of any size; filters and sorting are skipped.
+    if (params.has('cursor')) {
+      // An empty cursor starts at the first page; anything else must decode to an inventory key,
+      // or a client would silently restart the walk from the top.
+      const cursor = params.get('cursor');
+      const startKey = dynamodbLib.decodeCursor(cursor);
+      if (cursor && typeof startKey?.item_id !== 'string') {
+        return NextResponse.json({ error: 'Invalid cursor' }, { status: 400 });
+      }
+      const page = await dynamodbLib.scanPage<InventoryItem>(dynamodbLib.TABLES.inventory, limit, startKey);
+      const pageItems = page.items.map(normalizeInventoryItem);
+      return NextResponse.json({
+        items: pageItems,
+        count: pageItems.length,
+        next_cursor: dynamodbLib.encodeCursor(page.lastEvaluatedKey),
+        categories: DEFAULT_CATEGORIES,
+      });
+    }
+
+    let items = (await scanInventory()).map(normalizeInventoryItem);
     
     if (category) {
       items = items.filter((item) => matchesCategoryCandidates(String(item.category ?? ''), categoryCandidates));
@@ -134,6 +183,9 @@ export async function GET(request: NextRequest) {
     if (condition) {
       items = items.filter((item) => String(item.condition ?? '').toLowerCase() === condition);
     }
+    if (metal) {
+      items = items.filter((item) => item.valuation?.metal_type === metal);
+    }
     if (keyword) {
       items = items.filter((item) => {
         const blob = `${item.brand ?? ''} ${item.description ?? ''} ${item.category ?? ''} ${(item.tags ?? []).join(' ')} ${(item.searchable_tokens ?? []).join(' ')}`.toLowerCase();
@@ -155,6 +207,8 @@ export async function GET(request: NextRequest) {
       items.sort((a, b) => Number(a.price ?? 0) - Number(b.price ?? 0));
     } else if (sort === 'price-high') {
       items.sort((a, b) => Number(b.price ?? 0) - Number(a.price ?? 0));
+    } else if (sort === 'melt-high') {
+      items.sort((a, b) => Number(b.valuation?.melt_value ?? 0) - Number(a.valuation?.melt_value ?? 0));
     } else {
       items.sort((a, b) => new Date(b.created_at).getTime() - new Date(a.created_at).getTime());
     }
@@ -200,6 +254,7 @@ export async function POST(request: NextRequest) {
       metadata: body?.metadata && typeof body.metadata === 'object' ? body.metadata : undefined,
       created_at: new Date().toISOString(),
     };
+    item.date_added = item.created_at;
 
     item.searchable_tokens = buildSearchableTokens({
       category: item.category,
@@ -207,6 +262,7 @@ export async function POST(request: NextRequest) {
       description: item.description,
       tags: item.tags,
     });
+    Object.assign(item, valuationFields(description, await getSpotPrices()).set);
 
     await putInventory(item);
     return NextResponse.json(item, { status: 201 });
@@ -218,45 +274,98 @@ export async function POST(request: NextRequest) {
   }
 }
 
+function buildInventoryUpdates(body: Record<string, unknown>): Partial<InventoryItem> | string {
+  const updates: Partial<InventoryItem> = {
+    updated_at: new Date().toISOString(),
+  };
+
+  if (body.status) {
+    const normalized = String(body.status) as InventoryStatus;
+    if (!['available', 'sold', 'pending', 'returned'].includes(normalized)) {
+      return 'Invalid status';
+    }
+    updates.status = normalized;
+  }
+  if (body.price != null) {
+    updates.price = Number(body.price);
+  }
+  if (body.condition) {
+    updates.condition = String(body.condition);
+  }
+  if (body.description) {
+    updates.description = String(body.description);
+  }
+  if (body.brand) {
+    updates.brand = String(body.brand);
+  }
+  if (body.tags != null) {
+    updates.tags = normalizeTagList(body.tags);
+  }
+  if (Array.isArray(body.images)) {
+    updates.images = body.images.map(String);
+  }
+  if (body.sold_date) {
+    updates.sold_date = String(body.sold_date);
+  }
+
+  return updates;
+}
+
+type BulkUpdateResult = {
+  item_id: string;
+  ok: boolean;
+  error?: string;
+};
+
+async function applyBulkUpdate(entry: unknown): Promise<BulkUpdateResult> {
+  const body = (entry ?? {}) as Record<string, unknown>;
+  const itemId = String(body.item_id ?? '');
+  if (!itemId) {
+    return { item_id: itemId, ok: false, error: 'item_id is required' };
+  }
+
+  const updates = buildInventoryUpdates(body);
+  if (typeof updates === 'string') {
+    return { item_id: itemId, ok: false, error: updates };
+  }
+
+  try {
+    await updateInventory(itemId, updates);
+    return { item_id: itemId, ok: true };
+  } catch (error) {
+    return { item_id: itemId, ok: false, error: (error as Error).message };
+  }
+}
+
 export async function PATCH(request: NextRequest) {
   try {
     const body = await request.json();
-    const itemId = String(body?.item_id ?? '');
-    if (!itemId) {
-      return NextResponse.json({ error: 'item_id is required' }, { status: 400 });
-    }
 
-    const updates: Partial<InventoryItem> = {
-      updated_at: new Date().toISOString(),
-    };
+    // Bulk variant: { updates: [{ item_id, tags, ... }] }. Failures are reported per item.
+    if (Array.isArray(body?.updates)) {
+      const entries = body.updates as unknown[];
+      if (entries.length > MAX_BULK_UPDATES) {
+        return NextResponse.json({ error: `At most ${MAX_BULK_UPDATES} updates per request` }, { status: 400 });
+      }
 
-    if (body.status) {
-      const normalized = String(body.status) as InventoryStatus;
-      if (!['available', 'sold', 'pending', 'returned'].includes(normalized)) {
-        return NextResponse.json({ error: 'Invalid status' }, { status: 400 });
+      const results: BulkUpdateResult[] = [];
+      for (let start = 0; start < entries.length; start += BULK_UPDATE_CONCURRENCY) {
+        const chunk = entries.slice(start, start + BULK_UPDATE_CONCURRENCY);
+        results.push(...(await Promise.all(chunk.map(applyBulkUpdate))));
       }
-      updates.status = normalized;
-    }
-    if (body.price != null) {
-      updates.price = Number(body.price);
-    }
-    if (body.condition) {
-      updates.condition = String(body.condition);
-    }
-    if (body.description) {
-      updates.description = String(body.description);
-    }
-    if (body.brand) {
-      updates.brand = String(body.brand);
-    }
-    if (body.tags != null) {
-      updates.tags = normalizeTagList(body.tags);
+
+      const failed = results.filter((result) => !result.ok).length;
+      return NextResponse.json({ results, updated: results.length - failed, failed });
     }
-    if (Array.isArray(body.images)) {
-      updates.images = body.images.map(String);
+
+    const itemId = String(body?.item_id ?? '');
+    if (!itemId) {
+      return NextResponse.json({ error: 'item_id is required' }, { status: 400 });
     }
-    if (body.sold_date) {
-      updates.sold_date = String(body.sold_date);
+
+    const updates = buildInventoryUpdates(body);
+    if (typeof updates === 'string') {
+      return NextResponse.json({ error: updates }, { status: 400 });
     }
 
     const updated = await updateInventory(itemId, updates);
@@ -1,7 +1,8 @@
 import { NextRequest, NextResponse } from "next/server";
 import { CATEGORY_TAGS } from "@/lib/constants";
 import { TABLES, scanItems } from "@/lib/dynamodb";
-import { searchInventoryItems } from "@/lib/inventory-search";
+import { searchInventoryItems, type InventorySearchResult } from "@/lib/inventory-search";
+import { loadInventorySearchIndex, searchInventoryIndex } from "@/lib/inventory-search-index";
 
 /* ──────────────────────────────────────────────────────
    POST /api/inventory/search
@@ -9,6 +10,8 @@ import { searchInventoryItems } from "@/lib/inventory-search";
    Search inventory by category and/or keyword.
    Used by voice chat tool execution.
    Returns matching items with display image for first match.
+   Answers from the prebuilt search index when
+   INVENTORY_SEARCH_INDEX is set, otherwise scans the table.
    ────────────────────────────────────────────────────── */
 
 type SearchRequestBody = {
@@ -24,9 +27,16 @@ export async function POST(req: NextRequest) {
 
     console.log(`[Inventory Search] Category: "${category}", Keyword: "${keyword}"`);
 
-    const all = await scanItems<Record<string, unknown>>(TABLES.inventory);
-    console.log(`[Inventory Search] Total items: ${all.length}`);
-    const searchResult = searchInventoryItems(all, { category, keyword, limit: 5 });
+    const index = loadInventorySearchIndex();
+    let searchResult: InventorySearchResult;
+    if (index) {
+      console.log(`[Inventory Search] Index items: ${index.items.length} (built ${index.builtAt})`);
+      searchResult = searchInventoryIndex(index, { category, keyword, limit: 5 });
+    } else {
+      const all = await scanItems<Record<string, unknown>>(TABLES.inventory);
+      console.log(`[Inventory Search] Total items: ${all.length}`);
+      searchResult = searchInventoryItems(all, { category, keyword, limit: 5 });
+    }
     const topMatches = searchResult.topMatches;
 
     console.log(`[Inventory Search] Matches: ${searchResult.count}`);
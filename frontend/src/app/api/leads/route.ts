@@ -44,6 +44,23 @@ async function scanLeads(): Promise<LeadRecord[]> {
   return [];
 }
 
+async function queryLeadsByStatus(status: string): Promise<LeadRecord[]> {
+  try {
+    return await dynamodbLib.queryIndexItems<LeadRecord>(
+      dynamodbLib.TABLES.leads,
+      dynamodbLib.INDEXES.leadsByStatus,
+      { name: 'status', value: status },
+      { newestFirst: true },
+    );
+  } catch (error) {
+    if (!dynamodbLib.isMissingIndexError(error)) {
+      throw error;
+    }
+    const leads = await scanLeads();
+    return leads.filter((lead) => String(lead.status ?? 'new').toLowerCase() === status);
+  }
+}
+
 async function deleteLead(leadId: string): Promise<void> {
   if (typeof dynamodb.deleteItem === 'function') {
     await dynamodb.deleteItem(LEADS_TABLE, { lead_id: leadId });
@@ -152,7 +169,8 @@ export async function GET(request: NextRequest) {
     const limit = Math.max(1, Math.min(Number(params.get('limit') ?? '50'), 200));
     const cursor = Math.max(0, Number(params.get('cursor') ?? '0'));
 
-    let leads = (await scanLeads()).map(normalizeLead);
+    const rawLeads = status ? await queryLeadsByStatus(status.toLowerCase()) : await scanLeads();
+    let leads = rawLeads.map(normalizeLead);
 
     if (status) {
       leads = leads.filter((lead) => String(lead.status).toLowerCase() === status.toLowerCase());
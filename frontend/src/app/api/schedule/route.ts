@@ -32,6 +32,18 @@ const dynamodb = dynamodbLib as unknown as Record<string, AsyncUnknownFn>;
 const twilio = twilioLib as unknown as Record<string, AsyncUnknownFn>;
 
 async function scanAppointments(): Promise<AppointmentRecord[]> {
+  try {
+    return await dynamodbLib.queryIndexItems<AppointmentRecord>(
+      dynamodbLib.TABLES.leads,
+      dynamodbLib.INDEXES.appointmentsByTime,
+      { name: 'type', value: 'appointment' },
+    );
+  } catch (error) {
+    if (!dynamodbLib.isMissingIndexError(error)) {
+      throw error;
+    }
+  }
+
   let records: AppointmentRecord[] = [];
   if (typeof dynamodb.scanItems === 'function') {
     records = ((await dynamodb.scanItems(LEADS_TABLE)) as AppointmentRecord[]) ?? [];
@@ -0,0 +1,69 @@
+import { NextRequest, NextResponse } from "next/server";
+import { TABLES, getItem } from "@/lib/dynamodb";
+
+// Rollups are written by backend/scripts/rollup_staff_hours.py.
+type StaffHours = {
+  name: string;
+  seconds: number;
+  shifts: number;
+  days_worked?: number;
+  daily_seconds?: number[];
+};
+
+type HoursRollup = {
+  period: string;
+  period_type: "day" | "week";
+  start: string;
+  days?: string[];
+  staff: Record<string, StaffHours>;
+  total_seconds: number;
+  shift_count: number;
+  orphan_clock_outs?: number;
+  updated_at?: string;
+};
+
+function weekStart(value: string | null): string | null {
+  const parsed = value ? new Date(`${value}T00:00:00Z`) : new Date();
+  if (Number.isNaN(parsed.getTime())) {
+    return null;
+  }
+  const offset = (parsed.getUTCDay() + 6) % 7;
+  parsed.setUTCDate(parsed.getUTCDate() - offset);
+  return parsed.toISOString().slice(0, 10);
+}
+
+export async function GET(request: NextRequest) {
+  const week = weekStart(request.nextUrl.searchParams.get("week"));
+  if (!week) {
+    return NextResponse.json(
+      { success: false, error: "week must be a YYYY-MM-DD date" },
+      { status: 400 }
+    );
+  }
+
+  try {
+    const rollup = await getItem<HoursRollup>(TABLES.staffHours, { period: `week:${week}` });
+    if (!rollup) {
+      return NextResponse.json(
+        { success: false, error: `No staff hours rolled up for the week of ${week}` },
+        { status: 404 }
+      );
+    }
+
+    const days = await Promise.all(
+      (rollup.days ?? []).map((day) => getItem<HoursRollup>(TABLES.staffHours, { period: `day:${day}` }))
+    );
+
+    return NextResponse.json({
+      success: true,
+      week: rollup,
+      days: days.filter((day): day is HoursRollup => Boolean(day)),
+    });
+  } catch (error) {
+    console.error("Failed to fetch staff hours:", error);
+    return NextResponse.json(
+      { success: false, error: "Failed to fetch staff hours" },
+      { status: 500 }
+    );
+  }
+}
@@ -1,10 +1,12 @@
 import { createHash, randomUUID } from 'crypto';
 import { NextRequest, NextResponse } from 'next/server';
 import * as dynamodbLib from '@/lib/dynamodb';
+import { listStaff, staffKey, verifyStaffPin } from '@/lib/staff-directory';
 
 type StaffLogRecord = {
   log_id: string;
   staff_name: string;
+  staff_key?: string;
   event_type: 'in' | 'out';
   timestamp: string;
   shift_duration: number | null;
@@ -14,7 +16,6 @@ type StaffLogRecord = {
 };
 
 const STAFF_LOG_TABLE = 'USA_Pawn_Staff_Log';
-const STORE_CONFIG_TABLE = 'USA_Pawn_Store_Config';
 const dynamodb = dynamodbLib as unknown as Record<string, (...args: unknown[]) => Promise<unknown>>;
 
 async function scanTable<T = unknown>(table: string): Promise<T[]> {
@@ -27,6 +28,23 @@ async function scanTable<T = unknown>(table: string): Promise<T[]> {
   return [];
 }
 
+async function queryLogsForStaff(staffName: string): Promise<StaffLogRecord[]> {
+  const key = staffKey(staffName);
+  try {
+    return await dynamodbLib.queryIndexItems<StaffLogRecord>(
+      dynamodbLib.TABLES.staffLog,
+      dynamodbLib.INDEXES.staffLogByStaff,
+      { name: 'staff_key', value: key },
+    );
+  } catch (error) {
+    if (!dynamodbLib.isMissingIndexError(error)) {
+      throw error;
+    }
+    const logs = await scanTable<StaffLogRecord>(STAFF_LOG_TABLE);
+    return logs.filter((entry) => staffKey(String(entry.staff_name)) === key);
+  }
+}
+
 async function putLog(item: StaffLogRecord): Promise<void> {
   if (typeof dynamodb.putItem === 'function') {
     await dynamodb.putItem(STAFF_LOG_TABLE, item);
@@ -51,41 +69,6 @@ function todayToken(): string {
     .substring(0, 16);
 }
 
-function getStaffRecords(configItems: unknown[]): Array<{ name: string; pin: string }> {
-  const allCandidates = configItems.flatMap((item) => {
-    const candidates: unknown[] = [];
-    const typedItem = (item ?? {}) as Record<string, unknown>;
-    
-    // Check direct properties
-    if (Array.isArray(typedItem.staff)) candidates.push(...typedItem.staff);
-    if (Array.isArray(typedItem.staff_records)) candidates.push(...typedItem.staff_records);
-    if (Array.isArray(typedItem.staffMembers)) candidates.push(...typedItem.staffMembers);
-    
-    // Check JSON-stringified value field
-    if (typedItem.value && typeof typedItem.value === 'string') {
-      try {
-        const parsed = JSON.parse(typedItem.value) as Record<string, unknown>;
-        if (Array.isArray(parsed?.staff)) candidates.push(...parsed.staff);
-        if (Array.isArray(parsed?.staff_records)) candidates.push(...parsed.staff_records);
-      } catch {
-        // Ignore JSON parse errors
-      }
-    }
-    
-    return candidates;
-  });
-
-  return allCandidates
-    .map((record) => {
-      const typedRecord = (record ?? {}) as Record<string, unknown>;
-      return {
-        name: String(typedRecord.name ?? typedRecord.staff_name ?? ''),
-        pin: String(typedRecord.pin ?? ''),
-      };
-    })
-    .filter((record) => record.name && record.pin);
-}
-
 function pairShiftData(entries: StaffLogRecord[]): StaffLogRecord[] {
   const sorted = [...entries].sort(
     (a, b) => new Date(a.timestamp).getTime() - new Date(b.timestamp).getTime()
@@ -95,7 +78,7 @@ function pairShiftData(entries: StaffLogRecord[]): StaffLogRecord[] {
   const output: StaffLogRecord[] = [];
 
   for (const entry of sorted) {
-    const key = entry.staff_name.toLowerCase();
+    const key = staffKey(entry.staff_name);
     if (entry.event_type === 'in') {
       openByStaff.set(key, entry);
       output.push({ ...entry, shift_duration: null });
@@ -124,9 +107,8 @@ export async function GET(request: NextRequest) {
 
     // List available staff
     if (action === 'list-staff') {
-      const configItems = await scanTable(STORE_CONFIG_TABLE);
-      const staffRecords = getStaffRecords(configItems);
-      return NextResponse.json({ staff: staffRecords });
+      const staff = await listStaff();
+      return NextResponse.json({ staff: staff.map((member) => ({ name: member.name })) });
     }
 
     // Get staff logs
@@ -163,17 +145,13 @@ export async function POST(request: NextRequest) {
     }
 
     const complianceFlags: string[] = [];
-    const configItems = await scanTable(STORE_CONFIG_TABLE);
-    const staffRecords = getStaffRecords(configItems);
-    
+
     // Admin override PIN for force clock-out from dashboard
     const isAdminOverride = pin === '0000' && location === 'dashboard_force';
-    
-    const matchedStaff = isAdminOverride 
-      ? { name: staffName, pin: '0000' } // Allow admin override
-      : staffRecords.find(
-          (record) => record.name.toLowerCase() === staffName.toLowerCase() && record.pin === pin
-        );
+
+    const matchedStaff = isAdminOverride
+      ? { name: staffName } // Allow admin override
+      : await verifyStaffPin(staffName, pin);
 
     if (!matchedStaff) {
       return NextResponse.json(
@@ -194,10 +172,10 @@ export async function POST(request: NextRequest) {
       }
     }
 
-    const existing = await scanTable<StaffLogRecord>(STAFF_LOG_TABLE);
-    const forStaff = existing
-      .filter((entry) => String(entry.staff_name).toLowerCase() === staffName.toLowerCase())
-      .sort((a, b) => new Date(a.timestamp).getTime() - new Date(b.timestamp).getTime());
+    // staff_key normalizes case and spacing, so one index query covers every spelling of the name.
+    const forStaff = (await queryLogsForStaff(staffName)).sort(
+      (a, b) => new Date(a.timestamp).getTime() - new Date(b.timestamp).getTime()
+    );
 
     const lastIn = [...forStaff].reverse().find((entry) => entry.event_type === 'in');
     const lastOut = [...forStaff].reverse().find((entry) => entry.event_type === 'out');
@@ -221,6 +199,7 @@ export async function POST(request: NextRequest) {
     const record: StaffLogRecord = {
       log_id: randomUUID(),
       staff_name: staffName,
+      staff_key: staffKey(staffName),
       event_type: eventType,
       timestamp: new Date().toISOString(),
       shift_duration: shiftDuration,
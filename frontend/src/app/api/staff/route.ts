@@ -1,68 +1,24 @@
 import { NextRequest, NextResponse } from 'next/server';
-import { randomBytes } from 'crypto';
-import * as dynamodbLib from '@/lib/dynamodb';
-
-type StaffMember = {
-  name: string;
-  pin: string;
-  role?: string;
-  phone?: string;
-  email?: string;
-  hired_date?: string;
-};
-
-type StaffConfig = {
-  config_key: string;
-  value: string;
-  updated_at: string;
-};
-
-type StaffUpdatePayload = Partial<Pick<StaffMember, 'name' | 'pin' | 'role' | 'phone' | 'email'>>;
-
-const STORE_CONFIG_TABLE = 'USA_Pawn_Store_Config';
-const STAFF_CONFIG_KEY = 'staff_records';
-
-const dynamodb = dynamodbLib as unknown as Record<string, (...args: unknown[]) => Promise<unknown>>;
-
-async function getStaffConfig(): Promise<StaffMember[]> {
-  try {
-    if (typeof dynamodb.getItem === 'function') {
-      const result = (await dynamodb.getItem(STORE_CONFIG_TABLE, { config_key: STAFF_CONFIG_KEY })) as { value?: string } | null;
-      if (result && result.value) {
-        const parsed = JSON.parse(result.value);
-        return Array.isArray(parsed.staff) ? parsed.staff : [];
-      }
-    }
-    return [];
-  } catch (err) {
-    console.error('Failed to fetch staff config:', err);
-    return [];
-  }
-}
-
-async function saveStaffConfig(staff: StaffMember[]): Promise<void> {
-  const config: StaffConfig = {
-    config_key: STAFF_CONFIG_KEY,
-    value: JSON.stringify({ staff }),
-    updated_at: new Date().toISOString(),
-  };
-
-  if (typeof dynamodb.putItem === 'function') {
-    await dynamodb.putItem(STORE_CONFIG_TABLE, config);
-  }
-}
+import { randomInt } from 'crypto';
+import {
+  createStaffMember,
+  deleteStaffMember,
+  listStaff,
+  updateStaffMember,
+  type StaffUpdate,
+} from '@/lib/staff-directory';
 
 function generatePIN(): string {
-  return randomBytes(2).toString('hex').substring(0, 4);
+  return String(randomInt(0, 10000)).padStart(4, '0');
 }
 
 /**
  * GET /api/staff
- * Returns all staff members
+ * Returns all staff members (PINs are stored hashed and never returned)
  */
 export async function GET() {
   try {
-    const staff = await getStaffConfig();
+    const staff = await listStaff();
     return NextResponse.json({ staff, count: staff.length });
   } catch (err) {
     console.error('Failed to fetch staff:', err);
@@ -74,6 +30,7 @@ export async function GET() {
  * POST /api/staff
  * Add a new staff member
  * Body: { name: string, role?: string, phone?: string, email?: string, pin?: string }
+ * The response carries the PIN once so it can be handed to the staff member.
  */
 export async function POST(req: NextRequest) {
   try {
@@ -84,26 +41,20 @@ export async function POST(req: NextRequest) {
       return NextResponse.json({ error: 'Staff name is required' }, { status: 400 });
     }
 
-    const staff = await getStaffConfig();
-
-    // Check for duplicate name
-    if (staff.some((s) => s.name.toLowerCase() === name.toLowerCase())) {
-      return NextResponse.json({ error: 'Staff member with this name already exists' }, { status: 409 });
-    }
-
-    const newMember: StaffMember = {
+    const pin = body?.pin ? String(body.pin) : generatePIN();
+    const newMember = await createStaffMember({
       name,
-      pin: body?.pin || generatePIN(),
+      pin,
       role: body?.role || 'Staff',
       phone: body?.phone || undefined,
       email: body?.email || undefined,
-      hired_date: new Date().toISOString().slice(0, 10),
-    };
+    });
 
-    staff.push(newMember);
-    await saveStaffConfig(staff);
+    if (!newMember) {
+      return NextResponse.json({ error: 'Staff member with this name already exists' }, { status: 409 });
+    }
 
-    return NextResponse.json({ staff: newMember, message: 'Staff member added successfully' }, { status: 201 });
+    return NextResponse.json({ staff: { ...newMember, pin }, message: 'Staff member added successfully' }, { status: 201 });
   } catch (err) {
     console.error('Failed to add staff:', err);
     return NextResponse.json({ error: 'Failed to add staff member' }, { status: 500 });
@@ -113,35 +64,38 @@ export async function POST(req: NextRequest) {
 /**
  * PATCH /api/staff
  * Update an existing staff member
- * Body: { current_name: string, updates: Partial<StaffMember> }
+ * Body: { current_name: string, updates: Partial<StaffMember & { pin: string }> }
  */
 export async function PATCH(req: NextRequest) {
   try {
     const body = await req.json();
     const currentName = String(body?.current_name ?? '').trim();
-    const updates = (body?.updates ?? {}) as StaffUpdatePayload;
+    const raw = (body?.updates ?? {}) as Record<string, unknown>;
 
     if (!currentName) {
       return NextResponse.json({ error: 'current_name is required' }, { status: 400 });
     }
 
-    const staff = await getStaffConfig();
-    const index = staff.findIndex((s) => s.name.toLowerCase() === currentName.toLowerCase());
+    const updates: StaffUpdate = {
+      name: raw.name ? String(raw.name) : undefined,
+      pin: raw.pin ? String(raw.pin) : undefined,
+      role: raw.role ? String(raw.role) : undefined,
+      phone: raw.phone !== undefined ? (raw.phone ? String(raw.phone) : '') : undefined,
+      email: raw.email !== undefined ? (raw.email ? String(raw.email) : '') : undefined,
+    };
 
-    if (index === -1) {
+    const result = await updateStaffMember(currentName, updates);
+    if (result === 'not_found') {
       return NextResponse.json({ error: 'Staff member not found' }, { status: 404 });
     }
+    if (result === 'conflict') {
+      return NextResponse.json(
+        { error: 'Staff member was changed by someone else, or the new name is taken' },
+        { status: 409 }
+      );
+    }
 
-    // Update fields
-    if (updates.name) staff[index].name = String(updates.name);
-    if (updates.pin) staff[index].pin = String(updates.pin);
-    if (updates.role) staff[index].role = String(updates.role);
-    if (updates.phone !== undefined) staff[index].phone = updates.phone ? String(updates.phone) : undefined;
-    if (updates.email !== undefined) staff[index].email = updates.email ? String(updates.email) : undefined;
-
-    await saveStaffConfig(staff);
-
-    return NextResponse.json({ staff: staff[index], message: 'Staff member updated successfully' });
+    return NextResponse.json({ staff: result, message: 'Staff member updated successfully' });
   } catch (err) {
     console.error('Failed to update staff:', err);
     return NextResponse.json({ error: 'Failed to update staff member' }, { status: 500 });
@@ -161,15 +115,10 @@ export async function DELETE(req: NextRequest) {
       return NextResponse.json({ error: 'Staff name is required' }, { status: 400 });
     }
 
-    const staff = await getStaffConfig();
-    const filtered = staff.filter((s) => s.name.toLowerCase() !== name.toLowerCase());
-
-    if (filtered.length === staff.length) {
+    if (!(await deleteStaffMember(name))) {
       return NextResponse.json({ error: 'Staff member not found' }, { status: 404 });
     }
 
-    await saveStaffConfig(filtered);
-
     return NextResponse.json({ message: 'Staff member removed successfully', name });
   } catch (err) {
     console.error('Failed to delete staff:', err);
@@ -193,6 +193,43 @@ function formatDateTime(value?: string): string {
   });
 }
 
+/* ------------------------------------------------------------------
+   Precomputed counters (/api/cron/dashboard-metrics, every 15 minutes)
+   ------------------------------------------------------------------ */
+// Matches METRICS_FRESH_MS in lib/dashboard-metrics.ts (a server module, so not imported here).
+const METRICS_FRESH_MS = 30 * 60 * 1000;
+
+type DashboardMetricsResponse = {
+  success: boolean;
+  updated_at?: string;
+  metrics?: {
+    leads?: { today?: { date: string; unique_customers: number; revenue: number } };
+  };
+};
+
+/**
+ * Today's lead counters from the metrics document, or null when it is missing,
+ * built for another day, or older than METRICS_FRESH_MS (a missed cron run).
+ */
+function precomputedLeadCounters(
+  data: DashboardMetricsResponse | null,
+  today: string
+): { leads: number; revenue: number; asOf?: string } | null {
+  const counters = data?.success ? data.metrics?.leads?.today : undefined;
+  if (!counters || counters.date !== today) return null;
+  const builtAt = new Date(data?.updated_at ?? '').getTime();
+  if (!Number.isFinite(builtAt) || Date.now() - builtAt > METRICS_FRESH_MS) return null;
+  return { leads: counters.unique_customers, revenue: counters.revenue, asOf: data?.updated_at };
+}
+
+function metricsAsOf(value?: string): string {
+  if (!value) return '';
+  const date = new Date(value);
+  return Number.isNaN(date.getTime())
+    ? ''
+    : ` (as of ${date.toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' })})`;
+}
+
 /* ------------------------------------------------------------------
    Dashboard Page
    ------------------------------------------------------------------ */
@@ -209,7 +246,11 @@ function DashboardContent() {
   const [leads, setLeads] = useState<Lead[]>([]);
   const [staffLog, setStaffLog] = useState<StaffEntry[]>([]);
   const [complianceAlerts, setComplianceAlerts] = useState<ComplianceAlert[]>([]);
-  const [metrics, setMetrics] = useState({ leads: 0, staff: 0, revenue: 0 });
+  const [metrics, setMetrics] = useState<{ leads: number; staff: number; revenue: number; asOf?: string }>({
+    leads: 0,
+    staff: 0,
+    revenue: 0,
+  });
   const [selectedLead, setSelectedLead] = useState<Lead | null>(null);
   const [loading, setLoading] = useState(true);
   const [lastUpdated, setLastUpdated] = useState(new Date());
@@ -218,13 +259,15 @@ function DashboardContent() {
     try {
       const today = new Date().toISOString().slice(0, 10);
 
-      const [leadsRes, staffRes] = await Promise.all([
+      const [leadsRes, staffRes, metricsRes] = await Promise.all([
         fetch(`/api/leads?limit=50`),
         fetch(`/api/staff-log?date=${today}`),
+        fetch(`/api/dashboard-metrics`),
       ]);
 
       const leadsData = leadsRes.ok ? await leadsRes.json() : { leads: [], count: 0 };
       const staffData = staffRes.ok ? await staffRes.json() : { logs: [] };
+      const metricsData: DashboardMetricsResponse | null = metricsRes.ok ? await metricsRes.json() : null;
 
       // Deduplicate by primary key to prevent duplicate entries in UI
       const rawLeads: Lead[] = leadsData.leads ?? [];
@@ -237,7 +280,7 @@ function DashboardContent() {
         new Map(rawStaff.map((s) => [s.log_id, s])).values()
       );
 
-      // Derive metrics
+      // Live counters from the 50 most recent leads
       const todayLeads = fetchedLeads.filter((l) => {
         const ts = l.created_at ?? l.timestamp ?? '';
         return ts.startsWith(today);
@@ -276,10 +319,15 @@ function DashboardContent() {
       setLeads(fetchedLeads);
       setStaffLog(fetchedStaff);
       setComplianceAlerts(alerts);
+      // The precomputed counters cover every lead today, but only up to their build time; the feed
+      // covers leads since then, but only its first page. Both undercount, so show the larger.
+      const precomputed = precomputedLeadCounters(metricsData, today);
       setMetrics({
-        leads: uniqueCustomers.length,
+        leads: Math.max(precomputed?.leads ?? 0, uniqueCustomers.length),
         staff: activeSet.size,
-        revenue,
+        revenue: Math.max(precomputed?.revenue ?? 0, revenue),
+        // "As of" only when the document's figure is the one shown.
+        asOf: precomputed && precomputed.leads >= uniqueCustomers.length ? precomputed.asOf : undefined,
       });
       setLastUpdated(new Date());
     } catch (err) {
@@ -463,7 +511,7 @@ function DashboardContent() {
             <BentoGrid className="md:auto-rows-[13rem] mb-6">
               <BentoGridItem
                 title="Today's Leads"
-                description="New customer interactions captured today"
+                description={`New customer interactions captured today${metricsAsOf(metrics.asOf)}`}
                 header={<SkeletonLeadPulse value={loading ? '—' : metrics.leads} />}
                 className="md:col-span-1 p-3 space-y-2"
                 icon={<IconChartBar className="w-4 h-4 text-vault-red" />}
@@ -477,7 +525,7 @@ function DashboardContent() {
               />
               <BentoGridItem
                 title="Est. Revenue"
-                description="Projected revenue from today's leads"
+                description={`Projected revenue from today's leads${metricsAsOf(metrics.asOf)}`}
                 header={<SkeletonRevenue value={loading ? '—' : `$${metrics.revenue.toLocaleString()}`} />}
                 className="md:col-span-1 p-3 space-y-2"
                 icon={<IconCoin className="w-4 h-4 text-vault-gold" />}
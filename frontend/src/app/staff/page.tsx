@@ -40,7 +40,7 @@ export default function StaffPage() {
   const [showPriceLookup, setShowPriceLookup] = useState(false);
   const [showItemEntry, setShowItemEntry] = useState(false);
   const [showInventoryManager, setShowInventoryManager] = useState(false);
-  const [availableStaff, setAvailableStaff] = useState<Array<{ name: string; pin: string }>>([]);
+  const [availableStaff, setAvailableStaff] = useState<Array<{ name: string }>>([]);
   const isClockedIn = Boolean(activeShift);
 
   /* ----------------------------------------------------------------
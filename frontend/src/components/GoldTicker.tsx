@@ -9,6 +9,8 @@ type GoldPriceData = {
   platinum: number;
   timestamp: string;
   source: string;
+  live?: boolean;
+  stale?: boolean;
 };
 
 const CLIENT_FALLBACK_PRICES: GoldPriceData = {
@@ -17,6 +19,7 @@ const CLIENT_FALLBACK_PRICES: GoldPriceData = {
   platinum: 950,
   timestamp: new Date().toISOString(),
   source: 'fallback',
+  live: false,
 };
 
 export default function GoldTicker() {
@@ -29,10 +32,8 @@ export default function GoldTicker() {
     const timeout = setTimeout(() => controller.abort(), 7000);
 
     try {
-      const res = await fetch('/api/gold-price', {
-        cache: 'no-store',
-        signal: controller.signal,
-      });
+      // The route reads the published quote and is edge-cacheable, so let HTTP caching do its job.
+      const res = await fetch('/api/gold-price', { signal: controller.signal });
       if (!res.ok) throw new Error('Failed to fetch prices');
       const data: GoldPriceData = await res.json();
 
@@ -82,6 +83,11 @@ export default function GoldTicker() {
               <span className="hidden sm:inline">Platinum:</span>
               <span className="font-semibold">${prices.platinum.toFixed(2)}<span className="text-vault-text-muted">/oz</span></span>
             </span>
+            {prices.live === false ? (
+              <span className="text-vault-text-muted text-xs">(estimate)</span>
+            ) : (
+              prices.stale && <span className="text-vault-text-muted text-xs">(delayed)</span>
+            )}
           </div>
         ) : (
           <span className="text-vault-text-muted text-xs font-mono">Prices unavailable</span>
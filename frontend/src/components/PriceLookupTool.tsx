@@ -13,6 +13,7 @@ import {
   type ParsedMetalSpecs,
   type ValuationResult,
   type MetalType,
+  type StoredValuation,
 } from '@/lib/metalParser';
 
 /* ------------------------------------------------------------------
@@ -35,6 +36,15 @@ type StoreMargins = {
   retailPercent: number;
 };
 
+// Inventory rows carry a valuation precomputed by reprice_inventory.py.
+type ComparableItem = {
+  item_id: string;
+  brand?: string;
+  description?: string;
+  price?: number;
+  valuation: StoredValuation;
+};
+
 interface PriceLookupToolProps {
   onClose?: () => void;
 }
@@ -49,6 +59,7 @@ export default function PriceLookupTool({ onClose }: PriceLookupToolProps) {
   const [manualMetalType, setManualMetalType] = useState<MetalType>('gold');
   const [manualPurity, setManualPurity] = useState('14k');
   const [showManual, setShowManual] = useState(false);
+  const [comparables, setComparables] = useState<ComparableItem[]>([]);
 
   // Default store margins (configurable)
   const storeMargins: StoreMargins = useMemo(
@@ -81,6 +92,22 @@ export default function PriceLookupTool({ onClose }: PriceLookupToolProps) {
     }
   };
 
+  // In-stock items of the same metal, using their stored valuations
+  const comparableMetal = parsedSpecs?.metalType;
+  useEffect(() => {
+    if (!comparableMetal || comparableMetal === 'unknown') {
+      setComparables([]);
+      return;
+    }
+    const controller = new AbortController();
+    const params = new URLSearchParams({ metal: comparableMetal, status: 'available', sort: 'melt-high', limit: '5' });
+    fetch(`/api/inventory?${params}`, { signal: controller.signal })
+      .then((res) => (res.ok ? res.json() : { items: [] }))
+      .then((data) => setComparables((data.items ?? []) as ComparableItem[]))
+      .catch(() => {});
+    return () => controller.abort();
+  }, [comparableMetal]);
+
   // Auto-calculate when description changes
   const handleDescriptionChange = useCallback(
     (value: string) => {
@@ -370,6 +397,26 @@ export default function PriceLookupTool({ onClose }: PriceLookupToolProps) {
           </div>
         )}
 
+        {/* Comparable Stock */}
+        {comparables.length > 0 && (
+          <div className="p-3 rounded-lg bg-vault-black-deep/50 border border-vault-gold/5">
+            <div className="text-[10px] text-vault-text-muted uppercase mb-2">
+              In Stock ({parsedSpecs?.metalType})
+            </div>
+            <div className="space-y-1">
+              {comparables.map((item) => (
+                <div key={item.item_id} className="flex items-center justify-between gap-3 text-[11px]">
+                  <span className="text-vault-text-light line-clamp-1">{item.description || item.brand}</span>
+                  <span className="font-mono text-vault-text-muted whitespace-nowrap">
+                    melt {formatCurrency(item.valuation.melt_value)}
+                    {typeof item.price === 'number' && item.price > 0 ? ` · tag ${formatCurrency(item.price)}` : ''}
+                  </span>
+                </div>
+              ))}
+            </div>
+          </div>
+        )}
+
         {/* No Result State */}
         {description.trim().length >= 3 && !valuation && parsedSpecs?.metalType === 'unknown' && (
           <div className="p-4 rounded-lg bg-vault-black-deep border border-vault-gold/10 text-center">
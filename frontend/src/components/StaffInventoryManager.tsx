@@ -10,6 +10,7 @@ import { Card, CardContent } from '@/components/ui/card';
 import { Dialog, DialogContent, DialogHeader, DialogTitle, DialogDescription, DialogFooter } from '@/components/ui/dialog';
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from '@/components/ui/select';
 import { Alert, AlertDescription } from '@/components/ui/alert';
+import { formatCurrency, type StoredValuation } from '@/lib/metalParser';
 import { normalizeTagList } from '@/lib/tag-governance';
 import { cn } from '@/lib/utils';
 import { motion, AnimatePresence } from 'motion/react';
@@ -37,6 +38,7 @@ type InventoryItem = {
   condition?: string;
   status: InventoryStatus;
   images?: string[];
+  valuation?: StoredValuation;
   created_at: string;
   updated_at?: string;
 };
@@ -338,6 +340,14 @@ export default function StaffInventoryManager({ staffName }: StaffInventoryManag
                           {item.category}
                         </Badge>
                       </div>
+                      {item.valuation && (
+                        <p
+                          className="text-[11px] font-mono text-vault-text-muted"
+                          title={`At ${formatCurrency(item.valuation.spot_price)}/oz ${item.valuation.metal_type}, priced ${new Date(item.valuation.priced_at).toLocaleString()}`}
+                        >
+                          Melt {formatCurrency(item.valuation.melt_value)} · Pawn {formatCurrency(item.valuation.pawn_loan)}
+                        </p>
+                      )}
                     </div>
 
                     {/* Actions */}
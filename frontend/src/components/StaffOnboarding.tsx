@@ -26,7 +26,8 @@ import {
 
 type StaffMember = {
   name: string;
-  pin: string;
+  // Only present right after it is set; the API stores PINs hashed.
+  pin?: string;
   role?: string;
   phone?: string;
   email?: string;
@@ -274,13 +275,15 @@ export default function StaffOnboarding() {
                     <div className="space-y-2 text-sm">
                       <div className="flex items-center gap-2 text-vault-text-muted">
                         <IconKey className="h-4 w-4 text-vault-gold" />
-                        <span className="font-mono font-bold text-vault-text-light">{member.pin}</span>
-                        <button
-                          onClick={() => copyToClipboard(member.pin)}
-                          className="ml-auto p-1 hover:bg-vault-hover-overlay rounded transition-colors"
-                        >
-                          <IconCopy className="h-3 w-3" />
-                        </button>
+                        <span className="font-mono font-bold text-vault-text-light">{member.pin ?? '••••'}</span>
+                        {member.pin && (
+                          <button
+                            onClick={() => copyToClipboard(member.pin ?? '')}
+                            className="ml-auto p-1 hover:bg-vault-hover-overlay rounded transition-colors"
+                          >
+                            <IconCopy className="h-3 w-3" />
+                          </button>
+                        )}
                       </div>
                       {member.phone && (
                         <div className="flex items-center gap-2 text-vault-text-muted">
@@ -500,8 +503,9 @@ export default function StaffOnboarding() {
                     PIN
                   </label>
                   <Input
-                    value={editingStaff.pin}
+                    value={editingStaff.pin ?? ''}
                     onChange={(e) => setEditingStaff({ ...editingStaff, pin: e.target.value })}
+                    placeholder="Leave blank to keep"
                     maxLength={4}
                     className="bg-vault-surface border-vault-border text-vault-text-light font-mono"
                   />
@@ -0,0 +1,200 @@
+import { promises as fs } from "fs";
+import path from "path";
+import { gunzipSync } from "zlib";
+import { defaultProvider } from "@aws-sdk/credential-provider-node";
+import { Hash } from "@smithy/hash-node";
+import { SignatureV4 } from "@smithy/signature-v4";
+
+/* ──────────────────────────────────────────────────────
+   Conversation cold storage
+
+   Written by backend/scripts/archive_conversations.py: gzip JSONL parts
+   partitioned by month, one gzip member per conversation, plus index.json
+   mapping conversation_id to [file, offset, length, updated_at]. A lookup
+   reads and inflates just that byte range.
+
+   In production the archive lives in S3 (CONVERSATION_ARCHIVE_BUCKET,
+   keys under CONVERSATION_ARCHIVE_PREFIX) and parts are read with ranged
+   GETs, signed with SigV4 from the same credential chain and signer the
+   DynamoDB client already ships with. Without a bucket,
+   CONVERSATION_ARCHIVE_DIR (relative to the frontend directory) serves a
+   local archive for development.
+   ────────────────────────────────────────────────────── */
+
+export const CONVERSATION_ARCHIVE_VERSION = 1;
+
+// How long a warm instance trusts its copy of index.json before revalidating it.
+const INDEX_REVALIDATE_MS = 60 * 1000;
+
+type ArchiveEntry = [file: string, offset: number, length: number, updatedAt: string];
+
+type ArchiveIndexFile = {
+  version: number;
+  updated_at: string | null;
+  count: number;
+  conversations: Record<string, ArchiveEntry>;
+};
+
+type ArchiveStore = {
+  /** Opaque version of index.json (ETag or mtime); null when there is no archive. */
+  indexVersion(): Promise<string | null>;
+  readIndex(): Promise<string>;
+  readRange(file: string, offset: number, length: number): Promise<Buffer>;
+};
+
+let indexCache: {
+  store: string;
+  version: string;
+  checkedAt: number;
+  conversations: Map<string, ArchiveEntry>;
+} | null = null;
+
+let s3Signer: SignatureV4 | null = null;
+
+function signer(): SignatureV4 {
+  s3Signer ??= new SignatureV4({
+    credentials: defaultProvider(),
+    region: process.env.AWS_REGION ?? "us-east-1",
+    service: "s3",
+    sha256: Hash.bind(null, "sha256"),
+    // S3 signs the object key as sent, without a second round of escaping.
+    uriEscapePath: false,
+  });
+  return s3Signer;
+}
+
+class S3ReadError extends Error {
+  readonly status: number;
+
+  constructor(status: number, key: string) {
+    super(`S3 GET ${key} failed with status ${status}`);
+    this.name = "S3ReadError";
+    this.status = status;
+  }
+}
+
+async function s3Get(bucket: string, key: string, range?: string): Promise<Response> {
+  const hostname = `${bucket}.s3.${process.env.AWS_REGION ?? "us-east-1"}.amazonaws.com`;
+  const path = `/${key.split("/").map(encodeURIComponent).join("/")}`;
+  const headers: Record<string, string> = { host: hostname, "x-amz-content-sha256": "UNSIGNED-PAYLOAD" };
+  if (range) headers.range = range;
+
+  const signed = await signer().sign({ method: "GET", protocol: "https:", hostname, path, headers, query: {} });
+  // fetch derives Host from the URL, which is the hostname that was signed.
+  const sendHeaders = { ...signed.headers };
+  delete sendHeaders.host;
+  const response = await fetch(`https://${hostname}${path}`, { headers: sendHeaders, cache: "no-store" });
+  if (!response.ok) {
+    await response.body?.cancel();
+    throw new S3ReadError(response.status, key);
+  }
+  return response;
+}
+
+function isMissingObject(error: unknown): boolean {
+  return error instanceof S3ReadError && error.status === 404;
+}
+
+function s3Store(bucket: string, prefix: string): ArchiveStore {
+  const read = async (key: string, range?: string) =>
+    Buffer.from(await (await s3Get(bucket, prefix + key, range)).arrayBuffer());
+
+  return {
+    async indexVersion() {
+      try {
+        // A one-byte ranged GET is the cheapest way to read the ETag with GetObject permission alone.
+        const response = await s3Get(bucket, `${prefix}index.json`, "bytes=0-0");
+        await response.arrayBuffer();
+        return response.headers.get("etag");
+      } catch (error) {
+        if (isMissingObject(error)) return null;
+        throw error;
+      }
+    },
+    async readIndex() {
+      return (await read("index.json")).toString("utf-8");
+    },
+    async readRange(file, offset, length) {
+      return read(file, `bytes=${offset}-${offset + length - 1}`);
+    },
+  };
+}
+
+function localStore(dir: string): ArchiveStore {
+  return {
+    async indexVersion() {
+      try {
+        // The archiver replaces index.json atomically, so a changed mtime means a new run finished.
+        return String((await fs.stat(path.join(dir, "index.json"))).mtimeMs);
+      } catch {
+        return null;
+      }
+    },
+    async readIndex() {
+      return fs.readFile(path.join(dir, "index.json"), "utf-8");
+    },
+    async readRange(file, offset, length) {
+      const handle = await fs.open(path.join(dir, file), "r");
+      try {
+        const buffer = Buffer.alloc(length);
+        await handle.read(buffer, 0, length, offset);
+        return buffer;
+      } finally {
+        await handle.close();
+      }
+    },
+  };
+}
+
+function archiveStore(): { key: string; store: ArchiveStore } {
+  const bucket = process.env.CONVERSATION_ARCHIVE_BUCKET;
+  if (bucket) {
+    const prefix = process.env.CONVERSATION_ARCHIVE_PREFIX ?? "conversations/";
+    return { key: `s3://${bucket}/${prefix}`, store: s3Store(bucket, prefix) };
+  }
+  const configured = process.env.CONVERSATION_ARCHIVE_DIR;
+  const dir = configured
+    ? path.resolve(process.cwd(), configured)
+    : path.resolve(process.cwd(), "..", "backend", "data", "archive", "conversations");
+  return { key: `${dir}/`, store: localStore(dir) };
+}
+
+async function loadArchiveIndex(key: string, store: ArchiveStore): Promise<Map<string, ArchiveEntry> | null> {
+  const now = Date.now();
+  if (indexCache?.store === key && now - indexCache.checkedAt < INDEX_REVALIDATE_MS) {
+    return indexCache.conversations;
+  }
+
+  const version = await store.indexVersion();
+  if (version === null) return null;
+  if (indexCache?.store === key && indexCache.version === version) {
+    indexCache.checkedAt = now;
+    return indexCache.conversations;
+  }
+
+  const payload = JSON.parse(await store.readIndex()) as ArchiveIndexFile;
+  if (payload.version !== CONVERSATION_ARCHIVE_VERSION) {
+    console.warn(`[Conversation Archive] Unsupported version ${payload.version} in ${key}index.json`);
+    return null;
+  }
+  indexCache = { store: key, version, checkedAt: now, conversations: new Map(Object.entries(payload.conversations)) };
+  return indexCache.conversations;
+}
+
+export async function getArchivedConversation(
+  conversationId: string
+): Promise<Record<string, unknown> | null> {
+  const { key, store } = archiveStore();
+  const entry = (await loadArchiveIndex(key, store))?.get(conversationId);
+  if (!entry) return null;
+
+  const [file, offset, length] = entry;
+  const member = await store.readRange(file, offset, length);
+  return JSON.parse(gunzipSync(member).toString("utf-8")) as Record<string, unknown>;
+}
+
+/** Hot rows already copied to the archive and waiting for the TTL sweep. */
+export function isArchivedRow(item: Record<string, unknown>): boolean {
+  const expiresAt = Number(item.expires_at);
+  return Number.isFinite(expiresAt) && expiresAt > 0 && expiresAt * 1000 <= Date.now();
+}
@@ -0,0 +1,232 @@
+import { PutCommand } from "@aws-sdk/lib-dynamodb";
+import { TABLES, docClient, scanPage, type VaultTableName } from "@/lib/dynamodb";
+
+/* ──────────────────────────────────────────────────────
+   Dashboard metrics document
+
+   Port of backend/scripts/build_dashboard_metrics.py: the same projections,
+   column rules and aggregates, written to the same Store_Config item
+   (config_key "dashboard_metrics"), so either builder can refresh it.
+   The /api/cron/dashboard-metrics route rebuilds it on the schedule in
+   vercel.json; the Python script stays for ad-hoc runs and --snapshot.
+   ────────────────────────────────────────────────────── */
+
+export const METRICS_CONFIG_KEY = "dashboard_metrics";
+export const METRICS_VERSION = 1;
+// How old a document may be before the dashboard stops trusting its "today" counters.
+export const METRICS_FRESH_MS = 30 * 60 * 1000;
+const MAX_DOCUMENT_BYTES = 350_000;
+const DEFAULT_DAYS = 30;
+const SCAN_PAGE_SIZE = 1000;
+
+// Only these attributes are read; message bodies and photos never leave DynamoDB.
+const LEAD_ATTRIBUTES = [
+  "lead_id", "status", "source", "source_channel", "contact_method", "type",
+  "customer_name", "phone", "customer_phone", "estimated_value", "created_at", "timestamp",
+];
+const APPRAISAL_ATTRIBUTES = ["appraisal_id", "item_category", "estimated_value", "timestamp", "created_at"];
+const CONVERSATION_ATTRIBUTES = ["conversation_id", "channel", "source", "customer_key", "phone", "message_count", "started_at"];
+
+const DAY_PATTERN = /^\d{4}-\d{2}-\d{2}/;
+const NUMBER_CLEANUP = /[^\d.-]/g;
+const DAY_MS = 24 * 60 * 60 * 1000;
+
+type Row = Record<string, unknown>;
+type Counts = Record<string, number>;
+
+async function scanTable(tableName: VaultTableName, attributes: string[]): Promise<Row[]> {
+  const names = Object.fromEntries(attributes.map((name, index) => [`#a${index}`, name]));
+  const rows: Row[] = [];
+  let startKey: Record<string, unknown> | undefined;
+  do {
+    const page = await scanPage<Row>(tableName, SCAN_PAGE_SIZE, startKey, {
+      ProjectionExpression: Object.keys(names).join(", "),
+      ExpressionAttributeNames: names,
+    });
+    rows.push(...page.items);
+    startKey = page.lastEvaluatedKey;
+  } while (startKey);
+  return rows;
+}
+
+// Column rules, as text_column / number_column / day_column in the Python builder.
+
+function text(row: Row, names: string[], fallback = "", lower = true): string {
+  const name = names.find((candidate) => row[candidate] != null && row[candidate] !== "");
+  const value = String(name ? row[name] : fallback).trim();
+  return lower ? value.toLowerCase() : value;
+}
+
+function numberValue(row: Row, name: string): number {
+  // Mirrors parseEstimatedValue in the leads route: strip currency text, anything unparseable is 0.
+  const value = row[name];
+  if (value == null || typeof value === "boolean") return 0;
+  const parsed = typeof value === "string" ? Number(value.replace(NUMBER_CLEANUP, "") || 0) : Number(value);
+  return Number.isFinite(parsed) ? parsed : 0;
+}
+
+function day(row: Row, names: string[]): string | null {
+  // Same prefix test the dashboard uses (created_at.startsWith(today)), so offsets are kept as written.
+  const name = names.find((candidate) => Boolean(row[candidate]));
+  const value = name ? String(row[name]) : "";
+  return DAY_PATTERN.test(value) ? value.slice(0, 10) : null;
+}
+
+function deriveMethod(source: string): string {
+  if (source.includes("sms") || source.includes("mms") || source.includes("text")) return "sms";
+  if (source.includes("voice") || source.includes("phone") || source.includes("call")) return "phone";
+  if (source.includes("chat")) return "chat";
+  return "web";
+}
+
+// Aggregations.
+
+function roundNumber(value: number): number {
+  return Number.isInteger(value) ? value : Math.round(value * 100) / 100;
+}
+
+/** Totals per label, largest first; ties keep label order (np.unique sorts labels). */
+function countsBy(labels: string[], weights?: number[]): Counts {
+  const totals = new Map<string, number>();
+  labels.forEach((label, index) => totals.set(label, (totals.get(label) ?? 0) + (weights ? weights[index] : 1)));
+  const ordered = [...totals.entries()].sort(([a, x], [b, y]) => y - x || (a < b ? -1 : a > b ? 1 : 0));
+  return Object.fromEntries(ordered.map(([label, total]) => [label, roundNumber(total)]));
+}
+
+function dayOffset(value: string | null, start: number, window: number): number | null {
+  if (!value) return null;
+  const offset = Math.round((Date.parse(`${value}T00:00:00Z`) - start) / DAY_MS);
+  return Number.isFinite(offset) && offset >= 0 && offset < window ? offset : null;
+}
+
+function daily(days: (string | null)[], start: number, window: number, weights?: number[]): number[] {
+  const totals = new Array<number>(window).fill(0);
+  days.forEach((value, index) => {
+    const offset = dayOffset(value, start, window);
+    if (offset !== null) totals[offset] += weights ? weights[index] : 1;
+  });
+  return totals.map(roundNumber);
+}
+
+/** Distinct customers per day and their revenue, counting each customer's earliest lead of the day once. */
+function uniqueCustomersDaily(leads: Row[], start: number, window: number): [number[], number[]] {
+  const earliest = new Map<string, { offset: number; created: string; value: number }>();
+  for (const lead of leads) {
+    const offset = dayOffset(day(lead, ["created_at", "timestamp"]), start, window);
+    if (offset === null) continue;
+    const customer = `${text(lead, ["customer_name"])}|${text(lead, ["phone", "customer_phone"], "", false)}`;
+    const created = text(lead, ["created_at", "timestamp"], "", false);
+    const key = `${offset}\u0000${customer}`;
+    const current = earliest.get(key);
+    if (!current || created < current.created) {
+      earliest.set(key, { offset, created, value: numberValue(lead, "estimated_value") });
+    }
+  }
+
+  const customers = new Array<number>(window).fill(0);
+  const revenue = new Array<number>(window).fill(0);
+  for (const { offset, value } of earliest.values()) {
+    customers[offset] += 1;
+    revenue[offset] += value;
+  }
+  return [customers, revenue.map(roundNumber)];
+}
+
+export function buildDashboardMetrics(
+  leads: Row[],
+  appraisals: Row[],
+  conversations: Row[],
+  anchor: Date = new Date(),
+  window: number = DEFAULT_DAYS
+): Record<string, unknown> {
+  const end = Date.UTC(anchor.getUTCFullYear(), anchor.getUTCMonth(), anchor.getUTCDate());
+  const start = end - (window - 1) * DAY_MS;
+  const dates = Array.from({ length: window }, (_, offset) => new Date(start + offset * DAY_MS).toISOString().slice(0, 10));
+
+  const leadDays = leads.map((lead) => day(lead, ["created_at", "timestamp"]));
+  const leadSources = leads.map((lead) => text(lead, ["source", "source_channel"], "web"));
+  const [uniqueDaily, revenueDaily] = uniqueCustomersDaily(leads, start, window);
+
+  const appraisalCategories = appraisals.map((appraisal) => text(appraisal, ["item_category"], "unknown"));
+  const appraisalValues = appraisals.map((appraisal) => numberValue(appraisal, "estimated_value"));
+  const appraisalDays = appraisals.map((appraisal) => day(appraisal, ["timestamp", "created_at"]));
+  const appraisalTotal = appraisalValues.reduce((sum, value) => sum + value, 0);
+  const valueByCategory = countsBy(appraisalCategories, appraisalValues);
+
+  // The API shows a placeholder message for conversations with none recorded.
+  const messages = conversations.map((conversation) => Math.max(numberValue(conversation, "message_count"), 1));
+  const conversationDays = conversations.map((conversation) => day(conversation, ["started_at"]));
+  const customers = conversations.map((conversation) =>
+    text(conversation, ["customer_key", "phone", "conversation_id"], "", false)
+  );
+
+  return {
+    version: METRICS_VERSION,
+    generated_at: new Date().toISOString(),
+    dates,
+    leads: {
+      total: leads.length,
+      by_status: countsBy(leads.map((lead) => text(lead, ["status"], "new"))),
+      by_source: countsBy(leadSources),
+      by_contact_method: countsBy(
+        leads.map((lead, index) => text(lead, ["contact_method"]) || deriveMethod(leadSources[index]))
+      ),
+      by_type: countsBy(leads.map((lead) => text(lead, ["type"], "unknown"))),
+      daily: {
+        count: daily(leadDays, start, window),
+        unique_customers: uniqueDaily,
+        revenue: revenueDaily,
+      },
+      today: { date: dates[window - 1], unique_customers: uniqueDaily[window - 1], revenue: revenueDaily[window - 1] },
+    },
+    appraisals: {
+      total: appraisals.length,
+      total_value: roundNumber(appraisalTotal),
+      average_value: appraisals.length ? roundNumber(appraisalTotal / appraisals.length) : 0,
+      by_category: Object.fromEntries(
+        Object.entries(countsBy(appraisalCategories)).map(([category, count]) => [
+          category,
+          { count, value: valueByCategory[category] ?? 0 },
+        ])
+      ),
+      daily: {
+        count: daily(appraisalDays, start, window),
+        value: daily(appraisalDays, start, window, appraisalValues),
+      },
+    },
+    conversations: {
+      total: conversations.length,
+      messages: roundNumber(messages.reduce((sum, value) => sum + value, 0)),
+      unique_customers: new Set(customers).size,
+      by_channel: countsBy(conversations.map((conversation) => text(conversation, ["channel", "source"], "web"))),
+      by_source: countsBy(conversations.map((conversation) => text(conversation, ["source"], "web"))),
+      daily: {
+        count: daily(conversationDays, start, window),
+        messages: daily(conversationDays, start, window, messages),
+      },
+    },
+  };
+}
+
+/** Scan, aggregate and write the document; returns it with its encoded size. */
+export async function refreshDashboardMetrics(): Promise<{ metrics: Record<string, unknown>; bytes: number }> {
+  const [leads, appraisals, conversations] = await Promise.all([
+    scanTable(TABLES.leads, LEAD_ATTRIBUTES),
+    scanTable(TABLES.appraisals, APPRAISAL_ATTRIBUTES),
+    scanTable(TABLES.conversations, CONVERSATION_ATTRIBUTES),
+  ]);
+  const metrics = buildDashboardMetrics(leads, appraisals, conversations);
+  const value = JSON.stringify(metrics);
+  const bytes = Buffer.byteLength(value, "utf8");
+  if (bytes > MAX_DOCUMENT_BYTES) {
+    throw new Error(`Metrics document is ${bytes} bytes (limit ${MAX_DOCUMENT_BYTES})`);
+  }
+
+  await docClient.send(
+    new PutCommand({
+      TableName: TABLES.storeConfig,
+      Item: { config_key: METRICS_CONFIG_KEY, value, updated_at: metrics.generated_at },
+    })
+  );
+  return { metrics, bytes };
+}
@@ -81,10 +81,35 @@ export const TABLES = {
   appraisals: "USA_Pawn_Appraisals",
   conversations: "USA_Pawn_Conversations",
   storeConfig: "USA_Pawn_Store_Config",
+  staffHours: "USA_Pawn_Staff_Hours",
+  staff: "USA_Pawn_Staff",
 } as const;
 
 export type VaultTableName = (typeof TABLES)[keyof typeof TABLES];
 
+// Global secondary indexes defined in backend/scripts/create_tables.py.
+export const INDEXES = {
+  leadsByStatus: "status-created_at-index",
+  appointmentsByTime: "type-appointment_time-index",
+  inventoryByCategory: "category-date_added-index",
+  staffLogByStaff: "staff_key-timestamp-index",
+  conversationsByUpdatedBucket: "updated_bucket-updated_at-index",
+  staffByPinHash: "pin_hash-index",
+} as const;
+
+export type VaultIndexName = (typeof INDEXES)[keyof typeof INDEXES];
+
+export type SortKeyCondition =
+  | { name: string; beginsWith: string }
+  | { name: string; between: [string, string] }
+  | { name: string; gte: string };
+
+export type IndexQueryOptions = {
+  sortKey?: SortKeyCondition;
+  newestFirst?: boolean;
+  limit?: number;
+};
+
 const region = process.env.AWS_REGION ?? "us-east-1";
 
 const client = new DynamoDBClient({ region });
@@ -105,6 +130,39 @@ export async function getItem<T extends Record<string, unknown>>(
   return (result.Item as T | undefined) ?? null;
 }
 
+export function conversationUpdatedBucket(iso: string): string {
+  return iso.slice(0, 10);
+}
+
+function withIndexAttributes<T extends Record<string, unknown>>(tableName: VaultTableName, item: T): T {
+  // Conversations are re-put on every turn, so stamp the day bucket the GSI partitions on.
+  // A caller's own updated_at (e.g. a re-put of an older record) is kept; now() only fills a gap.
+  if (tableName === TABLES.conversations) {
+    const updatedAt = typeof item.updated_at === "string" && item.updated_at ? item.updated_at : new Date().toISOString();
+    return { ...item, updated_at: updatedAt, updated_bucket: conversationUpdatedBucket(updatedAt) };
+  }
+  // The schedule index is sparse on type + appointment_time, so every appointment row needs both,
+  // including leads posted with only a preferred or scheduled time.
+  if (tableName === TABLES.leads) {
+    const appointmentTime = leadAppointmentTime(item);
+    const isAppointment =
+      item.type === "appointment" || (item.type == null && (Boolean(item.appointment_id) || Boolean(appointmentTime)));
+    if (isAppointment && appointmentTime) {
+      return { ...item, type: "appointment", appointment_time: appointmentTime };
+    }
+  }
+  return item;
+}
+
+/** appointment_time, else scheduled_time, else preferred_time; backfill_index_attributes.py uses the same order. */
+export function leadAppointmentTime(item: Record<string, unknown>): string | undefined {
+  for (const name of ["appointment_time", "scheduled_time", "preferred_time"]) {
+    const value = item[name];
+    if (typeof value === "string" && value) return value;
+  }
+  return undefined;
+}
+
 export async function putItem<T extends Record<string, unknown>>(
   tableName: VaultTableName,
   item: T,
@@ -112,7 +170,7 @@ export async function putItem<T extends Record<string, unknown>>(
   await docClient.send(
     new PutCommand({
       TableName: tableName,
-      Item: item,
+      Item: withIndexAttributes(tableName, item),
     }),
   );
 }
@@ -130,6 +188,73 @@ export async function queryItems<T extends Record<string, unknown>>(
   return (result.Items as T[] | undefined) ?? [];
 }
 
+export async function queryAllItems<T extends Record<string, unknown>>(
+  tableName: VaultTableName,
+  params: Omit<QueryCommandInput, "TableName">,
+  maxItems?: number,
+): Promise<T[]> {
+  const items: T[] = [];
+  let exclusiveStartKey: QueryCommandInput["ExclusiveStartKey"] = undefined;
+
+  do {
+    const result = await docClient.send(
+      new QueryCommand({
+        TableName: tableName,
+        ...params,
+        ExclusiveStartKey: exclusiveStartKey,
+      }),
+    );
+    items.push(...((result.Items as T[] | undefined) ?? []));
+    exclusiveStartKey = result.LastEvaluatedKey;
+  } while (exclusiveStartKey && (maxItems == null || items.length < maxItems));
+
+  return maxItems == null ? items : items.slice(0, maxItems);
+}
+
+export async function queryIndexItems<T extends Record<string, unknown>>(
+  tableName: VaultTableName,
+  indexName: VaultIndexName,
+  partitionKey: { name: string; value: unknown },
+  options: IndexQueryOptions = {},
+): Promise<T[]> {
+  const names: Record<string, string> = { "#pk": partitionKey.name };
+  const values: Record<string, unknown> = { ":pk": partitionKey.value };
+  let keyCondition = "#pk = :pk";
+
+  const sortKey = options.sortKey;
+  if (sortKey) {
+    names["#sk"] = sortKey.name;
+    if ("beginsWith" in sortKey) {
+      keyCondition += " AND begins_with(#sk, :sk)";
+      values[":sk"] = sortKey.beginsWith;
+    } else if ("between" in sortKey) {
+      keyCondition += " AND #sk BETWEEN :skStart AND :skEnd";
+      values[":skStart"] = sortKey.between[0];
+      values[":skEnd"] = sortKey.between[1];
+    } else {
+      keyCondition += " AND #sk >= :sk";
+      values[":sk"] = sortKey.gte;
+    }
+  }
+
+  return queryAllItems<T>(
+    tableName,
+    {
+      IndexName: indexName,
+      KeyConditionExpression: keyCondition,
+      ExpressionAttributeNames: names,
+      ExpressionAttributeValues: values,
+      ScanIndexForward: !options.newestFirst,
+    } as Omit<QueryCommandInput, "TableName">,
+    options.limit,
+  );
+}
+
+export function isMissingIndexError(error: unknown): boolean {
+  const err = error as { name?: string; message?: string } | null;
+  return err?.name === "ValidationException" && /index/i.test(err.message ?? "");
+}
+
 export async function scanItems<T extends Record<string, unknown>>(
   tableName: VaultTableName,
   params?: Omit<ScanCommandInput, "TableName">,
@@ -143,10 +268,50 @@ export async function scanItems<T extends Record<string, unknown>>(
   return (result.Items as T[] | undefined) ?? [];
 }
 
+export type ScanPage<T> = {
+  items: T[];
+  lastEvaluatedKey?: Record<string, unknown>;
+};
+
+export async function scanPage<T extends Record<string, unknown>>(
+  tableName: VaultTableName,
+  limit: number,
+  exclusiveStartKey?: Record<string, unknown>,
+  params?: Omit<ScanCommandInput, "TableName" | "Limit" | "ExclusiveStartKey">,
+): Promise<ScanPage<T>> {
+  const result = await docClient.send(
+    new ScanCommand({
+      TableName: tableName,
+      ...(params ?? {}),
+      Limit: limit,
+      ExclusiveStartKey: exclusiveStartKey,
+    }),
+  );
+  return {
+    items: (result.Items as T[] | undefined) ?? [],
+    lastEvaluatedKey: result.LastEvaluatedKey,
+  };
+}
+
+export function encodeCursor(key: Record<string, unknown> | undefined): string | null {
+  return key ? Buffer.from(JSON.stringify(key), "utf8").toString("base64url") : null;
+}
+
+export function decodeCursor(cursor: string | null | undefined): Record<string, unknown> | undefined {
+  if (!cursor) return undefined;
+  try {
+    const parsed = JSON.parse(Buffer.from(cursor, "base64url").toString("utf8")) as unknown;
+    return parsed && typeof parsed === "object" && !Array.isArray(parsed) ? (parsed as Record<string, unknown>) : undefined;
+  } catch {
+    return undefined;
+  }
+}
+
 export async function updateItem<T extends Record<string, unknown>>(
   tableName: VaultTableName,
   key: Record<string, unknown>,
   updates: Record<string, unknown>,
+  remove: string[] = [],
 ): Promise<T | null> {
   // Build UpdateExpression dynamically from updates object
   const updateExpressions: string[] = [];
@@ -167,18 +332,27 @@ export async function updateItem<T extends Record<string, unknown>>(
     }
   }
 
-  if (updateExpressions.length === 0) {
+  const removePlaceholders = remove.map((name, position) => {
+    expressionAttributeNames[`#rem${position}`] = name;
+    return `#rem${position}`;
+  });
+
+  if (updateExpressions.length === 0 && removePlaceholders.length === 0) {
     // No updates to apply
     return null;
   }
 
+  const clauses = [
+    updateExpressions.length > 0 ? `SET ${updateExpressions.join(', ')}` : '',
+    removePlaceholders.length > 0 ? `REMOVE ${removePlaceholders.join(', ')}` : '',
+  ];
   const result = await docClient.send(
     new UpdateCommand({
       TableName: tableName,
       Key: key,
-      UpdateExpression: `SET ${updateExpressions.join(', ')}`,
+      UpdateExpression: clauses.filter(Boolean).join(' '),
       ExpressionAttributeNames: expressionAttributeNames,
-      ExpressionAttributeValues: expressionAttributeValues,
+      ExpressionAttributeValues: updateExpressions.length > 0 ? expressionAttributeValues : undefined,
       ReturnValues: "ALL_NEW",
     }),
   );
@@ -0,0 +1,218 @@
+import { readFileSync, statSync } from "fs";
+import path from "path";
+import {
+  SEARCH_WEIGHTS,
+  getItemSearchBlob,
+  prepareInventoryQuery,
+  rankInventoryCandidates,
+  type InventorySearchParams,
+  type InventorySearchResult,
+  type ItemSearchBlob,
+  type PreparedInventoryQuery,
+} from "@/lib/inventory-search";
+import { matchesCategoryCandidates } from "@/lib/tag-governance";
+
+/* ──────────────────────────────────────────────────────
+   Prebuilt inventory search index
+
+   Built offline by frontend/scripts/build_search_index.py. Postings map every
+   lowercase [a-z0-9-] run of an item's searchable text to item positions, so
+   a query only filters and scores the items that could possibly match.
+   Filtering and ranking reuse rankInventoryCandidates, so results are the
+   same as searchInventoryItems over the indexed items.
+
+   Enabled by setting INVENTORY_SEARCH_INDEX to the index file path
+   (relative to the frontend directory). The builder replaces the file
+   atomically; a warm instance notices a new mtime and reloads it.
+   ────────────────────────────────────────────────────── */
+
+export const SEARCH_INDEX_VERSION = 1;
+
+// How long a warm instance trusts its loaded index before checking the file's mtime again.
+const INDEX_REVALIDATE_MS = 60 * 1000;
+
+const WORD_RUN = /[a-z0-9-]+/g;
+
+type SearchIndexFile = {
+  version: number;
+  built_at: string;
+  source: string;
+  weights: Record<string, number>;
+  item_count: number;
+  items: Array<Record<string, unknown>>;
+  postings: Record<string, number[]>;
+  categories: Record<string, number[]>;
+};
+
+export type InventorySearchIndex = {
+  builtAt: string;
+  items: Array<Record<string, unknown>>;
+  blobs: ItemSearchBlob[];
+  postings: Map<string, number[]>;
+  categories: Array<[string, number[]]>;
+  words: string[];
+  offsets: number[];
+  vocabulary: string;
+  termCache: Map<string, number[]>;
+};
+
+let indexCache: {
+  path: string;
+  mtimeMs: number | null;
+  checkedAt: number;
+  index: InventorySearchIndex | null;
+} | null = null;
+
+function weightsMatch(weights: Record<string, number> | undefined): boolean {
+  if (!weights) return false;
+  const expected = Object.entries(SEARCH_WEIGHTS);
+  return Object.keys(weights).length === expected.length && expected.every(([key, value]) => weights[key] === value);
+}
+
+function readSearchIndex(indexPath: string): InventorySearchIndex | null {
+  const payload = JSON.parse(readFileSync(indexPath, "utf-8")) as SearchIndexFile;
+  if (payload.version !== SEARCH_INDEX_VERSION) {
+    console.warn(`[Search Index] Unsupported version ${payload.version} in ${indexPath}; using table scan.`);
+    return null;
+  }
+  if (!weightsMatch(payload.weights)) {
+    console.warn(`[Search Index] ${indexPath} was built with different scoring weights; using table scan.`);
+    return null;
+  }
+
+  // Vocabulary joined into one newline-separated string so substring lookups
+  // are indexOf calls over a single buffer.
+  const words = Object.keys(payload.postings);
+  const offsets: number[] = [];
+  let offset = 0;
+  for (const word of words) {
+    offsets.push(offset);
+    offset += word.length + 1;
+  }
+
+  return {
+    builtAt: payload.built_at,
+    items: payload.items,
+    blobs: payload.items.map(getItemSearchBlob),
+    postings: new Map(Object.entries(payload.postings)),
+    categories: Object.entries(payload.categories),
+    words,
+    offsets,
+    vocabulary: words.join("\n"),
+    termCache: new Map(),
+  };
+}
+
+export function loadInventorySearchIndex(): InventorySearchIndex | null {
+  const configured = process.env.INVENTORY_SEARCH_INDEX;
+  if (!configured) return null;
+
+  const indexPath = path.resolve(process.cwd(), configured);
+  const now = Date.now();
+  if (indexCache?.path === indexPath && now - indexCache.checkedAt < INDEX_REVALIDATE_MS) {
+    return indexCache.index;
+  }
+
+  let mtimeMs: number | null = null;
+  try {
+    mtimeMs = statSync(indexPath).mtimeMs;
+  } catch {
+    // Missing file: fall through and cache the miss like a failed load.
+  }
+  if (indexCache?.path === indexPath && indexCache.mtimeMs === mtimeMs) {
+    indexCache.checkedAt = now;
+    return indexCache.index;
+  }
+
+  let index: InventorySearchIndex | null = null;
+  if (mtimeMs !== null) {
+    try {
+      index = readSearchIndex(indexPath);
+    } catch (err) {
+      console.warn(`[Search Index] Failed to load ${indexPath}; using table scan.`, err);
+    }
+  } else {
+    console.warn(`[Search Index] ${indexPath} not found; using table scan.`);
+  }
+  indexCache = { path: indexPath, mtimeMs, checkedAt: now, index };
+  return index;
+}
+
+function wordIndexAt(offsets: number[], position: number): number {
+  let low = 0;
+  let high = offsets.length - 1;
+  while (low < high) {
+    const mid = (low + high + 1) >> 1;
+    if (offsets[mid] <= position) low = mid;
+    else high = mid - 1;
+  }
+  return low;
+}
+
+/** Positions of items whose searchable text contains `term`, a single [a-z0-9-] run. */
+function termPostings(index: InventorySearchIndex, term: string): number[] {
+  const cached = index.termCache.get(term);
+  if (cached) return cached;
+
+  const matched = new Set<number>();
+  const seenWords = new Set<number>();
+  let start = index.vocabulary.indexOf(term);
+  while (start !== -1) {
+    const wordIndex = wordIndexAt(index.offsets, start);
+    if (!seenWords.has(wordIndex)) {
+      seenWords.add(wordIndex);
+      for (const position of index.postings.get(index.words[wordIndex]) ?? []) matched.add(position);
+    }
+    start = index.vocabulary.indexOf(term, start + 1);
+  }
+
+  const result = [...matched].sort((a, b) => a - b);
+  index.termCache.set(term, result);
+  return result;
+}
+
+function allPositions(index: InventorySearchIndex): Iterable<number> {
+  return index.items.keys();
+}
+
+function candidatePositions(index: InventorySearchIndex, query: PreparedInventoryQuery): Iterable<number> {
+  const { queryCategory, queryKeyword, keywordTokens, categoryCandidates } = query;
+
+  if (!queryKeyword) {
+    if (!queryCategory) return allPositions(index);
+    const positions = new Set<number>();
+    for (const [category, members] of index.categories) {
+      if (matchesCategoryCandidates(category, categoryCandidates)) {
+        for (const position of members) positions.add(position);
+      }
+    }
+    return [...positions].sort((a, b) => a - b);
+  }
+
+  // Any keyword match needs either the whole keyword (every run of it inside
+  // some word) or at least one token to appear in the text.
+  const runs = [...new Set(queryKeyword.match(WORD_RUN) ?? [])];
+  if (runs.length === 0) return allPositions(index);
+
+  let direct: Set<number> | null = null;
+  for (const run of runs.sort((a, b) => b.length - a.length)) {
+    const members = termPostings(index, run);
+    const previous: Set<number> | null = direct;
+    direct = previous === null ? new Set(members) : new Set(members.filter((position) => previous.has(position)));
+    if (direct.size === 0) break;
+  }
+
+  const positions = new Set<number>(direct ?? []);
+  for (const token of keywordTokens) {
+    for (const position of termPostings(index, token)) positions.add(position);
+  }
+  return [...positions].sort((a, b) => a - b);
+}
+
+export function searchInventoryIndex(
+  index: InventorySearchIndex,
+  params: InventorySearchParams,
+): InventorySearchResult {
+  const query = prepareInventoryQuery(params);
+  return rankInventoryCandidates(index.items, index.blobs, query, candidatePositions(index, query));
+}
@@ -1,12 +1,12 @@
 import { matchesCategoryCandidates, resolveCategoryCandidates, tokenizeSearchInput } from "@/lib/tag-governance";
 
-type InventorySearchParams = {
+export type InventorySearchParams = {
   category: string;
   keyword: string;
   limit?: number;
 };
 
-type InventorySearchResult = {
+export type InventorySearchResult = {
   queryCategory: string;
   queryKeyword: string;
   count: number;
@@ -15,7 +15,44 @@ type InventorySearchResult = {
   usedKeywordFallback: boolean;
 };
 
-function getItemSearchBlob(item: Record<string, unknown>) {
+export type ItemSearchBlob = {
+  itemCategory: string;
+  brand: string;
+  description: string;
+  tags: string;
+  searchableTokens: string;
+  searchableText: string;
+};
+
+export type PreparedInventoryQuery = {
+  queryCategory: string;
+  queryKeyword: string;
+  limit: number;
+  keywordTokens: string[];
+  categoryCandidates: string[];
+};
+
+// Scoring weights. frontend/scripts/inventory_search.py mirrors these and the
+// prebuilt search index records them so a mismatched index is never used.
+export const SEARCH_WEIGHTS = {
+  categoryExact: 4,
+  categoryContains: 2,
+  categoryCandidateExact: 2,
+  categoryCandidateContains: 1,
+  keywordText: 6,
+  keywordDescription: 5,
+  keywordBrand: 4,
+  keywordTags: 4,
+  keywordCategory: 2,
+  tokenText: 1,
+  tokenDescription: 1,
+  tokenBrand: 1,
+  tokenTags: 1,
+  tokenSearchable: 1,
+  image: 0.5,
+} as const;
+
+export function getItemSearchBlob(item: Record<string, unknown>): ItemSearchBlob {
   const itemCategory = String(item.category ?? "").toLowerCase();
   const brand = String(item.brand ?? "").toLowerCase();
   const description = String(item.description ?? "").toLowerCase();
@@ -34,10 +71,7 @@ function getItemSearchBlob(item: Record<string, unknown>) {
   };
 }
 
-export function searchInventoryItems(
-  items: Array<Record<string, unknown>>,
-  params: InventorySearchParams,
-): InventorySearchResult {
+export function prepareInventoryQuery(params: InventorySearchParams): PreparedInventoryQuery {
   const queryCategory = String(params.category ?? "").toLowerCase().trim();
   const queryKeyword = String(params.keyword ?? "").toLowerCase().trim();
   const limit = Math.max(1, Number(params.limit ?? 5));
@@ -45,60 +79,82 @@ export function searchInventoryItems(
   const keywordTokens = tokenizeSearchInput(queryKeyword);
   const categoryCandidates = resolveCategoryCandidates(queryCategory, keywordTokens);
 
-  const matchesInventoryItem = (item: Record<string, unknown>, requireCategoryMatch: boolean) => {
-    const { itemCategory, searchableText } = getItemSearchBlob(item);
+  return { queryCategory, queryKeyword, limit, keywordTokens, categoryCandidates };
+}
 
-    const categoryMatch = !queryCategory || matchesCategoryCandidates(itemCategory, categoryCandidates);
-    const directKeywordMatch = Boolean(queryKeyword) && searchableText.includes(queryKeyword);
-    const tokenHits = keywordTokens.filter((token) => searchableText.includes(token)).length;
-    const tokenCoverage = keywordTokens.length > 0 ? tokenHits / keywordTokens.length : 0;
-    const tokenKeywordMatch = keywordTokens.length <= 1 ? tokenHits === 1 : tokenCoverage >= 0.6;
-    const keywordMatch = !queryKeyword || directKeywordMatch || tokenKeywordMatch;
+function matchesInventoryItem(blob: ItemSearchBlob, query: PreparedInventoryQuery, requireCategoryMatch: boolean) {
+  const { queryCategory, queryKeyword, keywordTokens, categoryCandidates } = query;
+  const { itemCategory, searchableText } = blob;
 
-    return (requireCategoryMatch ? categoryMatch : true) && keywordMatch;
-  };
+  const categoryMatch = !queryCategory || matchesCategoryCandidates(itemCategory, categoryCandidates);
+  const directKeywordMatch = Boolean(queryKeyword) && searchableText.includes(queryKeyword);
+  const tokenHits = keywordTokens.filter((token) => searchableText.includes(token)).length;
+  const tokenCoverage = keywordTokens.length > 0 ? tokenHits / keywordTokens.length : 0;
+  const tokenKeywordMatch = keywordTokens.length <= 1 ? tokenHits === 1 : tokenCoverage >= 0.6;
+  const keywordMatch = !queryKeyword || directKeywordMatch || tokenKeywordMatch;
 
-  const strictFiltered = items.filter((item) => matchesInventoryItem(item, true));
-  const fallbackFiltered = queryKeyword ? items.filter((item) => matchesInventoryItem(item, false)) : strictFiltered;
-  const usedKeywordFallback = strictFiltered.length === 0 && fallbackFiltered.length > 0 && Boolean(queryCategory);
-  const filtered = usedKeywordFallback ? fallbackFiltered : strictFiltered;
+  return (requireCategoryMatch ? categoryMatch : true) && keywordMatch;
+}
 
-  const scoreItem = (item: Record<string, unknown>) => {
-    const { itemCategory, brand, description, tags, searchableTokens, searchableText } = getItemSearchBlob(item);
-    const hasImage = Boolean(item.image_url) || (Array.isArray(item.images) && item.images.length > 0);
+function scoreItem(item: Record<string, unknown>, blob: ItemSearchBlob, query: PreparedInventoryQuery) {
+  const { queryCategory, queryKeyword, keywordTokens, categoryCandidates } = query;
+  const { itemCategory, brand, description, tags, searchableTokens, searchableText } = blob;
+  const hasImage = Boolean(item.image_url) || (Array.isArray(item.images) && item.images.length > 0);
+  const weights = SEARCH_WEIGHTS;
 
-    let score = 0;
+  let score = 0;
 
-    if (queryCategory) {
-      if (itemCategory === queryCategory) score += 4;
-      else if (itemCategory.includes(queryCategory)) score += 2;
-      else if (categoryCandidates.some((candidate) => itemCategory === candidate)) score += 2;
-      else if (categoryCandidates.some((candidate) => itemCategory.includes(candidate))) score += 1;
-    }
+  if (queryCategory) {
+    if (itemCategory === queryCategory) score += weights.categoryExact;
+    else if (itemCategory.includes(queryCategory)) score += weights.categoryContains;
+    else if (categoryCandidates.some((candidate) => itemCategory === candidate)) score += weights.categoryCandidateExact;
+    else if (categoryCandidates.some((candidate) => itemCategory.includes(candidate))) score += weights.categoryCandidateContains;
+  }
 
-    if (queryKeyword) {
-      if (searchableText.includes(queryKeyword)) score += 6;
-      if (description.includes(queryKeyword)) score += 5;
-      if (brand.includes(queryKeyword)) score += 4;
-      if (tags.includes(queryKeyword)) score += 4;
-      if (itemCategory.includes(queryKeyword)) score += 2;
-
-      for (const token of keywordTokens) {
-        if (searchableText.includes(token)) score += 1;
-        if (description.includes(token)) score += 1;
-        if (brand.includes(token)) score += 1;
-        if (tags.includes(token)) score += 1;
-        if (searchableTokens.includes(token)) score += 1;
-      }
+  if (queryKeyword) {
+    if (searchableText.includes(queryKeyword)) score += weights.keywordText;
+    if (description.includes(queryKeyword)) score += weights.keywordDescription;
+    if (brand.includes(queryKeyword)) score += weights.keywordBrand;
+    if (tags.includes(queryKeyword)) score += weights.keywordTags;
+    if (itemCategory.includes(queryKeyword)) score += weights.keywordCategory;
+
+    for (const token of keywordTokens) {
+      if (searchableText.includes(token)) score += weights.tokenText;
+      if (description.includes(token)) score += weights.tokenDescription;
+      if (brand.includes(token)) score += weights.tokenBrand;
+      if (tags.includes(token)) score += weights.tokenTags;
+      if (searchableTokens.includes(token)) score += weights.tokenSearchable;
     }
+  }
 
-    if (hasImage) score += 0.5;
+  if (hasImage) score += weights.image;
 
-    return score;
-  };
+  return score;
+}
+
+/**
+ * Filter and rank the items at `candidates` (ascending positions into `items`).
+ * Candidates must include every item that could match; ranking is identical to
+ * evaluating the full list because non-candidates can never pass the filters.
+ */
+export function rankInventoryCandidates(
+  items: Array<Record<string, unknown>>,
+  blobs: ItemSearchBlob[],
+  query: PreparedInventoryQuery,
+  candidates: Iterable<number>,
+): InventorySearchResult {
+  const { queryCategory, queryKeyword, limit } = query;
+  const candidateList = [...candidates];
+
+  const strictFiltered = candidateList.filter((index) => matchesInventoryItem(blobs[index], query, true));
+  const fallbackFiltered = queryKeyword
+    ? candidateList.filter((index) => matchesInventoryItem(blobs[index], query, false))
+    : strictFiltered;
+  const usedKeywordFallback = strictFiltered.length === 0 && fallbackFiltered.length > 0 && Boolean(queryCategory);
+  const filtered = usedKeywordFallback ? fallbackFiltered : strictFiltered;
 
-  const ranked = [...filtered]
-    .map((item) => ({ item, score: scoreItem(item) }))
+  const ranked = filtered
+    .map((index) => ({ item: items[index], score: scoreItem(items[index], blobs[index], query) }))
     .sort((a, b) => b.score - a.score)
     .map((entry) => entry.item);
 
@@ -121,3 +177,11 @@ export function searchInventoryItems(
     usedKeywordFallback,
   };
 }
+
+export function searchInventoryItems(
+  items: Array<Record<string, unknown>>,
+  params: InventorySearchParams,
+): InventorySearchResult {
+  const blobs = items.map(getItemSearchBlob);
+  return rankInventoryCandidates(items, blobs, prepareInventoryQuery(params), items.keys());
+}
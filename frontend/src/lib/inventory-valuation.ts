@@ -0,0 +1,210 @@
+import { createHash } from "crypto";
+import { UpdateCommand } from "@aws-sdk/lib-dynamodb";
+import { TABLES, docClient, scanPage } from "@/lib/dynamodb";
+import {
+  METAL_PARSER_VERSION,
+  calculateValuation,
+  parseMetalDescription,
+  type StoredMetalSpecs,
+  type StoredValuation,
+} from "@/lib/metalParser";
+import type { SpotPrices } from "@/lib/spot-prices";
+
+/* ──────────────────────────────────────────────────────
+   Stored inventory valuations, TypeScript side
+
+   The same metal_specs / valuation attributes
+   backend/scripts/reprice_inventory.py writes, computed the same way:
+   the inventory API stamps them when an item's description is created
+   or edited, and the /api/cron/spot-prices route reprices the whole
+   catalog after each live quote, so stored figures never lag the
+   description or the market by more than one cron interval.
+
+   Only live quotes produce a valuation. Without one an edited item keeps
+   its parsed specs and loses its old figures until the next reprice.
+   ────────────────────────────────────────────────────── */
+
+const SCAN_PAGE_SIZE = 500;
+const UPDATE_CONCURRENCY = 10;
+
+export type RepriceResult = {
+  scanned: number;
+  written: number;
+  conflicts: string[];
+};
+
+type PricedRow = {
+  item_id: string;
+  description?: string;
+  metal_specs?: StoredMetalSpecs;
+  valuation?: StoredValuation;
+};
+
+/** Same digest as description_hash() in reprice_inventory.py. */
+export function descriptionHash(description: string): string {
+  return createHash("sha256").update(description, "utf8").digest("hex").slice(0, 16);
+}
+
+export function storedMetalSpecs(description: string): StoredMetalSpecs {
+  const parsed = parseMetalDescription(description);
+  return {
+    metal_type: parsed.metalType,
+    purity: parsed.purity.decimal,
+    purity_label: parsed.purity.label,
+    karat: parsed.purity.karat,
+    weight_grams: parsed.weightGrams,
+    weight_pennyweight: parsed.weightPennyweight,
+    confidence: parsed.confidence,
+    parser_version: METAL_PARSER_VERSION,
+    description_hash: descriptionHash(description),
+  };
+}
+
+/** Figures for stored specs at a quote, or null when the specs carry no metal weight. */
+export function storedValuation(specs: StoredMetalSpecs, prices: SpotPrices, pricedAt: string): StoredValuation | null {
+  if (specs.metal_type === "unknown") return null;
+  const result = calculateValuation(
+    {
+      metalType: specs.metal_type,
+      purity: { karat: specs.karat, decimal: Number(specs.purity), label: specs.purity_label },
+      weightGrams: specs.weight_grams == null ? null : Number(specs.weight_grams),
+      weightPennyweight: specs.weight_pennyweight,
+      confidence: specs.confidence,
+      originalDescription: "",
+      detectedKeywords: [],
+    },
+    prices
+  );
+  if (!result) return null;
+  return {
+    melt_value: result.meltValue,
+    payout_low: result.payoutOfferLow,
+    payout_high: result.payoutOfferHigh,
+    pawn_loan: result.pawnLoanOffer,
+    retail_estimate: result.retailEstimate,
+    metal_type: specs.metal_type,
+    spot_price: Math.round(prices[specs.metal_type] * 100) / 100,
+    spot_timestamp: prices.timestamp,
+    priced_at: pricedTimestamp(pricedAt),
+  };
+}
+
+function pricedTimestamp(iso: string): string {
+  // reprice_inventory.py stamps whole seconds.
+  return iso.replace(/\.\d+Z$/, "Z");
+}
+
+/**
+ * metal_specs and valuation for a new or re-described item. valuation is
+ * listed in `remove` when the quote is not live or the text has no metal weight.
+ */
+export function valuationFields(
+  description: string,
+  prices: SpotPrices
+): { set: { metal_specs: StoredMetalSpecs; valuation?: StoredValuation }; remove: string[] } {
+  const metal_specs = storedMetalSpecs(description);
+  const valuation = prices.live ? storedValuation(metal_specs, prices, new Date().toISOString()) : null;
+  return valuation ? { set: { metal_specs, valuation }, remove: [] } : { set: { metal_specs }, remove: ["valuation"] };
+}
+
+function sameCents(previous: StoredValuation | undefined, next: StoredValuation): boolean {
+  if (!previous) return false;
+  const fields = ["melt_value", "payout_low", "payout_high", "pawn_loan", "retail_estimate"] as const;
+  return fields.every((field) => Math.round(Number(previous[field]) * 100) === Math.round(next[field] * 100));
+}
+
+async function writeRow(
+  row: PricedRow,
+  set: Record<string, unknown>,
+  remove: string[],
+  result: RepriceResult
+): Promise<void> {
+  const names: Record<string, string> = { "#description": "description" };
+  const values: Record<string, unknown> = {};
+  const setClauses = Object.entries(set).map(([name, value], position) => {
+    names[`#s${position}`] = name;
+    values[`:s${position}`] = value;
+    return `#s${position} = :s${position}`;
+  });
+  const removeClauses = remove.map((name, position) => {
+    names[`#r${position}`] = name;
+    return `#r${position}`;
+  });
+  // Only stamp figures derived from the description that was actually parsed.
+  let condition = "attribute_exists(item_id) AND attribute_not_exists(#description)";
+  if (row.description != null) {
+    condition = "#description = :description";
+    values[":description"] = row.description;
+  }
+
+  try {
+    await docClient.send(
+      new UpdateCommand({
+        TableName: TABLES.inventory,
+        Key: { item_id: row.item_id },
+        UpdateExpression: [
+          setClauses.length > 0 ? `SET ${setClauses.join(", ")}` : "",
+          removeClauses.length > 0 ? `REMOVE ${removeClauses.join(", ")}` : "",
+        ]
+          .filter(Boolean)
+          .join(" "),
+        ConditionExpression: condition,
+        ExpressionAttributeNames: names,
+        ExpressionAttributeValues: Object.keys(values).length > 0 ? values : undefined,
+      })
+    );
+    result.written++;
+  } catch (error) {
+    if ((error as { name?: string } | null)?.name !== "ConditionalCheckFailedException") throw error;
+    result.conflicts.push(row.item_id);
+  }
+}
+
+/** The plan_reprice + apply_plan pass of reprice_inventory.py, for a live quote. */
+export async function repriceInventory(prices: SpotPrices): Promise<RepriceResult> {
+  const result: RepriceResult = { scanned: 0, written: 0, conflicts: [] };
+  if (!prices.live) return result;
+
+  const pricedAt = new Date().toISOString();
+  let startKey: Record<string, unknown> | undefined;
+  do {
+    const page = await scanPage<PricedRow>(TABLES.inventory, SCAN_PAGE_SIZE, startKey, {
+      ProjectionExpression: "item_id, #description, metal_specs, valuation",
+      ExpressionAttributeNames: { "#description": "description" },
+    });
+    startKey = page.lastEvaluatedKey;
+
+    const writes: Array<[PricedRow, Record<string, unknown>, string[]]> = [];
+    for (const row of page.items) {
+      result.scanned++;
+      let specs = row.metal_specs;
+      const set: Record<string, unknown> = {};
+      const remove: string[] = [];
+      if (
+        !specs ||
+        specs.parser_version !== METAL_PARSER_VERSION ||
+        specs.description_hash !== descriptionHash(row.description ?? "")
+      ) {
+        specs = storedMetalSpecs(row.description ?? "");
+        set.metal_specs = specs;
+      }
+
+      const valuation = storedValuation(specs, prices, pricedAt);
+      if (valuation && !sameCents(row.valuation, valuation)) {
+        set.valuation = valuation;
+      } else if (!valuation && row.valuation) {
+        // The description no longer yields a metal weight, so the old figures are wrong.
+        remove.push("valuation");
+      }
+      if (Object.keys(set).length > 0 || remove.length > 0) writes.push([row, set, remove]);
+    }
+
+    for (let start = 0; start < writes.length; start += UPDATE_CONCURRENCY) {
+      await Promise.all(
+        writes.slice(start, start + UPDATE_CONCURRENCY).map(([row, set, remove]) => writeRow(row, set, remove, result))
+      );
+    }
+  } while (startKey);
+
+  return result;
+}
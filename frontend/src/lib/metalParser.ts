@@ -37,6 +37,40 @@ export type ValuationResult = {
   };
 };
 
+/**
+ * Parsed specs and valuation stored on inventory items by
+ * backend/scripts/reprice_inventory.py and lib/inventory-valuation.ts. The
+ * Python port of this parser (backend/scripts/metal_parser.py) must be kept
+ * in step with the rules below.
+ */
+
+// Stored as metal_specs.parser_version; equal to PARSER_VERSION in metal_parser.py.
+export const METAL_PARSER_VERSION = 1;
+
+export type StoredMetalSpecs = {
+  metal_type: MetalType;
+  purity: number;
+  purity_label: string;
+  karat: number | null;
+  weight_grams: number | null;
+  weight_pennyweight: number | null;
+  confidence: 'high' | 'medium' | 'low';
+  parser_version: number;
+  description_hash: string;
+};
+
+export type StoredValuation = {
+  melt_value: number;
+  payout_low: number;
+  payout_high: number;
+  pawn_loan: number;
+  retail_estimate: number;
+  metal_type: MetalType;
+  spot_price: number;
+  spot_timestamp?: string;
+  priced_at: string;
+};
+
 // Standard purity mappings
 const GOLD_PURITY: Record<string, PurityStandard> = {
   '24k': { karat: 24, decimal: 0.999, label: '24K' },
@@ -0,0 +1,225 @@
+import { PutCommand } from "@aws-sdk/lib-dynamodb";
+import { TABLES, docClient, getItem } from "@/lib/dynamodb";
+
+/* ──────────────────────────────────────────────────────
+   Metal spot prices
+
+   Published to USA_Pawn_Store_Config (config_key "spot_prices") by
+   backend/scripts/ingest_spot_prices.py, so every server instance reads the
+   same quote with one GetItem instead of calling metals-api itself.
+   On Vercel the /api/cron/spot-prices route does the same publish on the
+   schedule in vercel.json. If no live quote is published (or the last one
+   is stale), a server with METALS_API_KEY fetches one directly.
+
+   Only metals-api quotes are live. The ingest script's "local" provider
+   publishes a random walk for demos; it is served with live: false, the
+   same as the mock fallback, so nothing presents it as market data.
+   ────────────────────────────────────────────────────── */
+
+export const SPOT_PRICES_KEY = "spot_prices";
+const LIVE_SOURCES = new Set(["metals-api"]);
+
+// A quote older than this is still served, but flagged so the UI can say so.
+const STALE_AFTER_MS = 60 * 60 * 1000;
+// Successive requests on a warm instance share one read for this long.
+const READ_CACHE_MS = 30 * 1000;
+// Direct metals-api fetches are rationed to one per instance per ingest interval.
+const DIRECT_CACHE_MS = 15 * 60 * 1000;
+// Matches ingest_spot_prices.py DEFAULT_HISTORY_HOURS.
+const HISTORY_WINDOW_SECONDS = 7 * 24 * 60 * 60;
+const METALS_API_TIMEOUT_MS = 7000;
+const TROY_OUNCE_GRAMS = 31.1034768;
+const METALS = ["gold", "silver", "platinum"] as const;
+
+export type SpotPrices = {
+  gold: number;
+  silver: number;
+  platinum: number;
+  timestamp: string;
+  source: string;
+  live: boolean;
+  stale?: boolean;
+};
+
+export type SpotPriceHistory = {
+  t: number[];
+  gold: number[];
+  silver: number[];
+  platinum: number[];
+};
+
+type SpotPricesItem = {
+  config_key: string;
+  value?: string;
+  history?: string;
+  updated_at?: string;
+};
+
+export const FALLBACK_SPOT_PRICES: SpotPrices = {
+  gold: 2050.0,
+  silver: 24.5,
+  platinum: 950.0,
+  timestamp: "2026-02-13T12:00:00Z",
+  source: "mock",
+  live: false,
+};
+
+let cachedItem: SpotPricesItem | null = null;
+let cachedAt = 0;
+let directQuote: SpotPrices | null = null;
+let directQuoteAt = 0;
+
+function normalizeRateToOunce(rate: number): number {
+  // metals-api quotes either metal per USD, USD per gram or USD per ounce depending on plan.
+  if (!Number.isFinite(rate) || rate <= 0) return 0;
+  if (rate < 1) return 1 / rate;
+  if (rate < 100) return rate * TROY_OUNCE_GRAMS;
+  return rate;
+}
+
+/** One quote straight from metals-api; null without METALS_API_KEY or on any failure. */
+export async function fetchMetalsApiQuote(): Promise<SpotPrices | null> {
+  const apiKey = process.env.METALS_API_KEY;
+  if (!apiKey) return null;
+
+  const controller = new AbortController();
+  const timeout = setTimeout(() => controller.abort(), METALS_API_TIMEOUT_MS);
+  try {
+    const endpoint = `https://metals-api.com/api/latest?access_key=${apiKey}&base=USD&symbols=XAU,XAG,XPT`;
+    const response = await fetch(endpoint, { cache: "no-store", signal: controller.signal });
+    if (!response.ok) throw new Error(`Metals API failed with ${response.status}`);
+
+    const data = (await response.json()) as { success?: boolean; rates?: Record<string, number> };
+    if (!data.success || !data.rates) throw new Error("Unexpected metals API payload");
+    const gold = normalizeRateToOunce(Number(data.rates.XAU));
+    const silver = normalizeRateToOunce(Number(data.rates.XAG));
+    const platinum = normalizeRateToOunce(Number(data.rates.XPT));
+    if (!gold || !silver || !platinum) throw new Error("Metals API omitted a rate");
+
+    return {
+      gold: Number(gold.toFixed(2)),
+      silver: Number(silver.toFixed(2)),
+      platinum: Number(platinum.toFixed(2)),
+      timestamp: new Date().toISOString().replace(/\.\d{3}Z$/, "Z"),
+      source: "metals-api",
+      live: true,
+    };
+  } catch (error) {
+    console.error("[Spot Prices] metals-api fetch failed:", error);
+    return null;
+  } finally {
+    clearTimeout(timeout);
+  }
+}
+
+function appendHistory(history: Partial<SpotPriceHistory>, epoch: number, prices: SpotPrices): SpotPriceHistory {
+  let times = [...(history.t ?? [])];
+  let columns = METALS.map((metal) => [...(history[metal] ?? [])]);
+  if (columns.some((values) => values.length !== times.length)) {
+    // Columns out of step (hand edit or older format): start a fresh window.
+    times = [];
+    columns = METALS.map(() => []);
+  }
+
+  times.push(epoch);
+  METALS.forEach((metal, index) => columns[index].push(Number(prices[metal].toFixed(2))));
+
+  const cutoff = epoch - HISTORY_WINDOW_SECONDS;
+  const start = times.findIndex((value) => value >= cutoff);
+  const keep = start === -1 ? times.length : start;
+  return {
+    t: times.slice(keep),
+    gold: columns[0].slice(keep),
+    silver: columns[1].slice(keep),
+    platinum: columns[2].slice(keep),
+  };
+}
+
+/**
+ * Write a quote the way ingest_spot_prices.py does: latest value plus a rolling
+ * history, conditional on the item seen so two publishers never drop each
+ * other's points. Returns false when another writer got there first.
+ */
+export async function publishSpotPrices(prices: SpotPrices): Promise<boolean> {
+  const published = await getItem<SpotPricesItem>(TABLES.storeConfig, { config_key: SPOT_PRICES_KEY });
+  const epoch = Math.floor(new Date(prices.timestamp).getTime() / 1000);
+  const history = appendHistory(published?.history ? JSON.parse(published.history) : {}, epoch, prices);
+  const { gold, silver, platinum, timestamp, source } = prices;
+
+  try {
+    await docClient.send(
+      new PutCommand({
+        TableName: TABLES.storeConfig,
+        Item: {
+          config_key: SPOT_PRICES_KEY,
+          value: JSON.stringify({ gold, silver, platinum, timestamp, source }),
+          history: JSON.stringify(history),
+          updated_at: timestamp,
+        },
+        ...(published?.updated_at
+          ? { ConditionExpression: "updated_at = :previous", ExpressionAttributeValues: { ":previous": published.updated_at } }
+          : { ConditionExpression: "attribute_not_exists(config_key)" }),
+      })
+    );
+  } catch (error) {
+    if ((error as { name?: string } | null)?.name === "ConditionalCheckFailedException") return false;
+    throw error;
+  }
+  cachedItem = null;
+  return true;
+}
+
+async function directSpotPrices(): Promise<SpotPrices | null> {
+  const now = Date.now();
+  if (directQuote && now - directQuoteAt < DIRECT_CACHE_MS) return directQuote;
+  const quote = await fetchMetalsApiQuote();
+  if (quote) {
+    directQuote = quote;
+    directQuoteAt = now;
+  }
+  return quote ?? directQuote;
+}
+
+async function readSpotPricesItem(): Promise<SpotPricesItem | null> {
+  const now = Date.now();
+  if (cachedItem && now - cachedAt < READ_CACHE_MS) return cachedItem;
+
+  const item = await getItem<SpotPricesItem>(TABLES.storeConfig, { config_key: SPOT_PRICES_KEY });
+  if (item) {
+    cachedItem = item;
+    cachedAt = now;
+  }
+  return item;
+}
+
+async function readPublishedPrices(): Promise<SpotPrices | null> {
+  try {
+    const item = await readSpotPricesItem();
+    if (!item?.value) return null;
+    const published = JSON.parse(item.value) as Omit<SpotPrices, "live" | "stale">;
+    const prices: SpotPrices = { ...published, live: LIVE_SOURCES.has(published.source) };
+    const age = Date.now() - new Date(prices.timestamp).getTime();
+    return age > STALE_AFTER_MS ? { ...prices, stale: true } : prices;
+  } catch (error) {
+    console.error("[Spot Prices] Failed to read published prices:", error);
+    return null;
+  }
+}
+
+/**
+ * Latest published quote. Without a fresh live one, a direct metals-api quote;
+ * failing that, the published quote as-is, then the mock prices.
+ */
+export async function getSpotPrices(): Promise<SpotPrices> {
+  const published = await readPublishedPrices();
+  if (published?.live && !published.stale) return published;
+
+  const direct = await directSpotPrices();
+  if (direct) return direct;
+  return published ?? { ...FALLBACK_SPOT_PRICES, timestamp: new Date().toISOString() };
+}
+
+export async function getSpotPriceHistory(): Promise<SpotPriceHistory | null> {
+  const item = await readSpotPricesItem();
+  return item?.history ? (JSON.parse(item.history) as SpotPriceHistory) : null;
+}
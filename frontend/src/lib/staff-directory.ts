@@ -0,0 +1,218 @@
+import { createHmac } from "crypto";
+import { DeleteCommand, PutCommand, TransactWriteCommand, UpdateCommand } from "@aws-sdk/lib-dynamodb";
+import { INDEXES, TABLES, docClient, getItem, queryIndexItems, scanPage } from "@/lib/dynamodb";
+
+/* ──────────────────────────────────────────────────────
+   Staff directory
+
+   One USA_Pawn_Staff row per staff member, keyed by the lowercased name.
+   PINs are stored only as pin_hash, an HMAC-SHA256 keyed by STAFF_PIN_SALT,
+   and the pin_hash-index GSI makes a PIN check a single Query. Keep the
+   hash in step with backend/scripts/staff_directory.py.
+   ────────────────────────────────────────────────────── */
+
+export type StaffRecord = {
+  staff_key: string;
+  name: string;
+  pin_hash: string;
+  role?: string;
+  phone?: string;
+  email?: string;
+  hired_date?: string;
+  updated_at?: string;
+};
+
+export type StaffMember = Omit<StaffRecord, "staff_key" | "pin_hash" | "updated_at">;
+
+export type StaffInput = {
+  name: string;
+  pin: string;
+  role?: string;
+  phone?: string;
+  email?: string;
+  hired_date?: string;
+};
+
+export type StaffUpdate = Partial<Omit<StaffInput, "hired_date">>;
+
+function pinSalt(): string {
+  return process.env.STAFF_PIN_SALT || process.env.DAILY_QR_TOKEN_SECRET || "vault-dev-secret";
+}
+
+export function hashPin(pin: string): string {
+  return createHmac("sha256", pinSalt()).update(pin.trim()).digest("hex");
+}
+
+export function staffKey(name: string): string {
+  return name.trim().split(/\s+/).join(" ").toLowerCase();
+}
+
+function isConditionFailure(error: unknown): boolean {
+  const name = (error as { name?: string } | null)?.name;
+  return name === "ConditionalCheckFailedException" || name === "TransactionCanceledException";
+}
+
+export function toStaffMember(record: StaffRecord): StaffMember {
+  const { name, role, phone, email, hired_date } = record;
+  return { name, role, phone, email, hired_date };
+}
+
+export async function listStaff(): Promise<StaffMember[]> {
+  const records: StaffRecord[] = [];
+  let lastKey: Record<string, unknown> | undefined;
+  do {
+    const page = await scanPage<StaffRecord>(TABLES.staff, 500, lastKey);
+    records.push(...page.items);
+    lastKey = page.lastEvaluatedKey;
+  } while (lastKey);
+
+  return records.map(toStaffMember).sort((a, b) => a.name.localeCompare(b.name));
+}
+
+export async function getStaffRecord(name: string): Promise<StaffRecord | null> {
+  return getItem<StaffRecord>(TABLES.staff, { staff_key: staffKey(name) });
+}
+
+/** The staff member with this name and PIN, or null. PINs are not unique, so the name picks among matches. */
+export async function verifyStaffPin(name: string, pin: string): Promise<StaffMember | null> {
+  const matches = await queryIndexItems<StaffRecord>(TABLES.staff, INDEXES.staffByPinHash, {
+    name: "pin_hash",
+    value: hashPin(pin),
+  });
+  const key = staffKey(name);
+  const match = matches.find((record) => record.staff_key === key);
+  return match ? toStaffMember(match) : null;
+}
+
+/** Returns null when a staff member with the same name already exists. */
+export async function createStaffMember(input: StaffInput): Promise<StaffMember | null> {
+  const record: StaffRecord = {
+    staff_key: staffKey(input.name),
+    name: input.name.trim(),
+    pin_hash: hashPin(input.pin),
+    role: input.role || "Staff",
+    phone: input.phone || undefined,
+    email: input.email || undefined,
+    hired_date: input.hired_date ?? new Date().toISOString().slice(0, 10),
+    updated_at: new Date().toISOString(),
+  };
+
+  try {
+    await docClient.send(
+      new PutCommand({
+        TableName: TABLES.staff,
+        Item: record,
+        ConditionExpression: "attribute_not_exists(staff_key)",
+      })
+    );
+  } catch (error) {
+    if (isConditionFailure(error)) return null;
+    throw error;
+  }
+  return toStaffMember(record);
+}
+
+/**
+ * Updates one row in place. A rename moves the row to its new key in a
+ * transaction. Returns "not_found" or "conflict" instead of throwing for the
+ * cases the API reports to the caller.
+ */
+export async function updateStaffMember(
+  currentName: string,
+  updates: StaffUpdate
+): Promise<StaffMember | "not_found" | "conflict"> {
+  const existing = await getStaffRecord(currentName);
+  if (!existing) return "not_found";
+
+  const next: StaffRecord = {
+    ...existing,
+    name: updates.name ? updates.name.trim() : existing.name,
+    pin_hash: updates.pin ? hashPin(updates.pin) : existing.pin_hash,
+    role: updates.role || existing.role,
+    phone: updates.phone !== undefined ? updates.phone || undefined : existing.phone,
+    email: updates.email !== undefined ? updates.email || undefined : existing.email,
+    staff_key: staffKey(updates.name || existing.name),
+    updated_at: new Date().toISOString(),
+  };
+
+  try {
+    if (next.staff_key !== existing.staff_key) {
+      await docClient.send(
+        new TransactWriteCommand({
+          TransactItems: [
+            {
+              Put: {
+                TableName: TABLES.staff,
+                Item: next,
+                ConditionExpression: "attribute_not_exists(staff_key)",
+              },
+            },
+            {
+              Delete: {
+                TableName: TABLES.staff,
+                Key: { staff_key: existing.staff_key },
+                ConditionExpression: "updated_at = :seen",
+                ExpressionAttributeValues: { ":seen": existing.updated_at },
+              },
+            },
+          ],
+        })
+      );
+    } else {
+      const fields: Record<string, unknown> = {
+        name: next.name,
+        pin_hash: next.pin_hash,
+        role: next.role,
+        phone: next.phone,
+        email: next.email,
+        updated_at: next.updated_at,
+      };
+      const names: Record<string, string> = {};
+      const values: Record<string, unknown> = { ":seen": existing.updated_at };
+      const sets: string[] = [];
+      const removes: string[] = [];
+      Object.entries(fields).forEach(([field, value], index) => {
+        names[`#f${index}`] = field;
+        if (value === undefined) {
+          removes.push(`#f${index}`);
+        } else {
+          sets.push(`#f${index} = :v${index}`);
+          values[`:v${index}`] = value;
+        }
+      });
+      names["#seen"] = "updated_at";
+
+      await docClient.send(
+        new UpdateCommand({
+          TableName: TABLES.staff,
+          Key: { staff_key: existing.staff_key },
+          UpdateExpression: `SET ${sets.join(", ")}${removes.length ? ` REMOVE ${removes.join(", ")}` : ""}`,
+          // Reject the write if someone else saved this row since we read it.
+          ConditionExpression: "#seen = :seen",
+          ExpressionAttributeNames: names,
+          ExpressionAttributeValues: values,
+        })
+      );
+    }
+  } catch (error) {
+    if (isConditionFailure(error)) return "conflict";
+    throw error;
+  }
+  return toStaffMember(next);
+}
+
+export async function deleteStaffMember(name: string): Promise<boolean> {
+  try {
+    await docClient.send(
+      new DeleteCommand({
+        TableName: TABLES.staff,
+        Key: { staff_key: staffKey(name) },
+        ConditionExpression: "attribute_exists(staff_key)",
+      })
+    );
+  } catch (error) {
+    if (isConditionFailure(error)) return false;
+    throw error;
+  }
+  return true;
+}